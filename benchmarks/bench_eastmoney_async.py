@@ -0,0 +1,108 @@
+"""
+东方财富港股/美股报表获取基准测试（离线）
+
+在本地回放服务（tests/eastmoney_stub.py）上对比两种方式批量获取财务三表的耗时：
+
+- akshare：线程池中并发调用 `stock_financial_*_report_em`（每次请求新建连接）
+- async：`AsyncEastmoneyClient` 共享连接池并发获取（同组报表共享前置查询）
+
+`--latency` 为回放服务每个响应附加的延迟，用于模拟真实网络往返。
+
+用法:
+    uv run python benchmarks/bench_eastmoney_async.py [--symbols 200] [--concurrency 32] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, PROJECT_ROOT)
+
+import akshare as ak  # noqa: E402
+
+from akshare_value_investment.datasource.eastmoney_async import (  # noqa: E402
+    AsyncEastmoneyClient,
+    create_http_client,
+)
+from tests.eastmoney_stub import EastmoneyReplayServer  # noqa: E402
+
+HK_STATEMENTS = ["资产负债表", "利润表", "现金流量表"]
+US_STATEMENTS = ["资产负债表", "综合损益表", "现金流量表"]
+
+
+def akshare_fetch(stock: str):
+    if stock.isdigit():
+        return [ak.stock_financial_hk_report_em(stock=stock, symbol=name, indicator="年度") for name in HK_STATEMENTS]
+    return [ak.stock_financial_us_report_em(stock=stock, symbol=name, indicator="年报") for name in US_STATEMENTS]
+
+
+def run_akshare(server: EastmoneyReplayServer, stocks, concurrency: int) -> float:
+    real_get = requests.get
+
+    def redirected_get(url, *args, **kwargs):
+        return real_get(server.url, *args, **kwargs)
+
+    with patch.object(requests, "get", side_effect=redirected_get):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(akshare_fetch, stocks))
+        return time.perf_counter() - start
+
+
+def run_async(server: EastmoneyReplayServer, stocks, concurrency: int) -> float:
+    async def fetch_all():
+        semaphore = asyncio.Semaphore(concurrency)
+        http = create_http_client(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+        async def fetch(stock):
+            async with semaphore:
+                # 每只股票一个客户端：共享连接池，前置查询只在本组内复用
+                client = AsyncEastmoneyClient(base_url=server.url, client=http)
+                if stock.isdigit():
+                    return await client.hk_reports(stock, HK_STATEMENTS)
+                return await client.us_reports(stock, US_STATEMENTS)
+
+        try:
+            await asyncio.gather(*(fetch(stock) for stock in stocks))
+        finally:
+            await http.aclose()
+
+    start = time.perf_counter()
+    asyncio.run(fetch_all())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="东方财富报表获取基准测试")
+    parser.add_argument("--symbols", type=int, default=200, help="获取的股票数（循环使用样本股票）")
+    parser.add_argument("--concurrency", type=int, default=32, help="并发度（线程数 / 连接数）")
+    parser.add_argument("--latency", type=float, default=0.02, help="回放服务每个响应的延迟（秒）")
+    args = parser.parse_args()
+
+    samples = ["00700", "09988", "AAPL", "MSFT"]
+    stocks = [samples[i % len(samples)] for i in range(args.symbols)]
+
+    with EastmoneyReplayServer(latency=args.latency) as server:
+        akshare_seconds = run_akshare(server, stocks, args.concurrency)
+        akshare_requests = len(server.requests)
+        server.requests.clear()
+
+        async_seconds = run_async(server, stocks, args.concurrency)
+        async_requests = len(server.requests)
+
+    print(f"{'方式':<10}{'请求数':>8}{'耗时':>10}{'股票/秒':>10}")
+    print(f"{'akshare':<10}{akshare_requests:>8}{akshare_seconds:>9.2f}s{args.symbols / akshare_seconds:>10.1f}")
+    print(f"{'async':<10}{async_requests:>8}{async_seconds:>9.2f}s{args.symbols / async_seconds:>10.1f}")
+    print(f"加速: {akshare_seconds / async_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+窄表 → 宽表转换基准测试
+
+对比 pivot_table(aggfunc='first') 与 pivot_first() 在港股/美股财务报表样本上的耗时，
+并在计时前校验两者结果完全一致。
+
+用法:
+    uv run python benchmarks/bench_pivot.py [--repeat 50]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from akshare_value_investment.datasource.queryers.pivot import pivot_first  # noqa: E402
+
+SAMPLE_DIR = os.path.join(PROJECT_ROOT, "tests", "sample_data")
+
+# 样本文件模式 → (行键, 列键)
+SAMPLES = {
+    "hk_00700_*.csv": (["date", "SECURITY_CODE", "SECURITY_NAME_ABBR"], "STD_ITEM_NAME"),
+    "us_AAPL_*.csv": (["REPORT_DATE", "SECURITY_CODE", "SECURITY_NAME_ABBR"], "ITEM_NAME"),
+}
+
+
+def load_sample(path: str) -> pd.DataFrame:
+    """按查询器的预处理方式加载样本"""
+    df = pd.read_csv(path, dtype={"SECURITY_CODE": str})
+    if "STD_ITEM_NAME" in df.columns:
+        df["date"] = pd.to_datetime(df["REPORT_DATE"])
+    else:
+        df["REPORT_DATE"] = pd.to_datetime(df["REPORT_DATE"], errors="coerce")
+        df = df.sort_values("REPORT_DATE", ascending=False)
+        df["AMOUNT"] = pd.to_numeric(df["AMOUNT"], errors="coerce")
+    return df
+
+
+def pivot_table_first(df: pd.DataFrame, index, columns) -> pd.DataFrame:
+    wide_df = df.pivot_table(index=index, columns=columns, values="AMOUNT",
+                             aggfunc="first", fill_value=0).reset_index()
+    wide_df.columns.name = None
+    return wide_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="窄表转宽表基准测试")
+    parser.add_argument("--repeat", type=int, default=50, help="每个样本的重复次数")
+    args = parser.parse_args()
+
+    print(f"{'样本':<45}{'行数':>6}{'pivot_table':>14}{'pivot_first':>14}{'加速':>8}")
+    for pattern, (index, columns) in SAMPLES.items():
+        for path in sorted(glob.glob(os.path.join(SAMPLE_DIR, pattern))):
+            df = load_sample(path)
+
+            pd.testing.assert_frame_equal(pivot_table_first(df, index, columns),
+                                          pivot_first(df, index, columns, "AMOUNT"))
+
+            baseline = min(timeit.repeat(lambda: pivot_table_first(df, index, columns),
+                                         number=1, repeat=args.repeat))
+            fast = min(timeit.repeat(lambda: pivot_first(df, index, columns, "AMOUNT"),
+                                     number=1, repeat=args.repeat))
+            print(f"{os.path.basename(path):<45}{len(df):>6}"
+                  f"{baseline * 1000:>12.2f}ms{fast * 1000:>12.2f}ms{baseline / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
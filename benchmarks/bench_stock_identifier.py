@@ -0,0 +1,89 @@
+"""
+股票代码识别基准测试
+
+对比三种方式识别并格式化一批股票代码的耗时：
+
+- loop (cold): 逐个调用 identify() + format_symbol_for_akshare()，缓存为空
+- loop (warm): 同上，缓存已预热（重复代码、搜索框逐键输入的情形）
+- identify_many: 向量化批量识别
+
+计时前校验 identify_many 与逐个调用结果一致；最后一列为每个代码的平均耗时，
+用于确认批量接口中代码标准化的开销可以忽略（单次上游请求通常为数百毫秒）。
+
+用法:
+    uv run python benchmarks/bench_stock_identifier.py [--size 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from akshare_value_investment.core.stock_identifier import StockIdentifier  # noqa: E402
+
+PREFIXES = ["", "", "", "SH", "SZ", "HK.", "US."]
+SUFFIXES = ["", "", "", ".SS", ".SZ", ".HK", ".O"]
+
+
+def generate_symbols(size: int, seed: int = 42):
+    """生成混合格式的股票代码（A股/港股/美股，含前缀、后缀和大小写变化）"""
+    rng = random.Random(seed)
+    symbols = []
+    for _ in range(size):
+        kind = rng.randrange(3)
+        if kind == 0:
+            core = f"{rng.choice(['600', '000', '300', '688'])}{rng.randrange(1000):03d}"
+        elif kind == 1:
+            core = f"{rng.randrange(1, 10000):0{rng.choice([3, 4, 5])}d}"
+        else:
+            core = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(1, 5)))
+            core = core.lower() if rng.random() < 0.3 else core
+        symbols.append(rng.choice(PREFIXES) + core + rng.choice(SUFFIXES))
+    return symbols
+
+
+def identify_loop(identifier: StockIdentifier, symbols):
+    result = []
+    for symbol in symbols:
+        market, clean_symbol = identifier.identify(symbol)
+        result.append((market, clean_symbol, identifier.format_symbol_for_akshare(market, clean_symbol)))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="股票代码识别基准测试")
+    parser.add_argument("--size", type=int, default=100_000, help="股票代码数量")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    args = parser.parse_args()
+
+    identifier = StockIdentifier()
+    symbols = generate_symbols(args.size)
+
+    expected = identify_loop(identifier, symbols)
+    batch = identifier.identify_many(symbols)
+    assert list(batch.itertuples(index=False, name=None)) == expected, "identify_many 与逐个识别结果不一致"
+
+    def cold():
+        StockIdentifier.cache_clear()
+        identify_loop(identifier, symbols)
+
+    identify_loop(identifier, symbols)
+    timings = {
+        "loop (cold)": min(timeit.repeat(cold, number=1, repeat=args.repeat)),
+        "loop (warm)": min(timeit.repeat(lambda: identify_loop(identifier, symbols), number=1, repeat=args.repeat)),
+        "identify_many": min(timeit.repeat(lambda: identifier.identify_many(symbols), number=1, repeat=args.repeat)),
+    }
+
+    info = StockIdentifier.cache_info()["identify"]
+    print(f"代码数: {args.size}  去重后: {len(set(symbols))}  缓存容量: {info.maxsize}")
+    print(f"{'方式':<16}{'总耗时':>12}{'每个代码':>12}")
+    for name, seconds in timings.items():
+        print(f"{name:<16}{seconds * 1000:>10.1f}ms{seconds / args.size * 1e6:>10.2f}µs")
+
+
+if __name__ == "__main__":
+    main()
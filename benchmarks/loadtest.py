@@ -0,0 +1,483 @@
+"""
+API 压测工具（离线回放上游）
+
+回答"一个 worker 能承受多少 /statements、/indicators 请求，饱和时 p99 是多少"。
+上游全部来自离线录制的夹具（scripts/record_akshare_fixtures.py 的 `record_offline`），由
+`ReplayAkshare` 回放并可附加延迟，因此结果只反映本服务自身（缓存、转换、序列化、并发）的能力。
+
+## 🎯 负载模型
+
+- **股票池**: 样本股票（SH600519、00700、AAPL）通过夹具别名扩展为任意数量的代码，
+  分为热门股票（`--hot-symbols`，压测前预热缓存）和冷门股票池（每只只请求一次，必然缓存未命中）
+- **热度分布**: 热门股票按 Zipf 分布选择（`--zipf` 为指数 s，越大越集中在头部）
+- **命中/未命中比例**: `--miss-ratio` 的请求取自冷门股票池
+- **接口比例**: `--mix statements=0.7,indicators=0.3`
+- **并发阶梯**: `--stages 1:10,8:10,32:20` 表示依次以 1、8、32 个并发（闭环：每个并发收到响应后
+  立即发下一个请求）各运行 10、10、20 秒
+
+## 🔧 被测服务
+
+- 默认启动一个 uvicorn worker 子进程（`--workers` 可调），设置 AKSHARE_REPLAY_DIR 指向夹具目录
+- `--url` 压测已启动的服务：该服务需以 `AKSHARE_REPLAY_DIR=<--fixtures 目录>` 启动，
+  目录可先用 `--prepare-only` 生成
+
+## 📊 报告
+
+按阶段、按接口统计请求数、错误率、吞吐（请求/秒）、p50/p95/p99/最大延迟，以及服务端
+Server-Timing 观察到的上游请求比例；写入 JSON（`--output`）和简单的 HTML 汇总（`--html`）。
+
+用法:
+    uv run python benchmarks/loadtest.py [--stages 1:10,8:10,32:20] [--miss-ratio 0.05] [--zipf 1.1] \\
+        [--upstream-latency 0.05,0.2] [--output .cache/loadtest/report.json] [--html .cache/loadtest/report.html]
+"""
+
+import argparse
+import asyncio
+import bisect
+import html
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, PROJECT_ROOT)
+
+from akshare_value_investment.client import FINANCIAL_INDICATORS_PATH, FINANCIAL_STATEMENTS_PATH  # noqa: E402
+from akshare_value_investment.datasource.replay import FixtureStore  # noqa: E402
+from akshare_value_investment.observability.request_timing import SOURCE_UPSTREAM, parse_server_timing  # noqa: E402
+
+DEFAULT_OUTPUT = ".cache/loadtest/report.json"
+DEFAULT_HTML = ".cache/loadtest/report.html"
+
+# 市场 → (已录制的样本代码, 请求时的代码格式, 财务三表查询类型, 财务指标市场)
+MARKETS = {
+    "a": ("600519", "SH{code}", "a_financial_statements", "a_stock"),
+    "hk": ("00700", "{code}", "hk_financial_statements", "hk_stock"),
+    "us": ("AAPL", "{code}", "us_financial_statements", "us_stock"),
+}
+
+ENDPOINTS = ("statements", "indicators")
+
+
+@dataclass(frozen=True)
+class Stage:
+    """并发阶梯中的一级"""
+
+    concurrency: int
+    duration: float
+
+
+def parse_stages(value: str) -> List[Stage]:
+    """解析并发阶梯：`1:10,8:10,32:20`（并发:秒）"""
+    stages = []
+    for item in value.split(","):
+        concurrency, _, duration = item.strip().partition(":")
+        stage = Stage(int(concurrency), float(duration or 10))
+        if stage.concurrency < 1 or stage.duration <= 0:
+            raise ValueError(f"无效的并发阶梯: {item}")
+        stages.append(stage)
+    return stages
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """解析接口比例：`statements=0.7,indicators=0.3`（自动归一化）"""
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"未知的接口: {name}（可选: {', '.join(ENDPOINTS)}）")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("接口比例之和必须大于0")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+class ZipfSampler:
+    """按 Zipf 分布（第 k 名的概率正比于 1/k^s）选择下标"""
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        weights = [1 / (rank ** s) for rank in range(1, n + 1)]
+        total = sum(weights)
+        self._cumulative = list(itertools.accumulate(w / total for w in weights))
+        self._rng = rng
+
+    def sample(self) -> int:
+        index = bisect.bisect_left(self._cumulative, self._rng.random())
+        return min(index, len(self._cumulative) - 1)
+
+
+def _synthetic_code(market: str, index: int) -> str:
+    """第 index 个合成股票代码"""
+    if market == "a":
+        return str(600000 + index + (1 if 600000 + index >= 600519 else 0))  # 跳过样本代码本身
+    if market == "hk":
+        return f"{10000 + index:05d}"
+    letters = ""
+    for _ in range(3):
+        index, rest = divmod(index, 26)
+        letters = chr(ord("A") + rest) + letters
+    return "Z" + letters
+
+
+@dataclass
+class Universe:
+    """压测股票池"""
+
+    hot: List[Tuple[str, str]] = field(default_factory=list)   # (市场, 请求代码)
+    cold: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def build_universe(markets: Sequence[str], hot_symbols: int, cold_pool: int) -> Tuple[Universe, Dict[str, str]]:
+    """
+    生成股票池（各市场轮流分配）和夹具别名
+
+    Returns:
+        (股票池, 别名代码 → 样本代码)
+    """
+    universe = Universe()
+    aliases: Dict[str, str] = {}
+    counters = {market: 0 for market in markets}
+    cycle = itertools.cycle(markets)
+    for target, size in ((universe.hot, hot_symbols), (universe.cold, cold_pool)):
+        for _ in range(size):
+            market = next(cycle)
+            sample, symbol_format, _, _ = MARKETS[market]
+            code = _synthetic_code(market, counters[market])
+            counters[market] += 1
+            aliases[code] = sample
+            target.append((market, symbol_format.format(code=code)))
+    return universe, aliases
+
+
+def prepare_fixtures(directory: str, aliases: Dict[str, str]) -> FixtureStore:
+    """离线录制样本股票夹具（目录已有夹具时复用）并写入别名"""
+    store = FixtureStore(directory)
+    if not store.functions():
+        from scripts.record_akshare_fixtures import record_offline
+        store = record_offline(directory, symbols=[MARKETS[m][1].format(code=MARKETS[m][0]) for m in MARKETS])
+    store.add_aliases(aliases)
+    return store
+
+
+class RequestPlan:
+    """按接口比例、命中/未命中比例和 Zipf 热度生成请求"""
+
+    def __init__(self, universe: Universe, mix: Dict[str, float], miss_ratio: float, zipf: float, seed: int = 0):
+        if not 0 <= miss_ratio <= 1:
+            raise ValueError("未命中比例必须在0到1之间")
+        self.universe = universe
+        self.miss_ratio = miss_ratio
+        self.cold_pool_exhausted = False
+        self._rng = random.Random(seed)
+        self._endpoints = list(mix)
+        self._weights = list(mix.values())
+        self._zipf = ZipfSampler(len(universe.hot), zipf, self._rng) if universe.hot else None
+        self._cold: Iterator[Tuple[str, str]] = iter(universe.cold)
+
+    def next_request(self) -> Tuple[str, str, Dict[str, str], bool]:
+        """
+        Returns:
+            (接口名, 路径, 查询参数, 是否为冷门股票请求)
+        """
+        endpoint = self._rng.choices(self._endpoints, self._weights)[0]
+        cold = self._zipf is None or self._rng.random() < self.miss_ratio
+        if cold:
+            try:
+                market, symbol = next(self._cold)
+            except StopIteration:
+                self.cold_pool_exhausted = True
+                cold = False
+        if not cold:
+            market, symbol = self.universe.hot[self._zipf.sample()]
+        return (endpoint, *request_for(endpoint, market, symbol), cold)
+
+
+def request_for(endpoint: str, market: str, symbol: str) -> Tuple[str, Dict[str, str]]:
+    """接口路径和查询参数"""
+    _, _, statements_type, indicators_market = MARKETS[market]
+    if endpoint == "statements":
+        return FINANCIAL_STATEMENTS_PATH, {"symbol": symbol, "query_type": statements_type, "frequency": "annual"}
+    return FINANCIAL_INDICATORS_PATH, {"symbol": symbol, "market": indicators_market, "frequency": "annual"}
+
+
+@dataclass
+class Sample:
+    """一次请求的结果"""
+
+    endpoint: str
+    latency_ms: float
+    status: int           # 0 表示请求异常（连接失败、超时）
+    cold: bool
+    upstream: bool        # 服务端 Server-Timing 显示本次请求访问了上游
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """最近秩百分位数（输入需已排序）"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-pct / 100 * len(sorted_values) // 1)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: Sequence[Sample], duration: float) -> Dict[str, Any]:
+    """汇总一组请求：吞吐、错误率和延迟分位数"""
+    latencies = sorted(s.latency_ms for s in samples)
+    errors = sum(1 for s in samples if not s.ok)
+    statuses: Dict[str, int] = {}
+    for s in samples:
+        statuses[str(s.status)] = statuses.get(str(s.status), 0) + 1
+    count = len(samples)
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "mean_ms": round(sum(latencies) / count, 2) if count else 0.0,
+        "cold_requests": sum(1 for s in samples if s.cold),
+        "upstream_ratio": round(sum(1 for s in samples if s.upstream) / count, 4) if count else 0.0,
+        "status_codes": statuses,
+    }
+
+
+async def _send(client: httpx.AsyncClient, plan: RequestPlan) -> Sample:
+    endpoint, path, params, cold = plan.next_request()
+    start = time.perf_counter()
+    try:
+        response = await client.get(path, params=params)
+        status = response.status_code
+        sources = parse_server_timing(response.headers.get("server-timing"))["cache_sources"]
+        upstream = SOURCE_UPSTREAM in sources.values()
+    except httpx.HTTPError:
+        status, upstream = 0, False
+    return Sample(endpoint, (time.perf_counter() - start) * 1000, status, cold, upstream)
+
+
+async def run_stage(client: httpx.AsyncClient, plan: RequestPlan, stage: Stage) -> Tuple[List[Sample], float]:
+    """以固定并发闭环发送请求，直到阶段时长结束（已发出的请求会等待完成）"""
+    samples: List[Sample] = []
+    deadline = time.perf_counter() + stage.duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            samples.append(await _send(client, plan))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(stage.concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def stage_report(stage: Stage, samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    endpoints = {name: summarize([s for s in samples if s.endpoint == name], elapsed)
+                 for name in ENDPOINTS if any(s.endpoint == name for s in samples)}
+    return {"concurrency": stage.concurrency, "duration_s": round(elapsed, 3),
+            "overall": summarize(samples, elapsed), "endpoints": endpoints}
+
+
+async def run_load(base_url: str, plan: RequestPlan, stages: List[Stage], warmup: bool = True,
+                   transport: Optional[httpx.AsyncBaseTransport] = None,
+                   progress=lambda report: None) -> List[Dict[str, Any]]:
+    """预热热门股票后依次运行各阶段，返回各阶段报告"""
+    limits = httpx.Limits(max_connections=max(s.concurrency for s in stages),
+                          max_keepalive_connections=max(s.concurrency for s in stages))
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits, transport=transport) as client:
+        if warmup:
+            for market, symbol in plan.universe.hot:
+                for endpoint in ENDPOINTS:
+                    path, params = request_for(endpoint, market, symbol)
+                    await client.get(path, params=params)
+        reports = []
+        for stage in stages:
+            samples, elapsed = await run_stage(client, plan, stage)
+            reports.append(stage_report(stage, samples, elapsed))
+            progress(reports[-1])
+        return reports
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """以回放模式启动的 uvicorn 子进程"""
+
+    def __init__(self, fixtures: str, upstream_latency: str = "0", workers: int = 1):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._fixtures = fixtures
+        self._latency = upstream_latency
+        self._workers = workers
+        self._cache_dir = tempfile.TemporaryDirectory()
+        self._process: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "LocalServer":
+        env = dict(os.environ,
+                   PYTHONPATH=os.pathsep.join([os.path.join(PROJECT_ROOT, "src"), os.environ.get("PYTHONPATH", "")]),
+                   AKSHARE_REPLAY_DIR=self._fixtures, AKSHARE_REPLAY_LATENCY=self._latency,
+                   AKSHARE_CACHE_DIR=self._cache_dir.name)
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "akshare_value_investment.api.main:create_app", "--factory",
+             "--host", "127.0.0.1", "--port", str(self.port), "--workers", str(self._workers),
+             "--log-level", "warning"],
+            env=env, cwd=self._cache_dir.name)
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"被测服务启动失败（退出码 {self._process.returncode}）")
+            try:
+                if httpx.get(f"{self.url}/readyz", timeout=1).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError("等待被测服务启动超时")
+
+    def __exit__(self, *exc_info):
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._cache_dir.cleanup()
+
+
+def render_html(report: Dict[str, Any]) -> str:
+    """压测报告的 HTML 汇总"""
+    def cell(value):
+        return f"<td>{html.escape(str(value))}</td>"
+
+    columns = ["requests", "throughput_rps", "error_rate", "p50_ms", "p95_ms", "p99_ms", "max_ms", "upstream_ratio"]
+    rows = []
+    for stage in report["stages"]:
+        for name, stats in [("全部", stage["overall"])] + list(stage["endpoints"].items()):
+            rows.append("<tr>" + cell(stage["concurrency"]) + cell(name)
+                        + "".join(cell(stats[c]) for c in columns) + "</tr>")
+
+    peak = max(report["stages"], key=lambda s: s["overall"]["throughput_rps"]) if report["stages"] else None
+    peak_text = (f"峰值吞吐 {peak['overall']['throughput_rps']} 请求/秒（并发 {peak['concurrency']}，"
+                 f"p99 {peak['overall']['p99_ms']} ms）") if peak else "无数据"
+    config = "".join(f"<li><b>{html.escape(k)}</b>: {html.escape(json.dumps(v, ensure_ascii=False))}</li>"
+                     for k, v in report["config"].items())
+    header = "".join(f"<th>{c}</th>" for c in ["并发", "接口"] + columns)
+    return f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<title>压测报告 {html.escape(report['created_at'])}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 10px; text-align: right; }}
+th {{ background: #f0f0f0; }}
+</style>
+</head>
+<body>
+<h1>压测报告</h1>
+<p>{html.escape(report['created_at'])} · {html.escape(report['target'])} · {html.escape(peak_text)}</p>
+<table>
+<tr>{header}</tr>
+{''.join(rows)}
+</table>
+<h2>配置</h2>
+<ul>{config}</ul>
+</body>
+</html>
+"""
+
+
+def _save(path: str, content: str):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(content, encoding="utf-8")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="API 压测（离线回放上游）")
+    parser.add_argument("--url", help="压测已启动的服务（需以 AKSHARE_REPLAY_DIR=<--fixtures> 启动）")
+    parser.add_argument("--fixtures", default=".cache/loadtest/fixtures", help="夹具目录")
+    parser.add_argument("--prepare-only", action="store_true", help="只生成夹具和别名后退出")
+    parser.add_argument("--workers", type=int, default=1, help="本地启动的 uvicorn worker 数")
+    parser.add_argument("--upstream-latency", default="0.05,0.2", help="回放上游延迟（秒），如 0.1 或 0.05,0.2")
+    parser.add_argument("--stages", default="1:10,8:10,32:20", help="并发阶梯（并发:秒，逗号分隔）")
+    parser.add_argument("--mix", default="statements=0.7,indicators=0.3", help="接口比例")
+    parser.add_argument("--markets", default="a,hk,us", help="参与压测的市场")
+    parser.add_argument("--hot-symbols", type=int, default=30, help="热门股票数（压测前预热）")
+    parser.add_argument("--cold-pool", type=int, default=5000, help="冷门股票池大小（每只只请求一次）")
+    parser.add_argument("--miss-ratio", type=float, default=0.05, help="冷门股票（缓存未命中）请求比例")
+    parser.add_argument("--zipf", type=float, default=1.1, help="热门股票 Zipf 分布指数")
+    parser.add_argument("--no-warmup", action="store_true", help="不预热热门股票")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON 报告")
+    parser.add_argument("--html", default=DEFAULT_HTML, help="HTML 汇总")
+    args = parser.parse_args(argv)
+
+    markets = [m.strip() for m in args.markets.split(",") if m.strip()]
+    unknown = set(markets) - set(MARKETS)
+    if unknown:
+        parser.error(f"未知的市场: {', '.join(sorted(unknown))}")
+    stages = parse_stages(args.stages)
+    mix = parse_mix(args.mix)
+
+    universe, aliases = build_universe(markets, args.hot_symbols, args.cold_pool)
+    fixtures = os.path.abspath(args.fixtures)
+    prepare_fixtures(fixtures, aliases)
+    if args.prepare_only:
+        print(f"夹具已生成: {fixtures}（以 AKSHARE_REPLAY_DIR={fixtures} 启动被测服务）")
+        return 0
+
+    plan = RequestPlan(universe, mix, args.miss_ratio, args.zipf, seed=args.seed)
+
+    def progress(stage):
+        overall = stage["overall"]
+        print(f"并发 {stage['concurrency']:>4}: {overall['throughput_rps']:>8.1f} 请求/秒  "
+              f"p50 {overall['p50_ms']:>8.1f} ms  p95 {overall['p95_ms']:>8.1f} ms  "
+              f"p99 {overall['p99_ms']:>8.1f} ms  错误率 {overall['error_rate']:.2%}")
+
+    if args.url:
+        target = args.url
+        reports = asyncio.run(run_load(target, plan, stages, warmup=not args.no_warmup, progress=progress))
+    else:
+        with LocalServer(fixtures, args.upstream_latency, args.workers) as server:
+            target = f"{server.url}（本地 {args.workers} 个 worker，上游延迟 {args.upstream_latency}s）"
+            reports = asyncio.run(run_load(server.url, plan, stages, warmup=not args.no_warmup, progress=progress))
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "target": target,
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "html", "prepare_only")},
+        "cold_pool_exhausted": plan.cold_pool_exhausted,
+        "stages": reports,
+    }
+    _save(args.output, json.dumps(report, ensure_ascii=False, indent=2))
+    _save(args.html, render_html(report))
+    print(f"\n报告已写入: {args.output}、{args.html}")
+    if plan.cold_pool_exhausted:
+        print("⚠️ 冷门股票池已用完，之后的未命中请求改为热门股票，请增大 --cold-pool")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+按场景剖析单个 API 请求（离线）
+
+通过与线上相同的剖析钩子（请求头 X-Profile，见 observability/profiling.py）剖析一次请求，
+上游数据来自离线录制的夹具（scripts/record_akshare_fixtures.py 的 `record_offline`），
+由 `ReplayAkshare` 回放，不访问网络。cold 场景使用空的临时缓存目录。
+
+场景:
+    a_statements_cold   A股 SH600519 财务三表，缓存为空
+    a_statements_warm   A股 SH600519 财务三表，先请求一次预热缓存再剖析
+    hk_statements_cold  港股 00700 财务三表，缓存为空
+    us_statements_cold  美股 AAPL 财务三表，缓存为空
+
+用法:
+    uv run python benchmarks/profile_scenario.py a_statements_cold [--mode sample|cprofile] [--output .cache/profiles]
+
+sample 输出 collapsed-stack 文本，可用 `flamegraph.pl xxx.collapsed > xxx.svg` 或拖入
+https://www.speedscope.app 查看；cprofile 输出 pstats 文件，可用 `snakeviz xxx.prof` 查看。
+"""
+
+import argparse
+import os
+import pstats
+import secrets
+import sys
+import tempfile
+from collections import Counter
+from unittest.mock import patch
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, PROJECT_ROOT)
+
+# 提前导入 akshare，避免把首次导入（数百毫秒）计入被剖析的请求
+import akshare  # noqa: E402, F401
+from fastapi.testclient import TestClient  # noqa: E402
+
+from akshare_value_investment.api.main import create_app  # noqa: E402
+from akshare_value_investment.client import FINANCIAL_STATEMENTS_PATH  # noqa: E402
+from akshare_value_investment.datasource.lazy_akshare import ak  # noqa: E402
+from akshare_value_investment.datasource.replay import ReplayAkshare  # noqa: E402
+from scripts.record_akshare_fixtures import record_offline  # noqa: E402
+
+# 场景名 → (查询参数, 剖析前是否预热)
+SCENARIOS = {
+    "a_statements_cold": ({"symbol": "SH600519", "query_type": "a_financial_statements"}, False),
+    "a_statements_warm": ({"symbol": "SH600519", "query_type": "a_financial_statements"}, True),
+    "hk_statements_cold": ({"symbol": "00700", "query_type": "hk_financial_statements"}, False),
+    "us_statements_cold": ({"symbol": "AAPL", "query_type": "us_financial_statements"}, False),
+}
+
+
+def run_scenario(name: str, mode: str, output: str) -> str:
+    """
+    运行场景并剖析其中一次请求
+
+    Returns:
+        剖析文件路径
+    """
+    params, warm = SCENARIOS[name]
+    token = secrets.token_hex(8)
+    params = dict(params, frequency="annual")
+
+    with tempfile.TemporaryDirectory() as fixture_dir, tempfile.TemporaryDirectory() as cache_dir:
+        store = record_offline(fixture_dir)
+        with patch.dict(os.environ, {"AKSHARE_CACHE_DIR": cache_dir, "AKSHARE_PROFILING_TOKEN": token,
+                                     "AKSHARE_PROFILE_DIR": output}), \
+                ak.use_module(ReplayAkshare(store)), TestClient(create_app()) as client:
+            if warm:
+                client.get(FINANCIAL_STATEMENTS_PATH, params=params).raise_for_status()
+            response = client.get(FINANCIAL_STATEMENTS_PATH, params=params,
+                                  headers={"X-Profile": mode, "X-Profile-Token": token})
+            response.raise_for_status()
+
+    print(f"场景: {name}  状态: {response.status_code}  Server-Timing: {response.headers['Server-Timing']}")
+    return os.path.join(output, response.headers["X-Profile-File"])
+
+
+def summarize(path: str, top: int):
+    """打印最耗时的函数"""
+    if path.endswith(".prof"):
+        pstats.Stats(path).sort_stats("cumulative").print_stats(top)
+        return
+
+    # collapsed-stack：按栈顶帧统计自身采样数
+    self_samples = Counter()
+    total = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            self_samples[stack.rsplit(";", 1)[-1]] += int(count)
+            total += int(count)
+    print(f"{'自身采样':>8}{'占比':>8}  函数")
+    for frame, count in self_samples.most_common(top):
+        print(f"{count:>8}{count / total:>8.1%}  {frame}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按场景剖析单个 API 请求")
+    parser.add_argument("scenario", choices=sorted(SCENARIOS), help="剖析场景")
+    parser.add_argument("--mode", choices=["sample", "cprofile"], default="sample", help="剖析方式")
+    parser.add_argument("--output", default=".cache/profiles", help="剖析文件目录")
+    parser.add_argument("--top", type=int, default=15, help="打印最耗时的函数数")
+    args = parser.parse_args()
+
+    path = run_scenario(args.scenario, args.mode, os.path.abspath(args.output))
+    print(f"剖析文件: {path}")
+    summarize(path, args.top)
+
+
+if __name__ == "__main__":
+    main()
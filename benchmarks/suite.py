@@ -0,0 +1,475 @@
+"""
+查询流水线基准测试套件（离线，带回归门禁）
+
+覆盖查询流水线的各个热点环节和 webapp 计算器，上游数据来自离线录制的夹具
+（scripts/record_akshare_fixtures.py 的 `record_offline`），由 `ReplayAkshare` 回放：
+
+- `unit_converter.*`: `UnitConverter.convert_dataframe`（A股资产负债表原始数据）
+- `pivot.*`: 港股/美股报表窄表转宽表（查询器的 `_convert_statement`）
+- `filter.*`: `_filter_data_by_date_range`（港股资产负债表宽表）
+- `frequency.*`: `FinancialQueryService._process_frequency`、`_process_us_fiscal_year_data`
+- `formatter.*`: `ResponseFormatter.success`
+- `calculator.*`: 每个 webapp 计算器（数据经进程内后端预先取好，只计计算本身）
+- `e2e.*`: `/api/v1/financial/statements` 端到端（cold 每次清空缓存，warm 命中缓存）
+
+每个场景先自动确定单轮调用次数（单轮耗时不少于 `--min-time`），再重复 `--repeat` 轮，
+记录单次调用耗时的最小值、中位数、平均值和标准差（毫秒）。cold 场景每轮只调用一次，
+清空缓存不计入耗时。
+
+用法:
+    uv run python benchmarks/suite.py list
+    uv run python benchmarks/suite.py run [-k pivot] [--output .cache/benchmarks/latest.json] [--save-baseline]
+    uv run python benchmarks/suite.py run --baseline benchmarks/baselines/baseline.json --threshold 20
+    uv run python benchmarks/suite.py compare BASELINE.json CURRENT.json [--threshold 20]
+
+比较以中位数为准：相对基线变慢超过阈值（百分比）且绝对差值超过 `--min-delta-ms` 的场景判为回归，
+命令以退出码 1 结束，可直接用作 CI 门禁。基线与运行机器相关，应在同一台机器上生成和比较。
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import warnings
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "webapp"))
+
+DEFAULT_OUTPUT = ".cache/benchmarks/latest.json"
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "benchmarks", "baselines", "baseline.json")
+DEFAULT_THRESHOLD = 20.0
+DEFAULT_MIN_DELTA_MS = 0.05
+
+A_SYMBOL, HK_SYMBOL, US_SYMBOL = "SH600519", "00700", "AAPL"
+STATEMENT_TYPES = {"a": "a_financial_statements", "hk": "hk_financial_statements", "us": "us_financial_statements"}
+STATEMENT_SYMBOLS = {"a": A_SYMBOL, "hk": HK_SYMBOL, "us": US_SYMBOL}
+
+
+@dataclass
+class Benchmark:
+    """
+    基准测试场景
+
+    `factory(env)` 返回 `(func, setup)`：func 为被计时的无参函数；setup 不为 None 时
+    每轮计时前调用一次（不计时），且每轮只调用 func 一次。
+    """
+
+    name: str
+    factory: Callable[["SuiteEnvironment"], Tuple[Callable[[], Any], Optional[Callable[[], Any]]]]
+
+
+class SuiteEnvironment:
+    """套件运行环境：回放夹具、临时缓存目录、进程内数据后端，以及各场景共用的输入数据"""
+
+    def __init__(self):
+        self._stack = ExitStack()
+        self._inputs: Dict[str, Any] = {}
+        self.store = None
+        self.cache_dir = None
+
+    def __enter__(self) -> "SuiteEnvironment":
+        from akshare_value_investment.datasource.lazy_akshare import ak
+        from akshare_value_investment.datasource.replay import ReplayAkshare
+        from scripts.record_akshare_fixtures import record_offline
+
+        fixture_dir = self._stack.enter_context(tempfile.TemporaryDirectory())
+        self.cache_dir = self._stack.enter_context(tempfile.TemporaryDirectory())
+        self.store = record_offline(fixture_dir, symbols=[A_SYMBOL, HK_SYMBOL, US_SYMBOL])
+        self._stack.enter_context(patch.dict(os.environ, {"AKSHARE_CACHE_DIR": self.cache_dir}))
+        self._stack.enter_context(ak.use_module(ReplayAkshare(self.store)))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def cached(self, key: str, build: Callable[[], Any]) -> Any:
+        """各场景共用的输入数据（首次使用时构建）"""
+        if key not in self._inputs:
+            self._inputs[key] = build()
+        return self._inputs[key]
+
+    def recorded(self, function: str, **kwargs) -> Any:
+        """录制的 akshare 原始返回值（按参数筛选第一条）"""
+        for entry in self.store.entries():
+            if entry["function"] == function and all(entry["kwargs"].get(k) == v for k, v in kwargs.items()):
+                return entry["result"]
+        raise LookupError(f"夹具中没有 {function}({kwargs})")
+
+    def clear_cache(self):
+        """清空磁盘缓存（cold 场景）"""
+        import diskcache
+        with diskcache.Cache(self.cache_dir) as cache:
+            cache.clear()
+
+    def queried(self, queryer_cls, symbol: str):
+        """经查询器获取的（转换后的宽表）数据"""
+        import diskcache
+
+        def build():
+            with diskcache.Cache(tempfile.mkdtemp(dir=self.cache_dir)) as cache:
+                result = queryer_cls(cache=cache).query(symbol)
+            return result["data"] if isinstance(result, dict) else result
+
+        return self.cached(f"{queryer_cls.__name__}:{symbol}", build)
+
+    def service(self):
+        from akshare_value_investment.business.financial_query_service import FinancialQueryService
+        return self.cached("service", FinancialQueryService)
+
+    def client(self):
+        """API 测试客户端"""
+        from fastapi.testclient import TestClient
+        from akshare_value_investment.api.main import create_app
+
+        return self.cached("client", lambda: self._stack.enter_context(TestClient(create_app())))
+
+    def calculator_backend(self):
+        """安装缓存响应的进程内数据后端，计算器基准只计计算本身"""
+        def build():
+            from services import data_service
+            from services.data_backends import EmbeddedDataBackend
+
+            backend = _MemoBackend(EmbeddedDataBackend(self.service()))
+            data_service.set_backend(backend)
+            self._stack.callback(data_service.set_backend, None)
+            return backend
+
+        return self.cached("calculator_backend", build)
+
+
+class _MemoBackend:
+    """缓存每个请求的响应（InProcessResponse.json() 每次返回浅拷贝，可安全复用）"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._responses: Dict[Any, Any] = {}
+
+    def get(self, endpoint: str, params=None):
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        if key not in self._responses:
+            self._responses[key] = self.backend.get(endpoint, params)
+        return self._responses[key]
+
+    def get_many(self, requests):
+        return [self.get(endpoint, params) for endpoint, params in requests]
+
+
+# ---------------------------------------------------------------------------
+# 场景
+# ---------------------------------------------------------------------------
+
+def _unit_converter(env: SuiteEnvironment):
+    from akshare_value_investment.core.unit_converter import UnitConverter
+
+    raw = env.recorded("stock_financial_debt_ths")
+    return (lambda: UnitConverter.convert_dataframe(raw)), None
+
+
+def _pivot(market: str):
+    def factory(env: SuiteEnvironment):
+        import diskcache
+        if market == "hk":
+            from akshare_value_investment.datasource.queryers.hk_stock_queryers import HKStockBalanceSheetQueryer
+            raw = env.recorded("stock_financial_hk_report_em", stock=HK_SYMBOL, symbol="资产负债表")
+            queryer = HKStockBalanceSheetQueryer(cache=diskcache.Cache(tempfile.mkdtemp(dir=env.cache_dir)))
+        else:
+            from akshare_value_investment.datasource.queryers.us_stock_queryers import USStockBalanceSheetQueryer
+            raw = env.recorded("stock_financial_us_report_em", stock=US_SYMBOL, symbol="资产负债表")
+            queryer = USStockBalanceSheetQueryer(cache=diskcache.Cache(tempfile.mkdtemp(dir=env.cache_dir)))
+        return (lambda: queryer._convert_statement(raw)), None
+
+    return factory
+
+
+def _filter_date_range(env: SuiteEnvironment):
+    from akshare_value_investment.datasource.queryers.base_queryer import _filter_data_by_date_range
+    from akshare_value_investment.datasource.queryers.hk_stock_queryers import HKStockBalanceSheetQueryer
+
+    data = env.queried(HKStockBalanceSheetQueryer, HK_SYMBOL)
+    field = HKStockBalanceSheetQueryer.cache_date_field
+    return (lambda: _filter_data_by_date_range(data, "2018-01-01", "2023-12-31", field)), None
+
+
+def _process_frequency(env: SuiteEnvironment):
+    from akshare_value_investment.business.financial_types import FinancialQueryType, Frequency
+    from akshare_value_investment.datasource.queryers.a_stock_queryers import AStockIndicatorQueryer
+
+    service = env.service()
+    data = env.queried(AStockIndicatorQueryer, A_SYMBOL)
+    return (lambda: service._process_frequency(data, Frequency.ANNUAL, FinancialQueryType.A_STOCK_INDICATORS)), None
+
+
+def _us_fiscal_year(env: SuiteEnvironment):
+    from akshare_value_investment.datasource.queryers.us_stock_queryers import USStockIndicatorQueryer
+
+    service = env.service()
+    data = env.queried(USStockIndicatorQueryer, US_SYMBOL)
+    return (lambda: service._process_us_fiscal_year_data(data)), None
+
+
+def _formatter_success(env: SuiteEnvironment):
+    from akshare_value_investment.business.response_formatter import ResponseFormatter
+    from akshare_value_investment.datasource.queryers.a_stock_queryers import AStockIndicatorQueryer
+
+    data = env.queried(AStockIndicatorQueryer, A_SYMBOL)
+    query_info = {"market": "a_stock", "query_type": "a_stock_indicators", "symbol": A_SYMBOL}
+    return (lambda: ResponseFormatter.success(data, query_info=query_info)), None
+
+
+def _calculator(module: str, function: str = "calculate", *args):
+    def factory(env: SuiteEnvironment):
+        import importlib
+
+        env.calculator_backend()
+        calculate = getattr(importlib.import_module(f"services.calculators.{module}"), function)
+        calculate(*args)  # 预取数据
+        return (lambda: calculate(*args)), None
+
+    return factory
+
+
+def _e2e_statements(market: str, cold: bool):
+    def factory(env: SuiteEnvironment):
+        from akshare_value_investment.client import FINANCIAL_STATEMENTS_PATH
+
+        client = env.client()
+        params = {"symbol": STATEMENT_SYMBOLS[market], "query_type": STATEMENT_TYPES[market], "frequency": "annual"}
+
+        def request():
+            client.get(FINANCIAL_STATEMENTS_PATH, params=params).raise_for_status()
+
+        request()
+        return request, (env.clear_cache if cold else None)
+
+    return factory
+
+
+A_ARGS = (A_SYMBOL, "A股", 5)
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("unit_converter.a_balance_sheet", _unit_converter),
+    Benchmark("pivot.hk_balance_sheet", _pivot("hk")),
+    Benchmark("pivot.us_balance_sheet", _pivot("us")),
+    Benchmark("filter.date_range", _filter_date_range),
+    Benchmark("frequency.a_indicators_annual", _process_frequency),
+    Benchmark("frequency.us_fiscal_year", _us_fiscal_year),
+    Benchmark("formatter.success", _formatter_success),
+    Benchmark("calculator.cash_flow_pattern", _calculator("cash_flow_pattern", "calculate", *A_ARGS)),
+    Benchmark("calculator.dcf_valuation", _calculator("dcf_valuation", "calculate", *A_ARGS)),
+    Benchmark("calculator.debt_to_equity", _calculator("debt_to_equity", "calculate", *A_ARGS)),
+    Benchmark("calculator.debt_to_fcf_ratio", _calculator("debt_to_fcf_ratio", "calculate", *A_ARGS)),
+    Benchmark("calculator.ebit_margin", _calculator("ebit_margin", "calculate", *A_ARGS)),
+    Benchmark("calculator.free_cash_flow_ratio", _calculator("free_cash_flow_ratio", "calculate", *A_ARGS)),
+    Benchmark("calculator.investment_intensity_ratio",
+              _calculator("free_cash_flow_ratio", "calculate_investment_intensity_ratio", *A_ARGS)),
+    Benchmark("calculator.liquidity_ratio", _calculator("liquidity_ratio", "calculate", HK_SYMBOL, 5)),
+    Benchmark("calculator.interest_coverage_ratio",
+              _calculator("liquidity_ratio", "calculate_interest_coverage_ratio", *A_ARGS)),
+    Benchmark("calculator.net_income_valuation", _calculator("net_income_valuation", "calculate", *A_ARGS)),
+    Benchmark("calculator.net_profit_cash_ratio", _calculator("net_profit_cash_ratio", "calculate", *A_ARGS)),
+    Benchmark("calculator.revenue_growth", _calculator("revenue_growth", "calculate", *A_ARGS)),
+    Benchmark("calculator.roe", _calculator("roe", "calculate", *A_ARGS)),
+    Benchmark("calculator.roic", _calculator("roic", "calculate", *A_ARGS)),
+] + [
+    Benchmark(f"e2e.statements_{market}_{'cold' if cold else 'warm'}", _e2e_statements(market, cold))
+    for market in STATEMENT_TYPES for cold in (True, False)
+]
+
+
+# ---------------------------------------------------------------------------
+# 计时与比较
+# ---------------------------------------------------------------------------
+
+def measure(func: Callable[[], Any], setup: Optional[Callable[[], Any]] = None,
+            repeat: int = 7, min_time: float = 0.05) -> Dict[str, Any]:
+    """
+    计时单个场景
+
+    Returns:
+        单次调用耗时统计（毫秒）和调用次数
+    """
+    if setup is not None:
+        number = 1
+        times = []
+        for _ in range(repeat):
+            setup()
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    else:
+        timer = timeit.Timer(func)
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= min_time or number >= 1 << 16:
+                break
+            number *= 2 if elapsed <= 0 else max(2, min(int(min_time / elapsed * 1.2) + 1, 16))
+        times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    times_ms = [t * 1000 for t in times]
+    return {
+        "median_ms": round(statistics.median(times_ms), 4),
+        "min_ms": round(min(times_ms), 4),
+        "mean_ms": round(statistics.mean(times_ms), 4),
+        "stdev_ms": round(statistics.stdev(times_ms), 4) if len(times_ms) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def select(pattern: Optional[str] = None) -> List[Benchmark]:
+    """按名称子串筛选场景"""
+    return [bench for bench in BENCHMARKS if not pattern or pattern in bench.name]
+
+
+def run(benchmarks: List[Benchmark], repeat: int = 7, min_time: float = 0.05,
+        progress: Callable[[str, Dict[str, Any]], None] = lambda name, result: None) -> Dict[str, Any]:
+    """运行场景，返回可写入 JSON 的结果"""
+    results = {}
+    with SuiteEnvironment() as env:
+        for bench in benchmarks:
+            func, setup = bench.factory(env)
+            results[bench.name] = measure(func, setup, repeat=repeat, min_time=min_time)
+            progress(bench.name, results[bench.name])
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS, metric: str = "median_ms") -> List[Dict[str, Any]]:
+    """
+    比较两次结果
+
+    Returns:
+        每个场景一行：name、baseline、current、change_pct、status（regression / improvement / ok / new / missing）
+    """
+    rows = []
+    base_results, current_results = baseline["results"], current["results"]
+    for name in sorted(set(base_results) | set(current_results)):
+        if name not in base_results:
+            rows.append({"name": name, "baseline": None, "current": current_results[name][metric],
+                         "change_pct": None, "status": "new"})
+            continue
+        if name not in current_results:
+            rows.append({"name": name, "baseline": base_results[name][metric], "current": None,
+                         "change_pct": None, "status": "missing"})
+            continue
+        before, after = base_results[name][metric], current_results[name][metric]
+        change = (after - before) / before * 100 if before else 0.0
+        status = "ok"
+        if abs(after - before) > min_delta_ms:
+            if change > threshold:
+                status = "regression"
+            elif change < -threshold:
+                status = "improvement"
+        rows.append({"name": name, "baseline": before, "current": after,
+                     "change_pct": round(change, 2), "status": status})
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], threshold: float) -> bool:
+    """打印比较结果，返回是否有回归"""
+    def fmt(value):
+        return "-" if value is None else f"{value:.3f}"
+
+    marks = {"regression": "❌", "improvement": "🚀", "ok": "  ", "new": "🆕", "missing": "❔"}
+    print(f"{'':2} {'场景':<42}{'基线(ms)':>12}{'当前(ms)':>12}{'变化':>10}")
+    for row in rows:
+        change = "-" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+        print(f"{marks[row['status']]} {row['name']:<42}{fmt(row['baseline']):>12}{fmt(row['current']):>12}{change:>10}")
+
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n❌ {len(regressions)} 个场景变慢超过 {threshold:.0f}%: {', '.join(regressions)}")
+    else:
+        print(f"\n✅ 没有场景变慢超过 {threshold:.0f}%")
+    return bool(regressions)
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(path: str, data: Dict[str, Any]):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="查询流水线基准测试套件")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="列出场景")
+
+    run_parser = commands.add_parser("run", help="运行场景")
+    run_parser.add_argument("-k", dest="pattern", help="只运行名称包含该子串的场景")
+    run_parser.add_argument("--repeat", type=int, default=7, help="每个场景的重复轮数")
+    run_parser.add_argument("--min-time", type=float, default=0.05, help="单轮最短耗时（秒）")
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT, help="结果 JSON 文件")
+    run_parser.add_argument("--save-baseline", action="store_true", help=f"同时写入基线 {DEFAULT_BASELINE}")
+    run_parser.add_argument("--baseline", help="运行后与该基线比较，回归时退出码为 1")
+
+    compare_parser = commands.add_parser("compare", help="比较两次结果，回归时退出码为 1")
+    compare_parser.add_argument("baseline", help="基线 JSON 文件")
+    compare_parser.add_argument("current", help="当前结果 JSON 文件")
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="回归阈值（百分比）")
+        sub.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                         help="绝对差值小于该值（毫秒）时不判为回归")
+
+    args = parser.parse_args(argv)
+    # 计算器中的 pandas FutureWarning 每次调用都会输出，淹没计时结果
+    warnings.filterwarnings("ignore", category=FutureWarning)
+
+    if args.command == "list":
+        for bench in BENCHMARKS:
+            print(bench.name)
+        return 0
+
+    if args.command == "compare":
+        rows = compare(_load(args.baseline), _load(args.current), args.threshold, args.min_delta_ms)
+        return 1 if print_comparison(rows, args.threshold) else 0
+
+    benchmarks = select(args.pattern)
+    if not benchmarks:
+        parser.error(f"没有名称包含 {args.pattern!r} 的场景")
+
+    def progress(name, result):
+        print(f"{name:<44}{result['median_ms']:>10.3f} ms  (±{result['stdev_ms']:.3f}, {result['number']}×{result['repeat']})")
+
+    current = run(benchmarks, repeat=args.repeat, min_time=args.min_time, progress=progress)
+    _save(args.output, current)
+    print(f"\n结果已写入: {args.output}")
+    if args.save_baseline:
+        _save(DEFAULT_BASELINE, current)
+        print(f"基线已写入: {DEFAULT_BASELINE}")
+
+    if args.baseline:
+        rows = compare(_load(args.baseline), current, args.threshold, args.min_delta_ms)
+        return 1 if print_comparison(rows, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
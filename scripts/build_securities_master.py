@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+构建本地证券主数据（A股、港股、美股代码、名称、拼音首字母）
+
+调用 akshare 列表接口获取三地证券列表，保存为 JSON 供 Web 应用的股票搜索框使用。
+拼音首字母需要 pypinyin：
+
+    uv run --with pypinyin python scripts/build_securities_master.py [--output PATH]
+
+未安装 pypinyin 时仍可构建，但不支持拼音首字母搜索。
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录和 webapp 目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root / "webapp"))
+
+from config import SECURITIES_MASTER_PATH  # noqa: E402
+from services.securities_master import (  # noqa: E402
+    SecuritiesIndex,
+    fetch_securities_master,
+    pinyin_initials,
+    save_records,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="构建本地证券主数据")
+    parser.add_argument("--output", type=Path, default=SECURITIES_MASTER_PATH, help="输出文件路径")
+    args = parser.parse_args()
+
+    if not pinyin_initials("茅台"):
+        print("⚠️ 未安装 pypinyin，生成的主数据不支持拼音首字母搜索")
+
+    print("📥 获取三地证券列表...")
+    start = time.perf_counter()
+    records = fetch_securities_master()
+    print(f"   共 {len(records)} 条，耗时 {time.perf_counter() - start:.1f} 秒")
+
+    save_records(records, args.output)
+    print(f"✅ 已保存: {args.output}")
+
+    # 加载校验并报告搜索耗时
+    index = SecuritiesIndex.load(args.output)
+    terms = ["600519", "700", "aapl", "茅台", "gzmt", "腾讯"]
+    start = time.perf_counter()
+    for _ in range(100):
+        for term in terms:
+            index.search(term)
+    elapsed = (time.perf_counter() - start) / (100 * len(terms))
+    print(f"🔍 平均搜索耗时: {elapsed * 1e6:.1f} 微秒")
+    for term in terms:
+        print(f"   {term}: {[record.display_text for record in index.search(term, limit=3)]}")
+
+
+if __name__ == "__main__":
+    main()
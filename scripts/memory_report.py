@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+内存统计报告（见 observability/memory.py）
+
+- 默认直接读取本地缓存目录，统计 diskcache 各条目反序列化后的深度字节数、DataFrame block 数和最大的键
+- `--url` 读取正在运行的 API worker 的 /admin/memory（含进程 RSS），需要管理员令牌
+  （`--token` 或环境变量 AKSHARE_PROFILING_TOKEN）
+- `--url ... --snapshot` 拍摄 tracemalloc 快照（第一次开始跟踪，之后与上一次快照对比），
+  `--stop-tracing` 停止跟踪
+
+用法:
+    uv run python scripts/memory_report.py [--cache-dir .cache/diskcache] [--top 10] [--limit N] [--json]
+    uv run python scripts/memory_report.py --url http://localhost:8000 [--snapshot | --stop-tracing]
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from akshare_value_investment.observability.memory import memory_report  # noqa: E402
+
+
+def format_bytes(size) -> str:
+    if size is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+def print_report(report: Dict[str, Any]):
+    process = report["process"]
+    print(f"🧠 RSS: {format_bytes(process['rss_bytes'])}（{process['rss_source']}）  gc 对象: {process['gc_objects']}")
+    for tier in report["tiers"]:
+        line = f"\n📦 {tier['tier']}: {tier['entries']} 个条目"
+        if "bytes" in tier:
+            line += f"，深度 {format_bytes(tier['bytes'])}"
+        if "volume_bytes" in tier:
+            line += f"，磁盘 {format_bytes(tier['volume_bytes'])}"
+        if "maxsize" in tier:
+            line += f"（容量 {tier['maxsize']}，命中 {tier['hits']}，未命中 {tier['misses']}）"
+        if tier.get("truncated"):
+            line += "（已截断）"
+        print(line)
+        frames = tier.get("frames")
+        if frames and frames["count"]:
+            print(f"   DataFrame: {frames['count']} 个，{frames['blocks']} 个 block，"
+                  f"{frames['fragmented']} 个 block 数多于 dtype 种类")
+        for prefix, group in tier.get("by_prefix", {}).items():
+            print(f"   {prefix or '(无前缀)':<32} {group['entries']:>6} 个  {format_bytes(group['bytes']):>10}")
+        for item in tier.get("top_keys", []):
+            shape = f"{item['rows']}×{item['columns']}，{item['blocks']} block" if "rows" in item else ""
+            print(f"   · {item['key']:<40} {format_bytes(item['bytes']):>10}  {shape}")
+
+
+def print_snapshot(snapshot: Dict[str, Any]):
+    print(f"📸 快照 #{snapshot['snapshot']}: 跟踪 {format_bytes(snapshot['traced_bytes'])}，"
+          f"峰值 {format_bytes(snapshot['peak_traced_bytes'])}")
+    if snapshot["diff"] is None:
+        print("   已开始跟踪，再次快照后可对比增长")
+    else:
+        print("   与上一次快照相比增长最多:")
+        for stat in snapshot["diff"]:
+            print(f"   +{format_bytes(stat['size_diff_bytes']):>10} ({stat['count_diff']:+d})  {stat['location']}")
+    print("   当前占用最多:")
+    for stat in snapshot["top"]:
+        print(f"   {format_bytes(stat['size_bytes']):>11} ({stat['count']})  {stat['location']}")
+
+
+def remote(args) -> Dict[str, Any]:
+    import httpx
+
+    headers = {"X-Profile-Token": args.token or os.environ.get("AKSHARE_PROFILING_TOKEN", "")}
+    base = args.url.rstrip("/")
+    if args.snapshot:
+        response = httpx.post(f"{base}/admin/memory/snapshot", params={"top": args.top}, headers=headers, timeout=120)
+    elif args.stop_tracing:
+        response = httpx.delete(f"{base}/admin/memory/snapshot", headers=headers, timeout=30)
+    else:
+        params = {"top": args.top, **({"limit": args.limit} if args.limit else {})}
+        response = httpx.get(f"{base}/admin/memory", params=params, headers=headers, timeout=300)
+    response.raise_for_status()
+    return response.json()["data"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="内存统计报告")
+    parser.add_argument("--cache-dir", default=os.environ.get("AKSHARE_CACHE_DIR", ".cache/diskcache"),
+                        help="本地缓存目录")
+    parser.add_argument("--url", help="读取正在运行的 API 服务")
+    parser.add_argument("--token", help="管理员令牌（默认取 AKSHARE_PROFILING_TOKEN）")
+    parser.add_argument("--snapshot", action="store_true", help="拍摄 tracemalloc 快照（需要 --url）")
+    parser.add_argument("--stop-tracing", action="store_true", help="停止 tracemalloc 跟踪（需要 --url）")
+    parser.add_argument("--top", type=int, default=10, help="每个缓存层显示最大的前 N 个键")
+    parser.add_argument("--limit", type=int, help="diskcache 最多统计的条目数")
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args()
+
+    if (args.snapshot or args.stop_tracing) and not args.url:
+        parser.error("--snapshot / --stop-tracing 需要 --url（快照针对正在运行的 worker）")
+
+    if args.url:
+        data = remote(args)
+    else:
+        import diskcache
+
+        with diskcache.Cache(args.cache_dir) as cache:
+            data = memory_report(cache, top=args.top, limit=args.limit)
+
+    if args.json:
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+    elif args.snapshot:
+        print_snapshot(data)
+    elif args.stop_tracing:
+        print("⏹️ 已停止跟踪" if data["stopped"] else "未在跟踪")
+    else:
+        print_report(data)
+
+
+if __name__ == "__main__":
+    main()
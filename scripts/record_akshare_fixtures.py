@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+录制 akshare 调用夹具（见 datasource/replay.py）
+
+对每只股票执行一次财务三表和财务指标查询（使用空的临时缓存，每个 ak.* 调用都会真正发生），
+把调用结果录制到夹具目录，之后测试、基准测试和压测可通过 `ReplayAkshare` 或
+环境变量 AKSHARE_REPLAY_DIR 离线回放。
+
+- 默认访问真实的同花顺/东方财富接口
+- `--offline` 不访问网络：A股同花顺接口改用 tests/sample_data 中的样本，港股/美股请求
+  转发到本地回放服务（tests/eastmoney_stub.py），只支持样本中的股票（SH600519、00700、09988、AAPL、MSFT）
+
+用法:
+    uv run python scripts/record_akshare_fixtures.py [SH600519 00700 AAPL] [--output .cache/akshare_fixtures] [--offline]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List
+from unittest.mock import patch
+
+import pandas as pd
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root))
+
+from akshare_value_investment.business.financial_query_service import FinancialQueryService  # noqa: E402
+from akshare_value_investment.business.financial_types import FinancialQueryType  # noqa: E402
+from akshare_value_investment.container import create_container  # noqa: E402
+from akshare_value_investment.core.models import MarketType  # noqa: E402
+from akshare_value_investment.core.stock_identifier import StockIdentifier  # noqa: E402
+from akshare_value_investment.datasource.lazy_akshare import ak  # noqa: E402
+from akshare_value_investment.datasource.replay import FixtureStore, RecordingAkshare  # noqa: E402
+
+DEFAULT_SYMBOLS = ["SH600519", "00700", "AAPL"]
+DEFAULT_OUTPUT = ".cache/akshare_fixtures"
+SAMPLE_DIR = project_root / "tests" / "sample_data"
+
+# 各市场的财务三表 / 财务指标查询类型
+MARKET_QUERIES = {
+    MarketType.A_STOCK: (FinancialQueryType.A_FINANCIAL_STATEMENTS, FinancialQueryType.A_STOCK_INDICATORS),
+    MarketType.HK_STOCK: (FinancialQueryType.HK_FINANCIAL_STATEMENTS, FinancialQueryType.HK_STOCK_INDICATORS),
+    MarketType.US_STOCK: (FinancialQueryType.US_FINANCIAL_STATEMENTS, FinancialQueryType.US_STOCK_INDICATORS),
+}
+
+# A股同花顺接口 → 样本文件
+A_STOCK_SAMPLES = {
+    "stock_financial_debt_ths": "a_stock_balance_sheet_sample.csv",
+    "stock_financial_benefit_ths": "a_stock_profit_sheet_sample.csv",
+    "stock_financial_cash_ths": "a_stock_cash_flow_sheet_sample.csv",
+    "stock_financial_abstract_ths": "a_stock_indicators_sample.csv",
+}
+
+
+@contextmanager
+def offline_sources() -> Iterator[None]:
+    """离线数据源：A股同花顺接口返回样本，东方财富请求转发到本地回放服务"""
+    import requests
+    from tests.eastmoney_stub import EastmoneyReplayServer
+
+    frames = {name: pd.read_csv(SAMPLE_DIR / filename, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+              for name, filename in A_STOCK_SAMPLES.items()}
+    real_get = requests.get
+
+    with ExitStack() as stack:
+        server = stack.enter_context(EastmoneyReplayServer())
+        stack.enter_context(patch.object(
+            requests, "get", side_effect=lambda url, *args, **kwargs: real_get(server.url, *args, **kwargs)))
+        for name, frame in frames.items():
+            stack.enter_context(patch(f"akshare.{name}", side_effect=lambda frame=frame, **kwargs: frame.copy()))
+        yield
+
+
+def record(store: FixtureStore, symbols: Iterable[str]) -> List[str]:
+    """
+    录制每只股票的财务三表和财务指标查询
+
+    Returns:
+        失败的查询说明
+    """
+    failures = []
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            patch.dict(os.environ, {"AKSHARE_CACHE_DIR": cache_dir, "AKSHARE_EASTMONEY_ASYNC": "0"}), \
+            ak.use_module(RecordingAkshare(store)):
+        service = FinancialQueryService(create_container())
+        for symbol in symbols:
+            market, _ = StockIdentifier().identify(symbol)
+            statements_type, indicators_type = MARKET_QUERIES[market]
+            try:
+                service.query_financial_statements(query_type=statements_type, symbol=symbol)
+            except Exception as e:
+                failures.append(f"{symbol} {statements_type.value}: {e}")
+            result = service.query(market=market, query_type=indicators_type, symbol=symbol)
+            if result.get("status") != "success":
+                failures.append(f"{symbol} {indicators_type.value}: {result.get('message')}")
+    return failures
+
+
+def record_offline(directory, symbols: Iterable[str] = DEFAULT_SYMBOLS) -> FixtureStore:
+    """离线录制样本股票的夹具（供测试、基准测试和压测构建回放数据）"""
+    store = FixtureStore(directory)
+    with offline_sources():
+        failures = record(store, symbols)
+    if failures:
+        raise RuntimeError("离线录制失败: " + "; ".join(failures))
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="录制 akshare 调用夹具")
+    parser.add_argument("symbols", nargs="*", default=DEFAULT_SYMBOLS, help="股票代码")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="夹具目录")
+    parser.add_argument("--offline", action="store_true", help="使用本地样本数据录制，不访问网络")
+    args = parser.parse_args()
+
+    store = FixtureStore(args.output)
+    print(f"🎙️ 录制 {', '.join(args.symbols)} → {store.directory}")
+    with offline_sources() if args.offline else ExitStack():
+        failures = record(store, args.symbols)
+
+    for function in store.functions():
+        print(f"  ✅ {function}: {len(list((store.directory / function).glob('*.pkl')))} 个调用")
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,15 @@ __author__ = "akshare-value-investment team"
 
 # 导出主要接口
 from .core.models import MarketType
-from .container import create_container
+
+
+def __getattr__(name):
+    # 容器依赖 dependency_injector、diskcache 和全部查询器，按需导入以缩短包导入时间
+    if name == "create_container":
+        from .container import create_container
+        return create_container
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "create_container",
@@ -5,22 +5,46 @@ FastAPI依赖注入
 严格遵循SOLID原则，保持适配器模式。
 """
 
-from typing import Annotated
+import os
+import threading
+from typing import Annotated, Optional, Tuple
 from fastapi import Depends
 
-from ..container import create_container, ProductionContainer
+from ..container import DEFAULT_CACHE_DIR, create_container, ProductionContainer
 from ..business.financial_query_service import FinancialQueryService
 from ..business.field_discovery_service import FieldDiscoveryService
 
+# 进程内共享的容器（及创建时的缓存目录）
+_container: Optional[Tuple[str, ProductionContainer]] = None
+_container_lock = threading.Lock()
+
 
 def get_container() -> ProductionContainer:
     """
     获取依赖注入容器实例
 
+    容器在进程内只创建一次（查询器和 diskcache 连接在请求间复用），
+    AKSHARE_CACHE_DIR 变化时（测试、基准测试切换缓存目录）重新创建。
+
     Returns:
         ProductionContainer: 配置好的容器实例
     """
-    return create_container()
+    global _container
+    cache_dir = os.environ.get("AKSHARE_CACHE_DIR", DEFAULT_CACHE_DIR)
+    current = _container
+    if current is not None and current[0] == cache_dir:
+        return current[1]
+    with _container_lock:
+        if _container is None or _container[0] != cache_dir:
+            _container = (cache_dir, create_container())
+        return _container[1]
+
+
+def reset_container():
+    """丢弃共享容器（下次 `get_container()` 重新创建）"""
+    global _container
+    with _container_lock:
+        _container = None
 
 
 def get_financial_service(
@@ -5,10 +5,22 @@ FastAPI应用主入口
 集成依赖注入和业务服务。
 """
 
-from fastapi import FastAPI
+import time
+from contextlib import nullcontext
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from .dependencies import get_container
+from .readiness import readiness
+from ..observability.exposition import CONTENT_TYPE, render_prometheus
+from ..observability.memory import start_memory_sampler
+from ..observability.pipeline import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, refresh_cache_hit_ratio
+from ..observability.profiling import profile, requested_mode
+from ..observability.request_timing import collect_request_timings
+from ..observability.tracing import span
+from .routes.admin import router as admin_router
 from .routes.field_discovery import router as field_discovery_router
 from .routes.financial import router as financial_router
 
@@ -37,9 +49,50 @@ def create_app() -> FastAPI:
         allow_headers=["*"],  # 允许所有请求头
     )
 
+    # 压缩较大的响应（财务三表 JSON 通常有数百 KB），客户端需携带 Accept-Encoding: gzip
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+    # 记录请求耗时和正在处理的请求数（按路由模板分组，避免股票代码等路径参数造成标签爆炸），
+    # 在 Server-Timing 响应头中返回本次请求各阶段的耗时和报表数据来源；
+    # 采样到（或带 X-Trace: 1）的请求记录追踪，响应头 X-Trace-Id 对应追踪文件名；
+    # 带管理员令牌和 X-Profile 的请求做性能剖析，响应头 X-Profile-File 对应剖析文件名
+    @app.middleware("http")
+    async def track_requests(request: Request, call_next):
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        status = 500
+        try:
+            forced = request.headers.get("x-trace", "").lower() in ("1", "true")
+            profile_mode = requested_mode(request.headers, request.query_params)
+            label = f"{request.method} {request.url.path}"
+            with collect_request_timings() as timings, \
+                    span(label, category="http", force=forced) as root, \
+                    (profile(profile_mode, label) if profile_mode else nullcontext()) as profiled:
+                response = await call_next(request)
+            status = response.status_code
+            response.headers["Server-Timing"] = timings.server_timing()
+            if root is not None:
+                response.headers["X-Trace-Id"] = root.trace_id
+            if profiled is not None and profiled.path is not None:
+                response.headers["X-Profile-File"] = profiled.path.name
+            return response
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = request.scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=request.method,
+                route=getattr(route, "path", "unmatched"),
+                status=status
+            )
+
+    # 设置 AKSHARE_MEMORY_SAMPLE_INTERVAL 时周期记录 RSS 和缓存大小
+    start_memory_sampler(cache_provider=lambda: get_container().diskcache())
+
     # 注册路由
     app.include_router(field_discovery_router)
     app.include_router(financial_router)
+    app.include_router(admin_router)
 
     # 根路径重定向到文档页面
     @app.get("/", include_in_schema=False)
@@ -47,10 +100,30 @@ def create_app() -> FastAPI:
         """根路径重定向到API文档"""
         return RedirectResponse(url="/docs")
 
+    # 进程内指标（Prometheus 文本格式），本地 curl 即可查看
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """导出查询流水线各阶段耗时、缓存命中率、上游错误数等指标"""
+        refresh_cache_hit_ratio()
+        return PlainTextResponse(render_prometheus(), media_type=CONTENT_TYPE)
+
+    # 存活探针：常数时间，不访问任何依赖
+    @app.get("/livez", include_in_schema=False)
+    async def livez():
+        """存活探针"""
+        return {"status": "alive"}
+
+    # 就绪探针：缓存、线程池、熔断器和预热覆盖率（见 readiness.py）
+    @app.get("/readyz", include_in_schema=False)
+    async def readyz():
+        """就绪探针，未就绪时返回 503"""
+        ready, body = readiness(get_container())
+        return JSONResponse(body, status_code=200 if ready else 503)
+
     # 添加健康检查端点，验证依赖注入
     @app.get("/health")
     async def health_check():
-        """健康检查端点，验证容器集成"""
+        """健康检查端点，验证容器集成（复用进程内共享的容器）"""
         get_container()  # 验证容器可以正常初始化
 
         return {
@@ -0,0 +1,166 @@
+"""
+存活与就绪探针
+
+编排系统每隔几秒对每个 worker 探测一次，探针本身不能成为负担：
+
+- `/livez`: 进程能响应即存活，常数时间，不访问任何依赖
+- `/readyz`: 复用进程内共享的容器（不创建新的服务对象），检查：
+  - **缓存**: diskcache 能否读取
+  - **线程池**: 上游调用、对冲请求、三表并发获取线程池的忙碌线程数和排队任务数；
+    排队任务数达到线程数时视为过载
+  - **熔断器**: 各数据源熔断器状态；有熔断器打开时为降级（仍可返回缓存数据，保持就绪）
+  - **预热覆盖率**: `AKSHARE_WARM_SYMBOLS`（逗号分隔的股票代码）中各股票的财务三表和财务指标
+    已在缓存中的比例；设置 `AKSHARE_READY_MIN_WARM_COVERAGE`（0~1）时低于该比例视为未就绪
+
+就绪返回 200（status 为 ready 或 degraded），未就绪返回 503。
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..container import ProductionContainer
+from ..core.models import MarketType
+from ..core.stock_identifier import StockIdentifier
+from ..datasource import hedging, resilience
+from ..datasource.queryers import statement_group
+
+READY = "ready"
+DEGRADED = "degraded"
+NOT_READY = "not_ready"
+
+# 各市场预热的查询器（容器中的 provider 名称）：财务指标和财务三表
+WARM_QUERYERS = {
+    MarketType.A_STOCK: ("a_stock_indicators", "a_stock_balance_sheet",
+                         "a_stock_income_statement", "a_stock_cash_flow"),
+    MarketType.HK_STOCK: ("hk_stock_indicators", "hk_stock_balance_sheet",
+                          "hk_stock_income_statement", "hk_stock_cash_flow"),
+    MarketType.US_STOCK: ("us_stock_indicators", "us_stock_balance_sheet",
+                          "us_stock_income_statement", "us_stock_cash_flow"),
+}
+
+# 被检查的进程级线程池（模块中按需创建的 _executor）
+EXECUTOR_MODULES = {
+    "upstream": resilience,
+    "hedge": hedging,
+    "statement_group": statement_group,
+}
+
+_READINESS_PROBE_KEY = "__readyz__"
+
+
+def executor_stats(executor: Optional[ThreadPoolExecutor]) -> Dict[str, Any]:
+    """线程池的忙碌线程数和排队任务数（尚未创建的线程池视为空闲）"""
+    if executor is None:
+        return {"started": False, "max_workers": 0, "threads": 0, "busy": 0, "queued": 0,
+                "saturation": 0.0, "overloaded": False}
+    max_workers = executor._max_workers
+    threads = len(executor._threads)
+    busy = max(0, threads - executor._idle_semaphore._value)
+    queued = executor._work_queue.qsize()
+    return {
+        "started": True,
+        "max_workers": max_workers,
+        "threads": threads,
+        "busy": busy,
+        "queued": queued,
+        "saturation": round((busy + queued) / max_workers, 3),
+        "overloaded": queued >= max_workers,
+    }
+
+
+def check_cache(container: ProductionContainer) -> Dict[str, Any]:
+    """diskcache 能否读取"""
+    try:
+        container.diskcache().get(_READINESS_PROBE_KEY)
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    return {"ok": True}
+
+
+def check_executors() -> Dict[str, Dict[str, Any]]:
+    return {name: executor_stats(module._executor) for name, module in EXECUTOR_MODULES.items()}
+
+
+def warm_symbols() -> List[str]:
+    return [s.strip() for s in os.environ.get("AKSHARE_WARM_SYMBOLS", "").split(",") if s.strip()]
+
+
+class WarmCoverage:
+    """预热覆盖率：预热股票的缓存键只计算一次，每次探测只做键存在性检查（不反序列化）"""
+
+    def __init__(self, container: ProductionContainer, symbols: List[str]):
+        self.symbols = symbols
+        self.keys: List[Tuple[str, str]] = []   # (股票代码, 缓存键)
+        self.invalid: List[str] = []
+        identifier = StockIdentifier()
+        for symbol in symbols:
+            try:
+                market, _ = identifier.identify(symbol)
+                for name in WARM_QUERYERS[market]:
+                    queryer = getattr(container, name)()
+                    formatted = queryer._format_symbol_for_api(symbol)
+                    self.keys.append((symbol, f"{queryer.cache_query_type}:{formatted}"))
+            except (ValueError, KeyError):
+                self.invalid.append(symbol)
+
+    def check(self, cache) -> Dict[str, Any]:
+        cached = [(symbol, key) for symbol, key in self.keys if key in cache]
+        cold = sorted({symbol for symbol, _ in self.keys} - {symbol for symbol, _ in cached})
+        return {
+            "symbols": len(self.symbols),
+            "keys": len(self.keys),
+            "cached": len(cached),
+            "coverage": round(len(cached) / len(self.keys), 3) if self.keys else None,
+            "cold_symbols": cold[:20],
+            "invalid_symbols": self.invalid,
+        }
+
+
+# 按容器缓存的预热覆盖率计算器（容器和预热列表不变时复用）
+_coverage: Optional[Tuple[int, Tuple[str, ...], WarmCoverage]] = None
+
+
+def check_warm_coverage(container: ProductionContainer) -> Dict[str, Any]:
+    global _coverage
+    symbols = warm_symbols()
+    if not symbols:
+        return {"configured": False}
+    if _coverage is None or _coverage[0] != id(container) or _coverage[1] != tuple(symbols):
+        _coverage = (id(container), tuple(symbols), WarmCoverage(container, symbols))
+    return {"configured": True, **_coverage[2].check(container.diskcache())}
+
+
+def readiness(container: ProductionContainer) -> Tuple[bool, Dict[str, Any]]:
+    """
+    汇总就绪检查
+
+    Returns:
+        (是否就绪, 响应正文)
+    """
+    cache = check_cache(container)
+    executors = check_executors()
+    breakers = resilience.circuit_breaker_states()
+    warm = check_warm_coverage(container) if cache["ok"] else {"configured": bool(warm_symbols())}
+
+    reasons = []
+    if not cache["ok"]:
+        reasons.append("缓存不可读")
+    reasons.extend(f"线程池过载: {name}" for name, stats in executors.items() if stats["overloaded"])
+    min_coverage = float(os.environ.get("AKSHARE_READY_MIN_WARM_COVERAGE", "0"))
+    if min_coverage and warm.get("coverage") is not None and warm["coverage"] < min_coverage:
+        reasons.append(f"预热覆盖率 {warm['coverage']} 低于 {min_coverage}")
+
+    open_breakers = sorted(source for source, state in breakers.items() if state == "open")
+    ready = not reasons
+    status = NOT_READY if not ready else (DEGRADED if open_breakers else READY)
+    return ready, {
+        "status": status,
+        "reasons": reasons + [f"熔断器打开: {source}" for source in open_breakers],
+        "checks": {
+            "cache": cache,
+            "executors": executors,
+            "circuit_breakers": breakers,
+            "warm_cache": warm,
+        },
+    }
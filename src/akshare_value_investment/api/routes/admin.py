@@ -0,0 +1,94 @@
+"""
+管理路由
+
+列出和下载单请求剖析文件（见 observability/profiling.py），查看内存统计和 tracemalloc
+快照对比（见 observability/memory.py）。所有端点都需要请求头
+`X-Profile-Token` 与环境变量 AKSHARE_PROFILING_TOKEN 一致；未设置令牌时返回 404，
+不暴露管理端点的存在。
+"""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from ...container import ProductionContainer
+from ...observability.memory import memory_report, stop_tracing, take_snapshot
+from ...observability.profiling import ProfileStore, authorize, profiling_token
+from ..dependencies import get_container
+
+router = APIRouter(prefix="/admin", tags=["管理"])
+
+
+def require_admin_token(x_profile_token: Optional[str] = Header(None)) -> None:
+    """校验管理员令牌"""
+    if profiling_token() is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not authorize(x_profile_token):
+        raise HTTPException(status_code=403, detail="管理员令牌缺失或不正确")
+
+
+def get_profile_store() -> ProfileStore:
+    """剖析文件目录（按环境变量创建）"""
+    return ProfileStore()
+
+
+@router.get("/profiles", response_model=Dict[str, Any], dependencies=[Depends(require_admin_token)])
+async def list_profiles(store: ProfileStore = Depends(get_profile_store)) -> Dict[str, Any]:
+    """
+    列出剖析文件（最新的在前）
+
+    Returns:
+        Dict[str, Any]: 剖析文件名、格式（collapsed / pstats）、大小和生成时间
+    """
+    profiles = store.list()
+    return {
+        "status": "success",
+        "data": {"profiles": profiles},
+        "metadata": {"directory": str(store.directory), "count": len(profiles)},
+    }
+
+
+@router.get("/profiles/{name}", dependencies=[Depends(require_admin_token)])
+async def download_profile(name: str, store: ProfileStore = Depends(get_profile_store)) -> FileResponse:
+    """
+    下载剖析文件
+
+    Raises:
+        HTTPException: 文件名不合法或文件不存在时返回 404
+    """
+    path = store.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"剖析文件不存在: {name}")
+    media_type = "text/plain; charset=utf-8" if path.suffix == ".collapsed" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=path.name)
+
+
+@router.get("/memory", response_model=Dict[str, Any], dependencies=[Depends(require_admin_token)])
+def get_memory_report(
+    container: ProductionContainer = Depends(get_container),
+    top: int = Query(10, ge=1, le=100, description="每个缓存层返回最大的前 N 个键"),
+    limit: Optional[int] = Query(None, ge=1, description="diskcache 最多统计的条目数（条目很多时限制耗时）"),
+) -> Dict[str, Any]:
+    """
+    内存统计：进程 RSS、各缓存层的条目数、深度字节数、DataFrame block 数和最大的键
+
+    diskcache 层需要反序列化每个条目，条目很多时耗时较长（同步端点，在线程池中执行）。
+    """
+    return {"status": "success", "data": memory_report(container.diskcache(), top=top, limit=limit)}
+
+
+@router.post("/memory/snapshot", response_model=Dict[str, Any], dependencies=[Depends(require_admin_token)])
+def post_memory_snapshot(top: int = Query(10, ge=1, le=100, description="返回前 N 个分配位置")) -> Dict[str, Any]:
+    """
+    拍摄 tracemalloc 快照
+
+    第一次调用开始跟踪；之后每次返回当前占用最多的分配位置，以及与上一次快照相比增长最多的位置。
+    """
+    return {"status": "success", "data": take_snapshot(top=top)}
+
+
+@router.delete("/memory/snapshot", response_model=Dict[str, Any], dependencies=[Depends(require_admin_token)])
+def delete_memory_snapshot() -> Dict[str, Any]:
+    """停止 tracemalloc 跟踪并丢弃快照"""
+    return {"status": "success", "data": {"stopped": stop_tracing()}}
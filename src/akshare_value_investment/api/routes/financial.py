@@ -4,12 +4,15 @@
 提供财务数据查询相关的API端点，遵循SOLID原则和TDD开发流程。
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import Dict, Any, Optional
 
 from ...core.models import MarketType
 from ...business.financial_types import FinancialQueryType, Frequency
+from ...business.response_formatter import ResponseFormatter
 from ..dependencies import FinancialServiceDep
+from ..utils.http_cache import conditional_response
+from ...observability.request_timing import current_timings
 from ..models.requests import FinancialQueryRequest, FinancialStatementsAggregationRequest
 
 router = APIRouter(prefix="/api/v1/financial", tags=["财务查询"])
@@ -28,6 +31,16 @@ AGGREGATION_TYPES = {
     FinancialQueryType.US_FINANCIAL_STATEMENTS,
 }
 
+EXPLAIN_DESCRIPTION = "在 metadata.explain 中返回各阶段耗时和每张报表的数据来源（disk/upstream/stale）"
+
+
+def attach_explain(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """把当前请求的耗时明细加入响应元数据"""
+    timings = current_timings()
+    if timings is not None and isinstance(payload.get("metadata"), dict):
+        payload["metadata"]["explain"] = timings.explain()
+    return payload
+
 
 @router.post("/indicators", response_model=Dict[str, Any])
 async def query_financial_indicators(
@@ -232,50 +245,14 @@ async def query_financial_statements(
             limit=request.limit
         )
 
-        # 提取单位映射（如果存在，仅A股有）
-        unit_map = result.pop("unit_map", {})
-
-        # 构建响应数据
-        # 将DataFrame转换为字典格式以便JSON序列化
-        data_dict = {}
-        record_counts = {}
-
-        for statement_name, df in result.items():
-            if df.empty:
-                data_dict[statement_name] = {
-                    "columns": [],
-                    "data": [],
-                    "record_count": 0
-                }
-                record_counts[statement_name] = 0
-            else:
-                data_dict[statement_name] = {
-                    "columns": list(df.columns),
-                    "data": df.to_dict(orient='records'),
-                    "record_count": len(df)
-                }
-                record_counts[statement_name] = len(df)
-
-        # 构建元数据
-        metadata = {
-            "symbol": request.symbol,
-            "query_type": query_type_enum.get_display_name(),
-            "frequency": frequency_enum.get_display_name(),
-            "record_counts": record_counts,
-            "limit": request.limit
-        }
-
-        # 如果有单位映射，添加到元数据中
-        if unit_map:
-            metadata["unit_info"] = unit_map
-            metadata["default_unit"] = "亿元"
-
-        # 构建响应
-        return {
-            "status": "success",
-            "data": data_dict,
-            "metadata": metadata
-        }
+        # 构建响应（DataFrame转换为记录列表以便JSON序列化）
+        return ResponseFormatter.financial_statements(
+            result,
+            symbol=request.symbol,
+            query_type=query_type_enum,
+            frequency=frequency_enum,
+            limit=request.limit
+        )
 
     except HTTPException:
         # 重新抛出HTTP异常
@@ -301,24 +278,29 @@ async def query_financial_statements(
 
 @router.get("/indicators", response_model=Dict[str, Any])
 async def get_financial_indicators(
+    request: Request,
     symbol: str = Query(..., description="股票代码"),
     market: str = Query("a_stock", description="市场类型"),
     frequency: str = Query("annual", description="数据频率"),
+    explain: bool = Query(False, description=EXPLAIN_DESCRIPTION),
     financial_service: FinancialServiceDep = FinancialServiceDep
-) -> Dict[str, Any]:
+) -> Response:
     """
     财务指标查询接口（GET方法，支持浏览器URL访问）
 
-    通过URL查询参数查询财务指标数据。
+    通过URL查询参数查询财务指标数据。成功响应带 ETag 和 Cache-Control，
+    携带匹配的 If-None-Match 时返回 304。
 
     Args:
+        request: 当前请求（读取 If-None-Match）
         symbol: 股票代码（如：SH600519, 00700, AAPL）
         market: 市场类型（a_stock, hk_stock, us_stock）
         frequency: 数据频率（annual, quarterly）
+        explain: 是否在元数据中返回耗时明细
         financial_service: 财务查询服务（依赖注入）
 
     Returns:
-        Dict[str, Any]: 查询结果或错误信息
+        Response: 查询结果或错误信息（数据未变化时为 304）
 
     Examples:
         浏览器访问:
@@ -359,8 +341,11 @@ async def get_financial_indicators(
             frequency=frequency_enum
         )
 
-        # 返回服务响应（已经是标准格式）
-        return service_response
+        if explain:
+            attach_explain(service_response)
+
+        # 返回服务响应（已经是标准格式），支持条件请求
+        return conditional_response(request, service_response)
 
     except HTTPException:
         # 重新抛出HTTP异常
@@ -375,26 +360,31 @@ async def get_financial_indicators(
 
 @router.get("/statements", response_model=Dict[str, Any])
 async def get_financial_statements(
+    request: Request,
     symbol: str = Query(..., description="股票代码"),
     query_type: str = Query(..., description="查询类型（a_financial_statements/hk_financial_statements/us_financial_statements）"),
     frequency: str = Query("annual", description="数据频率（annual, quarterly）"),
     limit: Optional[int] = Query(None, ge=1, description="限制返回记录数"),
+    explain: bool = Query(False, description=EXPLAIN_DESCRIPTION),
     financial_service: FinancialServiceDep = FinancialServiceDep
-) -> Dict[str, Any]:
+) -> Response:
     """
     财务三表聚合查询接口（GET方法，支持浏览器URL访问）
 
-    通过URL查询参数查询财务三表数据。
+    通过URL查询参数查询财务三表数据。成功响应带 ETag 和 Cache-Control，
+    携带匹配的 If-None-Match 时返回 304。
 
     Args:
+        request: 当前请求（读取 If-None-Match）
         symbol: 股票代码（如：SH600519, 00700, AAPL）
         query_type: 查询类型（a_financial_statements, hk_financial_statements, us_financial_statements）
         frequency: 数据频率（annual, quarterly）
         limit: 限制返回记录数
+        explain: 是否在元数据中返回耗时明细
         financial_service: 财务查询服务（依赖注入）
 
     Returns:
-        Dict[str, Any]: 包含三表数据的字典
+        Response: 包含三表数据的字典（数据未变化时为 304）
 
     Examples:
         查询A股财务三表（最近10年）:
@@ -439,49 +429,19 @@ async def get_financial_statements(
             limit=limit
         )
 
-        # 提取单位映射（如果存在，仅A股有）
-        unit_map = result.pop("unit_map", {})
-
-        # 构建响应数据
-        data_dict = {}
-        record_counts = {}
-
-        for statement_name, df in result.items():
-            if df.empty:
-                data_dict[statement_name] = {
-                    "columns": [],
-                    "data": [],
-                    "record_count": 0
-                }
-                record_counts[statement_name] = 0
-            else:
-                data_dict[statement_name] = {
-                    "columns": list(df.columns),
-                    "data": df.to_dict(orient='records'),
-                    "record_count": len(df)
-                }
-                record_counts[statement_name] = len(df)
-
-        # 构建元数据
-        metadata = {
-            "symbol": symbol,
-            "query_type": query_type_enum.get_display_name(),
-            "frequency": frequency_enum.get_display_name(),
-            "record_counts": record_counts,
-            "limit": limit
-        }
-
-        # 如果有单位映射，添加到元数据中
-        if unit_map:
-            metadata["unit_info"] = unit_map
-            metadata["default_unit"] = "亿元"
+        # 构建响应（DataFrame转换为记录列表以便JSON序列化）
+        payload = ResponseFormatter.financial_statements(
+            result,
+            symbol=symbol,
+            query_type=query_type_enum,
+            frequency=frequency_enum,
+            limit=limit
+        )
+        if explain:
+            attach_explain(payload)
 
-        # 构建响应
-        return {
-            "status": "success",
-            "data": data_dict,
-            "metadata": metadata
-        }
+        # 支持条件请求
+        return conditional_response(request, payload)
 
     except HTTPException:
         # 重新抛出HTTP异常
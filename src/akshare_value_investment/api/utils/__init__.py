@@ -4,6 +4,7 @@ API工具模块
 API层工具函数和辅助类，保持单一职责。
 """
 
+from .http_cache import conditional_response
 from .response_utils import format_service_response
 
-__all__ = ["format_service_response"]
+__all__ = ["conditional_response", "format_service_response"]
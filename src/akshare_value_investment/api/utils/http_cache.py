@@ -0,0 +1,91 @@
+"""
+HTTP 条件请求（ETag / If-None-Match）
+
+财务数据在服务端缓存中通常数周不变，轮询同一股票的客户端没必要每次都下载完整响应体。
+GET 查询接口的成功响应带上：
+
+- **ETag**: 由请求路径、查询参数和数据内容计算的强校验值（响应生成时间 `timestamp` 不参与计算）
+- **Cache-Control**: `private, max-age=API_CACHE_MAX_AGE, must-revalidate`，过期后客户端必须用
+  `If-None-Match` 重新验证
+
+客户端携带的 `If-None-Match` 与当前 ETag 匹配时返回不含响应体的 304。
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Mapping, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# 客户端可以不经验证直接复用响应的秒数
+CACHE_MAX_AGE = int(os.getenv("API_CACHE_MAX_AGE", "300"))
+
+# 不参与 ETag 计算的字段（每次响应都会变化，但不代表数据版本变化）
+VOLATILE_FIELDS = frozenset({"timestamp"})
+
+
+def cache_control(max_age: int = CACHE_MAX_AGE) -> str:
+    """Cache-Control 响应头"""
+    return f"private, max-age={max_age}, must-revalidate"
+
+
+def compute_etag(path: str, params: Mapping[str, Any], payload: Dict[str, Any]) -> str:
+    """
+    计算强 ETag
+
+    Args:
+        path: 请求路径
+        params: 查询参数（顺序无关）
+        payload: 可 JSON 序列化的响应体
+
+    Returns:
+        带双引号的 ETag，如 '"3f2a..."'
+    """
+    version = {k: v for k, v in payload.items() if k not in VOLATILE_FIELDS}
+    digest = hashlib.sha256()
+    digest.update(path.encode("utf-8"))
+    digest.update(json.dumps(sorted((str(k), str(v)) for k, v in params.items()),
+                             ensure_ascii=False).encode("utf-8"))
+    digest.update(json.dumps(version, ensure_ascii=False, sort_keys=True, separators=(",", ":"),
+                             default=str).encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 是否匹配（按 RFC 9110 使用弱比较，支持多个值和 *）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (value.strip() for value in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def conditional_response(request: Request, payload: Dict[str, Any],
+                         max_age: int = CACHE_MAX_AGE) -> Response:
+    """
+    构建支持条件请求的响应
+
+    非成功响应（status != "success"）原样返回，不带缓存头。
+
+    Args:
+        request: 当前请求
+        payload: 响应体
+        max_age: Cache-Control 的 max-age（秒）
+
+    Returns:
+        304（If-None-Match 匹配）或带 ETag 的 200 JSON 响应
+    """
+    content = jsonable_encoder(payload)
+    if payload.get("status") != "success":
+        return JSONResponse(content)
+
+    etag = compute_etag(request.url.path, request.query_params, content)
+    headers = {"ETag": etag, "Cache-Control": cache_control(max_age)}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content, headers=headers)
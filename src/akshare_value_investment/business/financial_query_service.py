@@ -41,6 +41,9 @@ from ..container import create_container
 from .financial_types import FinancialQueryType, Frequency, MCPErrorType
 from .response_formatter import ResponseFormatter
 from .field_discovery_service import FieldDiscoveryService
+from ..observability.logging_pipeline import hot_path
+from ..observability.pipeline import FREQUENCY_PROCESSING, stage_timer
+from ..observability.tracing import span, traced
 
 
 class FinancialQueryService:
@@ -89,6 +92,7 @@ class FinancialQueryService:
             FinancialQueryType.US_STOCK_CASH_FLOW: self.container.us_stock_cash_flow(),
         }
 
+    @traced("FinancialQueryService.query", category="service")
     def query(
         self,
         market: MarketType,
@@ -165,7 +169,8 @@ class FinancialQueryService:
                 )
 
             # 3. 执行查询
-            self.logger.info(f"执行查询: {market.value} {query_type.value} {symbol}")
+            self.logger.info("执行查询: %s %s %s", market.value, query_type.value, symbol,
+                             extra=hot_path("query.start"))
             raw_data = queryer.query(symbol, start_date, end_date)
 
             if raw_data.empty:
@@ -177,7 +182,8 @@ class FinancialQueryService:
                 )
 
             # 4. 时间频率处理
-            processed_data = self._process_frequency(raw_data, frequency, query_type)
+            with stage_timer(FREQUENCY_PROCESSING, market=market.value, query_type=query_type.value):
+                processed_data = self._process_frequency(raw_data, frequency, query_type)
 
             # 5. 构建成功响应
             metadata = {
@@ -196,7 +202,8 @@ class FinancialQueryService:
                     "end_date": end_date
                 }
 
-            self.logger.info(f"查询成功: {len(processed_data)} 条记录, {len(processed_data.columns)} 个字段")
+            self.logger.info("查询成功: %d 条记录, %d 个字段", len(processed_data), len(processed_data.columns),
+                             extra=hot_path("query.success"))
 
             return ResponseFormatter.success(
                 data=processed_data,
@@ -205,7 +212,7 @@ class FinancialQueryService:
             )
 
         except Exception as e:
-            self.logger.error(f"查询失败: {e}", exc_info=True)
+            self.logger.error("查询失败: %s", e, exc_info=True)
             return ResponseFormatter.internal_error(
                 original_error=e,
                 operation=f"财务数据查询 ({query_type.get_display_name()})",
@@ -546,7 +553,8 @@ class FinancialQueryService:
         if 'STD_REPORT_DATE' in df_best.columns:
             df_best['REPORT_DATE'] = df_best['STD_REPORT_DATE']
 
-        self.logger.info(f"美股财年数据处理完成：从 {len(df)} 条记录处理为 {len(df_best)} 条年度数据")
+        self.logger.info("美股财年数据处理完成：从 %d 条记录处理为 %d 条年度数据", len(df), len(df_best),
+                         extra=hot_path("frequency.us_fiscal_year"))
         return df_best
 
     def _find_date_field(self, data: pd.DataFrame) -> Optional[str]:
@@ -615,6 +623,7 @@ class FinancialQueryService:
             self.logger.error(f"字段发现失败: {e}", exc_info=True)
             return []
 
+    @traced("FinancialQueryService.query_financial_statements", category="service")
     def query_financial_statements(
         self,
         query_type: FinancialQueryType,
@@ -703,7 +712,9 @@ class FinancialQueryService:
                 continue
 
             # 执行查询
-            query_result = queryer.query(symbol)
+            with span(f"statement.{statement_name}", category="queryer",
+                      query_type=statement_query_type.value, symbol=symbol):
+                query_result = queryer.query(symbol)
 
             # 所有市场现在都返回统一格式：{'data': DataFrame, 'unit_map': Dict}
             if isinstance(query_result, dict):
@@ -721,7 +732,8 @@ class FinancialQueryService:
                 continue
 
             # 应用时间频率处理
-            processed_data = self._process_frequency(raw_data, frequency, statement_query_type)
+            with stage_timer(FREQUENCY_PROCESSING, market=market.value, query_type=statement_query_type.value):
+                processed_data = self._process_frequency(raw_data, frequency, statement_query_type)
 
             # 应用记录数限制
             if limit is not None and len(processed_data) > limit:
@@ -9,7 +9,8 @@ import pandas as pd
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
-from .financial_types import MCPErrorType
+from .financial_types import FinancialQueryType, Frequency, MCPErrorType
+from ..observability.pipeline import SERIALIZATION, stage_timer
 
 
 class ResponseFormatter:
@@ -41,10 +42,12 @@ class ResponseFormatter:
 
         # 使用pandas的to_json方法处理DataFrame，确保日期等对象正确序列化
         if not data.empty:
-            # 使用orient='records'将DataFrame转换为记录列表
-            # date_format='iso'确保日期以ISO格式输出
-            records_json = data.to_json(orient='records', date_format='iso', force_ascii=False)
-            records = json.loads(records_json)
+            labels = {key: (query_info or {}).get(key, "unknown") for key in ("market", "query_type")}
+            with stage_timer(SERIALIZATION, **labels):
+                # 使用orient='records'将DataFrame转换为记录列表
+                # date_format='iso'确保日期以ISO格式输出
+                records_json = data.to_json(orient='records', date_format='iso', force_ascii=False)
+                records = json.loads(records_json)
         else:
             records = []
 
@@ -82,6 +85,75 @@ class ResponseFormatter:
 
         return response
 
+    @staticmethod
+    def financial_statements(
+        statements: Dict[str, Any],
+        symbol: str,
+        query_type: FinancialQueryType,
+        frequency: Frequency,
+        limit: Optional[int] = None,
+        as_records: bool = True
+    ) -> Dict[str, Any]:
+        """
+        创建财务三表聚合查询的成功响应
+
+        Args:
+            statements: `FinancialQueryService.query_financial_statements()` 的返回值
+                （报表名称 → DataFrame，可选 unit_map）
+            symbol: 股票代码
+            query_type: 财务三表聚合查询类型
+            frequency: 时间频率
+            limit: 限制返回记录数
+            as_records: True 时 data 为记录列表（用于JSON响应）；
+                False 时直接保留 DataFrame（进程内调用，无需序列化）
+
+        Returns:
+            {"status": "success", "data": {报表名称: {columns, data, record_count}}, "metadata": {...}}
+        """
+        # 提取单位映射
+        unit_map = statements.get("unit_map") or {}
+
+        data_dict = {}
+        record_counts = {}
+        labels = {"market": query_type.get_market().value, "query_type": query_type.value}
+        for statement_name, df in statements.items():
+            if statement_name == "unit_map":
+                continue
+            if df.empty:
+                data_dict[statement_name] = {
+                    "columns": [],
+                    "data": [] if as_records else pd.DataFrame(),
+                    "record_count": 0
+                }
+            else:
+                with stage_timer(SERIALIZATION, **labels):
+                    records = df.to_dict(orient='records') if as_records else df
+                data_dict[statement_name] = {
+                    "columns": list(df.columns),
+                    "data": records,
+                    "record_count": len(df)
+                }
+            record_counts[statement_name] = len(df)
+
+        metadata = {
+            "symbol": symbol,
+            "query_type": query_type.get_display_name(),
+            "frequency": frequency.get_display_name(),
+            "record_counts": record_counts,
+            "limit": limit
+        }
+
+        # 如果有单位映射，添加到元数据中
+        if unit_map:
+            metadata["unit_info"] = unit_map
+            metadata["default_unit"] = "亿元"
+
+        return {
+            "status": "success",
+            "data": data_dict,
+            "metadata": metadata
+        }
+
     @staticmethod
     def error(
         error_type: MCPErrorType,
@@ -0,0 +1,29 @@
+"""
+API 客户端模块
+
+访问本项目 FastAPI 服务的同步/异步 HTTP 客户端（连接池、gzip、重试、批量请求、本地响应缓存）。
+"""
+
+from .api_client import (
+    FINANCIAL_INDICATORS_PATH,
+    FINANCIAL_STATEMENTS_PATH,
+    ApiClient,
+    ApiClientError,
+    ApiConnectionError,
+    ApiTimeoutError,
+    AsyncApiClient,
+    get_base_url,
+)
+from .cache import ResponseCache
+
+__all__ = [
+    "ApiClient",
+    "AsyncApiClient",
+    "ApiClientError",
+    "ApiConnectionError",
+    "ApiTimeoutError",
+    "ResponseCache",
+    "FINANCIAL_STATEMENTS_PATH",
+    "FINANCIAL_INDICATORS_PATH",
+    "get_base_url",
+]
@@ -0,0 +1,313 @@
+"""
+FastAPI 服务的 HTTP 客户端
+
+基于 `httpx` 连接池的同步/异步客户端：
+
+- **keep-alive**: 同一个客户端复用 TCP 连接，不再每次请求都重新握手
+- **压缩**: 请求携带 `Accept-Encoding: gzip`，服务端 GZipMiddleware 压缩大响应
+- **重试**: 连接失败、超时和 502/503/504 按指数退避重试（仅 GET，幂等）
+- **批量请求**: `get_many()` 对一批请求去重后并发执行，结果按输入顺序返回
+- **本地响应缓存**: 可选的 `ResponseCache`，相同参数的成功响应在 TTL 内直接返回；
+  过期后携带 `If-None-Match` 重新验证，服务端返回 304 时复用缓存的正文
+
+```python
+with ApiClient("http://localhost:8000", cache=ResponseCache(ttl=60)) as client:
+    response = client.financial_statements("600519", "a_financial_statements")
+    data = response.json()
+
+async with AsyncApiClient() as client:
+    statements, indicators = await client.get_many([
+        (FINANCIAL_STATEMENTS_PATH, {"symbol": "00700", "query_type": "hk_financial_statements"}),
+        (FINANCIAL_INDICATORS_PATH, {"symbol": "00700", "market": "hk_stock"}),
+    ])
+```
+
+返回值为 `httpx.Response`；是否把非 200 状态码视为错误由调用方决定（与原先直接使用
+`requests.get` 的代码保持一致）。
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import httpx
+
+from .cache import ResponseCache, request_key
+
+DEFAULT_BASE_URL = "http://localhost:8000"
+
+FINANCIAL_STATEMENTS_PATH = "/api/v1/financial/statements"
+FINANCIAL_INDICATORS_PATH = "/api/v1/financial/indicators"
+
+# 视为临时故障、可以重试的状态码
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+# 缓存命中的响应带上该响应头（hit: 未过期直接返回；revalidated: 服务端 304 确认未变化），便于排查
+CACHE_HEADER = "x-client-cache"
+
+Request = Tuple[str, Optional[Mapping]]
+
+
+class ApiClientError(Exception):
+    """API 客户端错误基类"""
+
+
+class ApiConnectionError(ApiClientError):
+    """无法连接 API 服务"""
+
+
+class ApiTimeoutError(ApiClientError):
+    """API 请求超时"""
+
+
+def get_base_url() -> str:
+    """API 服务地址（环境变量 API_BASE_URL，默认 http://localhost:8000）"""
+    return os.environ.get("API_BASE_URL", DEFAULT_BASE_URL)
+
+
+class _BaseApiClient:
+    """同步/异步客户端共用的配置、缓存和重试策略"""
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 30.0, max_retries: int = 2,
+                 backoff: float = 0.2, max_connections: int = 10,
+                 cache: Optional[ResponseCache] = None):
+        """
+        Args:
+            base_url: API 服务地址，默认 `get_base_url()`
+            timeout: 单次请求超时（秒）
+            max_retries: 临时故障的最大重试次数
+            backoff: 首次重试前等待的秒数（之后每次翻倍）
+            max_connections: 连接池大小（也是批量请求的最大并发数）
+            cache: 本地响应缓存（None 表示不缓存）
+        """
+        self.base_url = (base_url or get_base_url()).rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.cache = cache
+
+    def _client_options(self) -> Dict:
+        return {
+            "base_url": self.base_url,
+            "timeout": self.timeout,
+            "limits": httpx.Limits(max_connections=self.max_connections,
+                                   max_keepalive_connections=self.max_connections),
+            "headers": {"Accept-Encoding": "gzip"},
+        }
+
+    def _cached(self, path: str, params: Optional[Mapping]) -> Optional[httpx.Response]:
+        if self.cache is None:
+            return None
+        content = self.cache.get(request_key(path, params))
+        if content is None:
+            return None
+        return self._cached_response(path, params, content, "hit")
+
+    def _cached_response(self, path: str, params: Optional[Mapping], content: bytes,
+                         marker: str) -> httpx.Response:
+        request = httpx.Request("GET", self.base_url + path, params=_clean_params(params))
+        return httpx.Response(200, content=content, request=request,
+                              headers={"content-type": "application/json", CACHE_HEADER: marker})
+
+    def _conditional_headers(self, path: str, params: Optional[Mapping]) -> Dict:
+        """过期缓存条目的 If-None-Match 请求头"""
+        if self.cache is None:
+            return {}
+        etag = self.cache.etag(request_key(path, params))
+        return {"If-None-Match": etag} if etag else {}
+
+    def _store(self, path: str, params: Optional[Mapping], response: httpx.Response) -> httpx.Response:
+        """缓存成功响应；304 时复用缓存的正文，返回调用方应使用的响应"""
+        if self.cache is None:
+            return response
+        key = request_key(path, params)
+        if response.status_code == 304:
+            content = self.cache.refresh(key)
+            if content is not None:
+                return self._cached_response(path, params, content, "revalidated")
+        elif response.status_code == 200:
+            self.cache.set(key, response.content, response.headers.get("etag"))
+        return response
+
+    def _retry_delay(self, attempt: int) -> float:
+        return self.backoff * (2 ** attempt)
+
+    @staticmethod
+    def _unique(requests: Sequence[Request]) -> Tuple[List[Request], List[int]]:
+        """批量请求去重，返回 (去重后的请求, 每个输入对应的下标)"""
+        positions: Dict[Tuple, int] = {}
+        unique: List[Request] = []
+        indexes: List[int] = []
+        for path, params in requests:
+            key = request_key(path, params)
+            if key not in positions:
+                positions[key] = len(unique)
+                unique.append((path, params))
+            indexes.append(positions[key])
+        return unique, indexes
+
+    @staticmethod
+    def _statements_params(symbol: str, query_type: str, frequency: str) -> Dict:
+        return {"symbol": symbol, "query_type": query_type, "frequency": frequency}
+
+    @staticmethod
+    def _indicators_params(symbol: str, market: str, frequency: str) -> Dict:
+        return {"symbol": symbol, "market": market, "frequency": frequency}
+
+
+def _clean_params(params: Optional[Mapping]) -> Dict:
+    return {k: v for k, v in (params or {}).items() if v is not None}
+
+
+def _translate_error(error: httpx.TransportError, url: str) -> ApiClientError:
+    if isinstance(error, httpx.TimeoutException):
+        return ApiTimeoutError(f"API请求超时: {url}")
+    return ApiConnectionError(f"无法连接API服务: {url} ({error})")
+
+
+class ApiClient(_BaseApiClient):
+    """同步 API 客户端（线程安全，可在多个线程间共享）"""
+
+    def __init__(self, base_url: Optional[str] = None, *, transport: Optional[httpx.BaseTransport] = None,
+                 **options):
+        """
+        Args:
+            base_url: API 服务地址
+            transport: 自定义 httpx 传输层（测试时可用 httpx.MockTransport）
+            **options: 见 `_BaseApiClient`
+        """
+        super().__init__(base_url, **options)
+        self._client = httpx.Client(transport=transport, **self._client_options())
+
+    def get(self, path: str, params: Optional[Mapping] = None) -> httpx.Response:
+        """
+        发送 GET 请求（带缓存和重试）
+
+        Raises:
+            ApiConnectionError: 重试后仍无法连接
+            ApiTimeoutError: 重试后仍超时
+        """
+        cached = self._cached(path, params)
+        if cached is not None:
+            return cached
+
+        headers = self._conditional_headers(path, params)
+        attempt = 0
+        while True:
+            try:
+                response = self._client.get(path, params=_clean_params(params), headers=headers)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise _translate_error(e, self.base_url + path) from e
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    response = self._store(path, params, response)
+                    if response.status_code == 304 and headers:
+                        # 等待响应期间条目被淘汰，304 没有可复用的正文：不带 If-None-Match 再请求一次
+                        headers = {}
+                        continue
+                    return response
+            time.sleep(self._retry_delay(attempt))
+            attempt += 1
+
+    def get_many(self, requests: Sequence[Request]) -> List[httpx.Response]:
+        """
+        批量 GET：相同请求只发送一次，其余并发执行
+
+        Returns:
+            与输入顺序一致的响应列表
+        """
+        unique, indexes = self._unique(requests)
+        if len(unique) <= 1:
+            responses = [self.get(path, params) for path, params in unique]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(unique), self.max_connections)) as executor:
+                responses = list(executor.map(lambda request: self.get(*request), unique))
+        return [responses[index] for index in indexes]
+
+    def financial_statements(self, symbol: str, query_type: str, frequency: str = "annual") -> httpx.Response:
+        """查询财务三表（/api/v1/financial/statements）"""
+        return self.get(FINANCIAL_STATEMENTS_PATH, self._statements_params(symbol, query_type, frequency))
+
+    def financial_indicators(self, symbol: str, market: str, frequency: str = "annual") -> httpx.Response:
+        """查询财务指标（/api/v1/financial/indicators）"""
+        return self.get(FINANCIAL_INDICATORS_PATH, self._indicators_params(symbol, market, frequency))
+
+    def close(self):
+        """关闭连接池"""
+        self._client.close()
+
+    def __enter__(self) -> "ApiClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncApiClient(_BaseApiClient):
+    """异步 API 客户端（在同一个事件循环内使用）"""
+
+    def __init__(self, base_url: Optional[str] = None, *,
+                 transport: Optional[httpx.AsyncBaseTransport] = None, **options):
+        """
+        Args:
+            base_url: API 服务地址
+            transport: 自定义 httpx 异步传输层（测试时可用 httpx.MockTransport）
+            **options: 见 `_BaseApiClient`
+        """
+        super().__init__(base_url, **options)
+        self._client = httpx.AsyncClient(transport=transport, **self._client_options())
+
+    async def get(self, path: str, params: Optional[Mapping] = None) -> httpx.Response:
+        """发送 GET 请求（带缓存和重试），异常同 `ApiClient.get`"""
+        cached = self._cached(path, params)
+        if cached is not None:
+            return cached
+
+        headers = self._conditional_headers(path, params)
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.get(path, params=_clean_params(params), headers=headers)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise _translate_error(e, self.base_url + path) from e
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    response = self._store(path, params, response)
+                    if response.status_code == 304 and headers:
+                        # 等待响应期间条目被淘汰，304 没有可复用的正文：不带 If-None-Match 再请求一次
+                        headers = {}
+                        continue
+                    return response
+            await asyncio.sleep(self._retry_delay(attempt))
+            attempt += 1
+
+    async def get_many(self, requests: Sequence[Request]) -> List[httpx.Response]:
+        """批量 GET：相同请求只发送一次，其余并发执行（并发数受连接池大小限制）"""
+        unique, indexes = self._unique(requests)
+        responses = await asyncio.gather(*(self.get(path, params) for path, params in unique))
+        return [responses[index] for index in indexes]
+
+    async def financial_statements(self, symbol: str, query_type: str,
+                                   frequency: str = "annual") -> httpx.Response:
+        """查询财务三表（/api/v1/financial/statements）"""
+        return await self.get(FINANCIAL_STATEMENTS_PATH, self._statements_params(symbol, query_type, frequency))
+
+    async def financial_indicators(self, symbol: str, market: str,
+                                   frequency: str = "annual") -> httpx.Response:
+        """查询财务指标（/api/v1/financial/indicators）"""
+        return await self.get(FINANCIAL_INDICATORS_PATH, self._indicators_params(symbol, market, frequency))
+
+    async def aclose(self):
+        """关闭连接池"""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
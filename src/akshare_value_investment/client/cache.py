@@ -0,0 +1,86 @@
+"""
+客户端本地响应缓存
+
+进程内的 TTL + LRU 缓存，按"路径 + 排序后的查询参数"缓存成功（200）响应的正文。
+同一页面的多个分析模块会用相同参数请求同一个端点，开启缓存后只有第一次真正发出请求。
+
+带 ETag 的条目过期后不会立即删除：客户端用 `If-None-Match` 重新验证，服务端返回 304 时
+`refresh()` 重置有效期并复用已缓存的正文，无需重新下载。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Mapping, Optional, Tuple
+
+
+def request_key(path: str, params: Optional[Mapping] = None) -> Tuple:
+    """请求的缓存/去重键（参数顺序无关）"""
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None))
+    return (path, items)
+
+
+class ResponseCache:
+    """线程安全的 TTL + LRU 响应缓存"""
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 256, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl: 缓存有效期（秒）
+            maxsize: 最多缓存的响应数
+            clock: 时钟函数（测试时可替换）
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes, Optional[str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """获取未过期的缓存正文"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._clock() - entry[0] >= self.ttl:
+                if entry is not None and entry[2] is None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, content: bytes, etag: Optional[str] = None):
+        """写入缓存（超出容量时淘汰最久未使用的条目）"""
+        with self._lock:
+            self._entries[key] = (self._clock(), content, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def etag(self, key: Hashable) -> Optional[str]:
+        """条目的 ETag（包括已过期、等待重新验证的条目）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[2] if entry is not None else None
+
+    def refresh(self, key: Hashable) -> Optional[bytes]:
+        """服务端确认未变化（304）：重置条目有效期并返回缓存的正文"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries[key] = (self._clock(), entry[1], entry[2])
+            self._entries.move_to_end(key)
+            self.revalidated += 1
+            return entry[1]
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
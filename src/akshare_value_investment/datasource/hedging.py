@@ -0,0 +1,162 @@
+"""
+多数据源对冲请求（hedged requests）
+
+同一份数据有多个可用上游时，先请求主数据源；主数据源在对冲延迟内没有返回，
+再并发请求备用数据源，取最先成功返回的结果。主数据源不可用（熔断、超时、网络错误）
+时立即切换到备用数据源。
+
+## 🎯 对冲延迟
+
+对冲延迟默认取主数据源历史耗时的 P95（来自 `upstream_latency_seconds` 直方图），
+这样只有约 5% 的慢请求会触发对冲，额外上游压力可控：
+
+- 样本数不足 `min_samples` 时使用 `default_delay`
+- 结果限制在 `[min_delay, max_delay]` 区间内
+- 环境变量 `AKSHARE_HEDGE_DELAY` 可固定对冲延迟（秒）
+- 环境变量 `AKSHARE_HEDGE_ENABLED=0` 关闭对冲（仍保留故障切换）
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .resilience import UPSTREAM_FAILURES
+from ..observability.metrics import REGISTRY
+
+logger = logging.getLogger("investment.hedging")
+
+_latency_histogram = REGISTRY.histogram("upstream_latency_seconds", "上游调用成功耗时（秒）")
+_hedges_counter = REGISTRY.counter("hedged_requests_total", "触发对冲或故障切换的请求次数")
+_wins_counter = REGISTRY.counter("hedged_request_wins_total", "触发对冲后各数据源胜出次数")
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """对冲策略"""
+
+    enabled: bool = True
+    quantile: float = 0.95           # 用主数据源耗时的哪个分位数作为对冲延迟
+    min_samples: int = 20            # 估算分位数所需的最少样本数
+    default_delay: float = 3.0       # 样本不足时的对冲延迟（秒）
+    min_delay: float = 0.2           # 对冲延迟下限（秒）
+    max_delay: float = 10.0          # 对冲延迟上限（秒）
+    fixed_delay: Optional[float] = None  # 固定对冲延迟（秒），设置后忽略直方图
+
+    def delay_for(self, source: str) -> float:
+        """计算数据源的对冲延迟"""
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+
+        if _latency_histogram.count(source=source) < self.min_samples:
+            return self.default_delay
+
+        estimate = _latency_histogram.quantile(self.quantile, source=source)
+        return min(self.max_delay, max(self.min_delay, estimate))
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """根据环境变量获取对冲策略"""
+    enabled = os.environ.get("AKSHARE_HEDGE_ENABLED", "1").lower() not in ("0", "false", "no")
+    fixed_delay = os.environ.get("AKSHARE_HEDGE_DELAY")
+    return HedgePolicy(
+        enabled=enabled,
+        fixed_delay=float(fixed_delay) if fixed_delay else None,
+    )
+
+
+def record_latency(source: str, seconds: float):
+    """记录一次上游成功调用耗时"""
+    _latency_histogram.observe(seconds, source=source)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """获取对冲请求线程池（与容错层线程池分开，避免嵌套提交时互相占满）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("AKSHARE_HEDGE_WORKERS", "16")),
+                thread_name_prefix="akshare-hedge",
+            )
+        return _executor
+
+
+def _timed(source: str, func: Callable[[], Any]) -> Callable[[], Any]:
+    def run():
+        started = time.perf_counter()
+        result = func()
+        record_latency(source, time.perf_counter() - started)
+        return result
+    return run
+
+
+def hedged_call(calls: Sequence[Tuple[str, Callable[[], Any]]],
+                policy: Optional[HedgePolicy] = None) -> Any:
+    """
+    按顺序对冲调用多个数据源
+
+    Args:
+        calls: [(数据源名称, 无参调用)]，第一个为主数据源
+        policy: 对冲策略，默认读取环境变量
+
+    Returns:
+        最先成功返回的结果
+
+    Raises:
+        所有数据源都不可用时抛出最后一个上游异常；
+        数据源返回非上游类异常（如数据解析错误）时直接抛出
+    """
+    if not calls:
+        raise ValueError("至少需要一个数据源")
+
+    policy = policy or get_hedge_policy()
+    pending: List[Tuple[str, Callable[[], Any]]] = list(calls)
+    running: Dict[Future, str] = {}
+    errors: List[BaseException] = []
+    executor = _get_executor()
+    primary = calls[0][0]
+
+    def launch(reason: str):
+        source, func = pending.pop(0)
+        if running or errors:
+            _hedges_counter.inc(primary=primary, source=source, reason=reason)
+            logger.info("对冲请求备用数据源: %s (%s)", source, reason)
+        context = contextvars.copy_context()
+        running[executor.submit(context.run, _timed(source, func))] = source
+
+    launch("primary")
+
+    while running:
+        hedge_delay = policy.delay_for(primary) if policy.enabled and pending else None
+        done, _ = wait(list(running), timeout=hedge_delay, return_when=FIRST_COMPLETED)
+
+        if not done:
+            launch("slow")
+            continue
+
+        for future in done:
+            source = running.pop(future)
+            try:
+                result = future.result()
+            except UPSTREAM_FAILURES as e:
+                errors.append(e)
+                logger.warning("数据源不可用: %s (%s)", source, e)
+                continue
+
+            if len(calls) - len(pending) > 1:
+                _wins_counter.inc(primary=primary, source=source)
+            return result
+
+        if not running and pending:
+            launch("failover")
+
+    raise errors[-1]
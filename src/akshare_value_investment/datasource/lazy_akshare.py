@@ -0,0 +1,119 @@
+"""
+akshare 延迟导入
+
+akshare 在导入时会加载数百个子模块（requests、bs4、curl_cffi 等），耗时从数百毫秒到数秒不等。
+查询器模块如果在顶层 `import akshare`，那么导入 `akshare_value_investment`（包括只用到
+`/health`、StockIdentifier 或只命中缓存的 API 进程）都要付出这份代价。
+
+本模块提供的 `ak` 是一个代理对象：第一次访问其属性（即第一次真正调用上游接口）时才导入
+akshare，之后每次属性访问都转发到 akshare 模块，因此 `patch("akshare.xxx")` 依然生效。
+通过代理调用的 akshare 函数会记录耗时和失败次数（`akshare_call_seconds{function}`、
+`akshare_errors_total{function, error}`），追踪开启时同时记录为 span。
+
+`ak.install_module()` / `ak.use_module()` 把代理指向替代模块（如 `replay.ReplayAkshare`
+回放录制的结果）；设置了 AKSHARE_REPLAY_DIR / AKSHARE_RECORD_DIR 时首次访问自动启用回放或录制。
+
+```python
+from ..lazy_akshare import ak
+
+df = ak.stock_financial_abstract_ths(symbol="600519")  # 此时才导入 akshare
+```
+"""
+
+import functools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+from ..observability.pipeline import AKSHARE_CALL_SECONDS, AKSHARE_ERRORS
+from ..observability.tracing import span
+
+
+def _timed(name: str, func: Callable) -> Callable:
+    """包装 akshare 函数，记录每次调用的耗时和失败"""
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with span(f"akshare.{name}", category="upstream", **kwargs):
+                return func(*args, **kwargs)
+        except Exception as e:
+            AKSHARE_ERRORS.inc(function=name, error=type(e).__name__)
+            raise
+        finally:
+            AKSHARE_CALL_SECONDS.observe(time.perf_counter() - start, function=name)
+
+    return call
+
+
+class _LazyAkshare:
+    """首次访问属性时才导入 akshare 的模块代理"""
+
+    _module_name = "akshare"
+
+    def __init__(self):
+        self._module = None
+        self._override = None
+        self._env_checked = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        if self._override is not None:
+            return self._override
+        if not self._env_checked:
+            with self._lock:
+                if not self._env_checked:
+                    from .replay import module_from_env
+                    self._override = module_from_env()
+                    self._env_checked = True
+            if self._override is not None:
+                return self._override
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    # 用 import 语句而不是 importlib.import_module，导入耗时才会计入 -X importtime
+                    import akshare
+                    self._module = akshare
+        return self._module
+
+    def install_module(self, module: Any) -> Any:
+        """
+        让代理转发到替代模块（None 表示恢复为真实的 akshare）
+
+        Returns:
+            之前安装的替代模块
+        """
+        with self._lock:
+            previous, self._override = self._override, module
+            self._env_checked = True
+        return previous
+
+    @contextmanager
+    def use_module(self, module: Any) -> Iterator[Any]:
+        """在代码块内转发到替代模块"""
+        previous = self.install_module(module)
+        try:
+            yield module
+        finally:
+            self.install_module(previous)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._load(), name)
+        if callable(attr) and not isinstance(attr, type):
+            return _timed(name, attr)
+        return attr
+
+    @property
+    def is_loaded(self) -> bool:
+        """模块是否已被导入（由本代理或其他代码导入）"""
+        return self._module is not None or self._module_name in sys.modules
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self._module_name}' ({state})>"
+
+
+ak = _LazyAkshare()
@@ -21,12 +21,17 @@
 
 ### 市场查询器分类
 
-#### A股市场（同花顺数据源）
+#### A股市场（同花顺数据源，财务三表以东方财富为备用数据源）
 - **AStockIndicatorQueryer**: A股财务指标查询器 - ROE、EPS、净利润等关键指标
 - **AStockBalanceSheetQueryer**: A股资产负债表查询器 - 资产、负债、权益数据
 - **AStockIncomeStatementQueryer**: A股利润表查询器 - 收入、成本、利润数据
 - **AStockCashFlowQueryer**: A股现金流量表查询器 - 经营、投资、筹资现金流
 
+**多数据源对冲**（见 a_stock_sources.py、datasource/hedging.py）:
+- 东方财富报表字段映射为同花顺字段结构，单位统一为亿元
+- 同花顺超过对冲延迟（默认取历史P95耗时）未返回时，并发请求东方财富，取先返回的结果
+- 同花顺不可用（熔断、超时、网络错误）时直接切换到东方财富
+
 **API兼容性特性**:
 - 支持SH/SZ前缀股票代码自动识别和标准化
 - 完全兼容akshare API，支持纯数字和前缀格式
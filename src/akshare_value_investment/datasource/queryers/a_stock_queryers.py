@@ -1,11 +1,15 @@
 """A股数据查询器模块"""
 
-import akshare as ak
+from ..lazy_akshare import ak
 import pandas as pd
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, ClassVar
 
+from .a_stock_sources import EastmoneyAStockStatementSource
 from .base_queryer import BaseDataQueryer
+from ..hedging import hedged_call
+from ..resilience import call_with_resilience
 from ...core.unit_converter import UnitConverter
+from ...observability.pipeline import UNIT_CONVERSION, stage_timer
 
 
 class AStockIndicatorQueryer(BaseDataQueryer):
@@ -13,26 +17,41 @@ class AStockIndicatorQueryer(BaseDataQueryer):
 
     cache_query_type = 'a_stock_indicators'
     cache_date_field = '报告期'
+    data_source = 'ths'
 
     def _query_raw(self, symbol: str) -> pd.DataFrame:
         """查询A股财务指标原始数据"""
         return ak.stock_financial_abstract_ths(symbol=symbol)
 
 
-class AStockBalanceSheetQueryer(BaseDataQueryer):
-    """A股资产负债表查询器"""
+class AStockStatementQueryerBase(BaseDataQueryer):
+    """
+    A股财务三表查询器基类
+
+    主数据源为同花顺，东方财富作为备用数据源：同花顺超过对冲延迟（默认取历史P95耗时）
+    仍未返回时并发请求东方财富，取先返回的结果；同花顺不可用时直接切换到东方财富。
+    """
 
-    cache_query_type = 'a_stock_balance'
     cache_date_field = '报告期'
+    data_source = 'ths'
+    statement_type: ClassVar[str] = ''  # balance / profit / cashflow
 
-    def _query_raw(self, symbol: str) -> pd.DataFrame:
-        """查询A股资产负债表原始数据"""
-        return ak.stock_financial_debt_ths(symbol=symbol)
+    alternate_source = EastmoneyAStockStatementSource()
+
+    def _fetch_raw(self, symbol: str) -> pd.DataFrame:
+        """同花顺为主、东方财富为备，对冲获取报表原始数据"""
+        alternate = self.alternate_source
+        return hedged_call([
+            (self.data_source,
+             lambda: call_with_resilience(self.data_source, self._query_raw, symbol)),
+            (alternate.name,
+             lambda: call_with_resilience(alternate.name, alternate.fetch, self.statement_type, symbol)),
+        ])
 
     def query(self, symbol: str, start_date: Optional[str] = None,
               end_date: Optional[str] = None) -> Dict[str, Any]:
         """
-        查询A股资产负债表数据（带单位标准化）
+        查询A股财务报表数据（带单位标准化）
 
         Returns:
             Dict[str, Any]: 包含data（DataFrame）和unit_map（单位映射）的字典
@@ -41,7 +60,8 @@ class AStockBalanceSheetQueryer(BaseDataQueryer):
         df = super().query(symbol, start_date, end_date)
 
         # 单位标准化
-        normalized_df, unit_map = UnitConverter.convert_dataframe(df)
+        with stage_timer(UNIT_CONVERSION, **self.metric_labels):
+            normalized_df, unit_map = UnitConverter.convert_dataframe(df)
 
         return {
             "data": normalized_df,
@@ -49,61 +69,34 @@ class AStockBalanceSheetQueryer(BaseDataQueryer):
         }
 
 
-class AStockIncomeStatementQueryer(BaseDataQueryer):
-    """A股利润表查询器"""
+class AStockBalanceSheetQueryer(AStockStatementQueryerBase):
+    """A股资产负债表查询器"""
 
-    cache_query_type = 'a_stock_profit'
-    cache_date_field = '报告期'
+    cache_query_type = 'a_stock_balance'
+    statement_type = 'balance'
 
     def _query_raw(self, symbol: str) -> pd.DataFrame:
-        """查询A股利润表原始数据"""
-        return ak.stock_financial_benefit_ths(symbol=symbol)
+        """查询A股资产负债表原始数据"""
+        return ak.stock_financial_debt_ths(symbol=symbol)
 
-    def query(self, symbol: str, start_date: Optional[str] = None,
-              end_date: Optional[str] = None) -> Dict[str, Any]:
-        """
-        查询A股利润表数据（带单位标准化）
 
-        Returns:
-            Dict[str, Any]: 包含data（DataFrame）和unit_map（单位映射）的字典
-        """
-        # 调用父类query方法获取原始DataFrame
-        df = super().query(symbol, start_date, end_date)
+class AStockIncomeStatementQueryer(AStockStatementQueryerBase):
+    """A股利润表查询器"""
 
-        # 单位标准化
-        normalized_df, unit_map = UnitConverter.convert_dataframe(df)
+    cache_query_type = 'a_stock_profit'
+    statement_type = 'profit'
 
-        return {
-            "data": normalized_df,
-            "unit_map": unit_map
-        }
+    def _query_raw(self, symbol: str) -> pd.DataFrame:
+        """查询A股利润表原始数据"""
+        return ak.stock_financial_benefit_ths(symbol=symbol)
 
 
-class AStockCashFlowQueryer(BaseDataQueryer):
+class AStockCashFlowQueryer(AStockStatementQueryerBase):
     """A股现金流量表查询器"""
 
     cache_query_type = 'a_stock_cashflow'
-    cache_date_field = '报告期'
+    statement_type = 'cashflow'
 
     def _query_raw(self, symbol: str) -> pd.DataFrame:
         """查询A股现金流量表原始数据"""
         return ak.stock_financial_cash_ths(symbol=symbol)
-
-    def query(self, symbol: str, start_date: Optional[str] = None,
-              end_date: Optional[str] = None) -> Dict[str, Any]:
-        """
-        查询A股现金流量表数据（带单位标准化）
-
-        Returns:
-            Dict[str, Any]: 包含data（DataFrame）和unit_map（单位映射）的字典
-        """
-        # 调用父类query方法获取原始DataFrame
-        df = super().query(symbol, start_date, end_date)
-
-        # 单位标准化
-        normalized_df, unit_map = UnitConverter.convert_dataframe(df)
-
-        return {
-            "data": normalized_df,
-            "unit_map": unit_map
-        }
@@ -0,0 +1,276 @@
+"""
+A股财务三表备用数据源
+
+A股财务三表的主数据源是同花顺（`stock_financial_*_ths`），本模块提供东方财富
+（`stock_*_sheet_by_report_em`）作为备用数据源，并把东方财富的英文字段映射到
+同花顺的中文字段，保证两个数据源返回相同结构的数据：
+
+- 字段名：东方财富字段 → 同花顺字段（同花顺"报表核心指标"中带 * 的字段同时填充）
+- 报告期：`REPORT_DATE` → `报告期`（YYYY-MM-DD 字符串），按报告期倒序
+- 金额单位：元 → 亿元（与 UnitConverter 对同花顺 "592.96亿" 的解析结果一致），每股收益不换算
+- 东方财富有、同花顺没有的字段直接丢弃；映射表中东方财富未返回的字段填充 0，
+  结果的列固定为 `ths_statement_columns()`
+
+同花顺的结果保持原样（不按映射表裁剪），只有东方财富的结果被映射到同花顺字段。
+"""
+
+from ..lazy_akshare import ak
+import pandas as pd
+from typing import Dict, List
+
+# 东方财富字段 → 同花顺字段（一个东方财富字段可对应多个同花顺字段）
+EASTMONEY_BALANCE_FIELD_MAP: Dict[str, List[str]] = {
+    "MONETARYFUNDS": ["货币资金"],
+    "LEND_FUND": ["拆出资金"],
+    "TRADE_FINASSET_NOTFVTPL": ["交易性金融资产"],
+    "NOTE_ACCOUNTS_RECE": ["应收票据及应收账款"],
+    "NOTE_RECE": ["其中：应收票据"],
+    "ACCOUNTS_RECE": ["应收账款"],
+    "PREPAYMENT": ["预付款项"],
+    "TOTAL_OTHER_RECE": ["其他应收款合计"],
+    "INTEREST_RECE": ["其中：应收利息"],
+    "OTHER_RECE": ["其他应收款"],
+    "INVENTORY": ["存货"],
+    "NONCURRENT_ASSET_1YEAR": ["一年内到期的非流动资产"],
+    "OTHER_CURRENT_ASSET": ["其他流动资产"],
+    "TOTAL_CURRENT_ASSETS": ["流动资产合计"],
+    "AVAILABLE_SALE_FINASSET": ["可供出售金融资产"],
+    "HOLD_MATURITY_INVEST": ["持有至到期投资"],
+    "LONG_EQUITY_INVEST": ["长期股权投资"],
+    "OTHER_NONCURRENT_FINASSET": ["其他非流动金融资产"],
+    "INVEST_REALESTATE": ["投资性房地产"],
+    "FIXED_ASSET": ["固定资产合计"],
+    "CIP": ["在建工程合计"],
+    "INTANGIBLE_ASSET": ["无形资产"],
+    "GOODWILL": ["商誉"],
+    "LONG_PREPAID_EXPENSE": ["长期待摊费用"],
+    "DEFER_TAX_ASSET": ["递延所得税资产"],
+    "OTHER_NONCURRENT_ASSET": ["其他非流动资产"],
+    "TOTAL_NONCURRENT_ASSETS": ["非流动资产合计"],
+    "TOTAL_ASSETS": ["*资产合计", "资产合计"],
+    "SHORT_LOAN": ["短期借款"],
+    "NOTE_ACCOUNTS_PAYABLE": ["应付票据及应付账款"],
+    "ACCOUNTS_PAYABLE": ["应付账款"],
+    "ADVANCE_RECEIVABLES": ["预收款项"],
+    "CONTRACT_LIAB": ["合同负债"],
+    "STAFF_SALARY_PAYABLE": ["应付职工薪酬"],
+    "TAX_PAYABLE": ["应交税费"],
+    "TOTAL_OTHER_PAYABLE": ["其他应付款合计"],
+    "INTEREST_PAYABLE": ["其中：应付利息"],
+    "DIVIDEND_PAYABLE": ["应付股利"],
+    "OTHER_PAYABLE": ["其他应付款"],
+    "NONCURRENT_LIAB_1YEAR": ["一年内到期的非流动负债"],
+    "OTHER_CURRENT_LIAB": ["其他流动负债"],
+    "TOTAL_CURRENT_LIAB": ["流动负债合计"],
+    "LONG_LOAN": ["长期借款"],
+    "BOND_PAYABLE": ["应付债券"],
+    "LONG_PAYABLE": ["长期应付款合计"],
+    "DEFER_TAX_LIAB": ["递延所得税负债"],
+    "TOTAL_NONCURRENT_LIAB": ["非流动负债合计"],
+    "TOTAL_LIABILITIES": ["*负债合计", "负债合计"],
+    "SHARE_CAPITAL": ["实收资本（或股本）"],
+    "CAPITAL_RESERVE": ["资本公积"],
+    "TREASURY_SHARES": ["减：库存股"],
+    "OTHER_COMPRE_INCOME": ["其他综合收益"],
+    "SURPLUS_RESERVE": ["盈余公积"],
+    "UNASSIGN_RPOFIT": ["未分配利润"],
+    "TOTAL_PARENT_EQUITY": ["*归属于母公司所有者权益合计", "归属于母公司所有者权益合计"],
+    "MINORITY_EQUITY": ["少数股东权益"],
+    "TOTAL_EQUITY": ["*所有者权益（或股东权益）合计", "所有者权益（或股东权益）合计"],
+    "TOTAL_LIAB_EQUITY": ["负债和所有者权益（或股东权益）合计"],
+}
+
+EASTMONEY_PROFIT_FIELD_MAP: Dict[str, List[str]] = {
+    "TOTAL_OPERATE_INCOME": ["*营业总收入", "一、营业总收入"],
+    "OPERATE_INCOME": ["其中：营业收入"],
+    "TOTAL_OPERATE_COST": ["*营业总成本", "二、营业总成本"],
+    "OPERATE_COST": ["其中：营业成本"],
+    "OPERATE_TAX_ADD": ["营业税金及附加"],
+    "SALE_EXPENSE": ["销售费用"],
+    "MANAGE_EXPENSE": ["管理费用"],
+    "RESEARCH_EXPENSE": ["研发费用"],
+    "FINANCE_EXPENSE": ["财务费用"],
+    "FE_INTEREST_EXPENSE": ["其中：利息费用"],
+    "FE_INTEREST_INCOME": ["利息收入"],
+    "ASSET_IMPAIRMENT_LOSS": ["资产减值损失"],
+    "CREDIT_IMPAIRMENT_LOSS": ["信用减值损失"],
+    "FAIRVALUE_CHANGE_INCOME": ["加：公允价值变动收益"],
+    "INVEST_INCOME": ["投资收益"],
+    "ASSET_DISPOSAL_INCOME": ["资产处置收益"],
+    "OTHER_INCOME": ["其他收益"],
+    "OPERATE_PROFIT": ["三、营业利润"],
+    "NONBUSINESS_INCOME": ["加：营业外收入"],
+    "NONBUSINESS_EXPENSE": ["减：营业外支出"],
+    "TOTAL_PROFIT": ["四、利润总额"],
+    "INCOME_TAX": ["减：所得税费用"],
+    "NETPROFIT": ["*净利润", "五、净利润"],
+    "CONTINUED_NETPROFIT": ["（一）持续经营净利润"],
+    "PARENT_NETPROFIT": ["*归属于母公司所有者的净利润", "归属于母公司所有者的净利润"],
+    "MINORITY_INTEREST": ["少数股东损益"],
+    "DEDUCT_PARENT_NETPROFIT": ["*扣除非经常性损益后的净利润", "扣除非经常性损益后的净利润"],
+    "BASIC_EPS": ["（一）基本每股收益"],
+    "DILUTED_EPS": ["（二）稀释每股收益"],
+    "OTHER_COMPRE_INCOME": ["七、其他综合收益"],
+    "PARENT_OCI": ["归属母公司所有者的其他综合收益"],
+    "TOTAL_COMPRE_INCOME": ["八、综合收益总额"],
+    "PARENT_TCI": ["归属于母公司股东的综合收益总额"],
+    "MINORITY_TCI": ["归属于少数股东的综合收益总额"],
+}
+
+EASTMONEY_CASHFLOW_FIELD_MAP: Dict[str, List[str]] = {
+    "SALES_SERVICES": ["销售商品、提供劳务收到的现金"],
+    "RECEIVE_TAX_REFUND": ["收到的税费与返还"],
+    "RECEIVE_OTHER_OPERATE": ["收到其他与经营活动有关的现金"],
+    "TOTAL_OPERATE_INFLOW": ["经营活动现金流入小计"],
+    "BUY_SERVICES": ["购买商品、接受劳务支付的现金"],
+    "PAY_STAFF_CASH": ["支付给职工以及为职工支付的现金"],
+    "PAY_ALL_TAX": ["支付的各项税费"],
+    "PAY_OTHER_OPERATE": ["支付其他与经营活动有关的现金"],
+    "TOTAL_OPERATE_OUTFLOW": ["经营活动现金流出小计"],
+    "NETCASH_OPERATE": ["*经营活动产生的现金流量净额", "经营活动产生的现金流量净额"],
+    "WITHDRAW_INVEST": ["收回投资收到的现金"],
+    "RECEIVE_INVEST_INCOME": ["取得投资收益收到的现金"],
+    "DISPOSAL_LONG_ASSET": ["处置固定资产、无形资产和其他长期资产收回的现金净额"],
+    "RECEIVE_OTHER_INVEST": ["收到其他与投资活动有关的现金"],
+    "TOTAL_INVEST_INFLOW": ["投资活动现金流入小计"],
+    "CONSTRUCT_LONG_ASSET": ["购建固定资产、无形资产和其他长期资产支付的现金"],
+    "INVEST_PAY_CASH": ["投资支付的现金"],
+    "PAY_OTHER_INVEST": ["支付其他与投资活动有关的现金"],
+    "TOTAL_INVEST_OUTFLOW": ["投资活动现金流出小计"],
+    "NETCASH_INVEST": ["*投资活动产生的现金流量净额", "投资活动产生的现金流量净额"],
+    "ACCEPT_INVEST_CASH": ["吸收投资收到的现金"],
+    "SUBSIDIARY_ACCEPT_INVEST": ["其中：子公司吸收少数股东投资收到的现金"],
+    "RECEIVE_LOAN_CASH": ["取得借款收到的现金"],
+    "RECEIVE_OTHER_FINANCE": ["收到其他与筹资活动有关的现金"],
+    "TOTAL_FINANCE_INFLOW": ["筹资活动现金流入小计"],
+    "PAY_DEBT_CASH": ["偿还债务支付的现金"],
+    "ASSIGN_DIVIDEND_PORFIT": ["分配股利、利润或偿付利息支付的现金"],
+    "SUBSIDIARY_PAY_DIVIDEND": ["其中：子公司支付给少数股东的股利、利润"],
+    "PAY_OTHER_FINANCE": ["支付其他与筹资活动有关的现金"],
+    "TOTAL_FINANCE_OUTFLOW": ["筹资活动现金流出小计"],
+    "NETCASH_FINANCE": ["*筹资活动产生的现金流量净额", "筹资活动产生的现金流量净额"],
+    "RATE_CHANGE_EFFECT": ["四、汇率变动对现金及现金等价物的影响"],
+    "CCE_ADD": ["*现金及现金等价物净增加额", "五、现金及现金等价物净增加额"],
+    "BEGIN_CCE": ["加：期初现金及现金等价物余额"],
+    "END_CCE": ["*期末现金及现金等价物余额", "六、期末现金及现金等价物余额"],
+    "NETPROFIT": ["净利润"],
+    "ASSET_IMPAIRMENT": ["加：资产减值准备"],
+    "FA_IR_DEPR": ["固定资产折旧、油气资产折耗、生产性生物资产折旧"],
+    "IA_AMORTIZE": ["无形资产摊销"],
+    "LPE_AMORTIZE": ["长期待摊费用摊销"],
+    "DISPOSAL_LONGASSET_LOSS": ["处置固定资产、无形资产和其他长期资产的损失"],
+    "FA_SCRAP_LOSS": ["固定资产报废损失"],
+    "FAIRVALUE_CHANGE_LOSS": ["公允价值变动损失"],
+    "FINANCE_EXPENSE": ["财务费用"],
+    "INVEST_LOSS": ["投资损失"],
+    "DT_ASSET_REDUCE": ["递延所得税资产减少"],
+    "DT_LIAB_ADD": ["递延所得税负债增加"],
+    "INVENTORY_REDUCE": ["存货的减少"],
+    "OPERATE_RECE_REDUCE": ["经营性应收项目的减少"],
+    "OPERATE_PAYABLE_ADD": ["经营性应付项目的增加"],
+    "OTHER": ["其他"],
+    "NETCASH_OPERATENOTE": ["间接法-经营活动产生的现金流量净额"],
+    "END_CASH": ["现金的期末余额"],
+    "BEGIN_CASH": ["减：现金的期初余额"],
+    "END_CASH_EQUIVALENTS": ["加：现金等价物的期末余额"],
+    "BEGIN_CASH_EQUIVALENTS": ["减：现金等价物的期初余额"],
+    "CCE_ADDNOTE": ["间接法-现金及现金等价物净增加额"],
+}
+
+# 报表类型 → (东方财富接口名, 字段映射)
+EASTMONEY_STATEMENTS = {
+    "balance": ("stock_balance_sheet_by_report_em", EASTMONEY_BALANCE_FIELD_MAP),
+    "profit": ("stock_profit_sheet_by_report_em", EASTMONEY_PROFIT_FIELD_MAP),
+    "cashflow": ("stock_cash_flow_sheet_by_report_em", EASTMONEY_CASHFLOW_FIELD_MAP),
+}
+
+# 不做单位换算的字段（每股指标）
+PER_SHARE_FIELDS = {"BASIC_EPS", "DILUTED_EPS"}
+
+# 元 → 亿元
+YUAN_PER_YI = 1e8
+
+
+def ths_statement_columns(statement_type: str) -> List[str]:
+    """报表的统一列（报告期 + 映射表中的同花顺字段，按映射表顺序）"""
+    _, field_map = EASTMONEY_STATEMENTS[statement_type]
+    columns = ["报告期"]
+    for ths_fields in field_map.values():
+        columns.extend(field for field in ths_fields if field not in columns)
+    return columns
+
+
+def to_eastmoney_symbol(symbol: str) -> str:
+    """
+    转换为东方财富带市场前缀的代码
+
+    Examples:
+        >>> to_eastmoney_symbol("600519")
+        'SH600519'
+        >>> to_eastmoney_symbol("000001")
+        'SZ000001'
+        >>> to_eastmoney_symbol("830799")
+        'BJ830799'
+    """
+    code = symbol.strip().upper()
+    if code[:2] in ("SH", "SZ", "BJ"):
+        return code
+    if code.startswith(("6", "9")):
+        return f"SH{code}"
+    if code.startswith(("4", "8")):
+        return f"BJ{code}"
+    return f"SZ{code}"
+
+
+def normalize_eastmoney_statement(raw_data: pd.DataFrame, statement_type: str) -> pd.DataFrame:
+    """
+    把东方财富报表数据转换为同花顺报表结构
+
+    Args:
+        raw_data: 东方财富接口返回的原始数据
+        statement_type: 报表类型（balance/profit/cashflow）
+
+    Returns:
+        同花顺字段结构的DataFrame，金额单位为亿元
+    """
+    if raw_data is None or raw_data.empty or "REPORT_DATE" not in raw_data.columns:
+        return pd.DataFrame()
+
+    _, field_map = EASTMONEY_STATEMENTS[statement_type]
+
+    columns = {"报告期": pd.to_datetime(raw_data["REPORT_DATE"]).dt.strftime("%Y-%m-%d")}
+    for em_field, ths_fields in field_map.items():
+        # 缺失值（含东方财富未返回的字段）按 0 处理，与同花顺用 false 表示缺失、UnitConverter 转为 0 的行为一致
+        if em_field not in raw_data.columns:
+            values = pd.Series(0.0, index=raw_data.index)
+        else:
+            values = pd.to_numeric(raw_data[em_field], errors="coerce").fillna(0.0)
+        if em_field not in PER_SHARE_FIELDS:
+            values = values / YUAN_PER_YI
+        for ths_field in ths_fields:
+            columns[ths_field] = values
+
+    result = pd.DataFrame(columns)
+    return result.sort_values("报告期", ascending=False).reset_index(drop=True)
+
+
+class EastmoneyAStockStatementSource:
+    """东方财富A股财务三表数据源"""
+
+    name = "eastmoney"
+
+    def fetch(self, statement_type: str, symbol: str) -> pd.DataFrame:
+        """
+        查询并标准化东方财富报表数据
+
+        Args:
+            statement_type: 报表类型（balance/profit/cashflow）
+            symbol: A股代码（纯数字或带市场前缀）
+
+        Returns:
+            同花顺字段结构的DataFrame
+        """
+        api_name, _ = EASTMONEY_STATEMENTS[statement_type]
+        # 调用时再解析 ak 属性，便于测试中 patch('akshare.xxx')
+        raw_data = getattr(ak, api_name)(symbol=to_eastmoney_symbol(symbol))
+        return normalize_eastmoney_statement(raw_data, statement_type)
@@ -1,38 +1,89 @@
-from typing import Optional, ClassVar, Tuple
+from typing import Dict, Optional, ClassVar, Tuple
+import logging
 import pandas as pd
 import os
 
 from .interfaces import IDataQueryer
+from ..resilience import UPSTREAM_FAILURES, call_with_resilience
 from ...core.models import MarketType
 from ...core.stock_identifier import StockIdentifier
+from ...observability.metrics import REGISTRY
+from ...observability.pipeline import (
+    CACHE_LOOKUP, SYMBOL_IDENTIFICATION, UPSTREAM, market_label, record_cache_lookup, stage_timer,
+)
+from ...observability.request_timing import (
+    SOURCE_DISK, SOURCE_STALE, SOURCE_UPSTREAM, record_cache_source,
+)
+
+logger = logging.getLogger("investment.queryer")
+
+# 缓存有效期：30天
+CACHE_EXPIRE_SECONDS = 30 * 24 * 3600
+
+# 过期缓存（stale）键前缀：上游不可用时回退使用
+STALE_KEY_PREFIX = "stale:"
+
+# 过期缓存有效期：4倍缓存有效期（120天），不再查询的股票最终会被清理，缓存目录不会无限增长
+STALE_EXPIRE_SECONDS = 4 * CACHE_EXPIRE_SECONDS
+
+_stale_served_counter = REGISTRY.counter("stale_cache_served_total", "上游不可用时返回过期缓存的次数")
+
+
+def resolve_cache(cache=None):
+    """返回注入的缓存实例，没有注入时创建默认的 diskcache 实例"""
+    if cache is not None:
+        return cache
+
+    import diskcache
+    # 优先使用环境变量指定的缓存目录（用于测试），否则使用默认目录
+    cache_dir = os.environ.get('AKSHARE_CACHE_DIR', '.cache/diskcache')
+    return diskcache.Cache(cache_dir)
+
+
+def store_in_cache(cache_instance, cache_key: str, data: pd.DataFrame):
+    """写入缓存（同时写入有效期更长的 stale 副本），空数据不缓存"""
+    if data is not None and not data.empty:
+        cache_instance.set(cache_key, data, expire=CACHE_EXPIRE_SECONDS)
+        cache_instance.set(STALE_KEY_PREFIX + cache_key, data, expire=STALE_EXPIRE_SECONDS)
 
 
 def create_cached_query_method(cache_date_field: str, cache_query_type: str, cache=None):
+    labels = {"market": market_label(cache_query_type), "query_type": cache_query_type}
+
     def cached_query(self, symbol: str, start_date: Optional[str] = None,
                      end_date: Optional[str] = None) -> pd.DataFrame:
         cache_key = f"{cache_query_type}:{symbol}"
 
         # 使用注入的缓存实例，如果没有则创建默认实例
-        if cache is not None:
-            cache_instance = cache
-        else:
-            import diskcache
-            # 优先使用环境变量指定的缓存目录（用于测试），否则使用默认目录
-            cache_dir = os.environ.get('AKSHARE_CACHE_DIR', '.cache/diskcache')
-            cache_instance = diskcache.Cache(cache_dir)
+        cache_instance = resolve_cache(cache)
 
-        cached_data = cache_instance.get(cache_key)
+        with stage_timer(CACHE_LOOKUP, **labels):
+            cached_data = cache_instance.get(cache_key)
+        hit = isinstance(cached_data, pd.DataFrame)
+        record_cache_lookup(hit, **labels)
 
         if cached_data is not None:
-            if isinstance(cached_data, pd.DataFrame):
+            if hit:
+                record_cache_source(cache_query_type, SOURCE_DISK)
                 return _filter_data_by_date_range(cached_data, start_date, end_date, cache_date_field)
             else:
                 cache_instance.delete(cache_key)
 
-        raw_data = self._query_raw(symbol)
-
-        if raw_data is not None and not raw_data.empty:
-            cache_instance.set(cache_key, raw_data, expire=30*24*3600)
+        try:
+            with stage_timer(UPSTREAM, **labels):
+                raw_data = self._fetch_raw(symbol)
+        except UPSTREAM_FAILURES as e:
+            # 上游不可用（熔断、超时或重试耗尽）：有过期缓存则回退使用
+            stale_data = cache_instance.get(STALE_KEY_PREFIX + cache_key)
+            if not isinstance(stale_data, pd.DataFrame):
+                raise
+            logger.warning("上游不可用，返回过期缓存: %s (%s)", cache_key, e)
+            _stale_served_counter.inc(query_type=cache_query_type)
+            record_cache_source(cache_query_type, SOURCE_STALE)
+            return _filter_data_by_date_range(stale_data, start_date, end_date, cache_date_field)
+
+        record_cache_source(cache_query_type, SOURCE_UPSTREAM)
+        store_in_cache(cache_instance, cache_key, raw_data)
 
         return _filter_data_by_date_range(raw_data, start_date, end_date, cache_date_field)
 
@@ -97,6 +148,7 @@ class BaseDataQueryer(IDataQueryer):
 
     cache_date_field: ClassVar[str] = 'date'
     cache_query_type: ClassVar[str] = 'indicators'
+    data_source: ClassVar[str] = 'akshare'  # 上游数据源名称，决定超时/重试/熔断策略
 
     def __init__(self, stock_identifier: Optional[StockIdentifier] = None, cache=None):
         try:
@@ -114,6 +166,11 @@ class BaseDataQueryer(IDataQueryer):
         except Exception as e:
             raise TypeError(f"初始化查询器失败，请检查缓存配置: {e}")
 
+    @property
+    def metric_labels(self) -> Dict[str, str]:
+        """流水线指标的标签（市场、查询类型）"""
+        return {"market": market_label(self.cache_query_type), "query_type": self.cache_query_type}
+
     def _format_symbol_for_api(self, symbol: str) -> str:
         try:
             if not symbol or not isinstance(symbol, str):
@@ -148,8 +205,13 @@ class BaseDataQueryer(IDataQueryer):
 
     def query(self, symbol: str, start_date: Optional[str] = None,
               end_date: Optional[str] = None) -> pd.DataFrame:
-        formatted_symbol = self._format_symbol_for_api(symbol)
+        with stage_timer(SYMBOL_IDENTIFICATION, **self.metric_labels):
+            formatted_symbol = self._format_symbol_for_api(symbol)
         return self._query_with_dates(formatted_symbol, start_date, end_date)
 
+    def _fetch_raw(self, symbol: str) -> pd.DataFrame:
+        """通过容错层（超时、重试、熔断）调用 _query_raw"""
+        return call_with_resilience(self.data_source, self._query_raw, symbol)
+
     def _query_raw(self, symbol: str) -> pd.DataFrame:
         raise NotImplementedError("子类必须实现 _query_raw 方法以提供具体的数据获取逻辑")
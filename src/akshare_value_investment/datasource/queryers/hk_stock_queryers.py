@@ -1,10 +1,13 @@
 """港股数据查询器模块"""
 
-import akshare as ak
+from ..lazy_akshare import ak
 import pandas as pd
 from typing import Optional, Dict, Any, Tuple
 
 from .base_queryer import BaseDataQueryer
+from .pivot import pivot_first
+from .statement_group import StatementGroupMixin
+from ...observability.pipeline import UNIT_CONVERSION, stage_timer
 
 
 class HKStockIndicatorQueryer(BaseDataQueryer):
@@ -12,6 +15,7 @@ class HKStockIndicatorQueryer(BaseDataQueryer):
 
     cache_date_field = 'date'
     cache_query_type = 'hk_indicators'
+    data_source = 'eastmoney'
 
     def _query_raw(self, symbol: str) -> pd.DataFrame:
         """查询港股财务指标原始数据"""
@@ -28,10 +32,20 @@ class HKStockIndicatorQueryer(BaseDataQueryer):
         return raw_data
 
 
-class HKStockStatementQueryerBase(BaseDataQueryer):
-    """港股财务报表查询器基类"""
+class HKStockStatementQueryerBase(StatementGroupMixin, BaseDataQueryer):
+    """港股财务报表查询器基类
+
+    三张报表查询器协同获取：任一报表缓存未命中时并发获取三张报表并写入各自缓存
+    """
 
     cache_date_field = 'date'  # 报表查询器的日期字段是转换后生成的date
+    data_source = 'eastmoney'
+
+    STATEMENT_GROUP = {
+        'hk_balance_sheet': '资产负债表',
+        'hk_income_statement': '利润表',
+        'hk_cash_flow': '现金流量表',
+    }
 
     # 港股财务数据单位转换比例：从元转换为亿元（除以1亿）
     UNIT_CONVERSION_FACTOR = 1e8
@@ -59,7 +73,8 @@ class HKStockStatementQueryerBase(BaseDataQueryer):
             }
 
         # 单位标准化：将元转换为亿元
-        normalized_df, unit_map = self._convert_units(df)
+        with stage_timer(UNIT_CONVERSION, **self.metric_labels):
+            normalized_df, unit_map = self._convert_units(df)
 
         return {
             "data": normalized_df,
@@ -105,12 +120,23 @@ class HKStockStatementQueryerBase(BaseDataQueryer):
         return result_df, unit_map
 
     def _query_raw(self, symbol: str) -> pd.DataFrame:
-        """查询港股财务报表原始数据
+        """查询港股财务报表原始数据"""
+        return self._query_statement_raw(symbol, self._get_statement_name())
+
+    def _query_statement_raw(self, symbol: str, statement_name: str) -> pd.DataFrame:
+        """查询指定港股财务报表原始数据
 
         使用年度数据以获取完整的年度财务数据
         """
-        df = ak.stock_financial_hk_report_em(stock=symbol, symbol=self._get_statement_name(), indicator="年度")
+        df = ak.stock_financial_hk_report_em(stock=symbol, symbol=statement_name, indicator="年度")
+        return self._convert_statement(df)
+
+    async def _fetch_statements_async(self, client, symbol: str, statement_names) -> Dict[str, pd.DataFrame]:
+        """通过原生异步客户端获取同组港股报表窄表（报告期列表只请求一次）"""
+        return await client.hk_reports(symbol, statement_names, indicator="年度")
 
+    def _convert_statement(self, df: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """港股报表窄表转宽表"""
         if df is None or df.empty:
             return self._create_empty_wide_format()
 
@@ -129,19 +155,19 @@ class HKStockStatementQueryerBase(BaseDataQueryer):
             raise ValueError(f"港股财务报表数据缺少必要列: {missing_columns}")
 
         try:
-            # 转换日期列
+            # 转换日期列（复制后再修改，避免改动调用方的数据）
+            df = df.copy()
             df['date'] = pd.to_datetime(df['REPORT_DATE'])
 
-            # 使用pivot_table进行宽表转换，避免数据丢失
-            wide_df = df.pivot_table(
+            # 宽表转换：重复科目取第一个值，空值用0填充（与 pivot_table(aggfunc='first') 结果一致）
+            wide_df = pivot_first(
+                df,
                 index=['date', 'SECURITY_CODE', 'SECURITY_NAME_ABBR'],
                 columns='STD_ITEM_NAME',
                 values='AMOUNT',
-                aggfunc='first',  # 使用第一个值，避免重复数据
-                fill_value=0  # 空值用0填充
-            ).reset_index()
+                fill_value=0
+            )
 
-            wide_df.columns.name = None
             # 添加REPORT_DATE字段（从date转换回字符串格式）
             wide_df['REPORT_DATE'] = wide_df['date'].dt.strftime('%Y-%m-%d')
 
@@ -226,17 +252,18 @@ class HKStockStatementQueryer(HKStockStatementQueryerBase):
             raise ValueError(f"港股财务三表数据缺少必要列: {missing_columns}")
 
         try:
-            # 转换日期列
+            # 转换日期列（复制后再修改，避免改动调用方的数据）
+            df = df.copy()
             df['date'] = pd.to_datetime(df['REPORT_DATE'])
 
-            # 使用pivot_table进行宽表转换，避免数据丢失
-            wide_df = df.pivot_table(
+            # 宽表转换：重复科目取第一个值，空值用0填充（与 pivot_table(aggfunc='first') 结果一致）
+            wide_df = pivot_first(
+                df,
                 index=['date', 'SECURITY_CODE', 'SECURITY_NAME_ABBR'],
                 columns='STD_ITEM_NAME',
                 values='AMOUNT',
-                aggfunc='first',  # 使用第一个值，避免重复数据
-                fill_value=0  # 空值用0填充
-            ).reset_index()
+                fill_value=0
+            )
 
             # 添加REPORT_DATE字段（从date转换回字符串格式）
             wide_df['REPORT_DATE'] = wide_df['date'].dt.strftime('%Y-%m-%d')
@@ -0,0 +1,137 @@
+"""
+窄表 → 宽表转换引擎
+
+港股、美股财务报表接口返回窄表（每行一个 日期 × 科目 × 金额），查询器需要转成
+每个报告期一行、每个科目一列的宽表。`pivot_table(aggfunc='first')` 要经过
+groupby → agg → unstack 多个阶段，是冷启动路径上最耗时的步骤之一。
+
+`pivot_first()` 用分类编码（factorize）把行键、列键映射为整数坐标，再用 NumPy
+一次性散射到预分配的二维数组中，结果与下式完全一致（行列顺序、dtype、填充值）：
+
+```python
+df.pivot_table(index=index, columns=columns, values=values,
+               aggfunc='first', fill_value=fill_value).reset_index()
+```
+
+## 🎯 语义
+
+- 行键或列键为空的记录丢弃（等同 groupby 的 dropna）
+- 重复的 (行键, 列键)：取原始顺序中第一个非空值（first-wins，确定性）
+- 所有值都为空的行、列不出现在结果中
+- 行按行键升序，列按列键升序
+- 值列不是数值类型时回退到 `pivot_table`
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def pivot_first(df: pd.DataFrame, index: Sequence[str], columns: str, values: str,
+                fill_value=0) -> pd.DataFrame:
+    """
+    窄表转宽表（first-wins），结果与 pivot_table(aggfunc='first').reset_index() 一致
+
+    Args:
+        df: 窄表数据（不会被修改）
+        index: 行键字段列表
+        columns: 列键字段（取值成为宽表的列名）
+        values: 值字段
+        fill_value: 缺失单元格的填充值
+
+    Returns:
+        宽表DataFrame，columns.name 为 None
+    """
+    index = list(index)
+    value_series = df[values]
+
+    if not _supports_fast_path(value_series, fill_value):
+        return _pivot_table_fallback(df, index, columns, values, fill_value)
+
+    # 1. 丢弃行键、列键或值为空的记录（pivot_table 中这些记录不会参与结果）
+    valid = value_series.notna().to_numpy()
+    for key in index + [columns]:
+        valid &= df[key].notna().to_numpy()
+
+    if not valid.any():
+        return _pivot_table_fallback(df, index, columns, values, fill_value)
+
+    positions = np.flatnonzero(valid)
+
+    # 2. 行键、列键编码为整数坐标（sort=True 保证与 groupby 的排序一致）
+    level_codes: List[np.ndarray] = []
+    level_sizes: List[int] = []
+    for key in index:
+        codes, uniques = pd.factorize(df[key].to_numpy()[positions], sort=True)
+        level_codes.append(codes.astype(np.int64))
+        level_sizes.append(len(uniques))
+
+    row_codes = _combine_codes(level_codes, level_sizes)
+    row_ids, row_uniques = pd.factorize(row_codes, sort=True)
+    col_ids, col_labels = pd.factorize(df[columns].to_numpy()[positions], sort=True)
+    n_rows, n_cols = len(row_uniques), len(col_labels)
+
+    # 3. first-wins：每个单元格取原始顺序中第一次出现的记录
+    cell_ids = row_ids.astype(np.int64) * n_cols + col_ids
+    cells, first_occurrence = np.unique(cell_ids, return_index=True)
+
+    # 4. 散射到预分配的二维数组
+    raw_values = value_series.to_numpy()[positions]
+    matrix = np.full((n_rows, n_cols), fill_value, dtype=raw_values.dtype)
+    matrix.flat[cells] = raw_values[first_occurrence]
+
+    # 5. 行键列：取每个宽表行在原始数据中的第一条记录，保留原始dtype
+    _, row_first = np.unique(row_ids, return_index=True)
+    result = {}
+    for key in index:
+        result[key] = df[key].iloc[positions[row_first]].reset_index(drop=True)
+
+    index_frame = pd.DataFrame(result)
+    value_frame = pd.DataFrame(matrix, columns=pd.Index(col_labels, dtype=object))
+    wide_df = pd.concat([index_frame, value_frame], axis=1)
+    wide_df.columns = pd.Index(list(index) + list(col_labels), dtype=object)
+    return wide_df
+
+
+def _supports_fast_path(value_series: pd.Series, fill_value) -> bool:
+    """快速路径只处理 NumPy 数值类型的值列和数值填充值"""
+    dtype = value_series.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in "iuf":
+        return False
+    if not np.isscalar(fill_value) or isinstance(fill_value, (str, bytes)):
+        return False
+    # 整数列填充浮点值时 pivot_table 会升级dtype，交给 pivot_table 处理
+    return dtype.kind == "f" or float(fill_value).is_integer()
+
+
+def _combine_codes(level_codes: List[np.ndarray], level_sizes: List[int]) -> np.ndarray:
+    """把多级行键编码合并为一个按字典序排列的整数编码"""
+    if len(level_codes) == 1:
+        return level_codes[0]
+
+    total = 1
+    for size in level_sizes:
+        total *= max(size, 1)
+
+    if total < np.iinfo(np.int64).max:
+        return np.ravel_multi_index(level_codes, [max(size, 1) for size in level_sizes])
+
+    # 组合空间过大时退回到逐级排序编码
+    frame = pd.DataFrame({i: codes for i, codes in enumerate(level_codes)})
+    order = frame.drop_duplicates().sort_values(list(frame.columns))
+    lookup = {tuple(row): i for i, row in enumerate(order.itertuples(index=False))}
+    return np.array([lookup[tuple(row)] for row in frame.itertuples(index=False)], dtype=np.int64)
+
+
+def _pivot_table_fallback(df: pd.DataFrame, index: List[str], columns: str, values: str,
+                          fill_value) -> pd.DataFrame:
+    wide_df = df.pivot_table(
+        index=index,
+        columns=columns,
+        values=values,
+        aggfunc='first',
+        fill_value=fill_value
+    ).reset_index()
+    wide_df.columns.name = None
+    return wide_df
@@ -0,0 +1,208 @@
+"""
+财务三表协同获取（fetch-once）
+
+港股、美股的资产负债表、利润表、现金流量表由三个查询器分别缓存。冷启动时，
+`/statements` 依次查询三个查询器，会串行触发三次上游请求。
+
+协同获取模式下，任一报表查询器缓存未命中时，一次性并发获取同组三张报表，
+并把兄弟报表写入各自的缓存键；同一时间对同组报表的其他查询会加入这次获取
+（single-flight），而不是各自再请求上游。
+
+⚠️ 东方财富的港股/美股报表没有三表合一的接口（`stock_financial_hk_report_em`
+每次只返回一张报表），因此"一次获取"仍是三次上游请求，但它们并发发出，
+且只发生在一次查询里：冷启动 `/statements` 的上游往返从三轮串行降为一轮并发。
+
+环境变量 `AKSHARE_STATEMENT_GROUP_FETCH=0` 关闭协同获取，恢复逐表获取。
+`AKSHARE_EASTMONEY_ASYNC=1` 时改用原生异步客户端（`eastmoney_async`）获取同组报表：
+共享连接池，且报告期列表等前置查询只请求一次。
+"""
+
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, ClassVar, Dict, Hashable, Optional
+
+import pandas as pd
+
+from .base_queryer import resolve_cache, store_in_cache
+from ..eastmoney_async import async_fetch_enabled, run_sync
+from ..resilience import call_with_resilience
+from ...observability.metrics import REGISTRY
+from ...observability.tracing import span
+
+logger = logging.getLogger("investment.queryer")
+
+_group_fetch_counter = REGISTRY.counter("statement_group_fetches_total", "财务三表协同获取次数")
+_group_join_counter = REGISTRY.counter("statement_group_joins_total", "加入进行中协同获取的查询次数")
+
+
+class SingleFlight:
+    """
+    相同键的并发调用合并为一次执行
+
+    第一个调用者执行函数，执行期间到达的其他调用者等待并共享结果（或异常）。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        执行或加入对 key 的调用
+
+        Returns:
+            函数返回值；调用失败时所有等待者都会收到同一个异常
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._flights[key] = flight
+
+        if not leader:
+            _group_join_counter.inc()
+            return flight.result()
+
+        try:
+            flight.set_result(func())
+        except BaseException as e:
+            flight.set_exception(e)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+        return flight.result()
+
+
+_flights = SingleFlight()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """获取三表并发获取线程池（按需创建）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("AKSHARE_STATEMENT_GROUP_WORKERS", "12")),
+                thread_name_prefix="statement-group",
+            )
+        return _executor
+
+
+def group_fetch_enabled() -> bool:
+    """是否启用财务三表协同获取"""
+    return os.environ.get("AKSHARE_STATEMENT_GROUP_FETCH", "1").lower() not in ("0", "false", "no")
+
+
+class StatementGroupMixin:
+    """
+    财务三表协同获取混入类
+
+    子类需要：
+    - 设置 `STATEMENT_GROUP`：{cache_query_type: 报表名称}，列出同组三张报表
+    - 实现 `_query_statement_raw(symbol, statement_name)`：获取单张报表并转换为宽表
+    - 实现 `_fetch_statements_async(client, symbol, statement_names)` 和
+      `_convert_statement(df)`：异步获取同组窄表、窄表转宽表（原生异步模式使用）
+
+    不在 `STATEMENT_GROUP` 中的查询器（如三表合一查询器）保持逐表获取。
+    """
+
+    STATEMENT_GROUP: ClassVar[Dict[str, str]] = {}
+
+    def _fetch_raw(self, symbol: str) -> pd.DataFrame:
+        if self.cache_query_type not in self.STATEMENT_GROUP or not group_fetch_enabled():
+            return super()._fetch_raw(symbol)
+
+        group_key = (tuple(self.STATEMENT_GROUP), symbol)
+        results = _flights.do(group_key, lambda: self._fetch_statement_group(symbol))
+
+        result = results.get(self.cache_query_type)
+        if result is None:
+            # 发起协同获取时本报表已有缓存，因而未被获取（并发竞争下才会出现）
+            return super()._fetch_raw(symbol)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def _fetch_statement_group(self, symbol: str) -> Dict[str, Any]:
+        """并发获取同组全部报表，并把兄弟报表写入缓存"""
+        with span("statement_group.fetch", category="fanout", symbol=symbol,
+                  group=self.STATEMENT_GROUP[self.cache_query_type]):
+            return self._fetch_and_store_statement_group(symbol)
+
+    def _fetch_and_store_statement_group(self, symbol: str) -> Dict[str, Any]:
+        _group_fetch_counter.inc(group=self.STATEMENT_GROUP[self.cache_query_type])
+        cache_instance = resolve_cache(self._cache)
+
+        pending = {}
+        for query_type, statement_name in self.STATEMENT_GROUP.items():
+            # 兄弟报表已有缓存时不重复获取
+            if (query_type != self.cache_query_type
+                    and isinstance(cache_instance.get(f"{query_type}:{symbol}"), pd.DataFrame)):
+                continue
+            pending[query_type] = statement_name
+
+        if async_fetch_enabled():
+            results = self._fetch_statement_group_async(symbol, pending)
+        else:
+            results = self._fetch_statement_group_threaded(symbol, pending)
+
+        # 当前查询器的结果由缓存查询流程写入，这里只写兄弟报表
+        for query_type, data in results.items():
+            if query_type == self.cache_query_type:
+                continue
+            if isinstance(data, BaseException):
+                logger.warning("协同获取报表失败: %s:%s (%s)", query_type, symbol, data)
+                continue
+            store_in_cache(cache_instance, f"{query_type}:{symbol}", data)
+
+        return results
+
+    def _fetch_statement_group_threaded(self, symbol: str, pending: Dict[str, str]) -> Dict[str, Any]:
+        """在线程池中逐表并发调用 akshare"""
+        executor = _get_executor()
+        futures = {
+            query_type: executor.submit(
+                contextvars.copy_context().run, self._fetch_group_member, symbol, statement_name,
+            )
+            for query_type, statement_name in pending.items()
+        }
+
+        results: Dict[str, Any] = {}
+        for query_type, future in futures.items():
+            try:
+                results[query_type] = future.result()
+            except Exception as e:
+                results[query_type] = e
+        return results
+
+    def _fetch_group_member(self, symbol: str, statement_name: str) -> pd.DataFrame:
+        """在线程池中获取同组的一张报表"""
+        with span(f"statement_group.{statement_name}", category="fanout"):
+            return call_with_resilience(self.data_source, self._query_statement_raw, symbol, statement_name)
+
+    def _fetch_statement_group_async(self, symbol: str, pending: Dict[str, str]) -> Dict[str, Any]:
+        """通过原生异步客户端一次获取同组窄表，再逐表转换为宽表"""
+        statement_names = list(pending.values())
+        try:
+            frames = call_with_resilience(
+                self.data_source, run_sync,
+                lambda client: self._fetch_statements_async(client, symbol, statement_names),
+            )
+        except Exception as e:
+            return {query_type: e for query_type in pending}
+
+        results: Dict[str, Any] = {}
+        for query_type, statement_name in pending.items():
+            try:
+                results[query_type] = self._convert_statement(frames[statement_name])
+            except Exception as e:
+                results[query_type] = e
+        return results
@@ -1,16 +1,20 @@
 """美股数据查询器模块"""
 
-import akshare as ak
+from ..lazy_akshare import ak
 import pandas as pd
 from typing import Optional, Dict, Any, Tuple
 
 from .base_queryer import BaseDataQueryer
+from .pivot import pivot_first
+from .statement_group import StatementGroupMixin
+from ...observability.pipeline import UNIT_CONVERSION, stage_timer
 
 
 class USStockIndicatorQueryer(BaseDataQueryer):
     """美股财务指标查询器"""
     cache_query_type = 'us_indicators'
     cache_date_field = 'date'
+    data_source = 'eastmoney'
 
     def _query_raw(self, symbol: str) -> pd.DataFrame:
         """查询美股财务指标原始数据
@@ -22,10 +26,20 @@ class USStockIndicatorQueryer(BaseDataQueryer):
         return ak.stock_financial_us_analysis_indicator_em(symbol=symbol, indicator="单季报")
 
 
-class USStockStatementQueryerBase(BaseDataQueryer):
-    """美股财务报表查询器基类"""
+class USStockStatementQueryerBase(StatementGroupMixin, BaseDataQueryer):
+    """美股财务报表查询器基类
+
+    三张报表查询器协同获取：任一报表缓存未命中时并发获取三张报表并写入各自缓存
+    """
 
     cache_date_field = 'date'  # 报表查询器的日期字段是转换后生成的date
+    data_source = 'eastmoney'
+
+    STATEMENT_GROUP = {
+        'us_balance_sheet': '资产负债表',
+        'us_income_statement': '综合损益表',
+        'us_cash_flow': '现金流量表',
+    }
 
     # 美股财务数据单位转换比例：从美元转换为亿美元（除以1亿）
     UNIT_CONVERSION_FACTOR = 1e8
@@ -53,7 +67,8 @@ class USStockStatementQueryerBase(BaseDataQueryer):
             }
 
         # 单位标准化：将美元转换为亿美元
-        normalized_df, unit_map = self._convert_units(df)
+        with stage_timer(UNIT_CONVERSION, **self.metric_labels):
+            normalized_df, unit_map = self._convert_units(df)
 
         return {
             "data": normalized_df,
@@ -99,15 +114,27 @@ class USStockStatementQueryerBase(BaseDataQueryer):
         return result_df, unit_map
 
     def _query_raw(self, symbol: str) -> pd.DataFrame:
-        """查询美股财务报表原始数据
+        """查询美股财务报表原始数据"""
+        return self._query_statement_raw(symbol, self._get_statement_name())
+
+    def _query_statement_raw(self, symbol: str, statement_name: str) -> pd.DataFrame:
+        """查询指定美股财务报表原始数据
 
         美股财务三表使用年报数据，akshare已返回纯年报数据
         """
         df = ak.stock_financial_us_report_em(
             stock=symbol,
-            symbol=self._get_statement_name(),
+            symbol=statement_name,
             indicator="年报"
         )
+        return self._convert_statement(df)
+
+    async def _fetch_statements_async(self, client, symbol: str, statement_names) -> Dict[str, pd.DataFrame]:
+        """通过原生异步客户端获取同组美股报表窄表（SECUCODE 只查询一次）"""
+        return await client.us_reports(symbol, statement_names, indicator="年报")
+
+    def _convert_statement(self, df: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """美股报表窄表转宽表"""
         if df is None or df.empty:
             return self._create_empty_wide_format()
 
@@ -146,18 +173,20 @@ class USStockStatementQueryerBase(BaseDataQueryer):
 
     def _convert_narrow_to_wide_format(self, df: pd.DataFrame) -> pd.DataFrame:
         """将窄表格式转换为宽表格式"""
+        # 复制后再修改，避免改动调用方的数据（协同获取时多个线程可能共享同一份数据）
+        df = df.copy()
         df["REPORT_DATE"] = pd.to_datetime(df["REPORT_DATE"], errors="coerce")
         df = df.sort_values("REPORT_DATE", ascending=False)
         df = df.dropna(subset=["ITEM_NAME", "AMOUNT"])
         df["AMOUNT"] = pd.to_numeric(df["AMOUNT"], errors="coerce")
-        wide_df = df.pivot_table(
+        # 宽表转换：重复科目取第一个值，空值用0填充（与 pivot_table(aggfunc='first') 结果一致）
+        wide_df = pivot_first(
+            df,
             index=['REPORT_DATE', 'SECURITY_CODE', 'SECURITY_NAME_ABBR'],
             columns='ITEM_NAME',
             values='AMOUNT',
-            fill_value=0,
-            aggfunc='first'
-        ).reset_index()
-        wide_df.columns.name = None
+            fill_value=0
+        )
         # 确保date字段是字符串格式，符合API期望
         wide_df['date'] = pd.to_datetime(wide_df['REPORT_DATE']).dt.strftime('%Y-%m-%d')
 
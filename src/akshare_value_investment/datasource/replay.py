@@ -0,0 +1,316 @@
+"""
+akshare 调用录制与回放
+
+基准测试、压测和集成测试如果依赖同花顺、东方财富的实时接口，结果会被网络延迟和上游
+波动淹没。本模块把 `ak.*` 调用的结果录制到本地夹具目录，之后由一个假的 akshare 模块回放，
+整个查询流水线（缓存、容错、单位转换、频率处理）照常运行，但不访问网络。
+
+## 🎯 两种模式
+
+- **录制**: `RecordingAkshare` 包装真实的 akshare，每次调用的返回值（或非网络类异常）按
+  "函数名 + 参数" 写入 `FixtureStore`
+- **回放**: `ReplayAkshare` 从 `FixtureStore` 读取结果，可配置延迟和错误注入；
+  没有录制过的调用抛出 `FixtureNotFoundError`
+
+两者都通过 `lazy_akshare.ak` 代理生效（`ak.use_module(module)` 或 `ak.install_module(module)`），查询器无需改动。
+
+## 🔧 环境变量
+
+设置后，进程第一次访问 akshare 时自动启用对应模式（用于 API 进程、压测等无法改代码的场景）：
+
+- `AKSHARE_RECORD_DIR`: 录制到该目录
+- `AKSHARE_REPLAY_DIR`: 从该目录回放
+- `AKSHARE_REPLAY_LATENCY`: 回放延迟（秒），`0.05` 为固定延迟，`0.02,0.08` 为区间内均匀随机
+- `AKSHARE_REPLAY_ERROR_RATE`: 回放时注入 `InjectedUpstreamError` 的概率（0~1）
+
+```python
+store = FixtureStore("fixtures/akshare")
+with ak.use_module(RecordingAkshare(store)):
+    service.query_financial_statements(...)   # 访问网络并录制
+
+with ak.use_module(ReplayAkshare(store, latency=(0.02, 0.08), error_rate=0.05, seed=1)):
+    service.query_financial_statements(...)   # 不访问网络
+```
+
+夹具文件是 pickle 格式（保留 DataFrame 的 dtype，回放结果与录制时完全一致），
+只应加载自己录制的夹具目录。
+
+压测需要大量股票代码时，可用 `FixtureStore.add_aliases({"600001": "600519", ...})` 让
+别名代码回放已录制股票的结果（别名写入夹具目录的 aliases.json，不复制夹具文件）。
+"""
+
+import builtins
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+logger = logging.getLogger("investment.replay")
+
+Latency = Union[float, Tuple[float, float]]
+
+
+class FixtureNotFoundError(LookupError):
+    """回放时没有找到对应调用的录制结果"""
+
+
+class InjectedUpstreamError(ConnectionError):
+    """回放时注入的上游错误（ConnectionError 属于可重试异常，会触发重试和熔断逻辑）"""
+
+
+class RecordedUpstreamError(Exception):
+    """录制时上游抛出的非内置异常（回放时以该类型重新抛出，消息包含原异常类型）"""
+
+
+def fixture_key(function: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """调用的夹具键：函数名和参数的稳定哈希"""
+    payload = json.dumps([function, list(args), sorted(kwargs.items())], ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _copy(value: Any) -> Any:
+    """返回结果副本（调用方可能原地修改 DataFrame）"""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+class FixtureStore:
+    """
+    夹具目录
+
+    每次调用一个文件：`<目录>/<函数名>/<键>.pkl`，内容为
+    `{"function", "args", "kwargs", "recorded_at", "result" 或 "error"}`。
+    """
+
+    ALIASES_FILE = "aliases.json"
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self._cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._aliases: Optional[Dict[str, str]] = None
+
+    @property
+    def aliases(self) -> Dict[str, str]:
+        """参数别名（别名代码 → 已录制的代码）"""
+        if self._aliases is None:
+            path = self.directory / self.ALIASES_FILE
+            self._aliases = json.loads(path.read_text(encoding="utf-8")) if path.is_file() else {}
+        return self._aliases
+
+    def add_aliases(self, aliases: Dict[str, str]):
+        """添加参数别名并写入 aliases.json（回放时别名参数按目标参数查找夹具）"""
+        merged = {**self.aliases, **aliases}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / self.ALIASES_FILE).write_text(json.dumps(merged, ensure_ascii=False), encoding="utf-8")
+        self._aliases = merged
+
+    def _resolve(self, args: tuple, kwargs: Dict[str, Any]) -> Tuple[tuple, Dict[str, Any]]:
+        aliases = self.aliases
+        if not aliases:
+            return args, kwargs
+
+        def resolve(value):
+            return aliases.get(value, value) if isinstance(value, str) else value
+
+        return tuple(resolve(a) for a in args), {k: resolve(v) for k, v in kwargs.items()}
+
+    def _path(self, function: str, key: str) -> Path:
+        return self.directory / function / f"{key}.pkl"
+
+    def save(self, function: str, args: tuple, kwargs: Dict[str, Any], result: Any = None,
+             error: Optional[BaseException] = None) -> Path:
+        """写入一次调用的结果或异常（先写临时文件再替换，并发录制时不会读到半个文件）"""
+        entry = {"function": function, "args": list(args), "kwargs": dict(kwargs),
+                 "recorded_at": datetime.now().isoformat(timespec="seconds")}
+        if error is not None:
+            entry["error"] = {"type": type(error).__name__, "message": str(error)}
+        else:
+            entry["result"] = result
+
+        key = fixture_key(function, args, kwargs)
+        path = self._path(function, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        with self._lock:
+            self._cache[(function, key)] = entry
+        return path
+
+    def load(self, function: str, args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        读取一次调用的录制结果（读过的条目缓存在内存中）
+
+        Raises:
+            FixtureNotFoundError: 没有录制过该调用
+        """
+        args, kwargs = self._resolve(args, kwargs)
+        key = fixture_key(function, args, kwargs)
+        with self._lock:
+            entry = self._cache.get((function, key))
+        if entry is None:
+            path = self._path(function, key)
+            if not path.is_file():
+                raise FixtureNotFoundError(f"没有录制过该调用: {function}(args={list(args)}, kwargs={kwargs})")
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            with self._lock:
+                self._cache[(function, key)] = entry
+        return entry
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """遍历所有录制的调用"""
+        for path in sorted(self.directory.glob("*/*.pkl")):
+            with open(path, "rb") as f:
+                yield pickle.load(f)
+
+    def functions(self) -> List[str]:
+        """录制过的函数名"""
+        return sorted(p.name for p in self.directory.iterdir() if p.is_dir()) if self.directory.exists() else []
+
+
+class RecordingAkshare:
+    """录制模式：转发到真实 akshare，并把结果写入夹具目录"""
+
+    def __init__(self, store: FixtureStore, module: Optional[ModuleType] = None):
+        """
+        Args:
+            store: 夹具目录
+            module: 被录制的模块，默认首次调用时导入 akshare
+        """
+        self.store = store
+        self._module = module
+
+    def _target(self) -> ModuleType:
+        if self._module is None:
+            import akshare
+            self._module = akshare
+        return self._module
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target(), name)
+        if not callable(attr) or isinstance(attr, type):
+            return attr
+
+        def record(*args, **kwargs):
+            try:
+                result = attr(*args, **kwargs)
+            except (OSError, TimeoutError):
+                # 网络类异常是暂时性的，不录制（否则回放时会固定复现一次偶发故障）
+                raise
+            except Exception as e:
+                self.store.save(name, args, kwargs, error=e)
+                raise
+            self.store.save(name, args, kwargs, result=result)
+            return _copy(result)
+
+        record.__name__ = name
+        return record
+
+
+class ReplayAkshare:
+    """回放模式：从夹具目录返回录制的结果，不访问网络"""
+
+    def __init__(self, store: FixtureStore, latency: Latency = 0.0, error_rate: float = 0.0,
+                 error_functions: Optional[List[str]] = None, seed: Optional[int] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            store: 夹具目录
+            latency: 每次调用的延迟（秒），固定值或 (最小, 最大) 区间
+            error_rate: 注入 InjectedUpstreamError 的概率（0~1）
+            error_functions: 只对这些函数注入错误，None 表示所有函数
+            seed: 随机种子（延迟抖动和错误注入可复现）
+            sleep: 延迟函数（测试中可替换）
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError("错误注入概率必须在0到1之间")
+        self.store = store
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_functions = set(error_functions) if error_functions is not None else None
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, tuple):
+            low, high = self.latency
+            with self._lock:
+                return self._random.uniform(low, high)
+        return self.latency
+
+    def _inject_error(self, name: str) -> bool:
+        if not self.error_rate or (self.error_functions is not None and name not in self.error_functions):
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def __getattr__(self, name: str) -> Callable:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def replay(*args, **kwargs):
+            with self._lock:
+                self.calls += 1
+            delay = self._delay()
+            if delay > 0:
+                self._sleep(delay)
+            if self._inject_error(name):
+                raise InjectedUpstreamError(f"注入的上游错误: {name}")
+
+            entry = self.store.load(name, args, kwargs)
+            if "error" in entry:
+                raise _rebuild_error(entry["error"])
+            return _copy(entry["result"])
+
+        replay.__name__ = name
+        return replay
+
+
+def _rebuild_error(error: Dict[str, str]) -> Exception:
+    """按录制的异常类型重建异常（内置异常保持原类型，其他类型用 RecordedUpstreamError）"""
+    error_type = getattr(builtins, error["type"], None)
+    if isinstance(error_type, type) and issubclass(error_type, Exception):
+        return error_type(error["message"])
+    return RecordedUpstreamError(f"{error['type']}: {error['message']}")
+
+
+def parse_latency(value: str) -> Latency:
+    """解析延迟配置：`0.05` 或 `0.02,0.08`"""
+    parts = [float(part) for part in value.split(",") if part.strip()]
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    return parts[0] if parts else 0.0
+
+
+def module_from_env() -> Optional[Union[RecordingAkshare, ReplayAkshare]]:
+    """按环境变量 AKSHARE_REPLAY_DIR / AKSHARE_RECORD_DIR 创建回放或录制模块，都未设置时返回 None"""
+    replay_dir = os.environ.get("AKSHARE_REPLAY_DIR")
+    if replay_dir:
+        logger.info("akshare 回放模式: %s", replay_dir)
+        return ReplayAkshare(
+            FixtureStore(replay_dir),
+            latency=parse_latency(os.environ.get("AKSHARE_REPLAY_LATENCY", "0")),
+            error_rate=float(os.environ.get("AKSHARE_REPLAY_ERROR_RATE", "0")),
+        )
+    record_dir = os.environ.get("AKSHARE_RECORD_DIR")
+    if record_dir:
+        logger.info("akshare 录制模式: %s", record_dir)
+        return RecordingAkshare(FixtureStore(record_dir))
+    return None
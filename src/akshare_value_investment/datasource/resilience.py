@@ -0,0 +1,400 @@
+"""
+上游数据源容错层
+
+为 akshare 上游调用提供按数据源配置的超时、有界重试和熔断器，
+避免上游挂起时阻塞请求线程，也避免在上游故障期间反复冲击上游。
+
+## 🎯 核心功能
+
+1. **调用超时**: 上游调用在独立线程中执行，超时后立即返回 `UpstreamTimeoutError`
+   （Python 线程无法被强制终止：超时的调用会继续占用线程直到自行返回，
+   数量见 `upstream_abandoned_calls` 指标；超时从提交到线程池开始计算，包含排队时间）
+2. **有界重试**: 仅对网络类异常重试，采用指数退避 + 全抖动（full jitter）
+3. **熔断器**: 连续失败达到阈值后熔断，熔断期间快速失败（由缓存层回退到过期缓存）
+4. **状态可观测**: 熔断器状态变化写入日志，并导出到进程内指标注册表
+
+## 📊 熔断器状态
+
+```
+CLOSED --连续失败≥阈值--> OPEN --恢复等待结束--> HALF_OPEN
+HALF_OPEN --探测成功--> CLOSED
+HALF_OPEN --探测失败--> OPEN
+```
+
+## 🔧 配置
+
+- 各数据源默认策略见 `DEFAULT_POLICIES`（ths: 同花顺，eastmoney: 东方财富）
+- 环境变量 `AKSHARE_UPSTREAM_TIMEOUT`、`AKSHARE_UPSTREAM_MAX_RETRIES` 覆盖所有数据源的超时和重试次数
+- `configure_policy()` 可在运行时调整单个数据源的策略
+"""
+
+import contextvars
+import dataclasses
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from ..observability.metrics import REGISTRY
+from ..observability.tracing import span
+
+logger = logging.getLogger("investment.resilience")
+
+
+class UpstreamError(Exception):
+    """上游数据源不可用错误基类"""
+
+
+class UpstreamTimeoutError(UpstreamError, TimeoutError):
+    """上游调用超时"""
+
+
+class CircuitOpenError(UpstreamError):
+    """熔断器打开，拒绝调用上游"""
+
+
+# 可重试的异常：网络连接错误、超时等（requests.RequestException 继承自 OSError）
+RETRYABLE_EXCEPTIONS = (OSError, TimeoutError)
+
+# 视为"上游不可用"的异常，缓存层据此回退到过期缓存
+UPSTREAM_FAILURES = (UpstreamError,) + RETRYABLE_EXCEPTIONS
+
+
+@dataclass(frozen=True)
+class DataSourcePolicy:
+    """数据源调用策略"""
+
+    timeout: Optional[float] = 20.0      # 单次调用超时（秒），None表示不限制
+    max_retries: int = 2                 # 首次调用失败后的最大重试次数
+    backoff_base: float = 0.5            # 退避基数（秒）
+    backoff_max: float = 8.0             # 单次退避上限（秒）
+    failure_threshold: int = 5           # 连续失败多少次后熔断
+    recovery_timeout: float = 30.0       # 熔断后多久允许探测（秒）
+
+    def backoff_delay(self, attempt: int) -> float:
+        """计算第 attempt 次重试前的等待时间（指数退避 + 全抖动）"""
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+
+
+DEFAULT_POLICIES: Dict[str, DataSourcePolicy] = {
+    "ths": DataSourcePolicy(timeout=20.0),
+    "eastmoney": DataSourcePolicy(timeout=15.0),
+}
+
+_policy_overrides: Dict[str, DataSourcePolicy] = {}
+
+
+def get_policy(source: str) -> DataSourcePolicy:
+    """
+    获取数据源调用策略
+
+    优先级：configure_policy() 设置 > 环境变量 > DEFAULT_POLICIES > 默认值
+    """
+    if source in _policy_overrides:
+        return _policy_overrides[source]
+
+    policy = DEFAULT_POLICIES.get(source, DataSourcePolicy())
+
+    env_timeout = os.environ.get("AKSHARE_UPSTREAM_TIMEOUT")
+    if env_timeout:
+        timeout = float(env_timeout)
+        policy = dataclasses.replace(policy, timeout=timeout if timeout > 0 else None)
+
+    env_retries = os.environ.get("AKSHARE_UPSTREAM_MAX_RETRIES")
+    if env_retries:
+        policy = dataclasses.replace(policy, max_retries=max(0, int(env_retries)))
+
+    return policy
+
+
+def configure_policy(source: str, **overrides) -> DataSourcePolicy:
+    """
+    调整单个数据源的调用策略
+
+    Args:
+        source: 数据源名称
+        **overrides: DataSourcePolicy 字段覆盖值
+
+    Returns:
+        生效后的策略
+    """
+    base = DEFAULT_POLICIES.get(source, DataSourcePolicy())
+    policy = dataclasses.replace(base, **overrides)
+    _policy_overrides[source] = policy
+
+    # 同步更新已创建熔断器的阈值
+    breaker = _breakers.get(source)
+    if breaker is not None:
+        breaker.failure_threshold = policy.failure_threshold
+        breaker.recovery_timeout = policy.recovery_timeout
+    return policy
+
+
+# ==================== 熔断器 ====================
+
+class CircuitState(Enum):
+    """熔断器状态"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# 状态在仪表指标中的数值表示
+_STATE_GAUGE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+_state_gauge = REGISTRY.gauge(
+    "circuit_breaker_state", "熔断器状态（0=closed, 1=half_open, 2=open）"
+)
+_transitions_counter = REGISTRY.counter(
+    "circuit_breaker_transitions_total", "熔断器状态变化次数"
+)
+_rejections_counter = REGISTRY.counter(
+    "circuit_breaker_rejections_total", "熔断期间被拒绝的上游调用次数"
+)
+_calls_counter = REGISTRY.counter("upstream_calls_total", "上游调用次数（按结果）")
+_retries_counter = REGISTRY.counter("upstream_retries_total", "上游调用重试次数")
+_timeouts_counter = REGISTRY.counter("upstream_timeouts_total", "上游调用超时次数")
+_abandoned_gauge = REGISTRY.gauge(
+    "upstream_abandoned_calls", "已超时返回但仍占用上游线程池线程的调用数"
+)
+
+
+class CircuitBreaker:
+    """
+    数据源熔断器
+
+    线程安全。HALF_OPEN 状态下只放行一个探测请求，其余请求继续快速失败。
+    """
+
+    def __init__(self, source: str, failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.source = source
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        _state_gauge.set(_STATE_GAUGE_VALUES[self._state], source=source)
+
+    @property
+    def state(self) -> CircuitState:
+        """当前状态（OPEN 超过恢复时间后自动转为 HALF_OPEN）"""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    @property
+    def consecutive_failures(self) -> int:
+        """当前连续失败次数"""
+        with self._lock:
+            return self._consecutive_failures
+
+    def allow_request(self) -> bool:
+        """判断是否允许调用上游"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            _rejections_counter.inc(source=self.source)
+            return False
+
+    def record_success(self):
+        """记录一次成功调用"""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            if self._state != CircuitState.CLOSED:
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self):
+        """记录一次失败调用"""
+        with self._lock:
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            if self._state == CircuitState.HALF_OPEN:
+                self._open()
+            elif (self._state == CircuitState.CLOSED
+                  and self._consecutive_failures >= self.failure_threshold):
+                self._open()
+
+    def reset(self):
+        """强制恢复到 CLOSED 状态"""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            if self._state != CircuitState.CLOSED:
+                self._transition(CircuitState.CLOSED)
+
+    def _open(self):
+        self._opened_at = self._clock()
+        self._transition(CircuitState.OPEN)
+
+    def _maybe_half_open(self):
+        if (self._state == CircuitState.OPEN
+                and self._clock() - self._opened_at >= self.recovery_timeout):
+            self._transition(CircuitState.HALF_OPEN)
+
+    def _transition(self, new_state: CircuitState):
+        old_state = self._state
+        self._state = new_state
+
+        log = logger.warning if new_state == CircuitState.OPEN else logger.info
+        log("熔断器状态变化: source=%s %s -> %s (连续失败 %d 次)",
+            self.source, old_state.value, new_state.value, self._consecutive_failures)
+
+        _state_gauge.set(_STATE_GAUGE_VALUES[new_state], source=self.source)
+        _transitions_counter.inc(
+            source=self.source, from_state=old_state.value, to_state=new_state.value
+        )
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(source: str) -> CircuitBreaker:
+    """获取数据源对应的进程级熔断器（按需创建）"""
+    with _breakers_lock:
+        breaker = _breakers.get(source)
+        if breaker is None:
+            policy = get_policy(source)
+            breaker = CircuitBreaker(
+                source,
+                failure_threshold=policy.failure_threshold,
+                recovery_timeout=policy.recovery_timeout,
+            )
+            _breakers[source] = breaker
+        return breaker
+
+
+def circuit_breaker_states() -> Dict[str, str]:
+    """返回所有已创建熔断器的当前状态"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.source: breaker.state.value for breaker in breakers}
+
+
+def reset_circuit_breakers():
+    """重置所有熔断器和策略覆盖（主要用于测试）"""
+    with _breakers_lock:
+        _breakers.clear()
+    _policy_overrides.clear()
+
+
+# ==================== 超时执行 ====================
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """获取上游调用线程池（按需创建）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("AKSHARE_UPSTREAM_WORKERS", "16")),
+                thread_name_prefix="akshare-upstream",
+            )
+        return _executor
+
+
+def _call_with_timeout(source: str, timeout: Optional[float], func: Callable[..., Any],
+                       *args, **kwargs) -> Any:
+    """
+    在线程池中执行调用，超时后抛出 UpstreamTimeoutError
+
+    注意：
+    - 超时包含在线程池中排队的时间。线程池饱和时调用可能在开始执行前就超时，
+      此时任务被取消，不会再调用上游
+    - 已开始执行的调用无法被取消（Python 线程不能被强制终止），超时后线程会一直被占用到
+      上游调用自行返回。这类调用计入 `upstream_abandoned_calls`，返回后扣减；
+      该值持续接近 `AKSHARE_UPSTREAM_WORKERS` 说明上游挂起的调用正在耗尽线程池
+    """
+    if not timeout:
+        return func(*args, **kwargs)
+
+    context = contextvars.copy_context()
+    future = _get_executor().submit(context.run, func, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        if not future.done():
+            if not future.cancel():
+                # 调用已在执行，只能放弃等待，线程在调用返回后才释放
+                _abandoned_gauge.inc(source=source)
+                future.add_done_callback(lambda _: _abandoned_gauge.dec(source=source))
+            raise UpstreamTimeoutError(f"上游调用超时（{timeout}秒）")
+        raise
+
+
+def call_with_resilience(source: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    带超时、重试和熔断保护地调用上游
+
+    Args:
+        source: 数据源名称（决定调用策略和熔断器）
+        func: 上游调用函数
+        *args, **kwargs: 调用参数
+
+    Returns:
+        上游调用结果
+
+    Raises:
+        CircuitOpenError: 熔断器打开，调用被拒绝
+        UpstreamTimeoutError: 最后一次调用超时
+        OSError: 重试耗尽后的网络异常
+        Exception: 上游返回的非网络类异常（不重试，直接抛出）
+    """
+    policy = get_policy(source)
+    breaker = get_circuit_breaker(source)
+    attempt = 0
+
+    while True:
+        if not breaker.allow_request():
+            _calls_counter.inc(source=source, outcome="rejected")
+            raise CircuitOpenError(f"数据源 {source} 已熔断，暂停调用上游")
+
+        try:
+            with span(f"upstream.{source}", category="upstream", attempt=attempt):
+                result = _call_with_timeout(source, policy.timeout, func, *args, **kwargs)
+        except RETRYABLE_EXCEPTIONS as e:
+            breaker.record_failure()
+            if isinstance(e, UpstreamTimeoutError):
+                _timeouts_counter.inc(source=source)
+            if attempt >= policy.max_retries:
+                _calls_counter.inc(source=source, outcome="failure")
+                raise
+            delay = policy.backoff_delay(attempt)
+            attempt += 1
+            _retries_counter.inc(source=source)
+            logger.warning("上游调用失败，%.2f秒后第%d次重试: source=%s error=%s",
+                           delay, attempt, source, e)
+            time.sleep(delay)
+            continue
+        except Exception:
+            # 非网络类异常说明上游可达（如代码不存在、数据解析失败），不计入熔断
+            breaker.record_success()
+            _calls_counter.inc(source=source, outcome="error")
+            raise
+
+        breaker.record_success()
+        _calls_counter.inc(source=source, outcome="success")
+        return result
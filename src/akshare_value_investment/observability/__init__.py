@@ -0,0 +1,27 @@
+"""
+可观测性模块
+
+提供进程内指标采集、链路追踪、性能剖析、内存统计等运行状态观测能力，无需依赖外部服务。
+"""
+
+from .exposition import render_prometheus
+from .memory import memory_report
+from .metrics import REGISTRY, MetricsRegistry, Counter, Gauge, Histogram
+from .pipeline import stage_timer
+from .profiling import profile
+from .tracing import configure_tracing, span, traced
+
+__all__ = [
+    "REGISTRY",
+    "MetricsRegistry",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "render_prometheus",
+    "stage_timer",
+    "span",
+    "traced",
+    "configure_tracing",
+    "profile",
+    "memory_report",
+]
@@ -0,0 +1,56 @@
+"""
+Prometheus 文本格式导出
+
+把 `MetricsRegistry` 中的指标渲染为 Prometheus 文本格式（0.0.4），API 服务的 `/metrics`
+端点直接返回该文本，本地 `curl` 或任意 Prometheus 兼容的采集器都可以读取。
+"""
+
+import math
+
+from .metrics import REGISTRY, Histogram, MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def render_prometheus(registry: MetricsRegistry = REGISTRY) -> str:
+    """
+    渲染注册表中的全部指标
+
+    Returns:
+        Prometheus 文本格式（以换行结尾）
+    """
+    lines = []
+    for metric in registry.collect():
+        if metric.description:
+            lines.append(f"# HELP {metric.name} {_escape(metric.description)}")
+        lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+
+        if isinstance(metric, Histogram):
+            for key, series in sorted(metric.samples().items()):
+                for upper, count in series["buckets"]:
+                    labels = key + (("le", _format_value(upper)),)
+                    lines.append(f"{metric.name}_bucket{_format_labels(labels)} {count}")
+                lines.append(f"{metric.name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+                lines.append(f"{metric.name}_count{_format_labels(key)} {series['count']}")
+        else:
+            for key, value in sorted(metric.samples().items()):
+                lines.append(f"{metric.name}{_format_labels(key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,261 @@
+"""
+异步日志流水线
+
+原先日志由同步的 `TimedRotatingFileHandler` 直接写文件，每次查询的几条 INFO 日志都在请求线程上
+做文件 I/O。本模块把日志改为：请求线程只把记录放入有界队列（`QueueHandler`），
+由独立的写入线程（`QueueListener`）格式化为 JSON 行并写入按天轮换的文件。
+
+## 🎯 设计要点
+
+- **不阻塞**: 队列满时直接丢弃记录并计数（`log_records_dropped_total`），请求线程从不等待磁盘
+- **结构化**: 每条记录一行 JSON，包含时间、级别、logger、消息、线程、追踪ID（有追踪时）、
+  `extra` 字段和异常堆栈，便于 jq / 日志平台检索
+- **热路径采样**: 以 `extra=hot_path("键")` 记录的 INFO/DEBUG 日志每个键只保留每 N 条中的 1 条
+  （首条总是保留），保留的记录带 `sample_every` 字段以便还原总量；WARNING 及以上从不采样
+- **不传播**: 接入的 logger 默认不向根 logger 传播，否则宿主进程（uvicorn、Streamlit）在根 logger
+  上的同步处理器仍会在请求线程上逐条输出；需要根处理器时（如 pytest caplog）传入 `propagate=True`
+  或临时打开 logger 的 `propagate`
+- **延迟格式化**: 调用方使用 `logger.info("执行查询: %s", symbol)` 而非 f-string，级别关闭时
+  不做任何字符串拼接；消息在请求线程合并参数（避免参数对象随后被修改），JSON 序列化在写入线程完成
+
+## 🔧 环境变量
+
+- `AKSHARE_LOG_DIR`: 日志目录，默认 `logs`
+- `AKSHARE_LOG_FORMAT`: `json`（默认）或 `text`（原先的单行文本格式）
+- `AKSHARE_LOG_QUEUE_SIZE`: 队列容量，默认 10000
+- `AKSHARE_LOG_SAMPLE_EVERY`: 热路径日志的采样间隔 N，默认 10（1 表示不采样）
+
+```python
+logger.info("查询成功: %d 条记录", len(df), extra=hot_path("query.success"))
+```
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from .metrics import REGISTRY
+from .tracing import current_span
+
+DEFAULT_LOG_DIR = "logs"
+LOG_FILE_NAME = "akshare_value_investment.log"
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_SAMPLE_EVERY = 10
+
+# 接入流水线的 logger：模块内的 "investment.*" 和按模块名命名的 "akshare_value_investment.*"
+# （默认不向根 logger 传播：uvicorn、Streamlit 在根 logger 上的同步处理器不会再逐条写 INFO 日志）
+LOGGER_NAMES = ("investment", "akshare_value_investment")
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_SAMPLE_KEY = "sample_key"
+
+# LogRecord 自带的属性，其余属性视为 extra 字段写入 JSON
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_dropped = REGISTRY.counter("log_records_dropped_total", "日志队列已满被丢弃的记录数")
+_sampled_out = REGISTRY.counter("log_records_sampled_out_total", "热路径采样跳过的日志记录数（按采样键）")
+
+
+def hot_path(key: str) -> Dict[str, str]:
+    """热路径日志的 extra 参数（同一键的 INFO/DEBUG 日志按 AKSHARE_LOG_SAMPLE_EVERY 采样）"""
+    return {_SAMPLE_KEY: key}
+
+
+class HotPathSampler(logging.Filter):
+    """热路径采样：同一采样键每 N 条只保留 1 条（首条总是保留）"""
+
+    def __init__(self, every: int = DEFAULT_SAMPLE_EVERY):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, _SAMPLE_KEY, None)
+        if key is None or self.every == 1 or record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        if count % self.every:
+            _sampled_out.inc(key=key)
+            return False
+        record.sample_every = self.every
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """每条记录格式化为一行 JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRS and name != _SAMPLE_KEY:
+                entry[name] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """放入有界队列的日志处理器：队列满时丢弃记录而不阻塞请求线程"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 在请求线程合并消息参数、渲染异常堆栈（参数对象和 traceback 不跨线程传递），
+        # 记录追踪ID；JSON 序列化留给写入线程
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        current = current_span()
+        if current is not None:
+            record.trace_id = current.trace_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped.inc()
+
+
+class LoggingPipeline:
+    """已启动的日志流水线（队列处理器 + 写入线程）"""
+
+    def __init__(self, handler: NonBlockingQueueHandler, listener: QueueListener,
+                 loggers: Sequence[logging.Logger], original_propagate: Sequence[bool]):
+        self.handler = handler
+        self.listener = listener
+        self.loggers = list(loggers)
+        self._original_propagate = list(original_propagate)
+
+    @property
+    def queue(self) -> queue.Queue:
+        return self.handler.queue
+
+    def flush(self, timeout: float = 5.0):
+        """等待队列中已有的记录写完（测试和进程退出前使用）"""
+        done = threading.Event()
+        self.queue.put(_FlushMarker(done))
+        done.wait(timeout)
+
+    def stop(self):
+        """停止写入线程（先写完队列中的记录）并移除处理器"""
+        for logger, propagate in zip(self.loggers, self._original_propagate):
+            logger.removeHandler(self.handler)
+            logger.propagate = propagate
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+class _FlushMarker(logging.LogRecord):
+    """放入队列的刷新标记：写入线程处理到它时通知等待方"""
+
+    def __init__(self, done: threading.Event):
+        super().__init__("investment.logging", logging.CRITICAL, "", 0, "", None, None)
+        self.done = done
+
+
+class _FileWriter(TimedRotatingFileHandler):
+    """写入线程上的文件处理器（遇到刷新标记时只通知，不写入）"""
+
+    def handle(self, record: logging.LogRecord):
+        if isinstance(record, _FlushMarker):
+            self.flush()
+            record.done.set()
+            return True
+        return super().handle(record)
+
+
+_pipeline: Optional[LoggingPipeline] = None
+_lock = threading.Lock()
+
+
+def configure_logging(log_dir: Optional[str] = None, fmt: Optional[str] = None,
+                      queue_size: Optional[int] = None, sample_every: Optional[int] = None,
+                      logger_names: Sequence[str] = LOGGER_NAMES, propagate: bool = False) -> LoggingPipeline:
+    """
+    启动日志流水线（进程内只启动一次，重复调用返回已有的流水线）
+
+    Args:
+        log_dir: 日志目录，默认取 AKSHARE_LOG_DIR
+        fmt: "json" 或 "text"，默认取 AKSHARE_LOG_FORMAT
+        queue_size: 队列容量，默认取 AKSHARE_LOG_QUEUE_SIZE
+        sample_every: 热路径采样间隔，默认取 AKSHARE_LOG_SAMPLE_EVERY
+        logger_names: 接入流水线的 logger
+        propagate: 接入的 logger 是否继续向根 logger 传播（默认不传播）
+
+    Returns:
+        日志流水线
+    """
+    global _pipeline
+    with _lock:
+        if _pipeline is not None:
+            return _pipeline
+
+        directory = Path(log_dir or os.environ.get("AKSHARE_LOG_DIR", DEFAULT_LOG_DIR))
+        directory.mkdir(parents=True, exist_ok=True)
+        writer = _FileWriter(
+            directory / LOG_FILE_NAME,
+            when="midnight",  # 每天午夜轮换
+            interval=1,
+            backupCount=30,   # 保留30天的日志
+            encoding="utf-8",
+        )
+        writer.suffix = "%Y-%m-%d"
+        if (fmt or os.environ.get("AKSHARE_LOG_FORMAT", "json")) == "text":
+            writer.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt="%Y-%m-%d %H:%M:%S"))
+        else:
+            writer.setFormatter(JsonFormatter())
+
+        size = queue_size or int(os.environ.get("AKSHARE_LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=size))
+        every = sample_every or int(os.environ.get("AKSHARE_LOG_SAMPLE_EVERY", DEFAULT_SAMPLE_EVERY))
+        handler.addFilter(HotPathSampler(every))
+
+        loggers, original_propagate = [], []
+        for name in logger_names:
+            logger = logging.getLogger(name)
+            original_propagate.append(logger.propagate)
+            logger.setLevel(logging.INFO)
+            logger.addHandler(handler)
+            logger.propagate = propagate
+            loggers.append(logger)
+
+        listener = QueueListener(handler.queue, writer, respect_handler_level=True)
+        listener.start()
+        _pipeline = LoggingPipeline(handler, listener, loggers, original_propagate)
+        return _pipeline
+
+
+def shutdown_logging():
+    """停止日志流水线（写完队列中的记录）；之后可重新 `configure_logging`"""
+    global _pipeline
+    with _lock:
+        if _pipeline is not None:
+            _pipeline.stop()
+            _pipeline = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,346 @@
+"""
+内存统计与泄漏诊断
+
+API worker 的 RSS 会缓慢增长，但指标里看不出增长来自哪里。本模块按缓存层统计内存占用，
+并提供按需的 tracemalloc 快照对比和周期性的内存采样日志。
+
+## 🎯 统计内容
+
+- **进程**: 常驻内存（RSS，Linux 读取 /proc/self/statm，其他平台退化为峰值 RSS）、gc 跟踪的对象数
+- **缓存层**:
+  - `diskcache`: 条目数、磁盘占用、缓存的 DataFrame 反序列化后的深度字节数（含 object 列中的字符串）、
+    pandas block 数、按键前缀（查询类型 / stale）汇总和最大的键；用于估算把热点数据放进进程内缓存需要多少内存
+  - `symbol_identifier`: 股票代码识别的 lru_cache 条目数和容量
+  - `replay_fixtures`: 回放模式下内存中缓存的夹具（只在启用回放时出现）
+- **tracemalloc**: 第一次快照时开始跟踪，之后每次快照返回与上一次快照相比增长最多的分配位置
+- **周期采样**: `AKSHARE_MEMORY_SAMPLE_INTERVAL`（秒，默认 0 即关闭）大于 0 时，后台线程定期
+  记录 RSS 和缓存大小到日志，并更新 `process_resident_memory_bytes` 等指标
+
+DataFrame 的 block 数远大于列的 dtype 种类数时，说明数据经过多次逐列插入，内存碎片化且后续
+运算更慢（`df.copy()` 会合并 block）。
+
+```python
+report = memory_report(cache, top=10)
+report["tiers"][0]["top_keys"]    # diskcache 中最大的 10 个键
+take_snapshot()                   # 开始跟踪
+take_snapshot()                   # 与上一次快照对比
+```
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger("investment.memory")
+
+DEFAULT_TOP = 10
+DEFAULT_TRACE_FRAMES = 10
+
+RSS_BYTES = REGISTRY.gauge("process_resident_memory_bytes", "进程常驻内存（字节）")
+CACHE_ENTRIES = REGISTRY.gauge("cache_entries", "缓存条目数（按缓存层）")
+CACHE_VOLUME = REGISTRY.gauge("cache_volume_bytes", "缓存磁盘占用（字节）")
+
+
+def rss_bytes() -> Tuple[Optional[int], str]:
+    """
+    进程常驻内存
+
+    Returns:
+        (字节数, 来源)：来源为 "statm"（当前值）或 "peak"（峰值，非 Linux 平台）；无法获取时字节数为 None
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"), "statm"
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None, "unavailable"
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 以字节为单位，其他平台以 KB 为单位
+    return (peak if sys.platform == "darwin" else peak * 1024), "peak"
+
+
+def frame_blocks(df: pd.DataFrame) -> int:
+    """DataFrame 内部的 block 数（pandas 私有属性，无法读取时返回 0）"""
+    try:
+        return df._mgr.nblocks
+    except AttributeError:
+        return 0
+
+
+def value_bytes(value: Any) -> int:
+    """缓存值的深度字节数（DataFrame/Series 包含 object 列中字符串的实际大小）"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    return sys.getsizeof(value)
+
+
+def tier_report(name: str, items: Iterable[Tuple[Any, Any]], top: int = DEFAULT_TOP,
+                limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    统计一个缓存层
+
+    Args:
+        name: 缓存层名称
+        items: (键, 值) 迭代器
+        top: 返回最大的前 N 个键
+        limit: 最多统计的条目数（None 表示全部）
+
+    Returns:
+        条目数、深度字节数、DataFrame 的 block 统计、按键前缀汇总和最大的键
+    """
+    entries = total = frames = blocks = fragmented = 0
+    prefixes: Dict[str, Dict[str, int]] = {}
+    sizes: List[Dict[str, Any]] = []
+    for key, value in items:
+        if limit is not None and entries >= limit:
+            break
+        size = value_bytes(value)
+        entries += 1
+        total += size
+        item = {"key": str(key), "bytes": size}
+        if isinstance(value, pd.DataFrame):
+            nblocks = frame_blocks(value)
+            frames += 1
+            blocks += nblocks
+            fragmented += nblocks > value.dtypes.nunique()
+            item.update(rows=len(value), columns=len(value.columns), blocks=nblocks)
+        prefix = str(key).split(":", 1)[0] if ":" in str(key) else ""
+        group = prefixes.setdefault(prefix, {"entries": 0, "bytes": 0})
+        group["entries"] += 1
+        group["bytes"] += size
+        sizes.append(item)
+
+    sizes.sort(key=lambda item: item["bytes"], reverse=True)
+    return {
+        "tier": name,
+        "entries": entries,
+        "bytes": total,
+        "frames": {"count": frames, "blocks": blocks, "fragmented": fragmented},
+        "by_prefix": dict(sorted(prefixes.items(), key=lambda kv: kv[1]["bytes"], reverse=True)),
+        "top_keys": sizes[:top],
+        "truncated": limit is not None and entries >= limit,
+    }
+
+
+def _disk_items(cache) -> Iterable[Tuple[Any, Any]]:
+    for key in cache.iterkeys():
+        value = cache.get(key)
+        if value is not None:
+            yield key, value
+
+
+def disk_cache_report(cache, top: int = DEFAULT_TOP, limit: Optional[int] = None) -> Dict[str, Any]:
+    """diskcache 层：反序列化每个条目统计深度字节数，另附磁盘占用"""
+    report = tier_report("diskcache", _disk_items(cache), top=top, limit=limit)
+    report["directory"] = cache.directory
+    report["volume_bytes"] = cache.volume()
+    return report
+
+
+def _lru_report(name: str, functions: Iterable[Callable]) -> Dict[str, Any]:
+    infos = [function.cache_info() for function in functions]
+    return {
+        "tier": name,
+        "entries": sum(info.currsize for info in infos),
+        "maxsize": sum(info.maxsize or 0 for info in infos),
+        "hits": sum(info.hits for info in infos),
+        "misses": sum(info.misses for info in infos),
+    }
+
+
+def _symbol_caches() -> List[Callable]:
+    from ..core import stock_identifier
+    return [stock_identifier._identify, stock_identifier._format_for_akshare]
+
+
+def process_tiers(top: int = DEFAULT_TOP) -> List[Dict[str, Any]]:
+    """进程内的缓存层（股票代码识别 lru_cache、回放夹具缓存）"""
+    from ..datasource.lazy_akshare import ak
+    from ..datasource.replay import ReplayAkshare
+
+    tiers = [_lru_report("symbol_identifier", _symbol_caches())]
+    replay = ak._override
+    if isinstance(replay, ReplayAkshare):
+        with replay.store._lock:
+            cached = list(replay.store._cache.items())
+        tiers.append(tier_report(
+            "replay_fixtures",
+            ((f"{function}:{key}", entry.get("result")) for (function, key), entry in cached),
+            top=top,
+        ))
+    return tiers
+
+
+def memory_report(cache=None, top: int = DEFAULT_TOP, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    完整的内存报告
+
+    Args:
+        cache: diskcache 实例（None 时不统计 diskcache 层）
+        top: 每个缓存层返回最大的前 N 个键
+        limit: diskcache 最多统计的条目数
+
+    Returns:
+        进程内存、gc 对象数、各缓存层统计和 tracemalloc 状态
+    """
+    rss, source = rss_bytes()
+    tiers = [disk_cache_report(cache, top=top, limit=limit)] if cache is not None else []
+    tiers.extend(process_tiers(top=top))
+    return {
+        "process": {"rss_bytes": rss, "rss_source": source, "gc_objects": len(gc.get_objects())},
+        "tiers": tiers,
+        "tracemalloc": {"tracing": tracemalloc.is_tracing(), "snapshots": _snapshots.count},
+    }
+
+
+class _SnapshotState:
+    """上一次 tracemalloc 快照（进程内共享）"""
+
+    def __init__(self):
+        self.previous: Optional[tracemalloc.Snapshot] = None
+        self.count = 0
+        self.lock = threading.Lock()
+
+
+_snapshots = _SnapshotState()
+
+# 不统计 tracemalloc 自身和导入机制的分配
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def _stat_entry(stat) -> Dict[str, Any]:
+    frame = stat.traceback[0]
+    entry = {"location": f"{frame.filename}:{frame.lineno}", "size_bytes": stat.size, "count": stat.count}
+    if hasattr(stat, "size_diff"):
+        entry.update(size_diff_bytes=stat.size_diff, count_diff=stat.count_diff)
+    return entry
+
+
+def take_snapshot(top: int = DEFAULT_TOP, frames: int = DEFAULT_TRACE_FRAMES) -> Dict[str, Any]:
+    """
+    拍摄 tracemalloc 快照
+
+    未开始跟踪时先开始跟踪（此时还没有可对比的数据）；之后每次快照返回当前占用最多的分配位置，
+    以及与上一次快照相比增长最多的位置。跟踪会增加内存和 CPU 开销，诊断完成后调用 `stop_tracing()`。
+    """
+    with _snapshots.lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            _snapshots.previous = None
+            _snapshots.count = 0
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        previous, _snapshots.previous = _snapshots.previous, snapshot
+        _snapshots.count += 1
+
+        current, peak = tracemalloc.get_traced_memory()
+        result = {
+            "snapshot": _snapshots.count,
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "top": [_stat_entry(stat) for stat in snapshot.statistics("lineno")[:top]],
+            "diff": None,
+        }
+        if previous is not None:
+            growth = [stat for stat in snapshot.compare_to(previous, "lineno") if stat.size_diff > 0]
+            result["diff"] = [_stat_entry(stat) for stat in growth[:top]]
+        return result
+
+
+def stop_tracing() -> bool:
+    """停止 tracemalloc 并丢弃快照，返回之前是否在跟踪"""
+    with _snapshots.lock:
+        was_tracing = tracemalloc.is_tracing()
+        tracemalloc.stop()
+        _snapshots.previous = None
+        _snapshots.count = 0
+        return was_tracing
+
+
+class MemorySampler:
+    """周期记录 RSS 和缓存大小的后台线程"""
+
+    def __init__(self, interval: float, cache=None):
+        """
+        Args:
+            interval: 采样间隔（秒）
+            cache: diskcache 实例（只读取条目数和磁盘占用，不反序列化）
+        """
+        self.interval = interval
+        self.cache = cache
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> Dict[str, Any]:
+        """采样一次：更新指标并写日志"""
+        rss, _ = rss_bytes()
+        stats: Dict[str, Any] = {"rss_bytes": rss}
+        if rss is not None:
+            RSS_BYTES.set(rss)
+        if self.cache is not None:
+            stats.update(cache_entries=len(self.cache), cache_volume_bytes=self.cache.volume())
+            CACHE_ENTRIES.set(stats["cache_entries"], tier="diskcache")
+            CACHE_VOLUME.set(stats["cache_volume_bytes"], tier="diskcache")
+        lru = _lru_report("symbol_identifier", _symbol_caches())
+        stats["symbol_cache_entries"] = lru["entries"]
+        CACHE_ENTRIES.set(lru["entries"], tier="symbol_identifier")
+        logger.info("内存采样: rss=%s cache_entries=%s cache_volume=%s",
+                    rss, stats.get("cache_entries"), stats.get("cache_volume_bytes"), extra={"memory": stats})
+        return stats
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning("内存采样失败: %s", e)
+
+    def start(self) -> "MemorySampler":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_sampler: Optional[MemorySampler] = None
+
+
+def start_memory_sampler(cache_provider: Optional[Callable[[], Any]] = None,
+                         interval: Optional[float] = None) -> Optional[MemorySampler]:
+    """
+    按 AKSHARE_MEMORY_SAMPLE_INTERVAL 启动进程内唯一的采样线程（间隔为 0 时不启动，返回 None）
+
+    Args:
+        cache_provider: 返回 diskcache 实例的函数（只在启动采样时调用一次）
+        interval: 采样间隔（秒），默认取环境变量
+    """
+    global _sampler
+    if interval is None:
+        interval = float(os.environ.get("AKSHARE_MEMORY_SAMPLE_INTERVAL", "0"))
+    if interval <= 0:
+        return None
+    if _sampler is None:
+        _sampler = MemorySampler(interval, cache_provider() if cache_provider else None).start()
+    return _sampler
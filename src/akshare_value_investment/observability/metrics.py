@@ -0,0 +1,259 @@
+"""
+进程内指标注册表
+
+提供线程安全的计数器（Counter）、仪表（Gauge）和直方图（Histogram），
+指标按标签分组存放在进程内存中，可以在本地直接读取，不依赖任何外部采集服务。
+
+## 🔧 使用示例
+
+```python
+from akshare_value_investment.observability.metrics import REGISTRY
+
+calls = REGISTRY.counter("upstream_calls_total", "上游调用次数")
+calls.inc(source="ths", outcome="success")
+calls.value(source="ths", outcome="success")  # 1.0
+
+latency = REGISTRY.histogram("upstream_latency_seconds", "上游调用耗时")
+latency.observe(1.2, source="ths")
+latency.quantile(0.95, source="ths")  # 基于分桶估算的P95
+```
+"""
+
+import bisect
+import math
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    """将标签字典转换为可哈希、顺序稳定的键"""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class _Metric:
+    """指标基类，负责按标签保存数值"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def value(self, **labels) -> float:
+        """读取指定标签组合的当前值，不存在时返回0"""
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> Dict[LabelKey, float]:
+        """返回所有标签组合的数值快照"""
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self):
+        """清空全部数值"""
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        """计数器累加"""
+        if amount < 0:
+            raise ValueError("计数器只能增加，不能减少")
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """可增可减的仪表值"""
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels):
+        """设置仪表值"""
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        """仪表值增加"""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        """仪表值减少"""
+        self.inc(-amount, **labels)
+
+
+# 默认分桶上界（秒），覆盖从毫秒级缓存命中到分钟级上游超时
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0,
+                   8.0, 13.0, 20.0, 30.0, 60.0)
+
+
+class _HistogramSeries:
+    """单个标签组合的直方图数据"""
+
+    __slots__ = ("bucket_counts", "sum", "count")
+
+    def __init__(self, bucket_size: int):
+        self.bucket_counts = [0] * bucket_size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """
+    分桶直方图
+
+    最后一个分桶为 +Inf，分桶计数为非累积值；quantile() 在命中的分桶内线性插值估算分位数。
+    """
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, description: str = "",
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(float(b) for b in buckets if not math.isinf(b))) + (math.inf,)
+        self._values: Dict[LabelKey, _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """记录一次观测值"""
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = _HistogramSeries(len(self.buckets))
+                self._values[key] = series
+            series.bucket_counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def count(self, **labels) -> int:
+        """观测次数"""
+        with self._lock:
+            series = self._values.get(_label_key(labels))
+            return series.count if series else 0
+
+    def sum(self, **labels) -> float:
+        """观测值总和"""
+        with self._lock:
+            series = self._values.get(_label_key(labels))
+            return series.sum if series else 0.0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """
+        估算分位数
+
+        Args:
+            q: 分位点（0~1）
+
+        Returns:
+            估算值，没有观测数据时返回None；落在 +Inf 分桶时返回最大有限上界
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("分位点必须在0到1之间")
+
+        with self._lock:
+            series = self._values.get(_label_key(labels))
+            if series is None or series.count == 0:
+                return None
+            bucket_counts = list(series.bucket_counts)
+            total = series.count
+
+        rank = q * total
+        cumulative = 0
+        for index, bucket_count in enumerate(bucket_counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                upper = self.buckets[index]
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if math.isinf(upper):
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-2]
+
+    def samples(self) -> Dict[LabelKey, Dict[str, object]]:
+        """返回所有标签组合的快照（累积分桶计数、总和、次数）"""
+        with self._lock:
+            snapshot = {}
+            for key, series in self._values.items():
+                cumulative, running = [], 0
+                for bucket_count in series.bucket_counts:
+                    running += bucket_count
+                    cumulative.append(running)
+                snapshot[key] = {
+                    "buckets": list(zip(self.buckets, cumulative)),
+                    "sum": series.sum,
+                    "count": series.count,
+                }
+            return snapshot
+
+    def reset(self):
+        """清空全部观测数据"""
+        with self._lock:
+            self._values.clear()
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """指标注册表，同名指标只会创建一次"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name: str, description: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, description, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"指标 {name} 已注册为 {metric.metric_type} 类型")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """获取或创建计数器"""
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        """获取或创建仪表"""
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(self, name: str, description: str = "",
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """获取或创建直方图"""
+        return self._get_or_create(Histogram, name, description, buckets=buckets)
+
+    def get(self, name: str):
+        """按名称获取指标，不存在返回None"""
+        with self._lock:
+            return self._metrics.get(name)
+
+    def collect(self) -> List[Metric]:
+        """返回所有已注册指标（按名称排序）"""
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def reset(self):
+        """清空所有指标数值（保留指标定义），主要用于测试"""
+        for metric in self.collect():
+            metric.reset()
+
+
+# 进程级默认注册表
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,93 @@
+"""
+查询流水线指标
+
+一次财务查询依次经过：股票代码识别 → 缓存查找 → 上游获取（akshare）→ 单位转换 →
+时间频率处理 → 序列化。本模块定义这些阶段共用的指标，各层在对应位置计时：
+
+- `pipeline_stage_seconds{stage, market, query_type}`: 各阶段耗时直方图
+- `cache_lookups_total{market, query_type, result}`: 缓存查找次数（hit / miss）
+- `cache_hit_ratio{market, query_type}`: 缓存命中率（抓取 /metrics 时由上一项计算）
+- `akshare_call_seconds{function}` / `akshare_errors_total{function, error}`: 每个 akshare 函数的耗时和失败次数
+- `http_requests_in_flight` / `http_request_duration_seconds{method, route, status}`: API 请求
+
+```python
+from akshare_value_investment.observability.pipeline import stage_timer
+
+with stage_timer("unit_conversion", market="a_stock", query_type="a_stock_balance"):
+    df, unit_map = UnitConverter.convert_dataframe(df)
+```
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from .metrics import DEFAULT_BUCKETS, REGISTRY
+from .request_timing import current_timings
+from .tracing import span
+
+# 流水线阶段名称
+SYMBOL_IDENTIFICATION = "symbol_identification"
+CACHE_LOOKUP = "cache_lookup"
+UPSTREAM = "upstream"
+UNIT_CONVERSION = "unit_conversion"
+FREQUENCY_PROCESSING = "frequency_processing"
+SERIALIZATION = "serialization"
+
+# 阶段耗时分桶：在默认分桶前补充亚毫秒级分桶（代码识别、缓存命中、单位转换通常不到 5 毫秒）
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025) + DEFAULT_BUCKETS
+
+STAGE_SECONDS = REGISTRY.histogram("pipeline_stage_seconds", "查询流水线各阶段耗时（秒）",
+                                   buckets=STAGE_BUCKETS)
+CACHE_LOOKUPS = REGISTRY.counter("cache_lookups_total", "缓存查找次数（按结果 hit/miss）")
+CACHE_HIT_RATIO = REGISTRY.gauge("cache_hit_ratio", "缓存命中率")
+AKSHARE_CALL_SECONDS = REGISTRY.histogram("akshare_call_seconds", "akshare 函数调用耗时（秒）")
+AKSHARE_ERRORS = REGISTRY.counter("akshare_errors_total", "akshare 函数调用失败次数")
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "正在处理的 API 请求数")
+HTTP_REQUEST_SECONDS = REGISTRY.histogram("http_request_duration_seconds", "API 请求处理耗时（秒）",
+                                          buckets=STAGE_BUCKETS)
+
+_MARKET_PREFIXES = (("a_", "a_stock"), ("hk_", "hk_stock"), ("us_", "us_stock"))
+
+
+def market_label(query_type: str) -> str:
+    """根据查询类型/缓存类型名称推断市场标签（如 a_stock_balance → a_stock）"""
+    for prefix, market in _MARKET_PREFIXES:
+        if query_type.startswith(prefix):
+            return market
+    return "unknown"
+
+
+@contextmanager
+def stage_timer(stage: str, **labels) -> Iterator[None]:
+    """记录代码块耗时到 pipeline_stage_seconds、当前请求的耗时明细和追踪 span（异常时同样记录）"""
+    start = time.perf_counter()
+    try:
+        with span(stage, category="stage", **labels):
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage, **labels)
+        timings = current_timings()
+        if timings is not None:
+            timings.add_stage(stage, elapsed, **labels)
+
+
+def record_cache_lookup(hit: bool, **labels):
+    """记录一次缓存查找结果"""
+    CACHE_LOOKUPS.inc(result="hit" if hit else "miss", **labels)
+
+
+def refresh_cache_hit_ratio():
+    """根据 cache_lookups_total 重新计算各标签组合的 cache_hit_ratio"""
+    totals = {}
+    for key, value in CACHE_LOOKUPS.samples().items():
+        labels = dict(key)
+        hit = labels.pop("result", None) == "hit"
+        group = tuple(sorted(labels.items()))
+        hits, lookups = totals.get(group, (0.0, 0.0))
+        totals[group] = (hits + (value if hit else 0.0), lookups + value)
+
+    for group, (hits, lookups) in totals.items():
+        if lookups:
+            CACHE_HIT_RATIO.set(hits / lookups, **dict(group))
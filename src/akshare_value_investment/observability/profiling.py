@@ -0,0 +1,287 @@
+"""
+单请求性能剖析（火焰图格式输出）
+
+追踪只能看到阶段级的耗时，热路径上的性能退化往往来自计算器、单位转换器里隐藏的
+pandas 拷贝或 `apply` 调用，需要函数级的剖析。本模块对单个请求开启剖析并把结果写入本地目录：
+
+- **sample**: 采样剖析，按固定间隔采集所有线程的调用栈（含线程池中的三表并发获取），
+  输出 collapsed-stack 文本（`.collapsed`），可直接交给 flamegraph.pl、speedscope
+  （https://www.speedscope.app）或 Perfetto 生成火焰图
+- **cprofile**: 确定性剖析（cProfile），输出 pstats 文件（`.prof`），可用 snakeviz、
+  `python -m pstats` 查看；只统计开启剖析的线程（API 中即事件循环线程）
+
+剖析需要管理员令牌：未设置 `AKSHARE_PROFILING_TOKEN` 时完全关闭。API 请求带
+`X-Profile: sample|cprofile`（或查询参数 `profile=sample`）且 `X-Profile-Token` 与令牌一致时剖析该请求，
+响应头 `X-Profile-File` 为剖析文件名，可通过 `/admin/profiles` 列出和下载。
+
+- `AKSHARE_PROFILE_DIR`: 剖析文件目录，默认 `.cache/profiles`
+- `AKSHARE_PROFILE_MAX_FILES`: 最多保留的剖析文件数（超出时删除最旧的），默认 100
+- `AKSHARE_PROFILE_INTERVAL`: 采样间隔（秒），默认 0.005
+
+同一时间只剖析一个请求（cProfile 在 Python 3.12+ 基于 sys.monitoring，不能同时开启多个），
+其他请求的剖析标记被忽略。
+
+```python
+from akshare_value_investment.observability.profiling import profile
+
+with profile("sample", label="a_statements") as result:
+    service.query_financial_statements(...)
+print(result.path)
+```
+"""
+
+import cProfile
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter as _Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = ".cache/profiles"
+DEFAULT_MAX_FILES = 100
+DEFAULT_INTERVAL = 0.005
+
+# 剖析文件名：profile-<时间>-<标签>-<id>.<后缀>，下载接口只接受该格式（防止路径穿越）
+_FILE_NAME = re.compile(r"^profile-[\w.-]+\.(collapsed|prof)$")
+
+# 空闲线程的栈顶函数（等待任务、等待事件、等待 IO 就绪），采样时跳过，避免火焰图被空闲栈淹没
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("queue.py", "get"),
+    ("socketserver.py", "serve_forever"),
+}
+
+
+def profiling_token() -> Optional[str]:
+    """管理员令牌（环境变量 AKSHARE_PROFILING_TOKEN，未设置时剖析关闭）"""
+    return os.environ.get("AKSHARE_PROFILING_TOKEN") or None
+
+
+def authorize(token: Optional[str]) -> bool:
+    """校验剖析令牌（剖析关闭时总是返回 False）"""
+    expected = profiling_token()
+    if expected is None or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+
+
+def requested_mode(headers: Mapping[str, str], query_params: Mapping[str, str]) -> Optional[str]:
+    """
+    解析请求要求的剖析方式
+
+    Returns:
+        剖析方式（sample / cprofile）；未要求、方式未知或令牌不正确时返回 None
+    """
+    mode = (headers.get("x-profile") or query_params.get("profile") or "").lower()
+    if not mode:
+        return None
+    if mode in ("1", "true"):
+        mode = "sample"
+    if mode not in PROFILERS:
+        logger.warning("未知的剖析方式: %s", mode)
+        return None
+    if not authorize(headers.get("x-profile-token")):
+        logger.warning("剖析令牌缺失或不正确，忽略剖析请求")
+        return None
+    return mode
+
+
+def _frame_label(code) -> str:
+    """火焰图中的帧名：函数名 (文件:行号)，文件取最后两级路径"""
+    filename = "/".join(Path(code.co_filename).parts[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """采样剖析器：后台线程定时采集所有线程的调用栈"""
+
+    mode = "sample"
+    suffix = "collapsed"
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval if interval is not None else float(
+            os.environ.get("AKSHARE_PROFILE_INTERVAL", str(DEFAULT_INTERVAL)))
+        self.stacks: _Counter = _Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own)
+
+    def sample(self, exclude: Optional[int] = None):
+        """采集一次所有线程的调用栈"""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude:
+                continue
+            code = frame.f_code
+            if (Path(code.co_filename).name, code.co_name) in IDLE_FRAMES:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def write(self, path: Path):
+        """写出 collapsed-stack 文本（每行 `帧;帧;... 次数`）"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class DeterministicProfiler:
+    """确定性剖析器（cProfile），只统计调用 start() 的线程"""
+
+    mode = "cprofile"
+    suffix = "prof"
+
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+
+    def start(self):
+        self._profiler.enable()
+
+    def stop(self):
+        self._profiler.disable()
+
+    def write(self, path: Path):
+        """写出 pstats 文件"""
+        self._profiler.dump_stats(str(path))
+
+
+PROFILERS = {
+    SamplingProfiler.mode: SamplingProfiler,
+    DeterministicProfiler.mode: DeterministicProfiler,
+}
+
+
+class ProfileStore:
+    """剖析文件目录"""
+
+    def __init__(self, directory: Union[str, Path, None] = None, max_files: Optional[int] = None):
+        """
+        Args:
+            directory: 输出目录，默认环境变量 AKSHARE_PROFILE_DIR 或 .cache/profiles
+            max_files: 最多保留的文件数，默认环境变量 AKSHARE_PROFILE_MAX_FILES 或 100
+        """
+        self.directory = Path(directory or os.environ.get("AKSHARE_PROFILE_DIR", DEFAULT_PROFILE_DIR))
+        self.max_files = max_files if max_files is not None else int(
+            os.environ.get("AKSHARE_PROFILE_MAX_FILES", str(DEFAULT_MAX_FILES)))
+        self._lock = threading.Lock()
+
+    def save(self, profiler, label: str) -> Path:
+        """写出剖析结果并清理超出数量的旧文件"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^\w.-]+", "_", label).strip("_")[:80] or "profile"
+        name = f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{uuid.uuid4().hex[:8]}.{profiler.suffix}"
+        path = self.directory / name
+        profiler.write(path)
+        self._prune()
+        return path
+
+    def list(self) -> List[Dict[str, Any]]:
+        """剖析文件列表（最新的在前）"""
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for path in self.directory.glob("profile-*"):
+            if not _FILE_NAME.match(path.name):
+                continue
+            stat = path.stat()
+            profiles.append({
+                "name": path.name,
+                "format": "collapsed" if path.suffix == ".collapsed" else "pstats",
+                "size_bytes": stat.st_size,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(stat.st_mtime)),
+                "_mtime": stat.st_mtime,
+            })
+        profiles.sort(key=lambda p: p.pop("_mtime"), reverse=True)
+        return profiles
+
+    def path(self, name: str) -> Optional[Path]:
+        """按文件名取剖析文件路径（名称不合法或文件不存在时返回 None）"""
+        if not _FILE_NAME.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+    def _prune(self):
+        with self._lock:
+            files = sorted((p for p in self.directory.glob("profile-*") if _FILE_NAME.match(p.name)),
+                           key=lambda p: p.stat().st_mtime)
+            for old in files[:max(len(files) - self.max_files, 0)]:
+                old.unlink(missing_ok=True)
+
+
+class ProfileResult:
+    """`profile()` 的结果：剖析文件路径（未剖析或写出失败时为 None）"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.path: Optional[Path] = None
+
+
+# 同一时间只允许一个剖析
+_active = threading.Lock()
+
+
+@contextmanager
+def profile(mode: str, label: str, store: Optional[ProfileStore] = None) -> Iterator[ProfileResult]:
+    """
+    剖析代码块并写出剖析文件
+
+    已有剖析在进行时不剖析（result.path 为 None），代码块照常执行。
+
+    Args:
+        mode: 剖析方式（sample / cprofile）
+        label: 剖析标签，用于文件名（如请求方法和路径）
+        store: 剖析文件目录，默认按环境变量创建
+    """
+    if mode not in PROFILERS:
+        raise ValueError(f"未知的剖析方式: {mode}")
+    result = ProfileResult(mode)
+    if not _active.acquire(blocking=False):
+        logger.warning("已有剖析在进行，忽略本次剖析: %s", label)
+        yield result
+        return
+
+    profiler = PROFILERS[mode]()
+    try:
+        profiler.start()
+        try:
+            yield result
+        finally:
+            profiler.stop()
+        try:
+            result.path = (store or ProfileStore()).save(profiler, label)
+            logger.info("剖析已写入: %s", result.path)
+        except Exception:
+            logger.warning("写入剖析文件失败", exc_info=True)
+    finally:
+        _active.release()
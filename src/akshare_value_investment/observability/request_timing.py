@@ -0,0 +1,139 @@
+"""
+单次请求的耗时明细
+
+`/metrics` 只能看到聚合分布，排查"某一次请求为什么慢"需要这一次请求自己的明细。
+API 中间件为每个请求创建一个 `RequestTimings` 并放入 ContextVar，`stage_timer` 计时的同时
+把耗时记到当前请求上，查询器记录每张报表的数据来源：
+
+- **disk**: 命中 diskcache
+- **upstream**: 缓存未命中，请求上游
+- **stale**: 上游不可用，回退到过期缓存
+
+请求结束时明细写入 `Server-Timing` 响应头（浏览器开发者工具可直接查看）；GET 查询接口
+带 `explain=true` 时，同样的信息以结构化形式放在响应的 `metadata.explain` 中。
+
+```python
+with collect_request_timings() as timings:
+    service.query_financial_statements(...)
+response.headers["Server-Timing"] = timings.server_timing()
+```
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# 报表数据来源
+SOURCE_DISK = "disk"
+SOURCE_UPSTREAM = "upstream"
+SOURCE_STALE = "stale"
+
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """一次请求内各阶段的耗时和每张报表的数据来源"""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: List[Dict[str, Any]] = []
+        self.sources: Dict[str, str] = {}
+
+    def add_stage(self, stage: str, seconds: float, **labels):
+        """记录一个阶段的耗时"""
+        with self._lock:
+            self.stages.append({"stage": stage, "duration_ms": seconds * 1000, **labels})
+
+    def record_source(self, query_type: str, source: str):
+        """记录报表的数据来源（disk / upstream / stale）"""
+        with self._lock:
+            self.sources[query_type] = source
+
+    def elapsed_ms(self) -> float:
+        """从请求开始到现在的耗时（毫秒）"""
+        return (time.perf_counter() - self._start) * 1000
+
+    def stage_totals(self) -> Dict[str, float]:
+        """按阶段汇总的耗时（毫秒），保持阶段首次出现的顺序"""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for entry in self.stages:
+                totals[entry["stage"]] = totals.get(entry["stage"], 0.0) + entry["duration_ms"]
+        return totals
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing 响应头
+
+        如 `cache_lookup;dur=0.42, upstream;dur=812.30, total;dur=815.10, cache;desc="a_stock_balance=upstream"`
+        """
+        entries = [f"{stage};dur={duration:.2f}" for stage, duration in self.stage_totals().items()]
+        entries.append(f"total;dur={self.elapsed_ms():.2f}")
+        with self._lock:
+            sources = " ".join(f"{query_type}={source}" for query_type, source in sorted(self.sources.items()))
+        if sources:
+            entries.append(f'cache;desc="{sources}"')
+        return ", ".join(entries)
+
+    def explain(self) -> Dict[str, Any]:
+        """结构化的耗时和数据来源（用于 explain=true）"""
+        with self._lock:
+            stages = [dict(entry, duration_ms=round(entry["duration_ms"], 3)) for entry in self.stages]
+            sources = dict(self.sources)
+        return {
+            "total_ms": round(self.elapsed_ms(), 3),
+            "stage_totals_ms": {stage: round(ms, 3) for stage, ms in self.stage_totals().items()},
+            "stages": stages,
+            "cache_sources": sources,
+        }
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """当前请求的耗时明细（不在请求上下文中时为 None）"""
+    return _current.get()
+
+
+@contextmanager
+def collect_request_timings() -> Iterator[RequestTimings]:
+    """在代码块内收集耗时明细"""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def record_cache_source(query_type: str, source: str):
+    """记录当前请求中某张报表的数据来源"""
+    timings = _current.get()
+    if timings is not None:
+        timings.record_source(query_type, source)
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, Any]:
+    """
+    解析 Server-Timing 响应头
+
+    Returns:
+        {"stages": {阶段: 毫秒}, "total_ms": 毫秒或None, "cache_sources": {查询类型: 来源}}
+    """
+    result: Dict[str, Any] = {"stages": {}, "total_ms": None, "cache_sources": {}}
+    for entry in (header or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        if not name:
+            continue
+        values = dict(param.strip().partition("=")[::2] for param in params.split(";") if param.strip())
+        if name == "cache":
+            desc = values.get("desc", "").strip('"')
+            result["cache_sources"] = dict(item.partition("=")[::2] for item in desc.split() if "=" in item)
+        elif "dur" in values:
+            duration = float(values["dur"])
+            if name == "total":
+                result["total_ms"] = duration
+            else:
+                result["stages"][name] = duration
+    return result
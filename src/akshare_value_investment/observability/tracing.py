@@ -0,0 +1,268 @@
+"""
+请求链路追踪（Chrome trace-event 格式）
+
+`/metrics` 和 Server-Timing 只能看到各阶段的耗时，调优三表并发获取时还需要知道这些阶段
+在哪个线程上、以什么顺序、彼此如何重叠。本模块记录嵌套的 span，一次追踪（trace）结束时
+写成 Chrome trace-event JSON 文件，可直接拖入 Perfetto（https://ui.perfetto.dev）或
+chrome://tracing 查看，不需要任何外部采集服务。
+
+span 的父子关系通过 ContextVar 传递：上游调用、三表并发获取、对冲请求提交到线程池时都用
+`contextvars.copy_context().run`，所以跨线程的子 span 仍挂在同一次追踪下；子 span 与父 span
+不在同一线程时额外写入 flow 事件，在 Perfetto 中显示为跨线程的箭头。
+
+## 采样
+
+- `AKSHARE_TRACE_SAMPLE_RATE`: 根 span 的采样率（0~1），默认 0 即关闭
+- 请求头 `X-Trace: 1`（或 `span(..., force=True)`）强制追踪单个请求
+- `AKSHARE_TRACE_DIR`: 追踪文件目录，默认 `.cache/traces`
+- `AKSHARE_TRACE_MAX_FILES`: 最多保留的追踪文件数（超出时删除最旧的），默认 200
+
+未采样的根 span 会让其内部的所有 span 都不记录，关闭时每个 span 的开销只是一次 ContextVar 读取。
+
+```python
+from akshare_value_investment.observability.tracing import span, traced
+
+with span("query_financial_statements", category="service", symbol="600519"):
+    ...
+
+@traced("queryer.query", category="queryer")
+def query(...): ...
+```
+"""
+
+import functools
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_DIR = ".cache/traces"
+DEFAULT_MAX_FILES = 200
+
+
+class Trace:
+    """一次追踪：根 span 及其全部子 span 的事件"""
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.events: List[Dict[str, Any]] = []
+        self.finished = False
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, event: Dict[str, Any]):
+        """加入事件（追踪结束后到达的事件丢弃，例如超时后仍在运行的上游调用）"""
+        thread = threading.current_thread()
+        with self._lock:
+            if self.finished:
+                return
+            if event["tid"] == thread.ident:
+                self._threads.setdefault(event["tid"], thread.name)
+            self.events.append(event)
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """结束追踪，返回按时间排序的事件（含线程名元数据）"""
+        with self._lock:
+            self.finished = True
+            events = sorted(self.events, key=lambda e: e["ts"])
+            threads = dict(self._threads)
+        pid = os.getpid()
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        return metadata + events
+
+
+class Span:
+    """已开始的 span（由 `span()` 返回）"""
+
+    __slots__ = ("trace", "span_id", "name", "category", "args", "parent", "start_us", "tid")
+
+    def __init__(self, trace: Trace, name: str, category: str, args: Dict[str, Any],
+                 parent: Optional["Span"]):
+        self.trace = trace
+        self.span_id = next(_span_ids)
+        self.name = name
+        self.category = category
+        self.args = args
+        self.parent = parent
+        self.start_us = _now_us()
+        self.tid = threading.get_ident()
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set(self, **args):
+        """补充 span 参数（如结果记录数）"""
+        self.args.update(args)
+
+
+# 未采样的根 span 在其作用域内放入该标记，内部 span 据此跳过记录，而不是各自重新采样
+_UNSAMPLED = object()
+
+_current: ContextVar[Union[Span, object, None]] = ContextVar("trace_span", default=None)
+_span_ids = itertools.count(1)
+
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000
+
+
+class ChromeTraceFileExporter:
+    """把每次追踪写成一个 Chrome trace-event JSON 文件"""
+
+    def __init__(self, directory: Union[str, Path, None] = None, max_files: Optional[int] = None):
+        """
+        Args:
+            directory: 输出目录，默认环境变量 AKSHARE_TRACE_DIR 或 .cache/traces
+            max_files: 最多保留的文件数，默认环境变量 AKSHARE_TRACE_MAX_FILES 或 200
+        """
+        self.directory = Path(directory or os.environ.get("AKSHARE_TRACE_DIR", DEFAULT_TRACE_DIR))
+        self.max_files = max_files if max_files is not None else int(
+            os.environ.get("AKSHARE_TRACE_MAX_FILES", str(DEFAULT_MAX_FILES)))
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace, events: List[Dict[str, Any]]) -> Path:
+        """写出追踪文件并清理超出数量的旧文件"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{trace.trace_id}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"trace_id": trace.trace_id}}, f, ensure_ascii=False, default=str)
+        self._prune()
+        return path
+
+    def _prune(self):
+        with self._lock:
+            files = sorted(self.directory.glob("trace-*.json"), key=lambda p: p.stat().st_mtime)
+            for old in files[:max(len(files) - self.max_files, 0)]:
+                old.unlink(missing_ok=True)
+
+
+class _Config:
+    def __init__(self):
+        self.sample_rate = float(os.environ.get("AKSHARE_TRACE_SAMPLE_RATE", "0"))
+        self.exporter = None
+
+
+_config = _Config()
+
+
+def configure_tracing(sample_rate: Optional[float] = None, exporter=None):
+    """
+    调整追踪配置（主要用于测试和脚本）
+
+    Args:
+        sample_rate: 根 span 采样率（0~1）
+        exporter: 导出器，需提供 `export(trace, events)`；None 表示保持不变
+    """
+    if sample_rate is not None:
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("采样率必须在0到1之间")
+        _config.sample_rate = sample_rate
+    if exporter is not None:
+        _config.exporter = exporter
+
+
+def _get_exporter():
+    if _config.exporter is None:
+        _config.exporter = ChromeTraceFileExporter()
+    return _config.exporter
+
+
+def current_span() -> Optional[Span]:
+    """当前正在记录的 span（未追踪时为 None）"""
+    current = _current.get()
+    return current if isinstance(current, Span) else None
+
+
+class span:
+    """
+    记录一个 span 的上下文管理器
+
+    没有父 span 时按采样率决定是否开始新的追踪；`with` 返回 `Span`，未记录时返回 None。
+    """
+
+    __slots__ = ("name", "category", "args", "force", "_span", "_token")
+
+    def __init__(self, name: str, category: str = "app", force: bool = False, **args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.force = force
+        self._span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> Optional[Span]:
+        parent = _current.get()
+        if parent is _UNSAMPLED:
+            return None
+        if parent is None:
+            if not (self.force or (_config.sample_rate and random.random() < _config.sample_rate)):
+                self._token = _current.set(_UNSAMPLED)
+                return None
+            trace = Trace()
+        else:
+            trace = parent.trace
+
+        self._span = Span(trace, self.name, self.category, self.args, parent)
+        self._token = _current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._token is not None:
+            _current.reset(self._token)
+        current = self._span
+        if current is None:
+            return False
+
+        end_us = _now_us()
+        args = dict(current.args, span_id=current.span_id)
+        if exc_type is not None:
+            args["error"] = f"{exc_type.__name__}: {exc}"
+        pid = os.getpid()
+        current.trace.add({
+            "name": current.name, "cat": current.category, "ph": "X", "pid": pid, "tid": current.tid,
+            "ts": current.start_us, "dur": end_us - current.start_us, "args": args,
+        })
+
+        parent = current.parent
+        if parent is not None and parent.tid != current.tid:
+            # 跨线程：从父 span 所在线程指向子 span 的 flow 箭头
+            flow = {"name": "thread hop", "cat": "flow", "id": current.span_id, "pid": pid, "ts": current.start_us}
+            current.trace.add(dict(flow, ph="s", tid=parent.tid))
+            current.trace.add(dict(flow, ph="f", bp="e", tid=current.tid))
+
+        if parent is None:
+            try:
+                path = _get_exporter().export(current.trace, current.trace.finish())
+                logger.debug("追踪已写入: %s", path)
+            except Exception:
+                logger.warning("写入追踪文件失败", exc_info=True)
+        return False
+
+
+def traced(name: Optional[str] = None, category: str = "app") -> Callable:
+    """把函数调用记录为 span 的装饰器（默认以函数的限定名作为 span 名称）"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, category=category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,107 @@
+"""
+条件请求测试
+
+测试 GET 查询接口的 ETag、Cache-Control 和 If-None-Match → 304。
+"""
+
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from akshare_value_investment.api.dependencies import get_financial_service
+from akshare_value_investment.api.main import create_app
+from akshare_value_investment.api.utils.http_cache import cache_control, compute_etag, etag_matches
+
+STATEMENTS_URL = "/api/v1/financial/statements"
+INDICATORS_URL = "/api/v1/financial/indicators"
+STATEMENTS_PARAMS = {"symbol": "SH600519", "query_type": "a_financial_statements"}
+
+
+class TestConditionalRequests:
+    """条件请求路由测试"""
+
+    @pytest.fixture
+    def financial_service(self):
+        """Mock 财务查询服务"""
+        service = Mock()
+        service.query_financial_statements.side_effect = lambda **kwargs: {
+            "balance_sheet": pd.DataFrame([{"date": "2023-12-31", "货币资金": 100}]),
+        }
+        service.query.side_effect = lambda **kwargs: {
+            "status": "success",
+            "timestamp": pd.Timestamp.now().isoformat(),
+            "data": {"records": [{"ROE": 0.3}]},
+        }
+        return service
+
+    @pytest.fixture
+    def client(self, financial_service):
+        """创建注入 Mock 服务的测试客户端"""
+        app = create_app()
+        app.dependency_overrides[get_financial_service] = lambda: financial_service
+        return TestClient(app)
+
+    def test_statements_etag_and_cache_control(self, client):
+        response = client.get(STATEMENTS_URL, params=STATEMENTS_PARAMS)
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"] == cache_control()
+        assert response.json()["data"]["balance_sheet"]["record_count"] == 1
+
+    def test_if_none_match_returns_304(self, client):
+        etag = client.get(STATEMENTS_URL, params=STATEMENTS_PARAMS).headers["etag"]
+
+        response = client.get(STATEMENTS_URL, params=STATEMENTS_PARAMS, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_etag_changes_with_params_and_data(self, client, financial_service):
+        etag = client.get(STATEMENTS_URL, params=STATEMENTS_PARAMS).headers["etag"]
+        limited = client.get(STATEMENTS_URL, params={**STATEMENTS_PARAMS, "limit": 1}).headers["etag"]
+        assert limited != etag
+
+        financial_service.query_financial_statements.side_effect = lambda **kwargs: {
+            "balance_sheet": pd.DataFrame([{"date": "2023-12-31", "货币资金": 200}]),
+        }
+        response = client.get(STATEMENTS_URL, params=STATEMENTS_PARAMS, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_indicators_etag_ignores_timestamp(self, client):
+        params = {"symbol": "SH600519", "market": "a_stock"}
+        first = client.get(INDICATORS_URL, params=params)
+        second = client.get(INDICATORS_URL, params=params, headers={"If-None-Match": first.headers["etag"]})
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+
+    def test_error_responses_not_cacheable(self, client, financial_service):
+        financial_service.query.side_effect = lambda **kwargs: {"status": "error", "error": {"message": "无数据"}}
+
+        response = client.get(INDICATORS_URL, params={"symbol": "SH600519", "market": "a_stock"})
+
+        assert response.json()["status"] == "error"
+        assert "etag" not in response.headers
+        assert "cache-control" not in response.headers
+
+
+class TestEtagHelpers:
+    """ETag 工具函数测试"""
+
+    def test_compute_etag_ignores_param_order(self):
+        payload = {"status": "success", "data": [1, 2]}
+        assert compute_etag("/p", {"a": 1, "b": 2}, payload) == compute_etag("/p", {"b": 2, "a": 1}, payload)
+        assert compute_etag("/p", {"a": 1}, payload) != compute_etag("/q", {"a": 1}, payload)
+
+    def test_etag_matches(self):
+        assert etag_matches('"x"', '"x"')
+        assert etag_matches('W/"x"', '"x"')
+        assert etag_matches('"y", "x"', '"x"')
+        assert etag_matches("*", '"x"')
+        assert not etag_matches(None, '"x"')
+        assert not etag_matches('"y"', '"x"')
@@ -0,0 +1,119 @@
+"""
+存活与就绪探针测试
+
+覆盖 /livez、/readyz 的各项检查（缓存、线程池、熔断器、预热覆盖率），
+以及探针复用进程内共享的容器。
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from akshare_value_investment.api import dependencies
+from akshare_value_investment.api.main import create_app
+from akshare_value_investment.api.readiness import executor_stats
+from akshare_value_investment.datasource.resilience import get_circuit_breaker
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("AKSHARE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("AKSHARE_WARM_SYMBOLS", raising=False)
+    monkeypatch.delenv("AKSHARE_READY_MIN_WARM_COVERAGE", raising=False)
+    return TestClient(create_app())
+
+
+class TestLiveness:
+    """测试存活探针"""
+
+    def test_livez_does_not_touch_container(self, client):
+        with patch.object(dependencies, "create_container", side_effect=AssertionError("不应创建容器")):
+            response = client.get("/livez")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+
+class TestReadiness:
+    """测试就绪探针"""
+
+    def test_ready(self, client):
+        body = client.get("/readyz").json()
+
+        assert body["status"] == "ready"
+        assert body["checks"]["cache"] == {"ok": True}
+        assert body["checks"]["warm_cache"] == {"configured": False}
+        assert set(body["checks"]["executors"]) == {"upstream", "hedge", "statement_group"}
+
+    def test_container_built_once(self, client):
+        with patch.object(dependencies, "create_container", wraps=dependencies.create_container) as create:
+            for _ in range(5):
+                client.get("/readyz")
+                client.get("/health")
+
+        assert create.call_count == 1
+
+    def test_open_breaker_is_degraded(self, client):
+        breaker = get_circuit_breaker("ths")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        response = client.get("/readyz")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "degraded"
+        assert response.json()["checks"]["circuit_breakers"]["ths"] == "open"
+
+    def test_unreadable_cache(self, client):
+        container = dependencies.get_container()
+        with patch.object(container.diskcache(), "get", side_effect=OSError("磁盘不可用")):
+            response = client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+        assert "缓存不可读" in response.json()["reasons"]
+
+    def test_warm_coverage(self, client, monkeypatch):
+        monkeypatch.setenv("AKSHARE_WARM_SYMBOLS", "SH600519,00700")
+        monkeypatch.setenv("AKSHARE_READY_MIN_WARM_COVERAGE", "0.5")
+        cache = dependencies.get_container().diskcache()
+        for key in ("a_stock_indicators", "a_stock_balance", "a_stock_profit", "a_stock_cashflow"):
+            cache.set(f"{key}:600519", pd.DataFrame({"x": [1]}))
+
+        body = client.get("/readyz").json()
+        assert body["status"] == "ready"
+        assert body["checks"]["warm_cache"]["coverage"] == 0.5
+        assert body["checks"]["warm_cache"]["cold_symbols"] == ["00700"]
+
+        monkeypatch.setenv("AKSHARE_READY_MIN_WARM_COVERAGE", "0.9")
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert "预热覆盖率" in response.json()["reasons"][0]
+
+
+class TestExecutorStats:
+    """测试线程池统计"""
+
+    def test_not_started(self):
+        assert executor_stats(None)["started"] is False
+
+    def test_busy_and_queued(self):
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            for _ in range(4):
+                executor.submit(release.wait, 5)
+
+            stats = executor_stats(executor)
+
+            assert stats["busy"] == 2
+            assert stats["queued"] == 2
+            assert stats["saturation"] == 2.0
+            assert stats["overloaded"] is True
+        finally:
+            release.set()
+            executor.shutdown()
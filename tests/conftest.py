@@ -616,6 +616,39 @@ def clear_project_cache():
         shutil.move(backup_cache, project_cache)
 
 
+@pytest.fixture(autouse=True, scope="function")
+def reset_resilience_state(request, monkeypatch):
+    """
+    自动重置熔断器、指标和 API 共享容器的fixture（每个测试前后执行）
+
+    熔断器和指标注册表是进程级状态，避免一个测试中的上游失败导致后续测试被熔断；
+    API 共享容器持有 diskcache 连接，避免测试之间复用已删除的缓存目录。
+    上游调用默认不重试、不退避，访问不到网络的测试立即失败而不是等完重试；
+    需要真实重试策略的测试标记 `real_retries`。
+    """
+    import dataclasses
+
+    from akshare_value_investment.api.dependencies import reset_container
+    from akshare_value_investment.datasource import resilience
+    from akshare_value_investment.datasource.resilience import reset_circuit_breakers
+    from akshare_value_investment.observability.metrics import REGISTRY
+
+    if request.node.get_closest_marker("real_retries") is None:
+        monkeypatch.setenv("AKSHARE_UPSTREAM_MAX_RETRIES", "0")
+        monkeypatch.setattr(resilience, "DEFAULT_POLICIES", {
+            source: dataclasses.replace(policy, max_retries=0, backoff_base=0.0)
+            for source, policy in resilience.DEFAULT_POLICIES.items()
+        })
+
+    reset_circuit_breakers()
+    REGISTRY.reset()
+    reset_container()
+    yield
+    reset_circuit_breakers()
+    REGISTRY.reset()
+    reset_container()
+
+
 @pytest.fixture
 def test_cache(temp_cache_dir):
     """创建测试专用的diskcache实例"""
@@ -0,0 +1,180 @@
+"""
+东方财富数据中心本地回放服务
+
+按 reportName + 证券代码回放录制的接口响应，供异步获取器的一致性测试和离线压测使用。
+录制数据由 sample_data 中的港股/美股样本 CSV 构造（与真实接口返回字段一致）。
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+SAMPLE_DATA_DIR = os.path.join(os.path.dirname(__file__), "sample_data")
+
+_CODE_PATTERN = re.compile(r'SECU(?:RITY_)?CODE="([^"]+)"')
+
+HK_STATEMENT_FILES = {
+    "RPT_HKF10_FN_BALANCE_PC": "balance_sheet",
+    "RPT_HKF10_FN_INCOME_PC": "income_statement",
+    "RPT_HKF10_FN_CASHFLOW_PC": "cash_flow",
+}
+
+US_STATEMENT_FILES = {
+    "RPT_USF10_FN_BALANCE": "balance_sheet",
+    "RPT_USF10_FN_INCOME": "income_statement",
+    "RPT_USSK_FN_CASHFLOW": "cash_flow",
+}
+
+
+def _records(filename: str) -> List[dict]:
+    """读取样本 CSV 为接口记录（字符串字段保持原样，AMOUNT 等数值字段为浮点数）"""
+    df = pd.read_csv(os.path.join(SAMPLE_DATA_DIR, filename), dtype=str, keep_default_na=False,
+                     encoding="utf-8-sig")
+    records = df.to_dict(orient="records")
+    for record in records:
+        for key, value in record.items():
+            if value == "":
+                record[key] = None
+            elif key == "AMOUNT":
+                record[key] = float(value)
+    return records
+
+
+def _sample_file(market: str, symbol: str, statement: str) -> str:
+    return f"{market}_{symbol}_{statement}_20251218.csv"
+
+
+def build_recorded_responses(hk_symbols=("00700", "09988"),
+                             us_symbols=("AAPL", "MSFT")) -> Dict[Tuple[str, str], List[dict]]:
+    """
+    构造录制响应：{(reportName, 证券代码): data 列表}
+
+    证券代码取自请求 filter 中的 SECUCODE / SECURITY_CODE。
+    """
+    responses: Dict[Tuple[str, str], List[dict]] = {}
+
+    for symbol in hk_symbols:
+        secucode = f"{symbol}.HK"
+        for report_name, statement in HK_STATEMENT_FILES.items():
+            responses[(report_name, secucode)] = _records(_sample_file("hk", symbol, statement))
+
+        # 报告期列表：财务摘要接口的 REPORT_LIST
+        balance = responses[("RPT_HKF10_FN_BALANCE_PC", secucode)]
+        report_dates = sorted({row["REPORT_DATE"] for row in balance}, reverse=True)
+        responses[("RPT_CUSTOM_HKSK_APPFN_CASHFLOW_SUMMARY", secucode)] = [{
+            "SECUCODE": secucode,
+            "SECURITY_CODE": symbol,
+            "REPORT_LIST": [
+                {"REPORT_DATE": date, "FISCAL_YEAR": "12-31", "CURRENCY": "HKD",
+                 "ACCOUNT_STANDARD": "IFRS", "REPORT_TYPE": "年报"}
+                for date in report_dates
+            ],
+        }]
+
+    indicators = _records("hk_stock_indicators_sample.csv")
+    for row in indicators:
+        responses.setdefault(("RPT_HKF10_FN_MAININDICATOR", row["SECUCODE"]), []).append(row)
+
+    for symbol in us_symbols:
+        statements = {report_name: _records(_sample_file("us", symbol, statement))
+                      for report_name, statement in US_STATEMENT_FILES.items()}
+        secucode = next(iter(statements.values()))[0]["SECUCODE"]
+        responses[("RPT_USF10_INFO_ORGPROFILE", symbol)] = [{"SECUCODE": secucode, "SECURITY_CODE": symbol}]
+
+        for report_name, rows in statements.items():
+            # 报告期列表与报表数据共用 reportName，按 columns 区分（见 EastmoneyReplayServer）
+            responses[(report_name, secucode)] = rows
+            responses[(report_name + ":REPORT_LIST", secucode)] = [
+                {"SECUCODE": secucode, "REPORT": report, "REPORT_DATE": date}
+                for report, date in sorted({(row["REPORT"], row["REPORT_DATE"]) for row in rows}, reverse=True)
+            ]
+
+    us_indicators = _records("us_stock_indicators_sample.csv")
+    for row in us_indicators:
+        responses.setdefault(("RPT_USF10_FN_GMAININDICATOR", row["SECUCODE"]), []).append(row)
+
+    return responses
+
+
+class EastmoneyReplayServer:
+    """
+    本地回放服务
+
+    - 未录制的请求返回 `{"result": null}`（与真实接口查无数据时一致）
+    - `requests` 记录收到的每个请求的查询参数，用于比对请求是否与 akshare 一致
+    - `latency` 为每个响应附加的延迟（秒），用于模拟网络往返
+    """
+
+    def __init__(self, responses: Optional[Dict[Tuple[str, str], List[dict]]] = None,
+                 latency: float = 0.0):
+        self.responses = responses if responses is not None else build_recorded_responses()
+        self.latency = latency
+        self.requests: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/securities/api/data/v1/get"
+
+    def start(self) -> "EastmoneyReplayServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "EastmoneyReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def lookup(self, params: Dict[str, str]) -> Optional[List[dict]]:
+        report_name = params.get("reportName", "")
+        match = _CODE_PATTERN.search(params.get("filter", ""))
+        code = match.group(1) if match else ""
+        if "REPORT,REPORT_DATE,FISCAL_YEAR" in params.get("columns", ""):
+            report_name += ":REPORT_LIST"
+        return self.responses.get((report_name, code))
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                params = dict(parse_qsl(urlsplit(self.path).query, keep_blank_values=True))
+                with server._lock:
+                    server.requests.append(params)
+                if server.latency:
+                    time.sleep(server.latency)
+
+                data = server.lookup(params)
+                payload = {"success": data is not None,
+                           "result": {"pages": 1, "data": data, "count": len(data)} if data is not None else None}
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,264 @@
+"""
+API 客户端测试
+
+使用 httpx.MockTransport 模拟 API 服务，验证连接复用、重试、批量请求去重、本地响应缓存，
+以及服务端 GZip 压缩。
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from akshare_value_investment.api.main import create_app
+from akshare_value_investment.client import (
+    FINANCIAL_INDICATORS_PATH,
+    FINANCIAL_STATEMENTS_PATH,
+    ApiClient,
+    ApiConnectionError,
+    ApiTimeoutError,
+    AsyncApiClient,
+    ResponseCache,
+)
+
+
+class FakeApi:
+    """记录请求并按预设序列返回响应的模拟服务"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0) if self.outcomes else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"path": request.url.path, "params": dict(request.url.params)})
+
+    def paths(self):
+        return [request.url.path for request in self.requests]
+
+
+def make_client(api: FakeApi, **options) -> ApiClient:
+    options.setdefault("backoff", 0)
+    return ApiClient("http://api.test", transport=httpx.MockTransport(api), **options)
+
+
+def make_async_client(api: FakeApi, **options) -> AsyncApiClient:
+    options.setdefault("backoff", 0)
+    return AsyncApiClient("http://api.test", transport=httpx.MockTransport(api), **options)
+
+
+class TestApiClient:
+    """测试同步客户端"""
+
+    def test_financial_statements(self):
+        api = FakeApi()
+        with make_client(api) as client:
+            response = client.financial_statements("600519", "a_financial_statements")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "path": FINANCIAL_STATEMENTS_PATH,
+            "params": {"symbol": "600519", "query_type": "a_financial_statements", "frequency": "annual"},
+        }
+        assert "gzip" in api.requests[0].headers["accept-encoding"]
+
+    def test_none_params_dropped(self):
+        api = FakeApi()
+        with make_client(api) as client:
+            client.get(FINANCIAL_INDICATORS_PATH, {"symbol": "AAPL", "market": None})
+        assert dict(api.requests[0].url.params) == {"symbol": "AAPL"}
+
+    def test_retries_transient_failures(self):
+        api = FakeApi(httpx.ConnectError("refused"), 503, 200)
+        with make_client(api, max_retries=2) as client:
+            assert client.get("/health").status_code == 200
+        assert len(api.requests) == 3
+
+    def test_client_errors_not_retried(self):
+        api = FakeApi(404)
+        with make_client(api) as client:
+            assert client.get("/health").status_code == 404
+        assert len(api.requests) == 1
+
+    def test_last_retryable_status_returned(self):
+        api = FakeApi(503, 503)
+        with make_client(api, max_retries=1) as client:
+            assert client.get("/health").status_code == 503
+
+    def test_connection_and_timeout_errors(self):
+        with make_client(FakeApi(httpx.ConnectError("refused")), max_retries=0) as client:
+            with pytest.raises(ApiConnectionError):
+                client.get("/health")
+        with make_client(FakeApi(httpx.ReadTimeout("slow")), max_retries=0) as client:
+            with pytest.raises(ApiTimeoutError):
+                client.get("/health")
+
+    def test_response_cache(self):
+        api = FakeApi(200, 500)
+        with make_client(api, cache=ResponseCache(ttl=60)) as client:
+            first = client.financial_indicators("00700", "hk_stock")
+            second = client.get(FINANCIAL_INDICATORS_PATH,
+                                {"frequency": "annual", "market": "hk_stock", "symbol": "00700"})
+            third = client.financial_indicators("00700", "us_stock")
+
+        assert len(api.requests) == 2
+        assert second.json() == first.json()
+        assert second.headers["x-client-cache"] == "hit"
+        assert third.status_code == 500
+
+    def test_error_responses_not_cached(self):
+        api = FakeApi(500, 200)
+        with make_client(api, cache=ResponseCache(ttl=60)) as client:
+            assert client.get("/health").status_code == 500
+            assert client.get("/health").status_code == 200
+        assert len(api.requests) == 2
+
+    def test_revalidates_expired_entries_with_etag(self):
+        now = [0.0]
+        seen = []
+
+        def api(request):
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"etag": '"v1"'})
+            return httpx.Response(200, json={"version": 1}, headers={"etag": '"v1"'})
+
+        cache = ResponseCache(ttl=10, clock=lambda: now[0])
+        with ApiClient("http://api.test", transport=httpx.MockTransport(api), cache=cache) as client:
+            first = client.get("/data")
+            now[0] = 10
+            second = client.get("/data")
+            third = client.get("/data")
+
+        assert seen == [None, '"v1"']
+        assert second.status_code == 200
+        assert second.json() == first.json() == {"version": 1}
+        assert second.headers["x-client-cache"] == "revalidated"
+        assert third.headers["x-client-cache"] == "hit"
+        assert cache.revalidated == 1
+
+    def test_refetches_when_entry_evicted_during_revalidation(self):
+        now = [0.0]
+        seen = []
+        cache = ResponseCache(ttl=10, maxsize=1, clock=lambda: now[0])
+
+        def api(request):
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                # 请求在途时另一个请求写入缓存，淘汰了正在重新验证的条目
+                cache.set(("/other", ()), b"{}")
+                return httpx.Response(304, headers={"etag": '"v1"'})
+            return httpx.Response(200, json={"version": 1}, headers={"etag": '"v1"'})
+
+        with ApiClient("http://api.test", transport=httpx.MockTransport(api), cache=cache) as client:
+            client.get("/data")
+            now[0] = 10
+            response = client.get("/data")
+
+        assert seen == [None, '"v1"', None]
+        assert response.status_code == 200
+        assert response.json() == {"version": 1}
+        assert cache.get(("/data", ())) is not None
+
+    def test_get_many_deduplicates_and_keeps_order(self):
+        api = FakeApi()
+        requests = [
+            (FINANCIAL_STATEMENTS_PATH, {"symbol": "600519"}),
+            (FINANCIAL_INDICATORS_PATH, {"symbol": "600519"}),
+            (FINANCIAL_STATEMENTS_PATH, {"symbol": "600519"}),
+        ]
+        with make_client(api) as client:
+            responses = client.get_many(requests)
+
+        assert sorted(api.paths()) == sorted([FINANCIAL_STATEMENTS_PATH, FINANCIAL_INDICATORS_PATH])
+        assert [r.json()["path"] for r in responses] == [path for path, _ in requests]
+        assert responses[0] is responses[2]
+
+
+class TestAsyncApiClient:
+    """测试异步客户端"""
+
+    def test_get_many(self):
+        api = FakeApi(httpx.ConnectError("refused"))
+
+        async def run():
+            async with make_async_client(api, cache=ResponseCache()) as client:
+                responses = await client.get_many([
+                    (FINANCIAL_STATEMENTS_PATH, {"symbol": "00700"}),
+                    (FINANCIAL_STATEMENTS_PATH, {"symbol": "00700"}),
+                ])
+                cached = await client.financial_indicators("00700", "hk_stock")
+                cached_again = await client.financial_indicators("00700", "hk_stock")
+                return responses, cached, cached_again
+
+        responses, cached, cached_again = asyncio.run(run())
+        assert [r.status_code for r in responses] == [200, 200]
+        assert len(api.requests) == 3  # 一次重试 + 两个不同请求
+        assert cached_again.headers["x-client-cache"] == "hit"
+        assert cached_again.json() == cached.json()
+
+    def test_timeout_error(self):
+        async def run():
+            async with make_async_client(FakeApi(httpx.ReadTimeout("slow")), max_retries=0) as client:
+                await client.get("/health")
+
+        with pytest.raises(ApiTimeoutError):
+            asyncio.run(run())
+
+
+class TestResponseCache:
+    """测试本地响应缓存"""
+
+    def test_ttl_and_lru(self):
+        now = [0.0]
+        cache = ResponseCache(ttl=10, maxsize=2, clock=lambda: now[0])
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        assert cache.get("a") == b"1"
+        cache.set("c", b"3")
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+        now[0] = 10
+        assert cache.get("a") is None
+        assert cache.hits == 1
+
+    def test_expired_entries_with_etag_kept_for_revalidation(self):
+        now = [0.0]
+        cache = ResponseCache(ttl=10, clock=lambda: now[0])
+        cache.set("a", b"1", etag='"e1"')
+        cache.set("b", b"2")
+
+        now[0] = 10
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.etag("a") == '"e1"'
+        assert cache.etag("b") is None
+
+        assert cache.refresh("a") == b"1"
+        assert cache.get("a") == b"1"
+        assert cache.refresh("missing") is None
+
+
+def test_server_gzip_compression():
+    """API 服务压缩较大的响应，客户端透明解压"""
+    app = create_app()
+    payload = {"records": [{"year": year, "value": "x" * 20} for year in range(200)]}
+
+    @app.get("/test/large")
+    async def large():
+        return payload
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with AsyncApiClient("http://api.test", transport=transport) as client:
+            return await client.get("/test/large")
+
+    response = asyncio.run(run())
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == payload
+    assert int(response.headers["content-length"]) < len(json.dumps(payload))
@@ -0,0 +1,88 @@
+"""
+基准测试套件测试
+
+覆盖计时统计、场景筛选、基线比较（回归门禁）和离线运行单个场景。
+"""
+
+import json
+
+import pytest
+
+from benchmarks import suite
+
+
+def result(**medians):
+    return {"results": {name: {"median_ms": value} for name, value in medians.items()}}
+
+
+class TestMeasure:
+    """测试计时"""
+
+    def test_calibrated_loop(self):
+        calls = []
+        stats = suite.measure(lambda: calls.append(1), repeat=3, min_time=0.001)
+
+        assert stats["repeat"] == 3
+        assert stats["number"] > 1
+        assert stats["min_ms"] <= stats["median_ms"]
+        assert len(calls) >= stats["number"] * 3
+
+    def test_setup_not_timed(self):
+        order = []
+        stats = suite.measure(lambda: order.append("run"), setup=lambda: order.append("setup"), repeat=2)
+
+        assert order == ["setup", "run", "setup", "run"]
+        assert stats["number"] == 1
+
+
+class TestCompare:
+    """测试基线比较"""
+
+    def test_statuses(self):
+        baseline = result(fast=1.0, slow=1.0, better=2.0, tiny=0.01, gone=1.0)
+        current = result(fast=1.1, slow=1.5, better=1.0, tiny=0.05, added=3.0)
+
+        rows = {row["name"]: row for row in suite.compare(baseline, current, threshold=20)}
+
+        assert rows["fast"]["status"] == "ok"
+        assert rows["slow"]["status"] == "regression"
+        assert rows["slow"]["change_pct"] == 50.0
+        assert rows["better"]["status"] == "improvement"
+        assert rows["tiny"]["status"] == "ok"  # 绝对差值低于 min_delta_ms
+        assert rows["gone"]["status"] == "missing"
+        assert rows["added"]["status"] == "new"
+
+    def test_compare_command_exit_code(self, tmp_path, capsys):
+        baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+        baseline.write_text(json.dumps(result(e2e=10.0)), encoding="utf-8")
+
+        current.write_text(json.dumps(result(e2e=11.0)), encoding="utf-8")
+        assert suite.main(["compare", str(baseline), str(current)]) == 0
+
+        current.write_text(json.dumps(result(e2e=13.0)), encoding="utf-8")
+        assert suite.main(["compare", str(baseline), str(current), "--threshold", "25"]) == 1
+        assert "e2e" in capsys.readouterr().out
+
+
+class TestRun:
+    """测试离线运行"""
+
+    def test_all_required_areas_covered(self):
+        names = [bench.name for bench in suite.BENCHMARKS]
+        for prefix in ("unit_converter.", "pivot.hk", "pivot.us", "filter.", "frequency.a", "frequency.us",
+                       "formatter.", "calculator.roic", "e2e.statements_a_cold", "e2e.statements_us_warm"):
+            assert any(name.startswith(prefix) for name in names), prefix
+        assert len(names) == len(set(names))
+
+    def test_run_selected(self):
+        benchmarks = suite.select("pivot.hk") + suite.select("e2e.statements_hk_cold")
+
+        report = suite.run(benchmarks, repeat=2, min_time=0.001)
+
+        assert set(report["results"]) == {"pivot.hk_balance_sheet", "e2e.statements_hk_cold"}
+        assert all(stats["median_ms"] > 0 for stats in report["results"].values())
+        assert report["python"]
+
+    def test_unknown_filter(self):
+        with pytest.raises(SystemExit):
+            suite.main(["run", "-k", "no-such-benchmark"])
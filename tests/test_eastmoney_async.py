@@ -0,0 +1,232 @@
+"""
+东方财富原生异步获取器单元测试
+
+在本地回放服务上比对 AsyncEastmoneyClient 与 akshare 的结果：同样的录制响应，
+两者必须产生完全相同的 DataFrame，并发出相同的请求参数。
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import akshare as ak
+import diskcache
+import httpx
+import pandas as pd
+import pytest
+import requests
+
+from akshare_value_investment.datasource import eastmoney_async
+from akshare_value_investment.datasource.eastmoney_async import AsyncEastmoneyClient
+from akshare_value_investment.datasource.queryers.hk_stock_queryers import (
+    HKStockBalanceSheetQueryer,
+    HKStockCashFlowQueryer,
+    HKStockIncomeStatementQueryer,
+)
+from akshare_value_investment.datasource.queryers.us_stock_queryers import (
+    USStockBalanceSheetQueryer,
+    USStockIncomeStatementQueryer,
+)
+from akshare_value_investment.datasource.resilience import UpstreamError, UpstreamTimeoutError
+
+from tests.eastmoney_stub import EastmoneyReplayServer
+
+HK_STATEMENTS = ["资产负债表", "利润表", "现金流量表"]
+US_STATEMENTS = ["资产负债表", "综合损益表", "现金流量表"]
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with EastmoneyReplayServer() as server:
+        yield server
+
+
+@pytest.fixture
+def stub(stub_server):
+    stub_server.requests.clear()
+    return stub_server
+
+
+@pytest.fixture
+def akshare_via_stub(stub):
+    """akshare 的东方财富请求改发到本地回放服务"""
+    real_get = requests.get
+
+    def redirected_get(url, *args, **kwargs):
+        return real_get(stub.url, *args, **kwargs)
+
+    # 两个 akshare 模块引用的是同一个 requests 模块
+    with patch.object(requests, "get", side_effect=redirected_get):
+        yield stub
+
+
+def run_client(stub, factory):
+    """在新的客户端上执行一次异步调用"""
+    async def runner():
+        async with AsyncEastmoneyClient(base_url=stub.url) as client:
+            return await factory(client)
+    return asyncio.run(runner())
+
+
+def request_set(requests_list):
+    return {tuple(sorted(params.items())) for params in requests_list}
+
+
+class TestFramesMatchAkshare:
+    """与 akshare 结果一致性测试"""
+
+    @pytest.mark.parametrize("stock", ["00700", "09988"])
+    @pytest.mark.parametrize("statement", HK_STATEMENTS)
+    def test_hk_report(self, akshare_via_stub, stock, statement):
+        expected = ak.stock_financial_hk_report_em(stock=stock, symbol=statement, indicator="年度")
+        akshare_requests = list(akshare_via_stub.requests)
+        akshare_via_stub.requests.clear()
+
+        result = run_client(akshare_via_stub, lambda c: c.hk_report(stock, statement, "年度"))
+
+        assert not expected.empty
+        pd.testing.assert_frame_equal(result, expected)
+        assert request_set(akshare_via_stub.requests) == request_set(akshare_requests)
+
+    def test_hk_indicator(self, akshare_via_stub):
+        expected = ak.stock_financial_hk_analysis_indicator_em(symbol="00700", indicator="年度")
+        result = run_client(akshare_via_stub, lambda c: c.hk_indicator("00700", "年度"))
+
+        assert not expected.empty
+        pd.testing.assert_frame_equal(result, expected)
+
+    @pytest.mark.parametrize("stock", ["AAPL", "MSFT"])
+    @pytest.mark.parametrize("statement", US_STATEMENTS)
+    def test_us_report(self, akshare_via_stub, stock, statement):
+        expected = ak.stock_financial_us_report_em(stock=stock, symbol=statement, indicator="年报")
+        akshare_requests = list(akshare_via_stub.requests)
+        akshare_via_stub.requests.clear()
+
+        result = run_client(akshare_via_stub, lambda c: c.us_report(stock, statement, "年报"))
+
+        assert not expected.empty
+        pd.testing.assert_frame_equal(result, expected)
+        assert request_set(akshare_via_stub.requests) == request_set(akshare_requests)
+
+    def test_us_indicator(self, akshare_via_stub):
+        expected = ak.stock_financial_us_analysis_indicator_em(symbol="AAPL", indicator="年报")
+        result = run_client(akshare_via_stub, lambda c: c.us_indicator("AAPL", "年报"))
+
+        assert not expected.empty
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_unknown_hk_statement_returns_empty(self, stub):
+        assert run_client(stub, lambda c: c.hk_report("00700", "股东权益表")).empty
+
+
+class TestSharedLookups:
+    """前置查询复用测试"""
+
+    def test_hk_group_requests_report_list_once(self, stub):
+        frames = run_client(stub, lambda c: c.hk_reports("00700", HK_STATEMENTS))
+
+        assert set(frames) == set(HK_STATEMENTS)
+        report_names = [params["reportName"] for params in stub.requests]
+        assert report_names.count("RPT_CUSTOM_HKSK_APPFN_CASHFLOW_SUMMARY") == 1
+        assert len(report_names) == 4
+
+    def test_us_group_queries_secucode_once(self, stub):
+        run_client(stub, lambda c: c.us_reports("AAPL", US_STATEMENTS))
+
+        report_names = [params["reportName"] for params in stub.requests]
+        assert report_names.count("RPT_USF10_INFO_ORGPROFILE") == 1
+        assert len(report_names) == 7
+
+    def test_high_concurrency_on_small_pool(self, stub):
+        stocks = ["00700", "09988"] * 50
+
+        async def fetch_all():
+            async with AsyncEastmoneyClient(base_url=stub.url, max_connections=8,
+                                            max_keepalive_connections=8) as client:
+                return await asyncio.gather(*(client.hk_report(stock, "利润表") for stock in stocks))
+
+        frames = asyncio.run(fetch_all())
+
+        assert len(frames) == 100
+        assert all(not frame.empty for frame in frames)
+
+
+class TestErrorTranslation:
+    """网络异常转换测试"""
+
+    def test_connection_refused_is_connection_error(self):
+        async def fetch():
+            async with AsyncEastmoneyClient(base_url="http://127.0.0.1:1/get") as client:
+                return await client.hk_report("00700")
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(fetch())
+
+    def test_timeout_is_upstream_timeout(self):
+        with EastmoneyReplayServer(latency=0.5) as slow:
+            async def fetch():
+                async with AsyncEastmoneyClient(base_url=slow.url, timeout=0.05) as client:
+                    return await client.hk_report("00700")
+
+            with pytest.raises(UpstreamTimeoutError):
+                asyncio.run(fetch())
+
+    @pytest.mark.parametrize("status, error", [
+        (503, ConnectionError),
+        (429, ConnectionError),
+        (404, UpstreamError),
+    ])
+    def test_error_status_is_not_decoded(self, status, error):
+        transport = httpx.MockTransport(lambda request: httpx.Response(status, text="<html>error</html>"))
+
+        async def fetch():
+            async with httpx.AsyncClient(transport=transport) as http:
+                return await AsyncEastmoneyClient(base_url="http://em.test/get", client=http).hk_report("00700")
+
+        with pytest.raises(error, match=f"HTTP {status}"):
+            asyncio.run(fetch())
+
+    def test_missing_report_list_is_upstream_error(self, stub):
+        with pytest.raises(UpstreamError):
+            run_client(stub, lambda c: c.hk_report("99999"))
+
+
+class TestQueryerIntegration:
+    """查询器原生异步模式测试"""
+
+    @pytest.fixture
+    def async_mode(self, stub, monkeypatch):
+        monkeypatch.setenv("AKSHARE_EASTMONEY_ASYNC", "1")
+        monkeypatch.setenv("AKSHARE_EASTMONEY_BASE_URL", stub.url)
+        eastmoney_async.reset_shared_client()
+        yield stub
+        eastmoney_async.reset_shared_client()
+
+    def test_hk_group_matches_akshare_path(self, async_mode, akshare_via_stub, temp_cache_dir, tmp_path):
+        async_cache = diskcache.Cache(temp_cache_dir)
+        balance = HKStockBalanceSheetQueryer(cache=async_cache).query("00700")
+        income = HKStockIncomeStatementQueryer(cache=async_cache).query("00700")
+        cash = HKStockCashFlowQueryer(cache=async_cache).query("00700")
+        assert len(async_mode.requests) == 4
+
+        async_mode.requests.clear()
+        with patch.dict("os.environ", {"AKSHARE_EASTMONEY_ASYNC": "0"}):
+            sync_cache = diskcache.Cache(str(tmp_path / "sync"))
+            expected = HKStockBalanceSheetQueryer(cache=sync_cache).query("00700")
+            expected_income = HKStockIncomeStatementQueryer(cache=sync_cache).query("00700")
+        assert len(async_mode.requests) == 6
+
+        pd.testing.assert_frame_equal(balance["data"], expected["data"])
+        pd.testing.assert_frame_equal(income["data"], expected_income["data"])
+        assert not cash["data"].empty
+
+    def test_us_group_matches_akshare_path(self, async_mode, akshare_via_stub, temp_cache_dir, tmp_path):
+        income = USStockIncomeStatementQueryer(cache=diskcache.Cache(temp_cache_dir)).query("AAPL")
+
+        with patch.dict("os.environ", {"AKSHARE_EASTMONEY_ASYNC": "0"}):
+            expected = USStockIncomeStatementQueryer(cache=diskcache.Cache(str(tmp_path / "sync"))).query("AAPL")
+
+        pd.testing.assert_frame_equal(income["data"], expected["data"])
+
+    def test_group_failure_propagates_to_own_query(self, async_mode, temp_cache_dir):
+        with pytest.raises(UpstreamError):
+            USStockBalanceSheetQueryer(cache=diskcache.Cache(temp_cache_dir)).query("ZZZZ")
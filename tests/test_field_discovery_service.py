@@ -18,6 +18,12 @@ from akshare_value_investment.business.field_discovery_service import FieldDisco
 from akshare_value_investment.core.models import MarketType
 
 
+@pytest.fixture
+def propagating_logs(monkeypatch):
+    """日志流水线接入的 logger 默认不向根 logger 传播，caplog 需要临时打开"""
+    monkeypatch.setattr(logging.getLogger("akshare_value_investment"), "propagate", True)
+
+
 class TestFieldDiscoveryService:
     """FieldDiscoveryService 测试类"""
 
@@ -398,7 +404,7 @@ class TestFieldDiscoveryService:
 
     # ==================== 日志验证测试 ====================
 
-    def test_logging_a_stock_discovery(self, caplog, mock_loader):
+    def test_logging_a_stock_discovery(self, caplog, propagating_logs, mock_loader):
         """测试A股字段发现的日志记录"""
         caplog.set_level(logging.INFO)
 
@@ -415,7 +421,7 @@ class TestFieldDiscoveryService:
         assert "发现A股财务指标字段，使用股票: SH600519" in caplog.text
         assert f"发现A股财务指标字段: {len(sample_data.columns)}个" in caplog.text
 
-    def test_logging_error_discovery(self, caplog):
+    def test_logging_error_discovery(self, caplog, propagating_logs):
         """测试字段发现失败的日志记录"""
         caplog.set_level(logging.ERROR)
 
@@ -429,7 +435,7 @@ class TestFieldDiscoveryService:
         # 验证错误日志
         assert "A股财务指标字段发现失败" in caplog.text
 
-    def test_logging_all_fields_discovery(self, caplog, mock_loader):
+    def test_logging_all_fields_discovery(self, caplog, propagating_logs, mock_loader):
         """测试全部字段发现的统计日志"""
         caplog.set_level(logging.INFO)
 
@@ -0,0 +1,243 @@
+"""
+多数据源对冲请求单元测试
+
+覆盖延迟直方图、对冲延迟计算、对冲/故障切换流程，以及东方财富报表到同花顺结构的映射。
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from akshare_value_investment.datasource.hedging import (
+    HedgePolicy,
+    get_hedge_policy,
+    hedged_call,
+    record_latency,
+)
+from akshare_value_investment.datasource.queryers.a_stock_sources import (
+    normalize_eastmoney_statement,
+    ths_statement_columns,
+    to_eastmoney_symbol,
+)
+from akshare_value_investment.datasource.resilience import configure_policy
+from akshare_value_investment.observability.metrics import REGISTRY, Histogram
+
+
+@pytest.fixture
+def release():
+    """用于释放挂起的模拟上游调用"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+class TestHistogram:
+    """直方图分位数估算测试"""
+
+    def test_quantile_interpolates_within_bucket(self):
+        histogram = Histogram("test_seconds", buckets=(1.0, 2.0, 4.0))
+        for value in [0.5] * 90 + [3.0] * 10:
+            histogram.observe(value)
+
+        assert histogram.count() == 100
+        assert histogram.quantile(0.5) == pytest.approx(0.5556, rel=1e-3)
+        assert 2.0 < histogram.quantile(0.95) <= 4.0
+
+    def test_quantile_empty_returns_none(self):
+        assert Histogram("empty_seconds").quantile(0.95) is None
+
+    def test_overflow_bucket_returns_largest_bound(self):
+        histogram = Histogram("overflow_seconds", buckets=(1.0, 2.0))
+        histogram.observe(100.0)
+        assert histogram.quantile(0.99) == 2.0
+
+
+class TestHedgePolicy:
+    """对冲延迟计算测试"""
+
+    def test_default_delay_without_samples(self):
+        policy = HedgePolicy(default_delay=3.0)
+        assert policy.delay_for("ths") == 3.0
+
+    def test_delay_follows_p95(self):
+        policy = HedgePolicy(min_samples=10, min_delay=0.0)
+        for _ in range(95):
+            record_latency("ths", 0.4)
+        for _ in range(5):
+            record_latency("ths", 7.0)
+
+        delay = policy.delay_for("ths")
+        assert 0.25 <= delay <= 0.5
+
+    def test_delay_is_clamped(self):
+        policy = HedgePolicy(min_samples=1, max_delay=5.0)
+        record_latency("ths", 50.0)
+        assert policy.delay_for("ths") == 5.0
+
+    def test_env_configuration(self, monkeypatch):
+        monkeypatch.setenv("AKSHARE_HEDGE_ENABLED", "0")
+        monkeypatch.setenv("AKSHARE_HEDGE_DELAY", "0.5")
+        policy = get_hedge_policy()
+        assert policy.enabled is False
+        assert policy.delay_for("ths") == 0.5
+
+
+class TestHedgedCall:
+    """对冲调用流程测试"""
+
+    def test_fast_primary_does_not_hedge(self):
+        alternate_calls = []
+        result = hedged_call(
+            [("ths", lambda: "ths"), ("eastmoney", lambda: alternate_calls.append(1))],
+            HedgePolicy(fixed_delay=1.0),
+        )
+        assert result == "ths"
+        assert alternate_calls == []
+
+    def test_slow_primary_is_hedged(self, release):
+        started = time.monotonic()
+        result = hedged_call(
+            [("ths", lambda: release.wait(5) and "ths"), ("eastmoney", lambda: "eastmoney")],
+            HedgePolicy(fixed_delay=0.05),
+        )
+        assert result == "eastmoney"
+        assert time.monotonic() - started < 2
+
+        hedges = REGISTRY.get("hedged_requests_total")
+        wins = REGISTRY.get("hedged_request_wins_total")
+        assert hedges.value(primary="ths", source="eastmoney", reason="slow") == 1
+        assert wins.value(primary="ths", source="eastmoney") == 1
+
+    def test_disabled_hedging_waits_for_primary(self):
+        def slow_primary():
+            time.sleep(0.1)
+            return "ths"
+
+        result = hedged_call(
+            [("ths", slow_primary), ("eastmoney", lambda: "eastmoney")],
+            HedgePolicy(enabled=False, fixed_delay=0.01),
+        )
+        assert result == "ths"
+
+    def test_failover_on_upstream_error(self):
+        def down():
+            raise ConnectionError("同花顺不可用")
+
+        result = hedged_call(
+            [("ths", down), ("eastmoney", lambda: "eastmoney")],
+            HedgePolicy(fixed_delay=10.0),
+        )
+        assert result == "eastmoney"
+
+    def test_all_sources_down_raises_last_error(self):
+        def down(message):
+            def call():
+                raise ConnectionError(message)
+            return call
+
+        with pytest.raises(ConnectionError, match="东方财富"):
+            hedged_call([("ths", down("同花顺")), ("eastmoney", down("东方财富"))],
+                        HedgePolicy(fixed_delay=10.0))
+
+    def test_non_upstream_error_is_not_failed_over(self):
+        alternate_calls = []
+
+        def broken():
+            raise KeyError("报告期")
+
+        with pytest.raises(KeyError):
+            hedged_call([("ths", broken), ("eastmoney", lambda: alternate_calls.append(1))],
+                        HedgePolicy(fixed_delay=10.0))
+        assert alternate_calls == []
+
+
+def make_eastmoney_balance_sheet() -> pd.DataFrame:
+    """构造东方财富资产负债表原始数据（单位：元）"""
+    return pd.DataFrame({
+        "SECUCODE": ["600519.SH", "600519.SH"],
+        "REPORT_DATE": ["2023-12-31 00:00:00", "2024-12-31 00:00:00"],
+        "MONETARYFUNDS": [6.9e10, 5.9296e10],
+        "TOTAL_ASSETS": [2.7e11, 2.98e11],
+        "SHORT_LOAN": [None, None],
+    })
+
+
+class TestEastmoneyStatementSource:
+    """东方财富报表映射测试"""
+
+    def test_to_eastmoney_symbol(self):
+        assert to_eastmoney_symbol("600519") == "SH600519"
+        assert to_eastmoney_symbol("000001") == "SZ000001"
+        assert to_eastmoney_symbol("SZ300750") == "SZ300750"
+
+    def test_normalize_balance_sheet(self):
+        result = normalize_eastmoney_statement(make_eastmoney_balance_sheet(), "balance")
+
+        assert list(result["报告期"]) == ["2024-12-31", "2023-12-31"]
+        assert result.loc[0, "货币资金"] == pytest.approx(592.96)
+        assert result.loc[0, "*资产合计"] == result.loc[0, "资产合计"] == pytest.approx(2980.0)
+        assert result.loc[0, "短期借款"] == 0.0
+        assert "SECUCODE" not in result.columns
+
+    def test_per_share_fields_not_scaled(self):
+        raw = pd.DataFrame({"REPORT_DATE": ["2024-12-31 00:00:00"], "BASIC_EPS": [68.64]})
+        result = normalize_eastmoney_statement(raw, "profit")
+        assert result.loc[0, "（一）基本每股收益"] == pytest.approx(68.64)
+
+    def test_empty_data(self):
+        assert normalize_eastmoney_statement(pd.DataFrame(), "cashflow").empty
+
+    def test_queryer_fails_over_to_eastmoney(self, test_container):
+        configure_policy("ths", max_retries=0)
+
+        with patch("akshare.stock_financial_debt_ths", side_effect=ConnectionError("同花顺不可用")), \
+             patch("akshare.stock_balance_sheet_by_report_em",
+                   return_value=make_eastmoney_balance_sheet()) as em_api:
+            queryer = test_container.a_stock_balance_sheet()
+            result = queryer.query("SH600519")
+
+        em_api.assert_called_once_with(symbol="SH600519")
+        data = result["data"]
+        assert data.loc[0, "报告期"] == "2024-12-31"
+        assert data.loc[0, "货币资金"] == pytest.approx(592.96)
+        assert result["unit_map"]["货币资金"] == "亿元"
+
+    def test_normalize_fills_fields_eastmoney_did_not_return(self):
+        result = normalize_eastmoney_statement(make_eastmoney_balance_sheet(), "balance")
+
+        assert list(result.columns) == ths_statement_columns("balance")
+        assert (result["商誉"] == 0.0).all()
+
+    @pytest.mark.parametrize("statement_type, ths_api, em_api, loader", [
+        ("balance", "stock_financial_debt_ths", "stock_balance_sheet_by_report_em",
+         "get_a_stock_balance_sheet_mock"),
+        ("profit", "stock_financial_benefit_ths", "stock_profit_sheet_by_report_em",
+         "get_a_stock_profit_sheet_mock"),
+        ("cashflow", "stock_financial_cash_ths", "stock_cash_flow_sheet_by_report_em",
+         "get_a_stock_cash_flow_sheet_mock"),
+    ])
+    def test_fetch_raw_keeps_ths_columns_and_maps_eastmoney(self, test_container, mock_loader,
+                                                            statement_type, ths_api, em_api, loader):
+        configure_policy("ths", max_retries=0)
+        queryer = {
+            "balance": test_container.a_stock_balance_sheet,
+            "profit": test_container.a_stock_income_statement,
+            "cashflow": test_container.a_stock_cash_flow,
+        }[statement_type]()
+        ths_raw = getattr(mock_loader, loader)(limit=2)
+        em_raw = pd.DataFrame({"REPORT_DATE": ["2024-12-31 00:00:00"], "SECUCODE": ["000858.SZ"]})
+
+        # 同花顺胜出：原样返回，不丢失任何列
+        with patch(f"akshare.{ths_api}", return_value=ths_raw), \
+             patch(f"akshare.{em_api}", side_effect=ConnectionError("不应使用")):
+            from_ths = queryer._fetch_raw("600519")
+        # 同花顺不可用，东方财富胜出：映射到同花顺字段名
+        with patch(f"akshare.{ths_api}", side_effect=ConnectionError("同花顺不可用")), \
+             patch(f"akshare.{em_api}", return_value=em_raw):
+            from_em = queryer._fetch_raw("000858")
+
+        pd.testing.assert_frame_equal(from_ths, ths_raw)
+        assert list(from_em.columns) == ths_statement_columns(statement_type)
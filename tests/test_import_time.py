@@ -0,0 +1,95 @@
+"""
+导入时间预算测试
+
+用 `python -X importtime` 在干净的子进程中导入模块，检查：
+- API 应用、容器和 StockIdentifier 的导入不会加载 akshare（只有第一次真正查询上游时才导入）
+- StockIdentifier 单个识别场景不会加载 pandas
+- 累计导入时间不超过预算（可通过环境变量放宽，慢机器上的 CI 可调整）
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_PATH = Path(__file__).parent.parent / "src"
+
+# 累计导入时间预算（毫秒）
+API_IMPORT_BUDGET_MS = float(os.environ.get("AKSHARE_API_IMPORT_BUDGET_MS", "2500"))
+IDENTIFIER_IMPORT_BUDGET_MS = float(os.environ.get("AKSHARE_IDENTIFIER_IMPORT_BUDGET_MS", "300"))
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def import_profile(code: str, **extra_env: str) -> dict:
+    """
+    在子进程中执行 code，返回 {模块名: 累计导入耗时(毫秒)}
+
+    执行结束时仍在 sys.modules 中、但未出现在 importtime 输出里的模块（如通过 importlib 导入）记为 0。
+    """
+    env = {**os.environ, "PYTHONPATH": str(SRC_PATH), "PYTHONDONTWRITEBYTECODE": "1", **extra_env}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + "\nimport sys\nprint('\\n'.join(sys.modules))"],
+        capture_output=True, text=True, env=env, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2)) / 1000
+    for name in result.stdout.split():
+        modules.setdefault(name, 0.0)
+    return modules
+
+
+@pytest.mark.parametrize("module", [
+    "akshare_value_investment",
+    "akshare_value_investment.core.stock_identifier",
+    "akshare_value_investment.container",
+    "akshare_value_investment.api.main",
+])
+def test_akshare_not_imported(module):
+    modules = import_profile(f"import {module}")
+    assert module in modules
+    assert "akshare" not in modules
+
+
+def test_container_creation_does_not_import_akshare(tmp_path):
+    modules = import_profile(
+        "from akshare_value_investment import create_container\n"
+        "container = create_container()\n"
+        "container.a_stock_indicators()\n"
+        "container.hk_stock_balance_sheet()\n"
+        "container.us_stock_income_statement()\n",
+        AKSHARE_CACHE_DIR=str(tmp_path),
+    )
+    assert "akshare" not in modules
+
+
+def test_stock_identifier_without_pandas():
+    modules = import_profile(
+        "from akshare_value_investment.core.stock_identifier import StockIdentifier\n"
+        "StockIdentifier().identify('600519')\n"
+    )
+    assert "pandas" not in modules
+    assert modules["akshare_value_investment.core.stock_identifier"] < IDENTIFIER_IMPORT_BUDGET_MS
+
+
+def test_api_import_budget():
+    modules = import_profile("import akshare_value_investment.api.main")
+    assert modules["akshare_value_investment.api.main"] < API_IMPORT_BUDGET_MS
+
+
+def test_lazy_akshare_imports_on_first_use():
+    modules = import_profile(
+        "from akshare_value_investment.datasource.lazy_akshare import ak\n"
+        "assert not ak.is_loaded\n"
+        "ak.stock_financial_abstract_ths\n"
+        "assert ak.is_loaded\n"
+    )
+    assert "akshare" in modules
@@ -0,0 +1,151 @@
+"""
+压测工具测试
+
+覆盖阶梯/比例解析、Zipf 抽样、股票池与别名、请求计划、百分位数和报告渲染，
+以及一次进程内（ASGI）的小规模压测。
+"""
+
+import asyncio
+import random
+from collections import Counter
+
+import httpx
+import pytest
+
+from benchmarks.loadtest import (
+    RequestPlan,
+    Sample,
+    Stage,
+    ZipfSampler,
+    build_universe,
+    parse_mix,
+    parse_stages,
+    percentile,
+    prepare_fixtures,
+    render_html,
+    run_load,
+    summarize,
+)
+from akshare_value_investment.core.stock_identifier import StockIdentifier
+from akshare_value_investment.datasource.lazy_akshare import ak
+from akshare_value_investment.datasource.replay import FixtureStore, ReplayAkshare
+
+
+class TestParsing:
+    """测试参数解析"""
+
+    def test_parse_stages(self):
+        assert parse_stages("1:10,8:2.5") == [Stage(1, 10.0), Stage(8, 2.5)]
+        with pytest.raises(ValueError):
+            parse_stages("0:10")
+
+    def test_parse_mix(self):
+        assert parse_mix("statements=3,indicators=1") == {"statements": 0.75, "indicators": 0.25}
+        with pytest.raises(ValueError, match="未知的接口"):
+            parse_mix("quotes=1")
+
+
+class TestLoadModel:
+    """测试负载模型"""
+
+    def test_zipf_favours_head(self):
+        sampler = ZipfSampler(20, 1.2, random.Random(1))
+        counts = Counter(sampler.sample() for _ in range(5000))
+
+        assert set(counts) <= set(range(20))
+        assert counts[0] > counts[1] > counts[5] > counts[19]
+
+    def test_universe_codes_are_valid_and_aliased(self):
+        universe, aliases = build_universe(["a", "hk", "us"], hot_symbols=6, cold_pool=30)
+        identifier = StockIdentifier()
+
+        symbols = [symbol for _, symbol in universe.hot + universe.cold]
+        assert len(set(symbols)) == 36
+        assert "SH600519" not in symbols
+        for market, symbol in universe.hot + universe.cold:
+            expected = {"a": "a_stock", "hk": "hk_stock", "us": "us_stock"}[market]
+            assert identifier.identify(symbol)[0].value == expected
+        assert set(aliases.values()) == {"600519", "00700", "AAPL"}
+
+    def test_plan_miss_ratio_and_exhaustion(self):
+        universe, _ = build_universe(["a", "hk"], hot_symbols=4, cold_pool=50)
+        plan = RequestPlan(universe, {"statements": 1.0}, miss_ratio=0.2, zipf=1.1, seed=3)
+
+        requests = [plan.next_request() for _ in range(200)]
+        cold = [r for r in requests if r[3]]
+        assert 20 <= len(cold) <= 50
+        assert len({r[2]["symbol"] for r in cold}) == len(cold)
+        assert all(r[0] == "statements" for r in requests)
+
+        for _ in range(500):
+            plan.next_request()
+        assert plan.cold_pool_exhausted
+
+    def test_plan_is_deterministic(self):
+        universe, _ = build_universe(["a", "us"], hot_symbols=5, cold_pool=20)
+        mix = parse_mix("statements=0.7,indicators=0.3")
+
+        def run(seed):
+            plan = RequestPlan(universe, mix, 0.1, 1.1, seed=seed)
+            return [plan.next_request() for _ in range(50)]
+
+        assert run(5) == run(5)
+
+
+class TestReport:
+    """测试统计和报告"""
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([], 95) == 0.0
+
+    def test_summarize(self):
+        samples = [Sample("statements", float(i), 200, False, False) for i in range(1, 10)]
+        samples.append(Sample("statements", 100.0, 0, True, True))
+
+        summary = summarize(samples, duration=2.0)
+
+        assert summary["requests"] == 10
+        assert summary["errors"] == 1
+        assert summary["throughput_rps"] == 5.0
+        assert summary["p50_ms"] == 5.0
+        assert summary["max_ms"] == 100.0
+        assert summary["upstream_ratio"] == 0.1
+        assert summary["status_codes"] == {"200": 9, "0": 1}
+
+    def test_render_html_escapes(self):
+        stats = summarize([Sample("statements", 10.0, 200, False, False)], 1.0)
+        report = {"created_at": "2024-01-01T00:00:00", "target": "<local>", "config": {"seed": 0},
+                  "stages": [{"concurrency": 4, "duration_s": 1.0, "overall": stats,
+                              "endpoints": {"statements": stats}}]}
+
+        page = render_html(report)
+
+        assert "&lt;local&gt;" in page
+        assert "峰值吞吐 1.0 请求/秒" in page
+
+
+class TestInProcessRun:
+    """测试进程内小规模压测"""
+
+    def test_run_against_asgi_app(self, tmp_path, monkeypatch):
+        from akshare_value_investment.api.main import create_app
+
+        monkeypatch.setenv("AKSHARE_CACHE_DIR", str(tmp_path / "cache"))
+        universe, aliases = build_universe(["a", "hk", "us"], hot_symbols=3, cold_pool=6)
+        store = prepare_fixtures(str(tmp_path / "fixtures"), aliases)
+        assert FixtureStore(store.directory).aliases == aliases
+
+        plan = RequestPlan(universe, parse_mix("statements=1,indicators=1"), miss_ratio=0.5, zipf=1.1, seed=1)
+        with ak.use_module(ReplayAkshare(FixtureStore(store.directory))):
+            reports = asyncio.run(run_load("http://test", plan, [Stage(2, 0.5)],
+                                           transport=httpx.ASGITransport(app=create_app())))
+
+        overall = reports[0]["overall"]
+        assert overall["requests"] > 0
+        assert overall["errors"] == 0
+        assert overall["cold_requests"] > 0
+        assert overall["upstream_ratio"] > 0
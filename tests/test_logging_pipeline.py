@@ -0,0 +1,152 @@
+"""
+异步日志流水线测试
+
+覆盖 JSON 行格式、热路径采样、队列满时丢弃、延迟格式化和写入线程。
+"""
+
+import json
+import logging
+import queue
+import sys
+import threading
+
+import pytest
+
+from akshare_value_investment.observability.logging_pipeline import (
+    HotPathSampler,
+    JsonFormatter,
+    LOG_FILE_NAME,
+    NonBlockingQueueHandler,
+    configure_logging,
+    hot_path,
+    shutdown_logging,
+)
+from akshare_value_investment.observability.metrics import REGISTRY
+from akshare_value_investment.observability.tracing import span
+
+
+def make_record(msg="消息 %s", args=("A",), level=logging.INFO, **extra):
+    record = logging.LogRecord("investment.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """在临时目录中启动独立的日志流水线（结束后恢复进程原有的流水线）"""
+    shutdown_logging()
+    started = configure_logging(log_dir=str(tmp_path), fmt="json", sample_every=3,
+                                logger_names=["investment.pipeline_test"])
+    yield started
+    shutdown_logging()
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestJsonFormatter:
+    """测试 JSON 行格式"""
+
+    def test_fields_and_extra(self):
+        record = make_record(symbol="600519")
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "investment.test"
+        assert entry["message"] == "消息 A"
+        assert entry["symbol"] == "600519"
+        assert "args" not in entry and "msecs" not in entry
+
+    def test_exception(self):
+        try:
+            raise ValueError("坏数据")
+        except ValueError:
+            record = logging.LogRecord("investment.test", logging.ERROR, __file__, 1, "失败", (), True)
+            record.exc_info = sys.exc_info()
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert "ValueError: 坏数据" in entry["exc_info"]
+
+
+class TestHotPathSampler:
+    """测试热路径采样"""
+
+    def test_keeps_one_in_n_per_key(self):
+        sampler = HotPathSampler(every=5)
+        kept = [sampler.filter(make_record(**hot_path("query.start"))) for _ in range(12)]
+
+        assert kept == [True, False, False, False, False] * 2 + [True, False]
+        assert REGISTRY.counter("log_records_sampled_out_total").value(key="query.start") == 9
+        assert sampler.filter(make_record(**hot_path("query.success")))
+
+    def test_never_samples_warnings_or_plain_records(self):
+        sampler = HotPathSampler(every=100)
+        sampler.filter(make_record(**hot_path("k")))
+
+        assert sampler.filter(make_record(level=logging.WARNING, **hot_path("k")))
+        assert all(sampler.filter(make_record()) for _ in range(5))
+
+
+class TestQueueHandler:
+    """测试队列处理器"""
+
+    def test_prepare_merges_message_and_trace_id(self):
+        handler = NonBlockingQueueHandler(queue.Queue())
+        payload = {"rows": 1}
+
+        with span("request", force=True) as current:
+            handler.handle(make_record("数据 %s", (payload,)))
+        payload["rows"] = 2
+
+        record = handler.queue.get_nowait()
+        assert record.getMessage() == "数据 {'rows': 1}"
+        assert record.trace_id == current.trace_id
+
+    def test_full_queue_drops_without_blocking(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        assert handler.queue.qsize() == 1
+        assert REGISTRY.counter("log_records_dropped_total").value() == 1
+
+
+class TestPipeline:
+    """测试写入线程"""
+
+    def test_writes_json_lines_off_thread(self, pipeline, tmp_path):
+        logger = logging.getLogger("investment.pipeline_test.service")
+
+        for i in range(7):
+            logger.info("执行查询: %s", f"60051{i}", extra=hot_path("query.start"))
+        logger.warning("上游不可用: %s", "ths")
+        pipeline.flush()
+
+        lines = read_lines(tmp_path / LOG_FILE_NAME)
+        assert [line["message"] for line in lines] == [
+            "执行查询: 600510", "执行查询: 600513", "执行查询: 600516", "上游不可用: ths"]
+        assert lines[0]["sample_every"] == 3
+        assert lines[0]["thread"] == threading.current_thread().name
+        assert "sample_key" not in lines[0]
+
+    def test_disabled_level_is_not_formatted(self, pipeline):
+        class Expensive:
+            def __str__(self):
+                raise AssertionError("关闭的级别不应格式化参数")
+
+        logging.getLogger("investment.pipeline_test").debug("调试: %s", Expensive())
+        pipeline.flush()
+
+    def test_configure_is_idempotent(self, pipeline):
+        assert configure_logging() is pipeline
+
+    def test_loggers_do_not_propagate_to_root(self, pipeline):
+        logger = logging.getLogger("investment.pipeline_test")
+        assert logger.propagate is False
+
+        shutdown_logging()
+        assert logger.propagate is True
@@ -0,0 +1,151 @@
+"""
+内存统计与泄漏诊断测试
+
+覆盖缓存层统计（深度字节数、block 数、按前缀汇总）、tracemalloc 快照对比、
+周期采样和管理端点。
+"""
+
+import time
+
+import diskcache
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from akshare_value_investment.api.main import create_app
+from akshare_value_investment.observability.memory import (
+    MemorySampler,
+    disk_cache_report,
+    frame_blocks,
+    memory_report,
+    stop_tracing,
+    take_snapshot,
+    tier_report,
+)
+from akshare_value_investment.observability.metrics import REGISTRY
+
+TOKEN = "memory-secret"
+
+
+def fragmented_frame(columns=6):
+    """逐列插入的 DataFrame（每列一个 block）"""
+    df = pd.DataFrame({"报告期": ["2024-12-31", "2023-12-31"]})
+    for i in range(columns):
+        df[f"指标{i}"] = [float(i), float(i + 1)]
+    return df
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with diskcache.Cache(str(tmp_path / "cache")) as cache:
+        cache.set("a_stock_balance_sheet:600519", fragmented_frame())
+        cache.set("stale:a_stock_balance_sheet:600519", fragmented_frame().copy())
+        cache.set("hk_stock_indicators:00700", pd.DataFrame({"x": ["长文本" * 200] * 50}))
+        yield cache
+
+
+@pytest.fixture
+def tracing_stopped():
+    yield
+    stop_tracing()
+
+
+class TestTierReport:
+    """测试缓存层统计"""
+
+    def test_blocks_and_fragmentation(self):
+        fragmented = fragmented_frame()
+        consolidated = fragmented.copy()
+
+        report = tier_report("test", [("a:1", fragmented), ("b:1", consolidated), ("c", "plain")])
+
+        assert frame_blocks(fragmented) == 7
+        assert frame_blocks(consolidated) == 2
+        assert report["entries"] == 3
+        assert report["frames"] == {"count": 2, "blocks": 9, "fragmented": 1}
+        assert set(report["by_prefix"]) == {"a", "b", ""}
+
+    def test_disk_cache_report(self, cache):
+        report = disk_cache_report(cache, top=2)
+
+        assert report["entries"] == 3
+        assert report["volume_bytes"] > 0
+        assert report["top_keys"][0]["key"] == "hk_stock_indicators:00700"
+        assert report["top_keys"][0]["bytes"] > 50 * 600  # 深度统计包含字符串内容
+        assert len(report["top_keys"]) == 2
+        assert report["by_prefix"]["stale"]["entries"] == 1
+
+    def test_limit_truncates(self, cache):
+        report = disk_cache_report(cache, limit=1)
+
+        assert report["entries"] == 1
+        assert report["truncated"]
+
+    def test_memory_report(self, cache):
+        report = memory_report(cache)
+
+        assert [tier["tier"] for tier in report["tiers"]][:2] == ["diskcache", "symbol_identifier"]
+        assert report["process"]["rss_bytes"] > 0
+        assert report["tracemalloc"]["tracing"] is False
+
+
+class TestTracemalloc:
+    """测试快照对比"""
+
+    def test_snapshot_diff_shows_growth(self, tracing_stopped):
+        first = take_snapshot()
+        assert first["diff"] is None
+
+        leaked = [bytearray(1024) for _ in range(2000)]
+        second = take_snapshot()
+
+        assert second["snapshot"] == 2
+        assert second["diff"][0]["size_diff_bytes"] >= 1024 * 2000
+        assert "test_memory.py" in second["diff"][0]["location"]
+        assert stop_tracing() is True
+        assert stop_tracing() is False
+        del leaked
+
+
+class TestSampler:
+    """测试周期采样"""
+
+    def test_sample_updates_gauges(self, cache):
+        stats = MemorySampler(60, cache).sample()
+
+        assert stats["cache_entries"] == 3
+        assert REGISTRY.gauge("cache_entries").value(tier="diskcache") == 3
+        assert REGISTRY.gauge("process_resident_memory_bytes").value() == stats["rss_bytes"] > 0
+
+    def test_background_thread(self, cache):
+        sampler = MemorySampler(0.01, cache).start()
+        try:
+            for _ in range(200):
+                if REGISTRY.gauge("cache_volume_bytes").value(tier="diskcache"):
+                    break
+                time.sleep(0.01)
+        finally:
+            sampler.stop()
+        assert REGISTRY.gauge("cache_volume_bytes").value(tier="diskcache") > 0
+
+
+class TestAdminEndpoints:
+    """测试管理端点"""
+
+    def test_memory_endpoints(self, monkeypatch, tmp_path, tracing_stopped):
+        monkeypatch.setenv("AKSHARE_PROFILING_TOKEN", TOKEN)
+        monkeypatch.setenv("AKSHARE_CACHE_DIR", str(tmp_path / "api-cache"))
+        client = TestClient(create_app())
+        admin = {"X-Profile-Token": TOKEN}
+
+        assert client.get("/admin/memory").status_code == 403
+        report = client.get("/admin/memory", params={"top": 3}, headers=admin).json()["data"]
+        assert report["tiers"][0]["tier"] == "diskcache"
+
+        assert client.post("/admin/memory/snapshot", headers=admin).json()["data"]["diff"] is None
+        assert client.post("/admin/memory/snapshot", headers=admin).json()["data"]["diff"] is not None
+        assert client.delete("/admin/memory/snapshot", headers=admin).json()["data"] == {"stopped": True}
+
+    def test_hidden_when_disabled(self, monkeypatch):
+        monkeypatch.delenv("AKSHARE_PROFILING_TOKEN", raising=False)
+        assert TestClient(create_app()).get("/admin/memory").status_code == 404
@@ -0,0 +1,128 @@
+"""
+查询流水线指标测试
+
+覆盖各阶段耗时、缓存命中率、akshare 函数耗时/失败计数、Prometheus 文本导出和 /metrics 端点。
+"""
+
+from unittest.mock import patch
+
+import diskcache
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from akshare_value_investment.api.main import create_app
+from akshare_value_investment.datasource.queryers.a_stock_queryers import (
+    AStockBalanceSheetQueryer,
+    AStockIndicatorQueryer,
+)
+from akshare_value_investment.observability.exposition import render_prometheus
+from akshare_value_investment.observability.metrics import MetricsRegistry, REGISTRY
+from akshare_value_investment.observability.pipeline import (
+    CACHE_HIT_RATIO,
+    STAGE_SECONDS,
+    market_label,
+    record_cache_lookup,
+    refresh_cache_hit_ratio,
+    stage_timer,
+)
+
+A_INDICATORS = {"market": "a_stock", "query_type": "a_stock_indicators"}
+
+
+class TestStageMetrics:
+    """测试阶段计时和缓存命中率"""
+
+    def test_stage_timer_records_on_error(self):
+        with pytest.raises(RuntimeError):
+            with stage_timer("upstream", market="a_stock"):
+                raise RuntimeError("失败")
+        assert STAGE_SECONDS.count(stage="upstream", market="a_stock") == 1
+
+    def test_market_label(self):
+        assert market_label("a_stock_balance") == "a_stock"
+        assert market_label("hk_statements") == "hk_stock"
+        assert market_label("us_stock_indicators") == "us_stock"
+        assert market_label("other") == "unknown"
+
+    def test_cache_hit_ratio(self):
+        for hit in (True, True, True, False):
+            record_cache_lookup(hit, **A_INDICATORS)
+        record_cache_lookup(False, market="hk_stock", query_type="hk_indicators")
+
+        refresh_cache_hit_ratio()
+
+        assert CACHE_HIT_RATIO.value(**A_INDICATORS) == 0.75
+        assert CACHE_HIT_RATIO.value(market="hk_stock", query_type="hk_indicators") == 0.0
+
+
+class TestQueryerInstrumentation:
+    """测试查询器各阶段埋点"""
+
+    def test_miss_then_hit(self, temp_cache_dir):
+        queryer = AStockIndicatorQueryer(cache=diskcache.Cache(temp_cache_dir))
+        data = pd.DataFrame({"报告期": ["2024-12-31"], "净利润": ["800亿"]})
+
+        with patch("akshare.stock_financial_abstract_ths", return_value=data):
+            queryer.query("SH600519")
+            queryer.query("SH600519")
+
+        lookups = REGISTRY.get("cache_lookups_total")
+        assert lookups.value(result="miss", **A_INDICATORS) == 1
+        assert lookups.value(result="hit", **A_INDICATORS) == 1
+        assert STAGE_SECONDS.count(stage="symbol_identification", **A_INDICATORS) == 2
+        assert STAGE_SECONDS.count(stage="cache_lookup", **A_INDICATORS) == 2
+        assert STAGE_SECONDS.count(stage="upstream", **A_INDICATORS) == 1
+        assert REGISTRY.get("akshare_call_seconds").count(function="stock_financial_abstract_ths") == 1
+
+    def test_akshare_errors_counted(self, temp_cache_dir):
+        queryer = AStockIndicatorQueryer(cache=diskcache.Cache(temp_cache_dir))
+
+        with patch("akshare.stock_financial_abstract_ths", side_effect=KeyError("字段缺失")):
+            with pytest.raises(KeyError):
+                queryer.query("SH600519")
+
+        errors = REGISTRY.get("akshare_errors_total")
+        assert errors.value(function="stock_financial_abstract_ths", error="KeyError") >= 1
+
+    def test_unit_conversion_stage(self, temp_cache_dir):
+        queryer = AStockBalanceSheetQueryer(cache=diskcache.Cache(temp_cache_dir))
+        data = pd.DataFrame({"报告期": ["2024-12-31"], "货币资金": ["10亿"]})
+
+        with patch("akshare.stock_financial_debt_ths", return_value=data):
+            queryer.query("SH600519")
+
+        assert STAGE_SECONDS.count(stage="unit_conversion", market="a_stock", query_type="a_stock_balance") == 1
+
+
+class TestPrometheusExposition:
+    """测试 Prometheus 文本格式导出"""
+
+    def test_render(self):
+        registry = MetricsRegistry()
+        registry.counter("calls_total", "调用次数").inc(2, source='t"s')
+        registry.histogram("latency_seconds", "耗时", buckets=(0.1, 1.0)).observe(0.5, source="ths")
+
+        text = render_prometheus(registry)
+
+        assert "# TYPE calls_total counter" in text
+        assert 'calls_total{source="t\\"s"} 2.0' in text
+        assert 'latency_seconds_bucket{source="ths",le="0.1"} 0' in text
+        assert 'latency_seconds_bucket{source="ths",le="1.0"} 1' in text
+        assert 'latency_seconds_bucket{source="ths",le="+Inf"} 1' in text
+        assert 'latency_seconds_sum{source="ths"} 0.5' in text
+        assert 'latency_seconds_count{source="ths"} 1' in text
+        assert text.endswith("\n")
+
+    def test_metrics_endpoint(self):
+        client = TestClient(create_app())
+        record_cache_lookup(True, **A_INDICATORS)
+
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"} 1' in response.text
+        assert 'cache_hit_ratio{market="a_stock",query_type="a_stock_indicators"} 1.0' in response.text
+        assert "http_requests_in_flight 1.0" in response.text
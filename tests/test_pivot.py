@@ -0,0 +1,91 @@
+"""
+窄表转宽表引擎单元测试
+
+pivot_first() 必须与 pivot_table(aggfunc='first', fill_value=0).reset_index() 结果完全一致。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from akshare_value_investment.datasource.queryers.pivot import pivot_first
+
+HK_INDEX = ["date", "SECURITY_CODE", "SECURITY_NAME_ABBR"]
+US_INDEX = ["REPORT_DATE", "SECURITY_CODE", "SECURITY_NAME_ABBR"]
+
+
+def reference_pivot(df, index, columns, values, fill_value=0):
+    """pivot_table 参考实现"""
+    wide_df = df.pivot_table(index=index, columns=columns, values=values,
+                             aggfunc="first", fill_value=fill_value).reset_index()
+    wide_df.columns.name = None
+    return wide_df
+
+
+class TestPivotFirstMatchesPivotTable:
+    """与 pivot_table 一致性测试"""
+
+    @pytest.mark.parametrize("loader", ["load_hk_balance_sheet", "load_hk_income_statement", "load_hk_cash_flow"])
+    def test_hk_samples(self, mock_loader, loader):
+        df = getattr(mock_loader, loader)()
+        df["date"] = pd.to_datetime(df["REPORT_DATE"])
+
+        expected = reference_pivot(df, HK_INDEX, "STD_ITEM_NAME", "AMOUNT")
+        pd.testing.assert_frame_equal(pivot_first(df, HK_INDEX, "STD_ITEM_NAME", "AMOUNT"), expected)
+
+    @pytest.mark.parametrize("loader", ["load_us_balance_sheet", "load_us_income_statement", "load_us_cash_flow"])
+    def test_us_samples(self, mock_loader, loader):
+        df = getattr(mock_loader, loader)()
+        df["REPORT_DATE"] = pd.to_datetime(df["REPORT_DATE"], errors="coerce")
+        df = df.sort_values("REPORT_DATE", ascending=False)
+
+        expected = reference_pivot(df, US_INDEX, "ITEM_NAME", "AMOUNT")
+        pd.testing.assert_frame_equal(pivot_first(df, US_INDEX, "ITEM_NAME", "AMOUNT"), expected)
+
+    def test_duplicates_first_non_null_wins(self):
+        df = pd.DataFrame({
+            "date": ["2024", "2024", "2024", "2023"],
+            "item": ["营业额", "营业额", "营业额", "营业额"],
+            "amount": [np.nan, 2.0, 3.0, 4.0],
+        })
+        result = pivot_first(df, ["date"], "item", "amount")
+
+        pd.testing.assert_frame_equal(result, reference_pivot(df, ["date"], "item", "amount"))
+        assert result.loc[result["date"] == "2024", "营业额"].iloc[0] == 2.0
+
+    def test_missing_keys_and_all_null_rows_dropped(self):
+        df = pd.DataFrame({
+            "date": ["2024", None, "2023", "2022", "2024"],
+            "item": ["A", "A", None, "B", "B"],
+            "amount": [1.0, 2.0, 3.0, np.nan, 5.0],
+        })
+        pd.testing.assert_frame_equal(pivot_first(df, ["date"], "item", "amount"),
+                                      reference_pivot(df, ["date"], "item", "amount"))
+
+    def test_integer_values_and_multi_level_index(self):
+        df = pd.DataFrame({
+            "year": [2024, 2023, 2024, 2023, 2024],
+            "code": ["b", "a", "a", "b", "a"],
+            "item": ["x", "x", "y", "y", "y"],
+            "amount": [1, 2, 3, 4, 5],
+        })
+        result = pivot_first(df, ["year", "code"], "item", "amount")
+
+        pd.testing.assert_frame_equal(result, reference_pivot(df, ["year", "code"], "item", "amount"))
+        assert result["x"].dtype == np.int64
+
+    @pytest.mark.filterwarnings("ignore::FutureWarning")
+    def test_object_values_fall_back(self):
+        df = pd.DataFrame({
+            "date": ["2024", "2023"],
+            "item": ["A", "B"],
+            "amount": pd.Series([1.5, 2.5], dtype=object),
+        })
+        pd.testing.assert_frame_equal(pivot_first(df, ["date"], "item", "amount"),
+                                      reference_pivot(df, ["date"], "item", "amount"))
+
+    def test_input_not_modified(self, mock_loader):
+        df = mock_loader.load_us_balance_sheet()
+        original = df.copy()
+        pivot_first(df, US_INDEX, "ITEM_NAME", "AMOUNT")
+        pd.testing.assert_frame_equal(df, original)
@@ -0,0 +1,178 @@
+"""
+单请求性能剖析测试
+
+覆盖令牌校验、采样/确定性剖析输出格式、剖析文件目录，以及 API 中间件钩子和 /admin/profiles 端点。
+"""
+
+import pstats
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from akshare_value_investment.api.main import create_app
+from akshare_value_investment.observability import profiling
+from akshare_value_investment.observability.profiling import (
+    DeterministicProfiler,
+    ProfileStore,
+    SamplingProfiler,
+    profile,
+    requested_mode,
+)
+
+TOKEN = "s3cret"
+
+
+def busy_loop(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+@pytest.fixture
+def profiling_env(monkeypatch, tmp_path):
+    """开启剖析并把剖析文件写到临时目录"""
+    monkeypatch.setenv("AKSHARE_PROFILING_TOKEN", TOKEN)
+    monkeypatch.setenv("AKSHARE_PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestRequestedMode:
+    """测试剖析请求解析和令牌校验"""
+
+    def test_disabled_without_token_env(self, monkeypatch):
+        monkeypatch.delenv("AKSHARE_PROFILING_TOKEN", raising=False)
+        assert requested_mode({"x-profile": "sample", "x-profile-token": TOKEN}, {}) is None
+
+    def test_token_required(self, profiling_env):
+        assert requested_mode({"x-profile": "sample"}, {}) is None
+        assert requested_mode({"x-profile": "sample", "x-profile-token": "wrong"}, {}) is None
+        assert requested_mode({"x-profile": "cprofile", "x-profile-token": TOKEN}, {}) == "cprofile"
+
+    def test_query_flag_and_unknown_mode(self, profiling_env):
+        headers = {"x-profile-token": TOKEN}
+        assert requested_mode(headers, {"profile": "true"}) == "sample"
+        assert requested_mode(headers, {"profile": "perf"}) is None
+        assert requested_mode(headers, {}) is None
+
+
+class TestProfilers:
+    """测试两种剖析器的输出"""
+
+    def test_sampling_collapsed_stacks(self, tmp_path):
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        busy_loop(0.1)
+        profiler.stop()
+
+        path = ProfileStore(tmp_path).save(profiler, "busy")
+        lines = path.read_text(encoding="utf-8").splitlines()
+
+        assert path.suffix == ".collapsed"
+        assert profiler.samples > 0
+        busy = [line for line in lines if "busy_loop (tests/test_profiling.py" in line]
+        assert busy
+        stack, _, count = busy[0].rpartition(" ")
+        assert int(count) > 0
+        assert stack.split(";")[0] == threading.current_thread().name
+
+    def test_idle_threads_skipped(self):
+        event = threading.Event()
+        waiter = threading.Thread(target=event.wait, name="idle-waiter")
+        waiter.start()
+        try:
+            profiler = SamplingProfiler()
+            profiler.sample()
+        finally:
+            event.set()
+            waiter.join()
+        assert not any(stack.startswith("idle-waiter") for stack in profiler.stacks)
+
+    def test_cprofile_pstats(self, tmp_path):
+        profiler = DeterministicProfiler()
+        profiler.start()
+        busy_loop(0.01)
+        profiler.stop()
+
+        path = ProfileStore(tmp_path).save(profiler, "busy")
+        stats = pstats.Stats(str(path))
+        assert path.suffix == ".prof"
+        assert any(func[2] == "busy_loop" for func in stats.stats)
+
+    def test_only_one_profile_at_a_time(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        with profile("sample", "outer", store=store) as outer:
+            with profile("cprofile", "inner", store=store) as inner:
+                pass
+        assert inner.path is None
+        assert outer.path is not None
+
+        with pytest.raises(ValueError, match="未知的剖析方式"):
+            with profile("perf", "x", store=store):
+                pass
+
+
+class TestProfileStore:
+    """测试剖析文件目录"""
+
+    def test_list_path_and_prune(self, tmp_path):
+        store = ProfileStore(tmp_path, max_files=2)
+        paths = []
+        for label in ("GET /a", "GET /b", "GET /c"):
+            profiler = SamplingProfiler()
+            profiler.sample()
+            paths.append(store.save(profiler, label))
+            time.sleep(0.01)
+
+        listed = store.list()
+        assert [p["name"] for p in listed] == [paths[2].name, paths[1].name]
+        assert listed[0]["format"] == "collapsed"
+        assert "GET_c" in listed[0]["name"]
+        assert store.path(paths[2].name) == paths[2]
+        assert store.path(paths[0].name) is None
+        assert store.path("../secrets.prof") is None
+
+
+class TestApiProfiling:
+    """测试 API 中间件剖析钩子和管理端点"""
+
+    def test_profiled_request_and_listing(self, profiling_env):
+        client = TestClient(create_app())
+        admin = {"X-Profile-Token": TOKEN}
+
+        plain = client.get("/health")
+        profiled = client.get("/health", headers={"X-Profile": "cprofile", **admin})
+
+        assert "X-Profile-File" not in plain.headers
+        name = profiled.headers["X-Profile-File"]
+        assert (profiling_env / name).is_file()
+
+        listing = client.get("/admin/profiles", headers=admin).json()
+        assert [p["name"] for p in listing["data"]["profiles"]] == [name]
+        assert listing["data"]["profiles"][0]["format"] == "pstats"
+
+        download = client.get(f"/admin/profiles/{name}", headers=admin)
+        assert download.status_code == 200
+        assert download.content == (profiling_env / name).read_bytes()
+        assert client.get("/admin/profiles/profile-missing.prof", headers=admin).status_code == 404
+
+    def test_wrong_token_not_profiled(self, profiling_env):
+        client = TestClient(create_app())
+
+        response = client.get("/health", headers={"X-Profile": "sample", "X-Profile-Token": "wrong"})
+
+        assert "X-Profile-File" not in response.headers
+        assert client.get("/admin/profiles", headers={"X-Profile-Token": "wrong"}).status_code == 403
+        assert client.get("/admin/profiles").status_code == 403
+
+    def test_admin_hidden_when_disabled(self, monkeypatch):
+        monkeypatch.delenv("AKSHARE_PROFILING_TOKEN", raising=False)
+        client = TestClient(create_app())
+        assert client.get("/admin/profiles", headers={"X-Profile-Token": TOKEN}).status_code == 404
+
+    def test_lock_released_after_request(self, profiling_env):
+        client = TestClient(create_app())
+        client.get("/health", headers={"X-Profile": "sample", "X-Profile-Token": TOKEN})
+        assert profiling._active.acquire(blocking=False)
+        profiling._active.release()
@@ -0,0 +1,219 @@
+"""
+akshare 调用录制与回放测试
+
+覆盖夹具键、录制（含异常）、回放（延迟、错误注入、缺失夹具）、环境变量启用，
+以及查询器通过 `ak.use_module` 离线回放录制结果。
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import diskcache
+import pandas as pd
+import pytest
+
+from akshare_value_investment.datasource.lazy_akshare import ak
+from akshare_value_investment.datasource.queryers.a_stock_queryers import AStockIndicatorQueryer
+from akshare_value_investment.datasource.replay import (
+    FixtureNotFoundError,
+    FixtureStore,
+    InjectedUpstreamError,
+    RecordedUpstreamError,
+    RecordingAkshare,
+    ReplayAkshare,
+    fixture_key,
+    module_from_env,
+    parse_latency,
+)
+
+REPORT = pd.DataFrame({"报告期": ["2024-12-31", "2023-12-31"], "净利润": ["800亿", "700亿"]})
+
+
+class UpstreamParseError(Exception):
+    """模拟 akshare 内部的非内置异常"""
+
+
+def fake_akshare():
+    def parse_error(symbol):
+        raise UpstreamParseError("页面结构变化")
+
+    def network_error(symbol):
+        raise ConnectionError("连接被重置")
+
+    def missing(symbol):
+        raise KeyError(symbol)
+
+    return SimpleNamespace(
+        stock_financial_abstract_ths=lambda symbol: REPORT.copy(),
+        parse_error=parse_error,
+        network_error=network_error,
+        missing=missing,
+        __version__="1.0",
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FixtureStore(tmp_path / "fixtures")
+
+
+@pytest.fixture
+def recorded(store):
+    """录制一次成功调用和两种异常"""
+    recorder = RecordingAkshare(store, module=fake_akshare())
+    recorder.stock_financial_abstract_ths(symbol="600519")
+    for name in ("parse_error", "missing", "network_error"):
+        with pytest.raises(Exception):
+            getattr(recorder, name)(symbol="600519")
+    return store
+
+
+class TestFixtureStore:
+    """测试夹具键和目录"""
+
+    def test_key_ignores_kwargs_order(self):
+        first = fixture_key("f", (), {"stock": "00700", "symbol": "利润表"})
+        second = fixture_key("f", (), {"symbol": "利润表", "stock": "00700"})
+        assert first == second
+        assert first != fixture_key("f", (), {"stock": "09988", "symbol": "利润表"})
+
+    def test_recorded_entries(self, recorded):
+        assert recorded.functions() == ["missing", "parse_error", "stock_financial_abstract_ths"]
+        entries = {entry["function"]: entry for entry in recorded.entries()}
+        assert entries["missing"]["error"] == {"type": "KeyError", "message": "'600519'"}
+        assert entries["stock_financial_abstract_ths"]["kwargs"] == {"symbol": "600519"}
+
+    def test_non_callable_attributes_passthrough(self, store):
+        assert RecordingAkshare(store, module=fake_akshare()).__version__ == "1.0"
+
+
+class TestReplayAkshare:
+    """测试回放"""
+
+    def test_replay_result_is_copy(self, recorded):
+        replay = ReplayAkshare(FixtureStore(recorded.directory))
+
+        first = replay.stock_financial_abstract_ths(symbol="600519")
+        first["新增列"] = 1
+        second = replay.stock_financial_abstract_ths(symbol="600519")
+
+        pd.testing.assert_frame_equal(second, REPORT)
+        assert replay.calls == 2
+
+    def test_replay_errors(self, recorded):
+        replay = ReplayAkshare(recorded)
+
+        with pytest.raises(KeyError):
+            replay.missing(symbol="600519")
+        with pytest.raises(RecordedUpstreamError, match="UpstreamParseError: 页面结构变化"):
+            replay.parse_error(symbol="600519")
+        with pytest.raises(FixtureNotFoundError, match="network_error"):
+            replay.network_error(symbol="600519")
+        with pytest.raises(FixtureNotFoundError):
+            replay.stock_financial_abstract_ths(symbol="000001")
+
+    def test_latency(self, recorded):
+        delays = []
+        ReplayAkshare(recorded, latency=0.05, sleep=delays.append).stock_financial_abstract_ths(symbol="600519")
+        replay = ReplayAkshare(recorded, latency=(0.01, 0.02), seed=7, sleep=delays.append)
+        for _ in range(5):
+            replay.stock_financial_abstract_ths(symbol="600519")
+
+        assert delays[0] == 0.05
+        assert all(0.01 <= d <= 0.02 for d in delays[1:])
+        assert len(set(delays[1:])) > 1
+
+    def test_aliases(self, recorded):
+        recorded.add_aliases({"600001": "600519"})
+        replay = ReplayAkshare(FixtureStore(recorded.directory))
+
+        pd.testing.assert_frame_equal(replay.stock_financial_abstract_ths(symbol="600001"), REPORT)
+        with pytest.raises(FixtureNotFoundError):
+            replay.stock_financial_abstract_ths(symbol="600002")
+
+    def test_error_injection(self, recorded):
+        always = ReplayAkshare(recorded, error_rate=1.0)
+        with pytest.raises(InjectedUpstreamError):
+            always.stock_financial_abstract_ths(symbol="600519")
+
+        other_only = ReplayAkshare(recorded, error_rate=1.0, error_functions=["stock_financial_debt_ths"])
+        assert not other_only.stock_financial_abstract_ths(symbol="600519").empty
+
+        def outcomes(seed):
+            replay = ReplayAkshare(recorded, error_rate=0.5, seed=seed)
+            results = []
+            for _ in range(20):
+                try:
+                    replay.stock_financial_abstract_ths(symbol="600519")
+                    results.append(True)
+                except InjectedUpstreamError:
+                    results.append(False)
+            return results
+
+        assert outcomes(3) == outcomes(3)
+        assert set(outcomes(3)) == {True, False}
+
+        with pytest.raises(ValueError):
+            ReplayAkshare(recorded, error_rate=1.5)
+
+
+class TestConfiguration:
+    """测试环境变量启用"""
+
+    def test_parse_latency(self):
+        assert parse_latency("0.05") == 0.05
+        assert parse_latency("0.02,0.08") == (0.02, 0.08)
+        assert parse_latency("") == 0.0
+
+    def test_module_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("AKSHARE_REPLAY_DIR", raising=False)
+        monkeypatch.delenv("AKSHARE_RECORD_DIR", raising=False)
+        assert module_from_env() is None
+
+        monkeypatch.setenv("AKSHARE_RECORD_DIR", str(tmp_path))
+        assert isinstance(module_from_env(), RecordingAkshare)
+
+        monkeypatch.setenv("AKSHARE_REPLAY_DIR", str(tmp_path))
+        monkeypatch.setenv("AKSHARE_REPLAY_LATENCY", "0.01,0.03")
+        monkeypatch.setenv("AKSHARE_REPLAY_ERROR_RATE", "0.1")
+        replay = module_from_env()
+        assert isinstance(replay, ReplayAkshare)
+        assert replay.latency == (0.01, 0.03)
+        assert replay.error_rate == 0.1
+
+
+class TestQueryerReplay:
+    """测试查询器通过 ak 代理录制和回放"""
+
+    def test_record_then_replay_offline(self, store, tmp_path):
+        with patch("akshare.stock_financial_abstract_ths", return_value=REPORT.copy()), \
+                ak.use_module(RecordingAkshare(store)):
+            recorded = AStockIndicatorQueryer(cache=diskcache.Cache(str(tmp_path / "c1"))).query("SH600519")
+
+        with patch("akshare.stock_financial_abstract_ths", side_effect=AssertionError("不应访问上游")), \
+                ak.use_module(ReplayAkshare(store)) as replay:
+            replayed = AStockIndicatorQueryer(cache=diskcache.Cache(str(tmp_path / "c2"))).query("SH600519")
+
+        pd.testing.assert_frame_equal(replayed, recorded)
+        assert replay.calls == 1
+
+    def test_use_module_restores_previous(self, store):
+        replay = ReplayAkshare(store)
+        previous = ak.install_module(None)
+        try:
+            with ak.use_module(replay):
+                assert ak._load() is replay
+            assert ak._override is None
+        finally:
+            ak.install_module(previous)
+
+    def test_offline_recording_script(self, tmp_path):
+        from scripts.record_akshare_fixtures import record_offline
+
+        store = record_offline(tmp_path / "fixtures", symbols=["SH600519", "00700"])
+
+        assert "stock_financial_debt_ths" in store.functions()
+        assert "stock_financial_hk_report_em" in store.functions()
+        replay = ReplayAkshare(FixtureStore(store.directory))
+        frame = replay.stock_financial_hk_report_em(stock="00700", symbol="资产负债表", indicator="年度")
+        assert not frame.empty
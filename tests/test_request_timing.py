@@ -0,0 +1,120 @@
+"""
+单次请求耗时明细测试
+
+覆盖 RequestTimings、Server-Timing 响应头的生成与解析，以及 GET 查询接口的 explain=true。
+"""
+
+from unittest.mock import patch
+
+import diskcache
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from akshare_value_investment.api.dependencies import get_financial_service
+from akshare_value_investment.api.main import create_app
+from akshare_value_investment.datasource.queryers.a_stock_queryers import AStockIndicatorQueryer
+from akshare_value_investment.observability.pipeline import stage_timer
+from akshare_value_investment.observability.request_timing import (
+    collect_request_timings,
+    current_timings,
+    parse_server_timing,
+    record_cache_source,
+)
+
+
+class TestRequestTimings:
+    """测试请求内耗时收集"""
+
+    def test_collects_only_inside_context(self):
+        with stage_timer("upstream"):
+            pass
+        assert current_timings() is None
+
+        with collect_request_timings() as timings:
+            with stage_timer("cache_lookup", query_type="a_stock_balance"):
+                pass
+            with stage_timer("cache_lookup", query_type="a_stock_profit"):
+                pass
+            record_cache_source("a_stock_balance", "disk")
+
+        assert current_timings() is None
+        assert list(timings.stage_totals()) == ["cache_lookup"]
+        assert len(timings.explain()["stages"]) == 2
+        assert timings.explain()["cache_sources"] == {"a_stock_balance": "disk"}
+
+    def test_server_timing_round_trip(self):
+        with collect_request_timings() as timings:
+            timings.add_stage("upstream", 0.8123)
+            timings.add_stage("unit_conversion", 0.0004)
+            record_cache_source("a_stock_balance", "upstream")
+            record_cache_source("a_stock_profit", "stale")
+
+        header = timings.server_timing()
+        parsed = parse_server_timing(header)
+
+        assert header.startswith("upstream;dur=812.30, unit_conversion;dur=0.40, total;dur=")
+        assert parsed["stages"] == {"upstream": 812.3, "unit_conversion": 0.4}
+        assert parsed["total_ms"] is not None
+        assert parsed["cache_sources"] == {"a_stock_balance": "upstream", "a_stock_profit": "stale"}
+
+    def test_parse_empty_header(self):
+        assert parse_server_timing(None) == {"stages": {}, "total_ms": None, "cache_sources": {}}
+
+    def test_queryer_records_cache_source(self, temp_cache_dir):
+        queryer = AStockIndicatorQueryer(cache=diskcache.Cache(temp_cache_dir))
+        data = pd.DataFrame({"报告期": ["2024-12-31"], "净利润": ["800亿"]})
+
+        with patch("akshare.stock_financial_abstract_ths", return_value=data):
+            with collect_request_timings() as first:
+                queryer.query("SH600519")
+            with collect_request_timings() as second:
+                queryer.query("SH600519")
+
+        assert first.sources == {"a_stock_indicators": "upstream"}
+        assert "upstream" in first.stage_totals()
+        assert second.sources == {"a_stock_indicators": "disk"}
+        assert "upstream" not in second.stage_totals()
+
+
+class FakeFinancialService:
+    """模拟财务查询服务：记录一个阶段和数据来源"""
+
+    def query_financial_statements(self, **kwargs):
+        with stage_timer("cache_lookup", market="a_stock", query_type="a_stock_balance"):
+            record_cache_source("a_stock_balance", "disk")
+        return {"balance_sheet": pd.DataFrame([{"date": "2023-12-31", "货币资金": 100}])}
+
+
+class TestServerTimingApi:
+    """测试 API 的 Server-Timing 和 explain"""
+
+    @pytest.fixture
+    def client(self):
+        app = create_app()
+        app.dependency_overrides[get_financial_service] = FakeFinancialService
+        return TestClient(app)
+
+    def test_every_response_has_server_timing(self, client):
+        response = client.get("/health")
+        assert parse_server_timing(response.headers["server-timing"])["total_ms"] is not None
+
+    def test_statements_server_timing(self, client):
+        response = client.get("/api/v1/financial/statements",
+                              params={"symbol": "SH600519", "query_type": "a_financial_statements"})
+
+        timing = parse_server_timing(response.headers["server-timing"])
+        assert {"cache_lookup", "serialization"} <= set(timing["stages"])
+        assert timing["cache_sources"] == {"a_stock_balance": "disk"}
+        assert "explain" not in response.json()["metadata"]
+
+    def test_explain(self, client):
+        response = client.get("/api/v1/financial/statements",
+                              params={"symbol": "SH600519", "query_type": "a_financial_statements",
+                                      "explain": "true"})
+
+        explain = response.json()["metadata"]["explain"]
+        assert explain["cache_sources"] == {"a_stock_balance": "disk"}
+        assert explain["stages"][0]["stage"] == "cache_lookup"
+        assert explain["stages"][0]["query_type"] == "a_stock_balance"
+        assert "serialization" in explain["stage_totals_ms"]
@@ -0,0 +1,273 @@
+"""
+上游容错层单元测试
+
+覆盖超时、有界重试、熔断器状态流转，以及查询器在上游不可用时回退到过期缓存。
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import diskcache
+import pandas as pd
+import pytest
+
+from akshare_value_investment.datasource import resilience
+from akshare_value_investment.datasource.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    UpstreamTimeoutError,
+    call_with_resilience,
+    circuit_breaker_states,
+    configure_policy,
+    get_circuit_breaker,
+    get_policy,
+)
+from akshare_value_investment.datasource.queryers.a_stock_queryers import AStockIndicatorQueryer
+from akshare_value_investment.datasource.queryers.base_queryer import (
+    CACHE_EXPIRE_SECONDS,
+    STALE_EXPIRE_SECONDS,
+    STALE_KEY_PREFIX,
+    store_in_cache,
+)
+from akshare_value_investment.observability.metrics import REGISTRY
+
+pytestmark = pytest.mark.real_retries
+
+
+@pytest.fixture
+def no_backoff():
+    """去掉重试退避等待，加快测试"""
+    with patch.object(resilience.time, "sleep"):
+        yield
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDataSourcePolicy:
+    """调用策略测试"""
+
+    def test_backoff_delay_is_bounded(self):
+        policy = resilience.DataSourcePolicy(backoff_base=0.5, backoff_max=2.0)
+        for attempt in range(10):
+            delay = policy.backoff_delay(attempt)
+            assert 0 <= delay <= min(2.0, 0.5 * 2 ** attempt)
+
+    def test_env_overrides(self, monkeypatch):
+        monkeypatch.setenv("AKSHARE_UPSTREAM_TIMEOUT", "3")
+        monkeypatch.setenv("AKSHARE_UPSTREAM_MAX_RETRIES", "0")
+        policy = get_policy("ths")
+        assert policy.timeout == 3.0
+        assert policy.max_retries == 0
+
+    def test_configure_policy_takes_precedence(self, monkeypatch):
+        monkeypatch.setenv("AKSHARE_UPSTREAM_TIMEOUT", "3")
+        configure_policy("ths", timeout=1.5)
+        assert get_policy("ths").timeout == 1.5
+
+
+class TestCircuitBreaker:
+    """熔断器状态流转测试"""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=10)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow_request()
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("test", failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+        clock.now = 10
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        clock.now = 15
+        assert breaker.state == CircuitState.OPEN
+
+    def test_transitions_exported_to_metrics(self):
+        breaker = CircuitBreaker("metrics_test", failure_threshold=1)
+        breaker.record_failure()
+
+        gauge = REGISTRY.get("circuit_breaker_state")
+        transitions = REGISTRY.get("circuit_breaker_transitions_total")
+        assert gauge.value(source="metrics_test") == 2
+        assert transitions.value(source="metrics_test", from_state="closed", to_state="open") == 1
+
+
+class TestCallWithResilience:
+    """带容错的上游调用测试"""
+
+    def test_success_passthrough(self):
+        assert call_with_resilience("ths", lambda x: x * 2, 21) == 42
+        assert REGISTRY.get("upstream_calls_total").value(source="ths", outcome="success") == 1
+
+    def test_retries_network_errors(self, no_backoff):
+        configure_policy("ths", max_retries=2)
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConnectionError("连接被重置")
+            return "ok"
+
+        assert call_with_resilience("ths", flaky) == "ok"
+        assert len(calls) == 3
+        assert REGISTRY.get("upstream_retries_total").value(source="ths") == 2
+
+    def test_retries_are_bounded(self, no_backoff):
+        configure_policy("ths", max_retries=1, failure_threshold=10)
+        calls = []
+
+        def always_fail():
+            calls.append(1)
+            raise ConnectionError("网络不可达")
+
+        with pytest.raises(ConnectionError):
+            call_with_resilience("ths", always_fail)
+        assert len(calls) == 2
+
+    def test_non_network_errors_not_retried(self, no_backoff):
+        calls = []
+
+        def bad_symbol():
+            calls.append(1)
+            raise KeyError("data")
+
+        with pytest.raises(KeyError):
+            call_with_resilience("ths", bad_symbol)
+        assert len(calls) == 1
+        assert get_circuit_breaker("ths").consecutive_failures == 0
+
+    def test_timeout(self):
+        configure_policy("ths", timeout=0.05, max_retries=0)
+        release = threading.Event()
+
+        def hang():
+            release.wait(5)
+
+        started = time.monotonic()
+        with pytest.raises(UpstreamTimeoutError):
+            call_with_resilience("ths", hang)
+        abandoned = REGISTRY.get("upstream_abandoned_calls")
+        assert abandoned.value(source="ths") == 1
+        release.set()
+
+        assert time.monotonic() - started < 2
+        assert REGISTRY.get("upstream_timeouts_total").value(source="ths") == 1
+        for _ in range(200):
+            if not abandoned.value(source="ths"):
+                break
+            time.sleep(0.01)
+        assert abandoned.value(source="ths") == 0
+
+    def test_timeout_while_queued_cancels_call(self, monkeypatch):
+        configure_policy("ths", timeout=0.05, max_retries=0)
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(resilience, "_executor", executor)
+        release = threading.Event()
+        executor.submit(release.wait, 5)
+        calls = []
+
+        try:
+            with pytest.raises(UpstreamTimeoutError):
+                call_with_resilience("ths", calls.append, "queued")
+        finally:
+            release.set()
+            executor.shutdown()
+
+        # 排队中超时的任务已取消，不会在线程空出后再调用上游，也不占用线程
+        assert calls == []
+        assert REGISTRY.get("upstream_abandoned_calls").value(source="ths") == 0
+
+    def test_circuit_opens_and_fails_fast(self, no_backoff):
+        configure_policy("eastmoney", max_retries=0, failure_threshold=2)
+
+        def down():
+            raise ConnectionError("上游宕机")
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                call_with_resilience("eastmoney", down)
+
+        assert circuit_breaker_states()["eastmoney"] == "open"
+        with pytest.raises(CircuitOpenError):
+            call_with_resilience("eastmoney", down)
+
+
+class TestQueryerStaleFallback:
+    """查询器过期缓存回退测试"""
+
+    def test_serves_stale_cache_when_upstream_down(self, temp_cache_dir, no_backoff):
+        cache = diskcache.Cache(temp_cache_dir)
+        queryer = AStockIndicatorQueryer(cache=cache)
+        data = pd.DataFrame({"报告期": ["2024-12-31"], "净利润": ["800亿"]})
+
+        with patch("akshare.stock_financial_abstract_ths", return_value=data):
+            queryer.query("SH600519")
+
+        # 模拟主缓存过期，只剩过期缓存
+        cache.delete("a_stock_indicators:600519")
+        assert cache.get(STALE_KEY_PREFIX + "a_stock_indicators:600519") is not None
+
+        with patch("akshare.stock_financial_abstract_ths", side_effect=ConnectionError("断网")):
+            result = queryer.query("SH600519")
+
+        pd.testing.assert_frame_equal(result, data)
+        assert REGISTRY.get("stale_cache_served_total").value(query_type="a_stock_indicators") == 1
+
+    def test_stale_copy_expires_later_than_primary(self, temp_cache_dir):
+        cache = diskcache.Cache(temp_cache_dir)
+        data = pd.DataFrame({"报告期": ["2024-12-31"], "净利润": ["800亿"]})
+
+        store_in_cache(cache, "a_stock_indicators:600519", data)
+
+        _, primary_expire = cache.get("a_stock_indicators:600519", expire_time=True)
+        _, stale_expire = cache.get(STALE_KEY_PREFIX + "a_stock_indicators:600519", expire_time=True)
+        assert stale_expire is not None
+        assert stale_expire - primary_expire == pytest.approx(STALE_EXPIRE_SECONDS - CACHE_EXPIRE_SECONDS, abs=5)
+
+    def test_raises_without_stale_cache(self, temp_cache_dir, no_backoff):
+        queryer = AStockIndicatorQueryer(cache=diskcache.Cache(temp_cache_dir))
+
+        with patch("akshare.stock_financial_abstract_ths", side_effect=ConnectionError("断网")):
+            with pytest.raises(ConnectionError):
+                queryer.query("SH600519")
@@ -0,0 +1,170 @@
+"""
+财务三表协同获取单元测试
+
+验证港股/美股任一报表缓存未命中时，一次协同获取填充三张报表的缓存。
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import diskcache
+import pandas as pd
+import pytest
+
+from akshare_value_investment.datasource.queryers.hk_stock_queryers import (
+    HKStockBalanceSheetQueryer,
+    HKStockCashFlowQueryer,
+    HKStockIncomeStatementQueryer,
+)
+from akshare_value_investment.datasource.queryers.statement_group import SingleFlight
+from akshare_value_investment.datasource.queryers.us_stock_queryers import (
+    USStockBalanceSheetQueryer,
+    USStockCashFlowQueryer,
+    USStockIncomeStatementQueryer,
+)
+from akshare_value_investment.observability.metrics import REGISTRY
+
+HK_ITEMS = {"资产负债表": "总资产", "利润表": "营业额", "现金流量表": "经营业务现金净额"}
+US_ITEMS = {"资产负债表": "总资产", "综合损益表": "营业收入", "现金流量表": "经营活动产生的现金流量净额"}
+
+
+def hk_report(stock, symbol, indicator):
+    """按报表名称返回港股窄表数据"""
+    return pd.DataFrame({
+        "REPORT_DATE": ["2024-12-31"],
+        "SECURITY_CODE": [stock],
+        "SECURITY_NAME_ABBR": ["腾讯控股"],
+        "STD_ITEM_NAME": [HK_ITEMS[symbol]],
+        "AMOUNT": [1e10],
+    })
+
+
+def us_report(stock, symbol, indicator):
+    """按报表名称返回美股窄表数据"""
+    return pd.DataFrame({
+        "REPORT_DATE": ["2024-09-28"],
+        "SECURITY_CODE": [stock],
+        "SECURITY_NAME_ABBR": ["苹果"],
+        "ITEM_NAME": [US_ITEMS[symbol]],
+        "AMOUNT": [2e10],
+    })
+
+
+@pytest.fixture
+def cache(temp_cache_dir):
+    return diskcache.Cache(temp_cache_dir)
+
+
+class TestStatementGroupFetch:
+    """协同获取测试"""
+
+    def test_hk_cold_query_fills_sibling_caches(self, cache):
+        with patch("akshare.stock_financial_hk_report_em", side_effect=hk_report) as api:
+            balance = HKStockBalanceSheetQueryer(cache=cache).query("00700")
+            assert api.call_count == 3
+            assert {call.kwargs["symbol"] for call in api.call_args_list} == set(HK_ITEMS)
+
+            income = HKStockIncomeStatementQueryer(cache=cache).query("00700")
+            cash = HKStockCashFlowQueryer(cache=cache).query("00700")
+            assert api.call_count == 3
+
+        assert balance["data"]["总资产"].iloc[0] == 100.0
+        assert income["data"]["营业额"].iloc[0] == 100.0
+        assert cash["data"]["经营业务现金净额"].iloc[0] == 100.0
+        assert REGISTRY.get("statement_group_fetches_total").value(group="资产负债表") == 1
+
+    def test_us_cold_query_fills_sibling_caches(self, cache):
+        with patch("akshare.stock_financial_us_report_em", side_effect=us_report) as api:
+            USStockCashFlowQueryer(cache=cache).query("AAPL")
+            income = USStockIncomeStatementQueryer(cache=cache).query("AAPL")
+            USStockBalanceSheetQueryer(cache=cache).query("AAPL")
+
+        assert api.call_count == 3
+        assert income["data"]["营业收入"].iloc[0] == 200.0
+
+    def test_cached_siblings_are_not_refetched(self, cache):
+        with patch("akshare.stock_financial_hk_report_em", side_effect=hk_report) as api:
+            HKStockBalanceSheetQueryer(cache=cache).query("00700")
+            cache.delete("hk_balance_sheet:00700")
+            HKStockBalanceSheetQueryer(cache=cache).query("00700")
+
+        assert api.call_count == 4
+        assert api.call_args_list[-1].kwargs["symbol"] == "资产负债表"
+
+    def test_sibling_failure_does_not_fail_own_query(self, cache):
+        def partially_down(stock, symbol, indicator):
+            if symbol == "现金流量表":
+                raise KeyError("数据解析失败")
+            return hk_report(stock, symbol, indicator)
+
+        with patch("akshare.stock_financial_hk_report_em", side_effect=partially_down):
+            result = HKStockBalanceSheetQueryer(cache=cache).query("00700")
+
+        assert not result["data"].empty
+        assert cache.get("hk_income_statement:00700") is not None
+        assert cache.get("hk_cash_flow:00700") is None
+
+    def test_disabled_by_env(self, cache, monkeypatch):
+        monkeypatch.setenv("AKSHARE_STATEMENT_GROUP_FETCH", "0")
+
+        with patch("akshare.stock_financial_hk_report_em", side_effect=hk_report) as api:
+            HKStockBalanceSheetQueryer(cache=cache).query("00700")
+
+        api.assert_called_once_with(stock="00700", symbol="资产负债表", indicator="年度")
+
+    def test_concurrent_queries_share_one_fetch(self, cache):
+        def slow_report(stock, symbol, indicator):
+            time.sleep(0.1)
+            return hk_report(stock, symbol, indicator)
+
+        queryers = [HKStockBalanceSheetQueryer(cache=cache),
+                    HKStockIncomeStatementQueryer(cache=cache),
+                    HKStockCashFlowQueryer(cache=cache)]
+        results = {}
+
+        with patch("akshare.stock_financial_hk_report_em", side_effect=slow_report) as api:
+            threads = [threading.Thread(target=lambda q=q: results.update({q.cache_query_type: q.query("00700")}))
+                       for q in queryers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert api.call_count == 3
+        assert len(results) == 3
+
+
+class TestSingleFlight:
+    """SingleFlight 测试"""
+
+    def test_concurrent_calls_execute_once(self):
+        flights = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def work():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return "done"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("key", work)))
+        leader.start()
+        started.wait(1)
+        results.append(flights.do("key", work))
+        leader.join()
+
+        assert results == ["done", "done"]
+        assert len(calls) == 1
+
+    def test_exception_shared_and_key_released(self):
+        flights = SingleFlight()
+
+        def fail():
+            raise ValueError("失败")
+
+        with pytest.raises(ValueError):
+            flights.do("key", fail)
+        assert flights.do("key", lambda: "ok") == "ok"
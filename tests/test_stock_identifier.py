@@ -447,4 +447,57 @@ class TestStockIdentifier:
             except Exception as e:
                 self.fail(f"API调用模拟失败: {e}")
 
-        print(f"✅ akshare API兼容性验证完成：SH/SZ前缀Bug已修复")
\ No newline at end of file
+        print(f"✅ akshare API兼容性验证完成：SH/SZ前缀Bug已修复")
+
+
+class TestStockIdentifierBatchAndCache:
+    """批量识别与LRU缓存测试"""
+
+    MIXED_SYMBOLS = [
+        "SH600519", "sz000001", "CN.600519", "HK.00700", "h.700", "US.AAPL", "u.msft",
+        "600519.SS", "000001.sz", "00700.HK", "AAPL.O", "TSLA.nasdaq", "BRK.NYSE",
+        "600519", "00700", "700", "9988", "aapl", "BRK-A", "BRK.B", "123456789",
+        "ABC123DEF", "0", "", "   ", " 600519 ", "1234567",
+    ]
+
+    @pytest.fixture
+    def identifier(self):
+        return StockIdentifier()
+
+    @pytest.mark.parametrize("default_market", [None, MarketType.HK_STOCK])
+    def test_identify_many_matches_identify(self, identifier, default_market):
+        """批量识别结果与逐个识别 + AKShare格式化一致"""
+        result = identifier.identify_many(self.MIXED_SYMBOLS, default_market=default_market)
+
+        for symbol, row in zip(self.MIXED_SYMBOLS, result.itertuples(index=False)):
+            market, clean_symbol = identifier.identify(symbol, default_market)
+            assert (row.market, row.symbol) == (market, clean_symbol), symbol
+            assert row.akshare_symbol == identifier.format_symbol_for_akshare(market, clean_symbol), symbol
+
+    def test_identify_many_keeps_series_index_and_handles_missing(self, identifier):
+        import pandas as pd
+
+        symbols = pd.Series(["SH600519", None, "700", float("nan"), "SH600519"], index=list("abcde"))
+        result = identifier.identify_many(symbols)
+
+        assert result.index.tolist() == list("abcde")
+        assert result["market"].tolist() == [MarketType.A_STOCK, MarketType.US_STOCK, MarketType.HK_STOCK,
+                                             MarketType.US_STOCK, MarketType.A_STOCK]
+        assert result["akshare_symbol"].tolist() == ["600519", "", "00700", "", "600519"]
+
+    def test_identify_many_large_batch(self, identifier):
+        """10万个代码批量识别"""
+        symbols = [f"{i:06d}" if i % 2 else f"US.T{chr(65 + i % 26)}" for i in range(100_000)]
+        result = identifier.identify_many(symbols)
+
+        assert len(result) == 100_000
+        assert result["market"].iloc[1] == MarketType.A_STOCK
+        assert result["market"].iloc[0] == MarketType.US_STOCK
+
+    def test_identify_is_memoized_across_instances(self):
+        StockIdentifier.cache_clear()
+
+        StockIdentifier().identify("SH600519")
+        StockIdentifier().identify("SH600519")
+
+        assert StockIdentifier.cache_info()["identify"].hits == 1
@@ -0,0 +1,177 @@
+"""
+链路追踪测试
+
+覆盖 span 嵌套、采样、跨线程传递（flow 事件）、Chrome trace 文件导出，
+以及 API 请求和三表并发获取的追踪。
+"""
+
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import diskcache
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from akshare_value_investment.api.dependencies import get_financial_service
+from akshare_value_investment.api.main import create_app
+from akshare_value_investment.datasource.queryers.hk_stock_queryers import HKStockBalanceSheetQueryer
+from akshare_value_investment.observability import tracing
+from akshare_value_investment.observability.tracing import (
+    ChromeTraceFileExporter,
+    configure_tracing,
+    current_span,
+    span,
+    traced,
+)
+
+from .test_statement_group import hk_report
+
+
+class ListExporter:
+    """把追踪保存在内存中的导出器"""
+
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace, events):
+        self.traces.append(events)
+
+    def spans(self, index=-1):
+        return [e for e in self.traces[index] if e["ph"] == "X"]
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = ListExporter()
+    monkeypatch.setattr(tracing._config, "exporter", exporter)
+    monkeypatch.setattr(tracing._config, "sample_rate", 0.0)
+    return exporter
+
+
+class TestSpans:
+    """测试 span 记录和采样"""
+
+    def test_disabled_by_default(self, exporter):
+        with span("root") as root:
+            with span("child") as child:
+                assert current_span() is None
+        assert root is None and child is None
+        assert exporter.traces == []
+
+    def test_forced_root_records_nested_spans(self, exporter):
+        @traced(category="service")
+        def work():
+            with span("inner", rows=3) as inner:
+                inner.set(done=True)
+
+        with span("root", force=True) as root:
+            work()
+
+        spans = {e["name"]: e for e in exporter.spans()}
+        assert set(spans) == {"root", "TestSpans.test_forced_root_records_nested_spans.<locals>.work", "inner"}
+        assert spans["inner"]["args"]["rows"] == 3
+        assert spans["inner"]["args"]["done"] is True
+        assert spans["root"]["dur"] >= spans["inner"]["dur"]
+        assert root.trace.finished
+
+    def test_unsampled_root_suppresses_children(self, exporter):
+        with span("root"):
+            configure_tracing(sample_rate=1.0)
+            with span("child") as child:
+                assert child is None
+        assert exporter.traces == []
+
+    def test_sample_rate(self, exporter):
+        configure_tracing(sample_rate=1.0)
+        with span("root") as root:
+            pass
+        assert root is not None
+        assert len(exporter.traces) == 1
+
+        with pytest.raises(ValueError):
+            configure_tracing(sample_rate=2)
+
+    def test_error_recorded(self, exporter):
+        with pytest.raises(KeyError):
+            with span("root", force=True):
+                raise KeyError("缺失")
+        assert "KeyError" in exporter.spans()[0]["args"]["error"]
+
+    def test_thread_hop_emits_flow_events(self, exporter):
+        def child():
+            with span("worker"):
+                pass
+
+        with span("root", force=True):
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="hop") as pool:
+                for future in [pool.submit(contextvars.copy_context().run, child) for _ in range(2)]:
+                    future.result()
+
+        events = exporter.traces[-1]
+        workers = [e for e in events if e["name"] == "worker"]
+        root = next(e for e in events if e["name"] == "root")
+        assert len(workers) == 2
+        assert all(w["tid"] != root["tid"] for w in workers)
+        assert len([e for e in events if e["ph"] == "s"]) == 2
+        assert len([e for e in events if e["ph"] == "f"]) == 2
+        thread_names = {e["args"]["name"] for e in events if e["ph"] == "M"}
+        assert any(name.startswith("hop") for name in thread_names)
+
+
+class TestChromeTraceFileExporter:
+    """测试追踪文件导出"""
+
+    def test_writes_loadable_file_and_prunes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tracing._config, "exporter", ChromeTraceFileExporter(tmp_path, max_files=2))
+        for _ in range(3):
+            with span("root", force=True):
+                with span("child"):
+                    pass
+
+        files = list(tmp_path.glob("trace-*.json"))
+        assert len(files) == 2
+        content = json.loads(files[0].read_text(encoding="utf-8"))
+        assert {e["name"] for e in content["traceEvents"] if e["ph"] == "X"} == {"root", "child"}
+        assert content["displayTimeUnit"] == "ms"
+
+
+class TestTracedRequests:
+    """测试请求链路追踪"""
+
+    def test_api_request_forced_by_header(self, exporter):
+        class FakeService:
+            @traced("FakeService.query_financial_statements")
+            def query_financial_statements(self, **kwargs):
+                return {"balance_sheet": pd.DataFrame([{"date": "2023-12-31", "货币资金": 100}])}
+
+        app = create_app()
+        app.dependency_overrides[get_financial_service] = FakeService
+        client = TestClient(app)
+        params = {"symbol": "SH600519", "query_type": "a_financial_statements"}
+
+        untraced = client.get("/api/v1/financial/statements", params=params)
+        traced_response = client.get("/api/v1/financial/statements", params=params, headers={"X-Trace": "1"})
+
+        assert "x-trace-id" not in untraced.headers
+        assert traced_response.headers["x-trace-id"]
+        names = [e["name"] for e in exporter.spans()]
+        assert names[0] == "GET /api/v1/financial/statements"
+        assert {"FakeService.query_financial_statements", "serialization"} <= set(names)
+
+    def test_statement_group_fan_out(self, exporter, temp_cache_dir):
+        queryer = HKStockBalanceSheetQueryer(cache=diskcache.Cache(temp_cache_dir))
+
+        with patch("akshare.stock_financial_hk_report_em", side_effect=hk_report):
+            with span("root", force=True):
+                queryer.query("00700")
+
+        spans = exporter.spans()
+        names = [e["name"] for e in spans]
+        assert "statement_group.fetch" in names
+        assert {"statement_group.资产负债表", "statement_group.利润表", "statement_group.现金流量表"} <= set(names)
+        assert names.count("akshare.stock_financial_hk_report_em") == 3
+        assert {"symbol_identification", "cache_lookup", "upstream", "unit_conversion"} <= set(names)
+        assert len({e["tid"] for e in spans}) > 1
@@ -7,7 +7,11 @@ Webapp 测试配置和 fixtures
 - Streamlit 测试工具
 """
 
+import atexit
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 import pandas as pd
 from typing import Dict, Any
@@ -18,6 +22,11 @@ import pytest
 webapp_path = Path(__file__).parent.parent.parent / "webapp"
 sys.path.insert(0, str(webapp_path))
 
+# 历史记录数据库写入临时目录（导入 app.py 会创建历史记录管理器，避免写入源码树的 webapp/.cache）
+_history_dir = tempfile.mkdtemp(prefix="webapp-history-")
+os.environ["HISTORY_CACHE_DIR"] = _history_dir
+atexit.register(shutil.rmtree, _history_dir, ignore_errors=True)
+
 
 # ========== Mock API 响应数据 ==========
 
@@ -50,8 +59,8 @@ def mock_financial_statements_response():
 
 @pytest.fixture
 def mock_api_requests(mock_financial_statements_response):
-    """Mock requests.get 调用 API"""
-    with patch('requests.get') as mock_get:
+    """Mock data_service.api_get 调用 API"""
+    with patch('services.data_service.api_get') as mock_get:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = mock_financial_statements_response
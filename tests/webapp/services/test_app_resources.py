@@ -0,0 +1,98 @@
+"""
+测试 services/app_resources.py
+
+测试应用资源只在进程内创建一次，以及重跑耗时统计
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# 添加 webapp 目录到 Python 路径
+webapp_path = Path(__file__).parent.parent.parent.parent / "webapp"
+sys.path.insert(0, str(webapp_path))
+
+from services import app_resources
+from services.app_resources import (
+    RerunTimer,
+    build_app_resources,
+    get_app_resources,
+    refresh_securities_index,
+)
+from services.securities_master import SecuritiesIndex, SecurityRecord
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setenv("AKSHARE_CACHE_DIR", str(tmp_path / "diskcache"))
+    get_app_resources.clear()
+    yield
+    get_app_resources.clear()
+
+
+class TestAppResources:
+    """测试共享资源缓存"""
+
+    def test_build_creates_fresh_resources(self, tmp_path):
+        first = build_app_resources(history_dir=tmp_path)
+        second = build_app_resources(history_dir=tmp_path)
+        assert first.container is not second.container
+        assert first.search_service.history is first.history_manager
+        assert first.search_service.identifier is first.stock_identifier
+
+    def test_get_returns_same_instance(self, tmp_path):
+        with patch.object(app_resources, "build_app_resources", wraps=build_app_resources) as build:
+            first = get_app_resources(history_dir=tmp_path)
+            second = get_app_resources(history_dir=tmp_path)
+
+        assert first is second
+        assert build.call_count == 1
+
+    def test_different_arguments_create_separate_resources(self, tmp_path):
+        first = get_app_resources(10, history_dir=tmp_path / "a")
+        second = get_app_resources(20, history_dir=tmp_path / "b")
+        assert first is not second
+        assert second.history_manager.max_records == 20
+
+    def test_refresh_securities_index(self, tmp_path):
+        resources = get_app_resources(history_dir=tmp_path)
+        assert resources.search_service.securities is None
+
+        master_path = tmp_path / "master.json"
+        SecuritiesIndex([SecurityRecord("600519", "贵州茅台", "A股", "gzmt")]).save(master_path)
+        refresh_securities_index(resources, master_path)
+        assert resources.search_service.search("茅台")[0][1] == "600519"
+
+        refresh_securities_index(resources, tmp_path / "missing.json")
+        assert resources.search_service.securities is not None
+
+
+class TestRerunTimer:
+    """测试重跑耗时统计"""
+
+    @pytest.fixture
+    def session_state(self):
+        state = {}
+        with patch.object(app_resources.st, "session_state", state):
+            yield state
+
+    def test_summary_empty(self, session_state):
+        assert RerunTimer.summary() is None
+
+    def test_stop_records_timings(self, session_state):
+        with patch.object(app_resources.time, "perf_counter", side_effect=[1.0, 1.25, 2.0, 2.05]):
+            assert RerunTimer.start().stop() == pytest.approx(250)
+            assert RerunTimer.start().stop() == pytest.approx(50)
+
+        summary = RerunTimer.summary()
+        assert summary["last_ms"] == pytest.approx(50)
+        assert summary["mean_ms"] == pytest.approx(150)
+        assert summary["max_ms"] == pytest.approx(250)
+        assert summary["count"] == 2
+
+    def test_history_is_bounded(self, session_state):
+        for _ in range(RerunTimer.HISTORY_SIZE + 10):
+            RerunTimer.start().stop()
+        assert RerunTimer.summary()["count"] == RerunTimer.HISTORY_SIZE
@@ -0,0 +1,217 @@
+"""
+测试 services/data_backends.py
+
+测试数据访问后端：进程内（embedded）后端与 HTTP 后端返回相同结构的响应，
+计算器在两种后端下得到相同结果。
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+# 添加 webapp 目录到 Python 路径
+webapp_path = Path(__file__).parent.parent.parent.parent / "webapp"
+sys.path.insert(0, str(webapp_path))
+
+from akshare_value_investment.business.financial_types import FinancialQueryType, Frequency
+from akshare_value_investment.business.response_formatter import ResponseFormatter
+from akshare_value_investment.client import FINANCIAL_INDICATORS_PATH, FINANCIAL_STATEMENTS_PATH
+from services import data_service
+from services.calculators.roic import calculate as calculate_roic
+from services.data_backends import EmbeddedDataBackend, HttpDataBackend, create_backend
+
+
+def make_statements():
+    """财务三表（与 FinancialQueryService.query_financial_statements 的返回值同构）"""
+    return {
+        "income_statement": pd.DataFrame([
+            {"date": "2023-12-31", "五、净利润": 1000000, "减：所得税费用": 200000,
+             "其中：利息费用": 50000, "其中：营业收入": 2000000, "REPORT_DATE": "2023-12-31"},
+            {"date": "2022-12-31", "五、净利润": 900000, "减：所得税费用": 180000,
+             "其中：利息费用": 45000, "其中：营业收入": 1800000, "REPORT_DATE": "2022-12-31"},
+        ]),
+        "balance_sheet": pd.DataFrame([
+            {"date": "2023-12-31", "短期借款": 100000, "长期借款": 200000, "应付债券": 50000,
+             "一年内到期的非流动负债": 30000, "股东权益合计": 2000000,
+             "归属于母公司所有者权益合计": 1900000, "货币资金": 500000, "REPORT_DATE": "2023-12-31"},
+            {"date": "2022-12-31", "短期借款": 90000, "长期借款": 180000, "应付债券": 45000,
+             "一年内到期的非流动负债": 27000, "股东权益合计": 1800000,
+             "归属于母公司所有者权益合计": 1710000, "货币资金": 450000, "REPORT_DATE": "2022-12-31"},
+        ]),
+        "cash_flow": pd.DataFrame([
+            {"date": "2023-12-31", "经营活动产生的现金流量净额": 1200000,
+             "购建固定资产、无形资产和其他长期资产支付的现金": 300000, "REPORT_DATE": "2023-12-31"},
+            {"date": "2022-12-31", "经营活动产生的现金流量净额": 1080000,
+             "购建固定资产、无形资产和其他长期资产支付的现金": 270000, "REPORT_DATE": "2022-12-31"},
+        ]),
+    }
+
+
+@pytest.fixture
+def financial_service():
+    """Mock FinancialQueryService"""
+    service = Mock()
+    service.query_financial_statements.side_effect = lambda **kwargs: make_statements()
+    service.query.return_value = {"status": "success", "data": {"records": []}}
+    return service
+
+
+@pytest.fixture
+def embedded(financial_service):
+    return EmbeddedDataBackend(financial_service)
+
+
+@pytest.fixture
+def use_backend():
+    """临时替换 data_service 的后端"""
+    def install(backend):
+        data_service.set_backend(backend)
+        return backend
+
+    yield install
+    data_service.set_backend(None)
+
+
+class TestEmbeddedDataBackend:
+    """测试进程内后端"""
+
+    def test_statements_keep_dataframes(self, embedded, financial_service):
+        params = {"symbol": "600519", "query_type": "a_financial_statements", "frequency": "annual"}
+        response = embedded.get(FINANCIAL_STATEMENTS_PATH, params)
+
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload["status"] == "success"
+        assert set(payload["data"]) == {"income_statement", "balance_sheet", "cash_flow"}
+        assert isinstance(payload["data"]["balance_sheet"]["data"], pd.DataFrame)
+        assert payload["metadata"]["record_counts"]["balance_sheet"] == 2
+
+        kwargs = financial_service.query_financial_statements.call_args.kwargs
+        assert kwargs["query_type"] is FinancialQueryType.A_FINANCIAL_STATEMENTS
+        assert kwargs["frequency"] is Frequency.ANNUAL
+
+    def test_json_returns_shallow_copies(self, embedded):
+        response = embedded.get(FINANCIAL_STATEMENTS_PATH,
+                                {"symbol": "600519", "query_type": "a_financial_statements"})
+        first = response.json()["data"]["balance_sheet"]["data"]
+        first["新增列"] = 1
+
+        second = response.json()["data"]["balance_sheet"]["data"]
+        assert "新增列" not in second.columns
+
+    def test_same_shape_as_http_payload(self, embedded):
+        params = {"symbol": "600519", "query_type": "a_financial_statements", "frequency": "annual"}
+        embedded_payload = embedded.get(FINANCIAL_STATEMENTS_PATH, params).json()
+        http_payload = ResponseFormatter.financial_statements(
+            make_statements(), symbol="600519", query_type=FinancialQueryType.A_FINANCIAL_STATEMENTS,
+            frequency=Frequency.ANNUAL
+        )
+
+        assert embedded_payload.keys() == http_payload.keys()
+        for name, statement in http_payload["data"].items():
+            frame = embedded_payload["data"][name]["data"]
+            assert frame.to_dict(orient="records") == statement["data"]
+            assert embedded_payload["data"][name]["columns"] == statement["columns"]
+
+    def test_indicators(self, embedded, financial_service):
+        response = embedded.get(FINANCIAL_INDICATORS_PATH, {"symbol": "00700", "market": "hk_stock"})
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "success", "data": {"records": []}}
+        kwargs = financial_service.query.call_args.kwargs
+        assert kwargs["query_type"] is FinancialQueryType.HK_STOCK_INDICATORS
+
+    def test_error_status_codes(self, embedded, financial_service):
+        assert embedded.get(FINANCIAL_STATEMENTS_PATH,
+                            {"symbol": "600519", "query_type": "unknown"}).status_code == 400
+        assert embedded.get("/api/v1/unknown").status_code == 404
+
+        financial_service.query_financial_statements.side_effect = RuntimeError("数据源异常")
+        assert embedded.get(FINANCIAL_STATEMENTS_PATH,
+                            {"symbol": "600519", "query_type": "a_financial_statements"}).status_code == 500
+
+    def test_server_timing_and_explain(self, embedded):
+        params = {"symbol": "600519", "query_type": "a_financial_statements"}
+
+        plain = embedded.get(FINANCIAL_STATEMENTS_PATH, params)
+        explained = embedded.get(FINANCIAL_STATEMENTS_PATH, {**params, "explain": "true"})
+
+        assert "total;dur=" in plain.headers["Server-Timing"]
+        assert "explain" not in plain.json()["metadata"]
+        assert "total_ms" in explained.json()["metadata"]["explain"]
+
+    def test_get_many_keeps_order(self, embedded):
+        responses = embedded.get_many([
+            (FINANCIAL_INDICATORS_PATH, {"symbol": "600519"}),
+            (FINANCIAL_STATEMENTS_PATH, {"symbol": "600519", "query_type": "a_financial_statements"}),
+        ])
+        assert [type(r.json()["data"]) for r in responses] == [dict, dict]
+        assert "balance_sheet" in responses[1].json()["data"]
+
+
+class TestCreateBackend:
+    """测试后端选择"""
+
+    def test_known_backends(self):
+        client = Mock()
+        http = create_backend("http", client_factory=lambda: client)
+        assert isinstance(http, HttpDataBackend)
+        assert http.client is client
+        assert isinstance(create_backend("embedded"), EmbeddedDataBackend)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="未知的数据访问后端"):
+            create_backend("grpc")
+
+    def test_api_get_uses_configured_backend(self, embedded, use_backend):
+        use_backend(embedded)
+        assert data_service.get_backend() is embedded
+
+        response = data_service.api_get(FINANCIAL_INDICATORS_PATH, params={"symbol": "600519"})
+        assert response.status_code == 200
+
+
+class TestServerTimingHistory:
+    """测试调试模式下的服务端耗时记录"""
+
+    def test_record_server_timing(self, monkeypatch):
+        monkeypatch.setattr(data_service, "_server_timings", data_service.deque(maxlen=2))
+        response = Mock(status_code=200, headers={
+            "Server-Timing": 'upstream;dur=812.30, total;dur=815.00, cache;desc="a_stock_balance=upstream"'
+        })
+
+        for symbol in ("600519", "000001", "00700"):
+            data_service.record_server_timing(FINANCIAL_STATEMENTS_PATH, {"symbol": symbol}, response)
+
+        timings = data_service.recent_server_timings()
+        assert [t["symbol"] for t in timings] == ["00700", "000001"]
+        assert timings[0]["total_ms"] == 815.0
+        assert timings[0]["cache_sources"] == {"a_stock_balance": "upstream"}
+        assert timings[0]["client_cache"] is None
+
+
+class TestCalculatorsOnBothBackends:
+    """测试计算器在两种后端下结果一致"""
+
+    def test_roic_identical(self, embedded, use_backend):
+        http_payload = json.loads(json.dumps(ResponseFormatter.financial_statements(
+            make_statements(), symbol="600519", query_type=FinancialQueryType.A_FINANCIAL_STATEMENTS,
+            frequency=Frequency.ANNUAL
+        )))
+        http_response = Mock(status_code=200)
+        http_response.json.return_value = http_payload
+        http_backend = Mock()
+        http_backend.get.return_value = http_response
+
+        use_backend(http_backend)
+        over_http = calculate_roic("600519", "A股", 5)
+        use_backend(embedded)
+        in_process = calculate_roic("600519", "A股", 5)
+
+        for http_frame, embedded_frame in zip(over_http[:3], in_process[:3]):
+            pd.testing.assert_frame_equal(http_frame, embedded_frame)
+        assert over_http[6:] == in_process[6:]
@@ -51,7 +51,7 @@ class TestNetIncomeValuationCalculator:
     @pytest.fixture
     def mock_api_requests(self, mock_api_response):
         """Mock API 请求"""
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = mock_api_response
@@ -194,7 +194,7 @@ class TestNetIncomeValuationCalculator:
             }
         }
 
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = api_response
@@ -225,7 +225,7 @@ class TestNetIncomeValuationCalculator:
             }
         }
 
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = api_response
@@ -241,7 +241,7 @@ class TestNetIncomeValuationCalculator:
 
     def test_api_error_handling(self):
         """测试 API 错误处理"""
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 500
             mock_get.return_value = mock_response
@@ -253,7 +253,7 @@ class TestNetIncomeValuationCalculator:
         """测试缺少利润表数据"""
         empty_response = {"data": {}}
 
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = empty_response
@@ -279,7 +279,7 @@ class TestNetIncomeValuationCalculator:
             }
         }
 
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = api_response
@@ -318,7 +318,7 @@ class TestNetIncomeValuationCalculator:
             }
         }
 
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = api_response
@@ -0,0 +1,225 @@
+"""
+测试 services/prefetch.py 和 data_service.warm_up
+
+测试后台预取的去重、过期和异常隔离，搜索框投机预取的防抖、取消、限流和命中率，
+以及预热请求的参数
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+# 添加 webapp 目录到 Python 路径
+webapp_path = Path(__file__).parent.parent.parent.parent / "webapp"
+sys.path.insert(0, str(webapp_path))
+
+from akshare_value_investment.client import ApiConnectionError
+from services import data_service
+from services.prefetch import Prefetcher, SpeculativePrefetcher, prefetch_symbol
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def prefetcher(clock):
+    prefetcher = Prefetcher(max_workers=2, ttl=60, clock=clock)
+    yield prefetcher
+    prefetcher.shutdown()
+
+
+class TestPrefetcher:
+    """测试预取器"""
+
+    def test_runs_off_calling_thread(self, prefetcher):
+        future = prefetcher.submit("key", threading.current_thread)
+        assert future.result(timeout=5) is not threading.current_thread()
+
+    def test_deduplicates_within_ttl(self, prefetcher, clock):
+        func = Mock(return_value=1)
+        prefetcher.submit("key", func).result(timeout=5)
+
+        clock.now = 30
+        assert prefetcher.submit("key", func) is None
+        assert prefetcher.submit("other", func) is not None
+
+        clock.now = 61
+        prefetcher.submit("key", func).result(timeout=5)
+        assert func.call_count == 3
+
+    def test_running_task_not_resubmitted(self, prefetcher, clock):
+        release = threading.Event()
+        future = prefetcher.submit("key", release.wait, 5)
+
+        clock.now = 120
+        assert prefetcher.submit("key", release.wait, 5) is None
+        release.set()
+        assert future.result(timeout=5) is True
+
+    def test_exception_is_swallowed(self, prefetcher):
+        future = prefetcher.submit("key", Mock(side_effect=RuntimeError("boom")))
+        assert future.result(timeout=5) is None
+
+    def test_prefetch_symbol_calls_warm_up(self, prefetcher):
+        with patch.object(data_service, "warm_up", return_value=2) as warm_up:
+            assert prefetch_symbol(prefetcher, "600519", "A股").result(timeout=5) == 2
+            assert prefetch_symbol(prefetcher, "600519", "A股") is None
+
+        warm_up.assert_called_once_with("600519", "A股")
+
+
+class RecordingWarm:
+    """记录预热调用的假预热函数"""
+
+    def __init__(self):
+        self.calls = []
+        self.called = threading.Event()
+
+    def __call__(self, symbol, market):
+        self.calls.append((symbol, market))
+        self.called.set()
+        return 2
+
+
+class TestSpeculativePrefetcher:
+    """测试搜索框投机预取"""
+
+    @pytest.fixture
+    def warm(self):
+        return RecordingWarm()
+
+    def make(self, prefetcher, warm, clock, **kwargs):
+        return SpeculativePrefetcher(prefetcher, delay=kwargs.pop("delay", 0.05), warm=warm, clock=clock, **kwargs)
+
+    def test_prefetches_stable_suggestion(self, prefetcher, warm, clock):
+        speculative = self.make(prefetcher, warm, clock)
+        speculative.suggest("s1", "600519", "A股")
+
+        assert warm.called.wait(5)
+        assert warm.calls == [("600519", "A股")]
+
+    def test_suggest_does_not_block(self, prefetcher, warm, clock):
+        speculative = self.make(prefetcher, warm, clock, delay=5)
+        speculative.suggest("s1", "600519", "A股")
+        assert warm.calls == []
+        speculative.cancel("s1")
+
+    def test_changing_suggestion_cancels_previous(self, prefetcher, warm, clock):
+        speculative = self.make(prefetcher, warm, clock, delay=0.2)
+        for symbol in ["6", "60", "600", "600519"]:
+            speculative.suggest("s1", symbol, "A股")
+
+        assert warm.called.wait(5)
+        assert warm.calls == [("600519", "A股")]
+        assert speculative.stats()["suggested"] == 4
+
+    def test_same_suggestion_keeps_timer(self, prefetcher, warm, clock):
+        speculative = self.make(prefetcher, warm, clock)
+        speculative.suggest("s1", "00700", "港股")
+        speculative.suggest("s1", "00700", "港股")
+
+        assert warm.called.wait(5)
+        assert speculative.stats()["suggested"] == 1
+
+    def wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    def test_rate_limit(self, prefetcher, warm, clock):
+        speculative = self.make(prefetcher, warm, clock, delay=0, max_per_minute=2)
+
+        def fired():
+            stats = speculative.stats()
+            return stats["prefetched"] + stats["rate_limited"]
+
+        for session, symbol in enumerate(["AAPL", "MSFT", "TSLA"]):
+            speculative.suggest(session, symbol, "美股")
+            self.wait_for(lambda: fired() == session + 1)
+        assert speculative.stats()["prefetched"] == 2
+        assert speculative.stats()["rate_limited"] == 1
+
+        clock.now = 61
+        speculative.suggest(3, "TSLA", "美股")
+        self.wait_for(lambda: speculative.stats()["prefetched"] == 3)
+
+    def test_hit_rate(self, prefetcher, warm, clock):
+        speculative = self.make(prefetcher, warm, clock)
+        assert speculative.stats()["hit_rate"] is None
+
+        speculative.suggest("s1", "600519", "A股")
+        assert warm.called.wait(5)
+
+        assert speculative.confirm("s1", "600519", "A股") is True
+        assert speculative.confirm("s1", "AAPL", "美股") is False
+        assert speculative.confirm("s2", "600519", "A股") is False
+
+        stats = speculative.stats()
+        assert stats["hits"] == 1
+        assert stats["confirmed"] == 3
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    def test_tracked_sessions_are_bounded(self, prefetcher, warm, clock):
+        speculative = self.make(prefetcher, warm, clock, delay=0, max_sessions=2)
+
+        for session, symbol in enumerate(["AAPL", "MSFT", "TSLA"]):
+            speculative.suggest(session, symbol, "美股")
+            self.wait_for(lambda: speculative.stats()["prefetched"] == session + 1)
+
+        assert speculative.stats()["tracked_sessions"] == 2
+        # 最久未活动的会话被淘汰，其余会话的命中照常统计
+        assert speculative.confirm(0, "AAPL", "美股") is False
+        assert speculative.confirm(2, "TSLA", "美股") is True
+
+    def test_confirm_cancels_waiting_timer(self, prefetcher, warm, clock):
+        speculative = self.make(prefetcher, warm, clock, delay=0.1)
+        speculative.suggest("s1", "600519", "A股")
+        speculative.confirm("s1", "600519", "A股")
+
+        assert not warm.called.wait(0.3)
+
+
+class TestWarmUp:
+    """测试数据预热"""
+
+    @pytest.fixture
+    def client(self):
+        client = Mock()
+        with patch.object(data_service, "get_backend", return_value=client):
+            yield client
+
+    def test_requests_statements_and_indicators(self, client):
+        client.get_many.return_value = [Mock(status_code=200), Mock(status_code=200)]
+        assert data_service.warm_up("00700", "港股") == 2
+
+        (statements, indicators), = client.get_many.call_args.args
+        assert statements[0] == data_service.FINANCIAL_STATEMENTS_ENDPOINT
+        assert statements[1]["query_type"] == "hk_financial_statements"
+        assert indicators[0] == data_service.FINANCIAL_INDICATORS_ENDPOINT
+        assert indicators[1]["market"] == "hk_stock"
+
+    def test_errors_are_ignored(self, client):
+        client.get_many.return_value = [Mock(status_code=500), Mock(status_code=200)]
+        assert data_service.warm_up("AAPL", "美股") == 1
+
+        client.get_many.side_effect = ApiConnectionError("down")
+        assert data_service.warm_up("AAPL", "美股") == 0
+
+    def test_unknown_market(self, client):
+        client.get_many.return_value = []
+        assert data_service.warm_up("X", "未知") == 0
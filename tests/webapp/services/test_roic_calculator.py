@@ -94,7 +94,7 @@ class TestROICCalculator:
     @pytest.fixture
     def mock_api_requests(self, mock_financial_statements_response):
         """Mock API 请求"""
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             response = Mock()
             response.status_code = 200
             response.json.return_value = mock_financial_statements_response
@@ -146,7 +146,7 @@ class TestROICCalculator:
 
     def test_calculate_roic_api_error(self):
         """测试 API 错误处理"""
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 500
             mock_get.return_value = mock_response
@@ -158,7 +158,7 @@ class TestROICCalculator:
         """测试缺少资产负债表数据"""
         empty_response = {"data": {}}
 
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = empty_response
@@ -227,7 +227,7 @@ class TestROICCalculator:
             }
         }
 
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = hk_response
@@ -282,7 +282,7 @@ class TestROICCalculator:
             }
         }
 
-        with patch('requests.get') as mock_get:
+        with patch('services.data_service.api_get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = us_response
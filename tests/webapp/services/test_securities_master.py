@@ -0,0 +1,149 @@
+"""
+测试 services/securities_master.py 和 services/stock_search_service.py
+
+测试本地证券主数据索引（代码前缀、名称、拼音首字母搜索）及其在搜索服务中的使用
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+# 添加 webapp 目录到 Python 路径
+webapp_path = Path(__file__).parent.parent.parent.parent / "webapp"
+sys.path.insert(0, str(webapp_path))
+
+from akshare_value_investment.core.stock_identifier import StockIdentifier
+from services.securities_master import (
+    SecuritiesIndex,
+    SecurityRecord,
+    fetch_securities_master,
+    get_securities_index,
+)
+from services.stock_search_service import StockSearchService
+from utils.stock_history_manager import StockHistoryManager
+
+RECORDS = [
+    SecurityRecord("600519", "贵州茅台", "A股", "gzmt"),
+    SecurityRecord("000001", "平安银行", "A股", "payh"),
+    SecurityRecord("601318", "中国平安", "A股", "zgpa"),
+    SecurityRecord("000858", "五粮液", "A股", "wly"),
+    SecurityRecord("00700", "腾讯控股", "港股", "txkg"),
+    SecurityRecord("02318", "中国平安", "港股", "zgpa"),
+    SecurityRecord("09988", "阿里巴巴-W", "港股", "albbw"),
+    SecurityRecord("AAPL", "苹果", "美股", "pg"),
+    SecurityRecord("BABA", "阿里巴巴", "美股", "albb"),
+]
+
+
+@pytest.fixture
+def index():
+    return SecuritiesIndex(RECORDS)
+
+
+class TestSecuritiesIndex:
+    """测试证券索引搜索"""
+
+    def symbols(self, records):
+        return [record.symbol for record in records]
+
+    def test_code_exact_and_prefix(self, index):
+        assert self.symbols(index.search("600519")) == ["600519"]
+        assert self.symbols(index.search("60")) == ["600519", "601318"]
+        assert self.symbols(index.search("aap")) == ["AAPL"]
+
+    def test_hk_code_zero_padding(self, index):
+        assert self.symbols(index.search("700"))[0] == "00700"
+
+    def test_name_substring(self, index):
+        assert self.symbols(index.search("茅台")) == ["600519"]
+        assert self.symbols(index.search("平安")) == ["000001", "601318", "02318"]
+        assert self.symbols(index.search("阿里巴巴")) == ["09988", "BABA"]
+
+    def test_single_character_name(self, index):
+        assert self.symbols(index.search("液")) == ["000858"]
+
+    def test_pinyin_initials(self, index):
+        assert self.symbols(index.search("gzmt")) == ["600519"]
+        assert self.symbols(index.search("ZGPA")) == ["601318", "02318"]
+
+    def test_limit_and_no_match(self, index):
+        assert len(index.search("0", limit=2)) == 2
+        assert index.search("不存在") == []
+        assert index.search("   ") == []
+
+    def test_get(self, index):
+        assert index.get("00700").name == "腾讯控股"
+        assert index.get("aapl", "美股").name == "苹果"
+        assert index.get("AAPL", "A股") is None
+
+    def test_save_and_load_round_trip(self, index, tmp_path):
+        path = tmp_path / "master.json"
+        index.save(path)
+
+        loaded = get_securities_index(path)
+        assert loaded.records == index.records
+        assert get_securities_index(path) is loaded
+        assert get_securities_index(tmp_path / "missing.json") is None
+
+    def test_search_is_sub_millisecond(self):
+        records = [SecurityRecord(f"{i:06d}", f"测试股份{i}", "A股", f"csgf{i}") for i in range(20000)]
+        large_index = SecuritiesIndex(records + RECORDS)
+
+        terms = ["600519", "6005", "茅台", "测试", "csgf1", "gzmt"]
+        start = time.perf_counter()
+        for _ in range(50):
+            for term in terms:
+                large_index.search(term)
+        per_search = (time.perf_counter() - start) / (50 * len(terms))
+
+        assert per_search < 0.001
+
+
+class TestFetchSecuritiesMaster:
+    """测试证券主数据构建"""
+
+    def test_fetch_normalizes_codes(self):
+        with patch("akshare.stock_info_a_code_name",
+                   return_value=pd.DataFrame({"code": ["600519"], "name": ["贵州茅台"]})), \
+                patch("akshare.stock_hk_spot_em",
+                      return_value=pd.DataFrame({"代码": ["700", "00700"], "名称": ["腾讯控股", "腾讯控股"]})), \
+                patch("akshare.stock_us_spot_em",
+                      return_value=pd.DataFrame({"代码": ["105.AAPL"], "名称": ["苹果"]})):
+            records = fetch_securities_master()
+
+        assert [(r.symbol, r.name, r.market) for r in records] == [
+            ("600519", "贵州茅台", "A股"),
+            ("00700", "腾讯控股", "港股"),
+            ("AAPL", "苹果", "美股"),
+        ]
+
+
+class TestStockSearchServiceWithMaster:
+    """测试搜索服务使用证券主数据"""
+
+    @pytest.fixture
+    def service(self, index, tmp_path):
+        return StockSearchService(StockIdentifier(), StockHistoryManager(cache_dir=tmp_path), securities_index=index)
+
+    def test_name_search_without_code_guess(self, service):
+        assert service.search("茅台") == [("600519 - 贵州茅台 [A股]", "600519")]
+
+    def test_code_search_shows_name(self, service):
+        results = service.search("700")
+        assert results[0] == ("00700 - 腾讯控股 [港股]", "00700")
+
+    def test_unknown_code_still_identified(self, service):
+        assert service.search("MSFT") == [("MSFT [美股] ⭐", "MSFT")]
+
+    def test_record_query_stores_name(self, service):
+        service.record_query("600519", "A股", "gzmt")
+        assert service.search("贵州")[0] == ("600519 - 贵州茅台 [A股]", "600519")
+        assert service.history.get_record("600519").name == "贵州茅台"
+
+    def test_without_master_keeps_previous_behavior(self, tmp_path):
+        service = StockSearchService(StockIdentifier(), StockHistoryManager(cache_dir=tmp_path))
+        assert service.search("600519") == [("600519 [A股] ⭐", "600519")]
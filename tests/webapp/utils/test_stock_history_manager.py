@@ -0,0 +1,120 @@
+"""
+测试 utils/stock_history_manager.py
+
+测试基于 SQLite 的股票历史记录：原子 upsert、前缀搜索、容量淘汰、并发写入和旧版 JSON 导入
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# 添加 webapp 目录到 Python 路径
+webapp_path = Path(__file__).parent.parent.parent.parent / "webapp"
+sys.path.insert(0, str(webapp_path))
+
+from utils.stock_history_manager import StockHistoryManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return StockHistoryManager(cache_dir=tmp_path)
+
+
+class TestStockHistoryManager:
+    """测试历史记录管理器"""
+
+    def test_add_record_upserts(self, manager):
+        manager.add_record("600519", "A股", "SH600519")
+        manager.add_record("600519", "A股", "600519", name="贵州茅台")
+
+        record = manager.get_record("600519")
+        assert record.query_count == 2
+        assert record.original_input == "SH600519"
+        assert record.name == "贵州茅台"
+
+    def test_empty_search_orders_by_query_count(self, manager):
+        manager.add_record("00700", "港股", "700")
+        manager.add_record("600519", "A股", "600519", name="贵州茅台")
+        manager.add_record("600519", "A股", "600519")
+
+        assert manager.search("") == [("600519 - 贵州茅台 [A股]", "600519"), ("00700 [港股]", "00700")]
+
+    def test_prefix_search_on_symbol_input_and_name(self, manager):
+        manager.add_record("600519", "A股", "gzmt", name="贵州茅台")
+        manager.add_record("00700", "港股", "HK.00700", name="腾讯控股")
+        manager.add_record("AAPL", "美股", "aapl")
+
+        assert [s for _, s in manager.search("6005")] == ["600519"]
+        assert [s for _, s in manager.search("GZ")] == ["600519"]
+        assert [s for _, s in manager.search("腾讯")] == ["00700"]
+        assert [s for _, s in manager.search("700")] == ["00700"]
+        assert [s for _, s in manager.search("Aa")] == ["AAPL"]
+
+    def test_substring_fallback_on_name(self, manager):
+        manager.add_record("600519", "A股", "600519", name="贵州茅台")
+        manager.add_record("000858", "A股", "000858", name="五粮液")
+        manager.add_record("600600", "A股", "600600", name="青岛啤酒")
+
+        assert manager.search("茅台") == [("600519 - 贵州茅台 [A股]", "600519")]
+        assert [s for _, s in manager.search("粮")] == ["000858"]
+        assert manager.search("%") == []
+        # 前缀结果在前，子串结果补足且不重复
+        manager.add_record("600601", "A股", "600601", name="6006茅台科技")
+        assert [s for _, s in manager.search("6006")] == ["600600", "600601"]
+        assert [s for _, s in manager.search("茅台", limit=1)] == ["600519"]
+
+    def test_retention_keeps_most_recent(self, tmp_path):
+        manager = StockHistoryManager(cache_dir=tmp_path, max_records=3)
+        for symbol in ["000001", "000002", "000003", "000004"]:
+            manager.add_record(symbol, "A股", symbol)
+
+        assert sorted(manager.get_all_symbols()) == ["000002", "000003", "000004"]
+
+    def test_concurrent_writers_lose_no_updates(self, tmp_path):
+        managers = [StockHistoryManager(cache_dir=tmp_path, max_records=100) for _ in range(4)]
+
+        def write(m):
+            for i in range(25):
+                m.add_record("600519", "A股", "600519")
+                m.add_record(f"{i:06d}", "A股", f"{i:06d}")
+
+        threads = [threading.Thread(target=write, args=(m,)) for m in managers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert managers[0].get_record("600519").query_count == 100
+        assert managers[0].get_statistics()["total_count"] == 26
+
+    def test_prefix_search_uses_index(self, manager):
+        with sqlite3.connect(manager.db_file) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT symbol FROM stock_history WHERE symbol_key >= ? AND symbol_key < ?",
+                ("60", "60\U0010ffff"),
+            ).fetchall()
+        assert "idx_history_symbol_key" in str(plan)
+
+    def test_legacy_json_is_migrated(self, tmp_path):
+        legacy = {
+            "600519": {"symbol": "600519", "market": "A股", "original_input": "600519",
+                       "query_count": 3, "last_query_time": "2025-01-01T00:00:00"},
+        }
+        (tmp_path / "stock_history.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        manager = StockHistoryManager(cache_dir=tmp_path)
+
+        assert manager.get_record("600519").query_count == 3
+        assert not (tmp_path / "stock_history.json").exists()
+        assert StockHistoryManager(cache_dir=tmp_path).get_record("600519").query_count == 3
+
+    def test_clear_history(self, manager):
+        manager.add_record("600519", "A股", "600519")
+        manager.clear_history()
+
+        assert manager.get_all_symbols() == []
+        assert manager.get_statistics()["total_queries"] == 0
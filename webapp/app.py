@@ -5,13 +5,13 @@
 """
 
 import sys
+import uuid
 from pathlib import Path
 
 # 添加 src 目录到 Python 路径
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import streamlit as st
-from akshare_value_investment.container import create_container
 
 # 导入配置
 from config import (
@@ -21,6 +21,8 @@ from config import (
     DEFAULT_SYMBOL,
     SEARCHBOX_RERUN_DELAY,
     SEARCHBOX_DEFAULT_LIMIT,
+    SPECULATIVE_PREFETCH_DELAY_MS,
+    SPECULATIVE_PREFETCH_PER_MINUTE,
     PAGE_TITLE,
     PAGE_LAYOUT,
     INITIAL_SIDEBAR_STATE,
@@ -28,12 +30,17 @@ from config import (
     MARKET_CAP_MAX,
     MARKET_CAP_STEP,
     MARKET_CAP_DEFAULT,
+    SECURITIES_MASTER_PATH,
+    HISTORY_CACHE_DIR,
+    MAX_HISTORY_RECORDS,
+    DEBUG_MODE,
 )
 
 # 导入搜索相关组件
 from streamlit_searchbox import st_searchbox
-from services.stock_search_service import StockSearchService
-from utils.stock_history_manager import StockHistoryManager
+from services.app_resources import RerunTimer, get_app_resources, refresh_securities_index
+from services.prefetch import prefetch_symbol
+from services.data_service import recent_server_timings
 
 # 导入分析组件
 from components.net_profit_cash_ratio import NetProfitCashRatioComponent
@@ -80,13 +87,20 @@ ANALYSIS_COMPONENTS = []
 for components in ANALYSIS_GROUPS.values():
     ANALYSIS_COMPONENTS.extend(components)
 
-# 创建容器，获取股票识别器
-container = create_container()
-stock_identifier = container.stock_identifier()
-
-# 初始化搜索服务
-history_manager = StockHistoryManager()
-search_service = StockSearchService(stock_identifier, history_manager)
+# 记录本次重跑的墙钟时间
+rerun_timer = RerunTimer.start()
+
+# 容器、股票识别器和搜索服务每个进程只创建一次，跨会话、跨重跑共享
+resources = get_app_resources(MAX_HISTORY_RECORDS, SECURITIES_MASTER_PATH,
+                              history_dir=HISTORY_CACHE_DIR,
+                              speculative_delay_ms=SPECULATIVE_PREFETCH_DELAY_MS,
+                              speculative_per_minute=SPECULATIVE_PREFETCH_PER_MINUTE)
+refresh_securities_index(resources, SECURITIES_MASTER_PATH)
+stock_identifier = resources.stock_identifier
+history_manager = resources.history_manager
+search_service = resources.search_service
+prefetcher = resources.prefetcher
+speculative_prefetcher = resources.speculative_prefetcher
 
 # 页面配置
 st.set_page_config(
@@ -105,11 +119,24 @@ if 'confirmed_symbol' not in st.session_state:
 if 'pending_symbol' not in st.session_state:
     st.session_state.pending_symbol = None
 
+# 会话标识（投机预取按会话防抖）
+if 'session_token' not in st.session_state:
+    st.session_state.session_token = uuid.uuid4().hex
+
+
+def resolve_symbol(value: str) -> tuple:
+    """识别股票代码，返回 (标准化代码, 市场名称)"""
+    identified_market, identified_symbol = stock_identifier.identify(value)
+    standardized_symbol = stock_identifier.format_symbol(identified_market, identified_symbol)
+    return standardized_symbol, MARKET_TYPE_MAP.get(identified_market, str(identified_market))
+
 
 # 股票搜索函数
 def search_stocks(searchterm: str, **kwargs) -> list:
     """搜索股票（用于 searchbox）
 
+    首个候选稳定一段时间后在后台投机预取其财务数据，不阻塞搜索框。
+
     Args:
         searchterm: 搜索词
         **kwargs: searchbox 传递的额外参数（如 rerun_delay），忽略即可
@@ -117,18 +144,24 @@ def search_stocks(searchterm: str, **kwargs) -> list:
     if not searchterm:
         # 返回最近查询的股票
         return history_manager.search("", limit=SEARCHBOX_DEFAULT_LIMIT)
-    return search_service.search(searchterm)
+    results = search_service.search(searchterm)
+    if results and SPECULATIVE_PREFETCH_PER_MINUTE > 0:
+        speculative_prefetcher.suggest(st.session_state.session_token, *resolve_symbol(results[0][1]))
+    return results
 
 
 # 股票代码搜索框
 selected_result = st_searchbox(
     search_stocks,
     key="stock_searchbox",
-    placeholder="输入股票代码...",
+    placeholder="输入股票代码、名称或拼音首字母...",
     label="股票代码",
     help="""
     **智能识别**：自动识别股票代码所属市场
 
+    **名称搜索**：茅台、腾讯、苹果；拼音首字母：gzmt
+    （需先运行 `scripts/build_securities_master.py` 生成证券主数据）
+
     **A股格式**：
     - 纯数字：600519, 000001, 300015
     - 带前缀：SH600519, SZ000001
@@ -149,20 +182,20 @@ selected_result = st_searchbox(
 if selected_result and selected_result != st.session_state.pending_symbol:
     st.session_state.pending_symbol = selected_result
 
-    # 识别股票信息
-    identified_market, identified_symbol = stock_identifier.identify(selected_result)
-
-    # 使用 format_symbol 获得真正标准化的代码（用于去重）
-    standardized_symbol = stock_identifier.format_symbol(identified_market, identified_symbol)
+    # 识别股票信息，使用 format_symbol 获得真正标准化的代码（用于去重）
+    standardized_symbol, selected_market = resolve_symbol(selected_result)
 
     # 更新确认的股票代码
     st.session_state.confirmed_symbol = standardized_symbol
 
+    # 统计投机预取命中率
+    speculative_prefetcher.confirm(st.session_state.session_token, standardized_symbol, selected_market)
+
     # 注意：历史记录将在数据查询成功后记录
     # 这里暂存待记录的信息（使用标准化代码作为键）
     st.session_state.pending_record = {
         'symbol': standardized_symbol,
-        'market': MARKET_TYPE_MAP.get(identified_market, str(identified_market)),
+        'market': selected_market,
         'original_input': selected_result
     }
 
@@ -233,23 +266,30 @@ if should_analyze:
 
 # 渲染组件
 if selected_component == "全部显示":
-    # 使用Tab标签页分组显示
+    # 分组切换：只渲染选中的分组，其它分组在打开时才计算
     group_names = list(ANALYSIS_GROUPS.keys())
-    tabs = st.tabs(group_names)
+    selected_group = st.segmented_control(
+        "分析分组",
+        group_names,
+        default=group_names[0],
+        key="selected_group",
+        label_visibility="collapsed"
+    ) or group_names[0]
 
     # 记录是否有组件成功渲染
     any_component_success = False
 
-    for tab, group_name in zip(tabs, group_names):
-        with tab:
-            components = ANALYSIS_GROUPS[group_name]
-            if not components:
-                st.info("📭 该分类下暂无分析模块")
-            else:
-                for component in components:
-                    success = component.render(symbol, market, years)
-                    if success:
-                        any_component_success = True
+    components = ANALYSIS_GROUPS[selected_group]
+    if not components:
+        st.info("📭 该分类下暂无分析模块")
+    else:
+        for component in components:
+            success = component.render(symbol, market, years)
+            if success:
+                any_component_success = True
+
+    # 后台预取其它分组用到的数据，切换分组时命中 API 缓存
+    prefetch_symbol(prefetcher, symbol, market)
 
     # 如果有组件成功渲染，记录历史
     if any_component_success and 'pending_record' in st.session_state:
@@ -272,6 +312,7 @@ else:
 
             # 渲染该组件
             success = component.render(symbol, market, years)
+            prefetch_symbol(prefetcher, symbol, market)
 
             # 如果渲染成功，记录历史
             if success and 'pending_record' in st.session_state:
@@ -285,3 +326,40 @@ else:
                 del st.session_state.pending_record
 
             break
+
+# ==================== 重跑耗时 ====================
+rerun_timer.stop()
+if DEBUG_MODE:
+    timing = RerunTimer.summary()
+    st.sidebar.caption(
+        f"⏱️ 重跑耗时：本次 {timing['last_ms']:.0f} ms，"
+        f"平均 {timing['mean_ms']:.0f} ms，最大 {timing['max_ms']:.0f} ms（{timing['count']} 次）"
+    )
+    speculation = speculative_prefetcher.stats()
+    if speculation['hit_rate'] is not None:
+        st.sidebar.caption(
+            f"🔮 投机预取命中率：{speculation['hit_rate']:.0%}"
+            f"（命中 {speculation['hits']}/{speculation['confirmed']}，"
+            f"预取 {speculation['prefetched']}，限流 {speculation['rate_limited']}）"
+        )
+
+    # 最近请求的服务端耗时（Server-Timing）：各阶段耗时和每张报表的数据来源
+    server_timings = recent_server_timings()
+    if server_timings:
+        with st.sidebar.expander("🧭 服务端耗时", expanded=False):
+            st.dataframe(
+                [
+                    {
+                        "端点": entry["endpoint"].rsplit("/", 1)[-1],
+                        "代码": entry["symbol"],
+                        "总耗时(ms)": entry["total_ms"],
+                        "阶段耗时(ms)": ", ".join(f"{stage}={ms:.1f}" for stage, ms in entry["stages"].items()),
+                        "数据来源": (
+                            f"客户端缓存({entry['client_cache']})" if entry["client_cache"]
+                            else " ".join(f"{name}={source}" for name, source in entry["cache_sources"].items())
+                        ),
+                    }
+                    for entry in server_timings
+                ],
+                hide_index=True,
+            )
@@ -4,9 +4,7 @@
 
 import traceback
 import streamlit as st
-import plotly.graph_objects as go
 import pandas as pd
-import requests
 from services.calculators.liquidity_ratio import calculate, calculate_interest_coverage_ratio, INF_VALUE
 from services import data_service
 
@@ -28,6 +26,9 @@ class LiquidityRatioComponent:
         Returns:
             bool: 是否成功渲染
         """
+        # 延迟导入，优化启动性能
+        import plotly.graph_objects as go
+
         try:
             st.markdown("---")
             st.subheader(
@@ -63,14 +64,13 @@ class LiquidityRatioComponent:
                     }
                     market_type = market_type_map.get(market)
 
-                    indicators_response = requests.get(
-                        f"{data_service.API_BASE_URL}/api/v1/financial/indicators",
+                    indicators_response = data_service.api_get(
+                        data_service.FINANCIAL_INDICATORS_ENDPOINT,
                         params={
                             "symbol": symbol,
                             "market": market_type,
                             "frequency": "annual"
-                        },
-                        timeout=30
+                        }
                     )
 
                     if indicators_response.status_code != 200:
@@ -28,6 +28,16 @@ API_BASE_URL: Final = os.getenv(
 # API 超时设置（秒）
 API_TIMEOUT: Final = int(os.getenv("API_TIMEOUT", "30"))
 
+# API 请求失败（连接失败、超时、502/503/504）时的重试次数
+API_MAX_RETRIES: Final = int(os.getenv("API_MAX_RETRIES", "2"))
+
+# 本地响应缓存有效期（秒），0 表示不缓存
+API_RESPONSE_CACHE_TTL: Final = float(os.getenv("API_RESPONSE_CACHE_TTL", "60"))
+
+# 数据访问后端：http（请求 FastAPI 服务）或 embedded（进程内直接调用查询服务，
+# Web 应用与 API 部署在同一主机时可省去 HTTP 和 JSON 开销）
+DATA_BACKEND: Final = os.getenv("DATA_BACKEND", "http").lower()
+
 
 # ==================== Streamlit 配置 ====================
 
@@ -42,12 +52,18 @@ DEFAULT_SYMBOL: Final = os.getenv("DEFAULT_SYMBOL", "600519")
 
 # ==================== 缓存配置 ====================
 
-# 历史记录缓存路径
-HISTORY_CACHE_PATH: Final = PROJECT_ROOT / "webapp" / ".cache" / "stock_history.json"
+# 历史记录数据库目录（SQLite，库文件为其中的 stock_history.db）
+HISTORY_CACHE_DIR: Final = Path(os.getenv("HISTORY_CACHE_DIR", str(PROJECT_ROOT / "webapp" / ".cache")))
 
 # 历史记录最大条数
 MAX_HISTORY_RECORDS: Final = int(os.getenv("MAX_HISTORY_RECORDS", "50"))
 
+# 证券主数据路径（由 scripts/build_securities_master.py 生成）
+SECURITIES_MASTER_PATH: Final = Path(os.getenv(
+    "SECURITIES_MASTER_PATH",
+    str(PROJECT_ROOT / "webapp" / ".cache" / "securities_master.json")
+))
+
 
 # ==================== UI 配置 ====================
 
@@ -68,6 +84,10 @@ SEARCHBOX_RERUN_DELAY: Final = 200
 # 搜索框默认显示数量
 SEARCHBOX_DEFAULT_LIMIT: Final = 8
 
+# 搜索框投机预取：首个候选保持不变多少毫秒后预取，每分钟最多预取次数（0 表示关闭）
+SPECULATIVE_PREFETCH_DELAY_MS: Final = int(os.getenv("SPECULATIVE_PREFETCH_DELAY_MS", "400"))
+SPECULATIVE_PREFETCH_PER_MINUTE: Final = int(os.getenv("SPECULATIVE_PREFETCH_PER_MINUTE", "20"))
+
 
 # ==================== 市场类型映射 ====================
 
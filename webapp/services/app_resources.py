@@ -0,0 +1,145 @@
+"""
+应用级共享资源
+
+Streamlit 每次交互（输入、拖动滑块、切换选项）都会重新执行 `app.py`。
+容器、历史记录管理器、搜索服务和后台预取线程池如果在脚本顶层创建，每次重跑都会重新配置日志、
+打开 diskcache 句柄、重建搜索服务。
+
+这里用 `st.cache_resource` 让这些资源每个服务进程只创建一次，在所有会话和重跑之间共享。
+这些对象本身是线程安全的（SQLite 每次操作独立连接，识别器无状态），可以跨会话共享。
+
+同时提供重跑耗时统计 `RerunTimer`，用于对比优化前后每次重跑的墙钟时间。
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import streamlit as st
+
+from akshare_value_investment.core.stock_identifier import StockIdentifier
+from services.prefetch import Prefetcher, SpeculativePrefetcher
+from services.securities_master import get_securities_index
+from services.stock_search_service import StockSearchService
+from utils.stock_history_manager import StockHistoryManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AppResources:
+    """应用共享资源"""
+    container: object
+    stock_identifier: StockIdentifier
+    history_manager: StockHistoryManager
+    search_service: StockSearchService
+    prefetcher: Prefetcher
+    speculative_prefetcher: SpeculativePrefetcher
+
+
+def build_app_resources(max_history_records: int = 50,
+                        securities_master_path: Optional[Path] = None,
+                        history_dir: Optional[Path] = None,
+                        speculative_delay_ms: int = 400,
+                        speculative_per_minute: int = 20) -> AppResources:
+    """
+    创建应用资源（不缓存，每次调用都重新创建）
+
+    Args:
+        max_history_records: 历史记录最大条数
+        securities_master_path: 证券主数据路径（None 表示不使用证券主数据）
+        history_dir: 历史记录数据库目录（None 使用默认目录）
+        speculative_delay_ms: 搜索框候选稳定多少毫秒后投机预取
+        speculative_per_minute: 每分钟最多投机预取次数
+
+    Returns:
+        应用资源
+    """
+    from akshare_value_investment.container import create_container
+
+    container = create_container()
+    stock_identifier = container.stock_identifier()
+    history_manager = StockHistoryManager(cache_dir=history_dir, max_records=max_history_records)
+    securities_index = get_securities_index(securities_master_path) if securities_master_path else None
+    search_service = StockSearchService(stock_identifier, history_manager, securities_index=securities_index)
+    prefetcher = Prefetcher()
+    speculative_prefetcher = SpeculativePrefetcher(prefetcher, delay=speculative_delay_ms / 1000,
+                                                   max_per_minute=speculative_per_minute)
+    return AppResources(container, stock_identifier, history_manager, search_service,
+                        prefetcher, speculative_prefetcher)
+
+
+@st.cache_resource(show_spinner=False)
+def get_app_resources(max_history_records: int = 50,
+                      securities_master_path: Optional[Path] = None,
+                      history_dir: Optional[Path] = None,
+                      speculative_delay_ms: int = 400,
+                      speculative_per_minute: int = 20) -> AppResources:
+    """
+    获取应用资源（每个服务进程只创建一次，跨会话、跨重跑共享）
+
+    参数相同的调用返回同一个实例；参数见 `build_app_resources`。
+    """
+    logger.info("创建应用共享资源")
+    return build_app_resources(max_history_records, securities_master_path, history_dir,
+                               speculative_delay_ms, speculative_per_minute)
+
+
+def refresh_securities_index(resources: AppResources, securities_master_path: Optional[Path]):
+    """
+    证券主数据文件更新后切换到新索引
+
+    `get_securities_index` 按文件修改时间缓存，文件未变化时只有一次 stat 调用。
+    """
+    if securities_master_path:
+        index = get_securities_index(securities_master_path)
+        if index is not None:
+            resources.search_service.securities = index
+
+
+class RerunTimer:
+    """
+    记录每次脚本重跑的墙钟时间
+
+    ```python
+    timer = RerunTimer.start()
+    ...  # 页面渲染
+    timer.stop()
+    ```
+
+    最近的耗时保存在 `st.session_state` 中，`summary()` 返回最近一次和平均耗时（毫秒）。
+    """
+
+    SESSION_KEY = "_rerun_timings_ms"
+    HISTORY_SIZE = 50
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+
+    @classmethod
+    def start(cls) -> "RerunTimer":
+        return cls(time.perf_counter())
+
+    def stop(self) -> float:
+        """结束计时并记录，返回本次耗时（毫秒）"""
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        timings: List[float] = st.session_state.setdefault(self.SESSION_KEY, [])
+        timings.append(elapsed_ms)
+        del timings[:-self.HISTORY_SIZE]
+        logger.debug("页面重跑耗时 %.1f ms", elapsed_ms)
+        return elapsed_ms
+
+    @classmethod
+    def summary(cls) -> Optional[dict]:
+        """最近一次、平均和最大重跑耗时（毫秒）；尚无记录时返回 None"""
+        timings = st.session_state.get(cls.SESSION_KEY)
+        if not timings:
+            return None
+        return {
+            "last_ms": timings[-1],
+            "mean_ms": sum(timings) / len(timings),
+            "max_ms": max(timings),
+            "count": len(timings),
+        }
@@ -6,7 +6,6 @@
 
 from typing import Dict, Tuple, List
 import pandas as pd
-import requests
 
 from .. import data_service
 from .common import calculate_interest_bearing_debt, calculate_free_cash_flow
@@ -41,14 +40,13 @@ def calculate(symbol: str, market: str, years: int) -> Tuple[pd.DataFrame, List[
     }
     query_type = query_type_map.get(market)
 
-    response = requests.get(
-        f"{data_service.API_BASE_URL}{data_service.FINANCIAL_STATEMENTS_ENDPOINT}",
+    response = data_service.api_get(
+        data_service.FINANCIAL_STATEMENTS_ENDPOINT,
         params={
             "symbol": symbol,
             "query_type": query_type,
             "frequency": "annual"
-        },
-        timeout=30
+        }
     )
 
     if response.status_code != 200:
@@ -6,7 +6,6 @@
 
 from typing import Dict, Tuple, List
 import pandas as pd
-import requests
 
 from .. import data_service
 
@@ -32,14 +31,13 @@ def calculate(
         data_service.DataServiceError: 其他数据错误
     """
     # 获取港股资产负债表
-    response = requests.get(
-        f"{data_service.API_BASE_URL}{data_service.FINANCIAL_STATEMENTS_ENDPOINT}",
+    response = data_service.api_get(
+        data_service.FINANCIAL_STATEMENTS_ENDPOINT,
         params={
             "symbol": symbol,
             "query_type": "hk_financial_statements",
             "frequency": "annual"
-        },
-        timeout=30
+        }
     )
 
     if response.status_code != 200:
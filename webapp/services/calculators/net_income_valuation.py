@@ -8,7 +8,6 @@
 
 from typing import Dict, List, Tuple
 import pandas as pd
-import requests
 
 from .. import data_service
 
@@ -51,14 +50,13 @@ def calculate(
         raise ValueError(f"不支持的市场类型: {market}")
 
     # 调用FastAPI的财务三表查询端点
-    response = requests.get(
-        "http://localhost:8000/api/v1/financial/statements",
+    response = data_service.api_get(
+        data_service.FINANCIAL_STATEMENTS_ENDPOINT,
         params={
             "symbol": symbol,
             "query_type": query_type,
             "frequency": "annual"
-        },
-        timeout=30
+        }
     )
 
     if response.status_code != 200:
@@ -6,7 +6,6 @@ ROE和杜邦分析计算器
 
 from typing import Tuple
 import pandas as pd
-import requests
 
 from .. import data_service
 
@@ -35,14 +34,13 @@ def calculate(symbol: str, market: str, years: int) -> Tuple[pd.DataFrame, pd.Da
     }
     market_type = market_type_map.get(market)
 
-    response = requests.get(
-        f"{data_service.API_BASE_URL}/api/v1/financial/indicators",
+    response = data_service.api_get(
+        data_service.FINANCIAL_INDICATORS_ENDPOINT,
         params={
             "symbol": symbol,
             "market": market_type,
             "frequency": "annual"
-        },
-        timeout=30
+        }
     )
 
     if response.status_code != 200:
@@ -113,14 +111,13 @@ def calculate(symbol: str, market: str, years: int) -> Tuple[pd.DataFrame, pd.Da
     }
     query_type = query_type_map.get(market)
 
-    response = requests.get(
-        f"{data_service.API_BASE_URL}/api/v1/financial/statements",
+    response = data_service.api_get(
+        data_service.FINANCIAL_STATEMENTS_ENDPOINT,
         params={
             "symbol": symbol,
             "query_type": query_type,
             "frequency": "annual"
-        },
-        timeout=30
+        }
     )
 
     if response.status_code != 200:
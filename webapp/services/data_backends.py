@@ -0,0 +1,182 @@
+"""
+数据访问后端
+
+分析模块通过 `data_service.api_get(endpoint, params)` 获取数据，返回对象只需要
+`status_code` 和 `json()`。这里提供两种可互换的实现，由配置 `DATA_BACKEND` 选择：
+
+- **http**（默认）: 经 `ApiClient` 请求独立部署的 FastAPI 服务
+- **embedded**: Web 应用与 API 部署在同一主机时，在进程内直接调用 `FinancialQueryService`，
+  省去 HTTP 往返、JSON 编解码和第二个 Python 进程；财务三表以 DataFrame 形式直接返回
+  （`pd.DataFrame(df)` 对 DataFrame 同样适用，计算器代码无需修改）
+
+两种后端对同一请求返回相同结构的响应体（同一个 `ResponseFormatter`），错误状态码也与
+API 路由一致：参数错误 400，其它异常 500。进程内响应同样带 `Server-Timing` 响应头，
+`explain=true` 时在 metadata.explain 中返回耗时明细。
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from akshare_value_investment.client import (
+    FINANCIAL_INDICATORS_PATH,
+    FINANCIAL_STATEMENTS_PATH,
+    ApiClient,
+)
+from akshare_value_investment.observability.request_timing import collect_request_timings
+
+logger = logging.getLogger(__name__)
+
+Request = Tuple[str, Optional[Mapping]]
+
+
+class HttpDataBackend:
+    """通过 HTTP 请求 FastAPI 服务"""
+
+    name = "http"
+
+    def __init__(self, client: ApiClient):
+        self.client = client
+
+    def get(self, endpoint: str, params: Optional[Mapping] = None):
+        return self.client.get(endpoint, params)
+
+    def get_many(self, requests: Sequence[Request]) -> List:
+        return self.client.get_many(requests)
+
+
+class InProcessResponse:
+    """进程内调用的响应（与 httpx.Response 一样提供 status_code、headers 和 json()）"""
+
+    def __init__(self, status_code: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+
+    def json(self) -> Dict[str, Any]:
+        """
+        响应体
+
+        财务三表中的 DataFrame 每次返回浅拷贝，调用方新增列不会影响其它调用方。
+        """
+        data = self._payload.get("data")
+        if not isinstance(data, dict):
+            return self._payload
+
+        copied = {}
+        for name, statement in data.items():
+            frame = statement.get("data") if isinstance(statement, dict) else None
+            if hasattr(frame, "copy"):
+                statement = {**statement, "data": frame.copy(deep=False)}
+            copied[name] = statement
+        return {**self._payload, "data": copied}
+
+
+class EmbeddedDataBackend:
+    """在进程内直接调用 FinancialQueryService"""
+
+    name = "embedded"
+
+    def __init__(self, financial_service=None):
+        """
+        Args:
+            financial_service: 财务查询服务（None 时首次请求时用 create_container() 创建）
+        """
+        self._service = financial_service
+        self._lock = threading.Lock()
+
+    @property
+    def financial_service(self):
+        if self._service is None:
+            with self._lock:
+                if self._service is None:
+                    from akshare_value_investment.container import create_container
+                    from akshare_value_investment.business.financial_query_service import FinancialQueryService
+
+                    self._service = FinancialQueryService(create_container())
+        return self._service
+
+    def get(self, endpoint: str, params: Optional[Mapping] = None) -> InProcessResponse:
+        params = dict(params or {})
+        with collect_request_timings() as timings:
+            response = self._dispatch(endpoint, params)
+            if params.get("explain") in (True, "true") and isinstance(response._payload.get("metadata"), dict):
+                response._payload["metadata"]["explain"] = timings.explain()
+        response.headers["Server-Timing"] = timings.server_timing()
+        return response
+
+    def _dispatch(self, endpoint: str, params: Dict) -> InProcessResponse:
+        try:
+            if endpoint == FINANCIAL_STATEMENTS_PATH:
+                return self._statements(params)
+            if endpoint == FINANCIAL_INDICATORS_PATH:
+                return self._indicators(params)
+            return InProcessResponse(404, {"detail": f"嵌入模式不支持的端点: {endpoint}"})
+        except (KeyError, ValueError) as e:
+            return InProcessResponse(400, {"detail": {"error": {"type": "invalid_request", "message": str(e)}}})
+        except Exception as e:
+            logger.error("进程内查询失败: %s %s", endpoint, params, exc_info=True)
+            return InProcessResponse(500, {"detail": f"进程内查询错误: {e}"})
+
+    def get_many(self, requests: Sequence[Request]) -> List[InProcessResponse]:
+        return [self.get(endpoint, params) for endpoint, params in requests]
+
+    def _statements(self, params: Dict) -> InProcessResponse:
+        from akshare_value_investment.business.financial_types import FinancialQueryType, Frequency
+        from akshare_value_investment.business.response_formatter import ResponseFormatter
+
+        query_type = FinancialQueryType(params["query_type"])
+        frequency = Frequency(params.get("frequency", "annual"))
+        limit = int(params["limit"]) if params.get("limit") is not None else None
+
+        result = self.financial_service.query_financial_statements(
+            query_type=query_type,
+            symbol=params["symbol"],
+            frequency=frequency,
+            limit=limit
+        )
+        payload = ResponseFormatter.financial_statements(
+            result, symbol=params["symbol"], query_type=query_type, frequency=frequency,
+            limit=limit, as_records=False
+        )
+        return InProcessResponse(200, payload)
+
+    def _indicators(self, params: Dict) -> InProcessResponse:
+        from akshare_value_investment.business.financial_types import FinancialQueryType, Frequency
+        from akshare_value_investment.core.models import MarketType
+
+        query_types = {
+            MarketType.A_STOCK: FinancialQueryType.A_STOCK_INDICATORS,
+            MarketType.HK_STOCK: FinancialQueryType.HK_STOCK_INDICATORS,
+            MarketType.US_STOCK: FinancialQueryType.US_STOCK_INDICATORS,
+        }
+        market = MarketType(params.get("market", "a_stock"))
+
+        payload = self.financial_service.query(
+            market=market,
+            query_type=query_types[market],
+            symbol=params["symbol"],
+            frequency=Frequency(params.get("frequency", "annual"))
+        )
+        return InProcessResponse(200, payload)
+
+
+BACKENDS = ("http", "embedded")
+
+
+def create_backend(name: str, client_factory=None):
+    """
+    按名称创建数据访问后端
+
+    Args:
+        name: "http" 或 "embedded"
+        client_factory: 创建 ApiClient 的函数（仅 http 后端使用）
+
+    Raises:
+        ValueError: 未知的后端名称
+    """
+    if name == "http":
+        return HttpDataBackend(client_factory())
+    if name == "embedded":
+        return EmbeddedDataBackend()
+    raise ValueError(f"未知的数据访问后端: {name}（可选: {', '.join(BACKENDS)}）")
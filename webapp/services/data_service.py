@@ -2,19 +2,52 @@
 数据获取服务
 
 为Streamlit应用提供简化的数据查询接口，通过FastAPI Web服务获取数据
+
+所有 API 请求都经过 `api_get()`，由配置 `DATA_BACKEND` 选择的数据访问后端执行
+（见 `services.data_backends`）：
+- http: 共用进程内的 `ApiClient`（连接池、gzip、重试、本地响应缓存）请求 FastAPI 服务
+- embedded: 进程内直接调用 `FinancialQueryService`，不经过 HTTP 和 JSON
+
+调试模式（DEBUG_MODE）下记录最近请求的 `Server-Timing`（各阶段耗时和报表数据来源），
+由侧边栏展示。
 """
 
-import requests
+import threading
+from collections import deque
 import pandas as pd
 import sys
 from pathlib import Path
 
 # 添加项目根目录到路径以导入配置
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import API_BASE_URL, API_TIMEOUT, get_api_endpoint
+from config import API_BASE_URL, API_TIMEOUT, API_MAX_RETRIES, API_RESPONSE_CACHE_TTL, DATA_BACKEND, DEBUG_MODE
+from akshare_value_investment.client import (
+    FINANCIAL_INDICATORS_PATH,
+    FINANCIAL_STATEMENTS_PATH,
+    ApiClient,
+    ApiConnectionError,
+    ApiTimeoutError,
+    ResponseCache,
+)
+from akshare_value_investment.client.api_client import CACHE_HEADER
+from akshare_value_investment.observability.request_timing import parse_server_timing
+from services.data_backends import create_backend
 
 # API端点常量
-FINANCIAL_STATEMENTS_ENDPOINT = "/api/v1/financial/statements"
+FINANCIAL_STATEMENTS_ENDPOINT = FINANCIAL_STATEMENTS_PATH
+FINANCIAL_INDICATORS_ENDPOINT = FINANCIAL_INDICATORS_PATH
+
+# 市场 → 查询类型 / 市场参数
+STATEMENTS_QUERY_TYPES = {
+    "A股": "a_financial_statements",
+    "港股": "hk_financial_statements",
+    "美股": "us_financial_statements"
+}
+INDICATOR_MARKETS = {
+    "A股": "a_stock",
+    "港股": "hk_stock",
+    "美股": "us_stock"
+}
 
 
 class DataServiceError(Exception):
@@ -35,6 +68,99 @@ class APIServiceUnavailableError(DataServiceError):
     pass
 
 
+_client = None
+_client_lock = threading.RLock()
+
+
+def get_api_client() -> ApiClient:
+    """进程内共享的 API 客户端（首次使用时创建）"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                cache = ResponseCache(ttl=API_RESPONSE_CACHE_TTL) if API_RESPONSE_CACHE_TTL > 0 else None
+                _client = ApiClient(API_BASE_URL, timeout=API_TIMEOUT, max_retries=API_MAX_RETRIES, cache=cache)
+    return _client
+
+
+_backend = None
+
+
+def get_backend():
+    """当前数据访问后端（首次使用时按 DATA_BACKEND 配置创建）"""
+    global _backend
+    if _backend is None:
+        with _client_lock:
+            if _backend is None:
+                _backend = create_backend(DATA_BACKEND, client_factory=get_api_client)
+    return _backend
+
+
+def set_backend(backend):
+    """替换数据访问后端（None 表示恢复为按配置创建）"""
+    global _backend
+    _backend = backend
+
+
+def api_get(endpoint: str, params: dict = None):
+    """GET 请求 API 端点
+
+    Args:
+        endpoint: API 端点路径（如 FINANCIAL_STATEMENTS_ENDPOINT）
+        params: 查询参数
+
+    Returns:
+        带 status_code 和 json() 的响应（是否成功由调用方根据 status_code 判断）
+
+    Raises:
+        APIServiceUnavailableError: 无法连接或请求超时（已重试）
+    """
+    try:
+        response = get_backend().get(endpoint, params)
+    except ApiConnectionError:
+        raise APIServiceUnavailableError(
+            "无法连接到API服务",
+            [
+                "请确保FastAPI服务已启动 (poe api)",
+                f"检查服务地址: {API_BASE_URL}",
+                "查看文档启动API服务"
+            ]
+        )
+    except ApiTimeoutError:
+        raise APIServiceUnavailableError(
+            "API服务请求超时",
+            ["网络连接较慢，请稍后重试", "API服务可能负载过高"]
+        )
+
+    if DEBUG_MODE:
+        record_server_timing(endpoint, params, response)
+    return response
+
+
+# 调试模式下保留的最近请求耗时条数
+SERVER_TIMING_HISTORY = 20
+
+_server_timings = deque(maxlen=SERVER_TIMING_HISTORY)
+
+
+def record_server_timing(endpoint: str, params: dict, response):
+    """记录一次请求的服务端耗时（本地响应缓存命中的请求没有服务端耗时）"""
+    headers = getattr(response, "headers", None) or {}
+    timing = parse_server_timing(headers.get("Server-Timing"))
+    _server_timings.append({
+        "endpoint": endpoint,
+        "symbol": (params or {}).get("symbol"),
+        "status_code": response.status_code,
+        "client_cache": headers.get(CACHE_HEADER),
+        **timing,
+    })
+
+
+def recent_server_timings() -> list:
+    """最近请求的服务端耗时（最新的在前）"""
+    return list(reversed(_server_timings))
+
+
 def get_financial_statements(symbol: str, market: str, years: int = 10):
     """获取财务三表原始数据（保持分离的字典结构）
 
@@ -56,27 +182,19 @@ def get_financial_statements(symbol: str, market: str, years: int = 10):
         APIServiceUnavailableError: API服务不可用
         DataServiceError: 其他数据处理错误
     """
-    # 查询类型映射
-    query_type_map = {
-        "A股": "a_financial_statements",
-        "港股": "hk_financial_statements",
-        "美股": "us_financial_statements"
-    }
-
-    query_type = query_type_map.get(market)
+    query_type = STATEMENTS_QUERY_TYPES.get(market)
     if not query_type:
         raise DataServiceError(f"不支持的市场类型: {market}")
 
     # 调用FastAPI的财务三表查询端点
     try:
-        response = requests.get(
-            get_api_endpoint(FINANCIAL_STATEMENTS_ENDPOINT),
+        response = api_get(
+            FINANCIAL_STATEMENTS_ENDPOINT,
             params={
                 "symbol": symbol,
                 "query_type": query_type,
                 "frequency": "annual"
-            },
-            timeout=API_TIMEOUT
+            }
         )
 
         # 检查HTTP状态码
@@ -149,25 +267,6 @@ def get_financial_statements(symbol: str, market: str, years: int = 10):
             "cash_flow": cashflow_df
         }
 
-    except requests.exceptions.ConnectionError:
-        raise APIServiceUnavailableError(
-            "无法连接到API服务",
-            [
-                "请确保FastAPI服务已启动 (poe api)",
-                "检查服务地址: http://localhost:8000",
-                "查看文档启动API服务"
-            ]
-        )
-    except requests.exceptions.Timeout:
-        raise APIServiceUnavailableError(
-            "API服务请求超时",
-            ["网络连接较慢，请稍后重试", "API服务可能负载过高"]
-        )
-    except requests.exceptions.RequestException as e:
-        raise APIServiceUnavailableError(
-            f"API请求失败: {str(e)}",
-            ["请检查网络连接", "请稍后重试"]
-        )
     except (SymbolNotFoundError, APIServiceUnavailableError):
         # 重新抛出业务异常
         raise
@@ -178,6 +277,41 @@ def get_financial_statements(symbol: str, market: str, years: int = 10):
         )
 
 
+def warm_up(symbol: str, market: str) -> int:
+    """预热分析模块用到的API数据（财务三表、财务指标）
+
+    请求参数与各分析模块一致，API 服务会把上游数据写入缓存，成功的响应也会进入
+    本地响应缓存，之后打开其它分组时直接命中缓存。只用于后台预取，失败时静默忽略。
+
+    Args:
+        symbol: 股票代码
+        market: 市场类型（A股/港股/美股）
+
+    Returns:
+        int: 成功的请求数
+    """
+    requests_to_warm = []
+    if market in STATEMENTS_QUERY_TYPES:
+        requests_to_warm.append((FINANCIAL_STATEMENTS_ENDPOINT, {
+            "symbol": symbol,
+            "query_type": STATEMENTS_QUERY_TYPES[market],
+            "frequency": "annual"
+        }))
+    if market in INDICATOR_MARKETS:
+        requests_to_warm.append((FINANCIAL_INDICATORS_ENDPOINT, {
+            "symbol": symbol,
+            "market": INDICATOR_MARKETS[market],
+            "frequency": "annual"
+        }))
+
+    # 批量并发请求；成功响应同时写入本地响应缓存
+    try:
+        responses = get_backend().get_many(requests_to_warm)
+    except (ApiConnectionError, ApiTimeoutError):
+        return 0
+    return sum(1 for response in responses if response.status_code == 200)
+
+
 def _get_common_mistakes(symbol: str, market: str) -> list:
     """获取常见错误和更正建议
 
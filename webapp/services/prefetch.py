@@ -0,0 +1,228 @@
+"""
+后台预取
+
+页面只渲染当前选中的分析分组。其它分组的数据在渲染完成后由后台线程预取
+（`data_service.warm_up`，让 API 服务把上游数据写入缓存），用户切换分组时直接命中缓存。
+
+用户在搜索框输入时，`SpeculativePrefetcher` 对稳定一段时间的首个候选股票做投机预取，
+确认选择时数据往往已在 API 缓存中。
+
+预取任务在线程池中执行，不占用 Streamlit 渲染线程；同一股票在 ttl 秒内只预取一次。
+`Prefetcher` 随应用共享资源创建（见 `services.app_resources`），所有会话共用。
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """去重的后台预取器"""
+
+    def __init__(self, max_workers: int = 2, ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_workers: 预取线程数
+            ttl: 同一个键在多少秒内不重复预取
+            clock: 时钟函数（测试时可替换）
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._submitted: Dict[Hashable, Tuple[float, Future]] = {}
+
+    def submit(self, key: Hashable, func: Callable, *args, **kwargs) -> Optional[Future]:
+        """
+        提交预取任务
+
+        Args:
+            key: 去重键（如 (symbol, market)）
+            func: 预取函数，异常只记录日志
+            *args, **kwargs: 传给 func 的参数
+
+        Returns:
+            新提交任务的 Future；同一个键仍在执行或未过期时返回 None
+        """
+        now = self._clock()
+        with self._lock:
+            previous = self._submitted.get(key)
+            if previous and not previous[1].cancelled():
+                submitted_at, previous_future = previous
+                if not previous_future.done() or now - submitted_at < self.ttl:
+                    return None
+            # 顺带清理过期的键，避免长期运行时无限增长
+            for stale in [k for k, (at, f) in self._submitted.items() if f.done() and now - at >= self.ttl]:
+                del self._submitted[stale]
+            future = self._executor.submit(self._run, key, func, *args, **kwargs)
+            self._submitted[key] = (now, future)
+            return future
+
+    @staticmethod
+    def _run(key: Hashable, func: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            logger.warning("预取失败: %s", key, exc_info=True)
+            return None
+        finally:
+            logger.debug("预取 %s 耗时 %.0f ms", key, (time.perf_counter() - start) * 1000)
+
+    def shutdown(self, wait: bool = True):
+        """停止线程池"""
+        self._executor.shutdown(wait=wait)
+
+
+def prefetch_symbol(prefetcher: Prefetcher, symbol: str, market: str) -> Optional[Future]:
+    """后台预热某只股票所有分析分组用到的数据"""
+    from services import data_service
+
+    return prefetcher.submit((symbol, market), data_service.warm_up, symbol, market)
+
+
+class SpeculativePrefetcher:
+    """
+    搜索框投机预取
+
+    - **防抖**: 同一会话的首个候选在 delay 秒内没有变化才预取；候选变化时取消尚未开始的预取
+    - **限流**: 整个进程每分钟最多发起 max_per_minute 次投机预取
+    - **命中率**: 用户确认的股票如果之前被投机预取过记为命中，`stats()` 报告命中率
+
+    定时器和预取任务都在后台线程执行，`suggest()` 只登记候选，立即返回。
+    """
+
+    def __init__(self, prefetcher: Prefetcher, delay: float = 0.4, max_per_minute: int = 20,
+                 warm: Optional[Callable[[str, str], object]] = None,
+                 clock: Callable[[], float] = time.monotonic, max_tracked: int = 1000,
+                 max_sessions: int = 1000):
+        """
+        Args:
+            prefetcher: 共享的预取器（与分组预取共用去重）
+            delay: 候选需要保持稳定的秒数
+            max_per_minute: 每分钟最多投机预取次数
+            warm: 预热函数，默认 `data_service.warm_up`
+            clock: 时钟函数（测试时可替换）
+            max_tracked: 每个会话最多记住的已预取股票数
+            max_sessions: 最多记住多少个会话的已预取股票（超出时淘汰最久未活动的会话）
+        """
+        self.prefetcher = prefetcher
+        self.delay = delay
+        self.max_per_minute = max_per_minute
+        self._warm = warm
+        self._clock = clock
+        self._max_tracked = max_tracked
+        self._max_sessions = max_sessions
+
+        self._lock = threading.Lock()
+        self._timers: Dict[Hashable, Tuple[Tuple[str, str], threading.Timer]] = {}
+        self._pending: Dict[Hashable, Future] = {}
+        # 会话 → 已预取股票，两层都按 LRU 淘汰（会话结束时 Streamlit 不会通知，只能靠容量上限回收）
+        self._speculated: "OrderedDict[Hashable, OrderedDict[Tuple[str, str], None]]" = OrderedDict()
+        self._fired: Deque[float] = deque()
+        self._counters = {"suggested": 0, "prefetched": 0, "cancelled": 0,
+                          "rate_limited": 0, "confirmed": 0, "hits": 0}
+
+    def suggest(self, session: Hashable, symbol: str, market: str):
+        """
+        登记会话当前的首个候选（不阻塞）
+
+        Args:
+            session: 会话标识
+            symbol: 候选股票代码
+            market: 市场类型（A股/港股/美股）
+        """
+        key = (symbol, market)
+        with self._lock:
+            current = self._timers.get(session)
+            if current and current[0] == key:
+                return
+            self._counters["suggested"] += 1
+            self._cancel_locked(session)
+            timer = threading.Timer(self.delay, self._fire, args=(session, key))
+            timer.daemon = True
+            self._timers[session] = (key, timer)
+        timer.start()
+
+    def cancel(self, session: Hashable):
+        """取消会话尚未开始的投机预取"""
+        with self._lock:
+            self._cancel_locked(session)
+
+    def _cancel_locked(self, session: Hashable):
+        current = self._timers.pop(session, None)
+        if current:
+            current[1].cancel()
+        pending = self._pending.pop(session, None)
+        if pending and pending.cancel():
+            self._counters["cancelled"] += 1
+
+    def _fire(self, session: Hashable, key: Tuple[str, str]):
+        with self._lock:
+            current = self._timers.get(session)
+            if not current or current[0] != key:
+                return
+            del self._timers[session]
+
+            now = self._clock()
+            while self._fired and now - self._fired[0] >= 60:
+                self._fired.popleft()
+            if len(self._fired) >= self.max_per_minute:
+                self._counters["rate_limited"] += 1
+                return
+            self._fired.append(now)
+
+            speculated = self._speculated.setdefault(session, OrderedDict())
+            self._speculated.move_to_end(session)
+            while len(self._speculated) > self._max_sessions:
+                self._speculated.popitem(last=False)
+            speculated[key] = None
+            speculated.move_to_end(key)
+            while len(speculated) > self._max_tracked:
+                speculated.popitem(last=False)
+            self._counters["prefetched"] += 1
+
+        future = self.prefetcher.submit(key, self._warm_func(), *key)
+        if future is not None:
+            with self._lock:
+                self._pending[session] = future
+
+    def _warm_func(self) -> Callable[[str, str], object]:
+        if self._warm is None:
+            from services import data_service
+            return data_service.warm_up
+        return self._warm
+
+    def confirm(self, session: Hashable, symbol: str, market: str) -> bool:
+        """
+        用户确认选择了某只股票
+
+        Returns:
+            该股票之前是否被投机预取过（命中）
+        """
+        with self._lock:
+            # 确认后页面会直接查询，不再需要等待中的投机预取；已开始的预取继续执行
+            current = self._timers.pop(session, None)
+            if current:
+                current[1].cancel()
+            hit = (symbol, market) in self._speculated.get(session, ())
+            if session in self._speculated:
+                self._speculated.move_to_end(session)
+            self._counters["confirmed"] += 1
+            self._counters["hits"] += hit
+            self._pending.pop(session, None)
+        return hit
+
+    def stats(self) -> dict:
+        """投机预取统计（含命中率 hit_rate = 命中数 / 确认数）"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["tracked_sessions"] = len(self._speculated)
+        stats["hit_rate"] = stats["hits"] / stats["confirmed"] if stats["confirmed"] else None
+        return stats
@@ -0,0 +1,278 @@
+"""
+本地证券主数据与搜索索引
+
+证券主数据（代码、名称、市场、拼音首字母）由 `scripts/build_securities_master.py`
+离线调用 akshare 列表接口生成并保存为 JSON，应用启动时加载到内存索引：
+
+- **代码前缀**: 有序键 + 二分查找（等价于前缀树），`600` / `007` / `aap`
+- **拼音首字母前缀**: 同上，`gzmt` → 贵州茅台
+- **名称子串**: 字符 1-gram / 2-gram 倒排索引，`茅台` → 贵州茅台
+
+倒排列表按"A股 → 港股 → 美股、代码升序"的优先级排列，只需扫描到 limit 条即可返回，
+单次搜索在万级证券上远低于 1 毫秒。
+"""
+
+import json
+import os
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+MASTER_FILE_VERSION = 1
+
+# 市场显示名称（与历史记录的 market 字段一致），按搜索优先级排列
+MARKET_ORDER = ("A股", "港股", "美股")
+
+
+@dataclass(frozen=True)
+class SecurityRecord:
+    """证券主数据记录"""
+    symbol: str   # 标准化股票代码（600519, 00700, AAPL）
+    name: str     # 证券名称
+    market: str   # 市场（A股、港股、美股）
+    pinyin: str = ""  # 名称拼音首字母（小写，如 gzmt）
+
+    @property
+    def display_text(self) -> str:
+        """搜索框显示文本"""
+        return f"{self.symbol} - {self.name} [{self.market}]"
+
+
+class SecuritiesIndex:
+    """证券主数据内存索引"""
+
+    def __init__(self, records: Iterable[SecurityRecord]):
+        market_rank = {market: i for i, market in enumerate(MARKET_ORDER)}
+        self.records: List[SecurityRecord] = sorted(
+            records, key=lambda r: (market_rank.get(r.market, len(MARKET_ORDER)), r.symbol)
+        )
+
+        self._by_symbol: Dict[str, List[int]] = {}
+        code_keys: List[Tuple[str, int]] = []
+        pinyin_keys: List[Tuple[str, int]] = []
+        self._grams: Dict[str, List[int]] = {}
+        self._names: List[str] = []
+
+        for record_id, record in enumerate(self.records):
+            code = record.symbol.lower()
+            self._by_symbol.setdefault(code, []).append(record_id)
+            code_keys.append((code, record_id))
+            if record.pinyin:
+                pinyin_keys.append((record.pinyin, record_id))
+
+            name = record.name.lower()
+            self._names.append(name)
+            for gram in _name_grams(name):
+                self._grams.setdefault(gram, []).append(record_id)
+
+        code_keys.sort()
+        pinyin_keys.sort()
+        self._code_keys = [key for key, _ in code_keys]
+        self._code_ids = [record_id for _, record_id in code_keys]
+        self._pinyin_keys = [key for key, _ in pinyin_keys]
+        self._pinyin_ids = [record_id for _, record_id in pinyin_keys]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, symbol: str, market: Optional[str] = None) -> Optional[SecurityRecord]:
+        """按代码（和市场）查找证券"""
+        for record_id in self._by_symbol.get(symbol.strip().lower(), ()):
+            record = self.records[record_id]
+            if market is None or record.market == market:
+                return record
+        return None
+
+    def search(self, searchterm: str, limit: int = 10) -> List[SecurityRecord]:
+        """
+        搜索证券（代码精确 → 代码前缀 → 名称子串 → 拼音首字母前缀）
+
+        Args:
+            searchterm: 搜索词（代码、名称或拼音首字母，大小写不敏感）
+            limit: 最大返回数量
+
+        Returns:
+            匹配的证券记录列表
+        """
+        term = (searchterm or "").strip().lower()
+        if not term or limit <= 0:
+            return []
+
+        found: List[int] = []
+        seen = set()
+
+        def collect(record_ids: Iterable[int]) -> bool:
+            for record_id in record_ids:
+                if record_id not in seen:
+                    seen.add(record_id)
+                    found.append(record_id)
+                    if len(found) >= limit:
+                        return True
+            return False
+
+        if term.isascii():
+            exact = list(self._by_symbol.get(term, ()))
+            if term.isdigit() and len(term) < 5:
+                # 港股代码补零（700 → 00700）
+                exact += self._by_symbol.get(term.zfill(5), [])
+            sources = [
+                exact,
+                _prefix_ids(self._code_keys, self._code_ids, term),
+                self._name_matches(term),
+                _prefix_ids(self._pinyin_keys, self._pinyin_ids, term),
+            ]
+        else:
+            sources = [self._name_matches(term)]
+
+        for source in sources:
+            if collect(source):
+                break
+
+        return [self.records[record_id] for record_id in found]
+
+    def _name_matches(self, term: str) -> Iterable[int]:
+        """名称包含 term 的记录（按优先级顺序惰性产出）"""
+        grams = [term] if len(term) == 1 else [term[i:i + 2] for i in range(len(term) - 1)]
+        postings = [self._grams.get(gram) for gram in grams]
+        if not postings or any(p is None for p in postings):
+            return
+        # 从最短的倒排列表出发，逐个校验完整子串
+        for record_id in min(postings, key=len):
+            if term in self._names[record_id]:
+                yield record_id
+
+    # ==================== 持久化 ====================
+
+    def save(self, path: Path):
+        """保存证券主数据到 JSON 文件"""
+        save_records(self.records, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SecuritiesIndex":
+        """从 JSON 文件加载证券主数据并建立索引"""
+        return cls(load_records(path))
+
+
+def _name_grams(name: str) -> Iterable[str]:
+    """名称的 1-gram 和 2-gram"""
+    grams = set(name)
+    grams.update(name[i:i + 2] for i in range(len(name) - 1))
+    return grams
+
+
+def _prefix_ids(keys: List[str], ids: List[int], prefix: str) -> Iterable[int]:
+    """有序键上的前缀查找"""
+    position = bisect_left(keys, prefix)
+    while position < len(keys) and keys[position].startswith(prefix):
+        yield ids[position]
+        position += 1
+
+
+def save_records(records: Iterable[SecurityRecord], path: Path):
+    """保存证券主数据（紧凑 JSON：[代码, 名称, 市场, 拼音] 列表）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = [[r.symbol, r.name, r.market, r.pinyin] for r in records]
+    payload = {
+        "version": MASTER_FILE_VERSION,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "count": len(rows),
+        "records": rows,
+    }
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_records(path: Path) -> List[SecurityRecord]:
+    """加载证券主数据"""
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    if payload.get("version") != MASTER_FILE_VERSION:
+        raise ValueError(f"不支持的证券主数据版本: {payload.get('version')}")
+    return [SecurityRecord(*row) for row in payload["records"]]
+
+
+_loaded: Dict[str, Tuple[float, SecuritiesIndex]] = {}
+
+
+def get_securities_index(path: Path) -> Optional[SecuritiesIndex]:
+    """
+    获取证券索引（按文件修改时间缓存，进程内共享）
+
+    Streamlit 每次交互重新执行脚本，但已导入模块保持不变，因此索引只在文件更新后重建。
+
+    Returns:
+        证券索引；主数据文件不存在或无法解析时返回 None
+    """
+    path = Path(path)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+    cached = _loaded.get(str(path))
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        index = SecuritiesIndex.load(path)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    _loaded[str(path)] = (mtime, index)
+    return index
+
+
+# ==================== 离线构建 ====================
+
+def pinyin_initials(name: str) -> str:
+    """
+    名称拼音首字母（小写，只保留字母和数字）
+
+    需要 pypinyin（仅构建主数据时使用）；未安装时返回空字符串。
+    """
+    try:
+        from pypinyin import Style, lazy_pinyin
+    except ImportError:
+        return ""
+    initials = "".join(lazy_pinyin(name, style=Style.FIRST_LETTER))
+    return "".join(ch for ch in initials.lower() if ch.isascii() and ch.isalnum())
+
+
+def _records_from_frame(df: pd.DataFrame, code_column: str, name_column: str, market: str,
+                        code_transform: Optional[Callable[[str], str]] = None) -> List[SecurityRecord]:
+    records = []
+    for code, name in zip(df[code_column].astype(str), df[name_column].astype(str)):
+        code = code_transform(code) if code_transform else code
+        name = name.strip()
+        if code and name:
+            records.append(SecurityRecord(code, name, market, pinyin_initials(name)))
+    return records
+
+
+def fetch_securities_master() -> List[SecurityRecord]:
+    """
+    调用 akshare 列表接口获取三地证券主数据
+
+    - A股: `stock_info_a_code_name`（code, name）
+    - 港股: `stock_hk_spot_em`（代码, 名称）
+    - 美股: `stock_us_spot_em`（代码形如 105.AAPL, 名称）
+    """
+    import akshare as ak
+
+    records = _records_from_frame(ak.stock_info_a_code_name(), "code", "name", "A股")
+    records += _records_from_frame(ak.stock_hk_spot_em(), "代码", "名称", "港股",
+                                   code_transform=lambda code: code.zfill(5))
+    records += _records_from_frame(ak.stock_us_spot_em(), "代码", "名称", "美股",
+                                   code_transform=lambda code: code.split(".", 1)[-1].upper())
+
+    # 同一市场同一代码只保留第一条
+    unique: Dict[Tuple[str, str], SecurityRecord] = {}
+    for record in records:
+        unique.setdefault((record.market, record.symbol), record)
+    return list(unique.values())
@@ -1,11 +1,12 @@
 """
 股票代码搜索服务
 
-结合历史记录管理和股票识别器
+结合历史记录管理、本地证券主数据索引和股票识别器
 """
-from typing import List
+from typing import List, Optional
 from akshare_value_investment.core.stock_identifier import StockIdentifier
 from akshare_value_investment.core.models import MarketType
+from services.securities_master import SecuritiesIndex
 from utils.stock_history_manager import StockHistoryManager
 
 
@@ -15,7 +16,9 @@ class StockSearchService:
     def __init__(
         self,
         stock_identifier: StockIdentifier,
-        history_manager: StockHistoryManager
+        history_manager: StockHistoryManager,
+        securities_index: Optional[SecuritiesIndex] = None,
+        master_limit: int = 10
     ):
         """
         初始化搜索服务
@@ -23,9 +26,13 @@ class StockSearchService:
         Args:
             stock_identifier: 股票识别器
             history_manager: 历史记录管理器
+            securities_index: 证券主数据索引（可选，支持名称和拼音首字母搜索）
+            master_limit: 证券主数据最多返回的条数
         """
         self.identifier = stock_identifier
         self.history = history_manager
+        self.securities = securities_index
+        self.master_limit = master_limit
 
     def search(self, searchterm: str) -> List[tuple]:
         """
@@ -40,10 +47,26 @@ class StockSearchService:
         # 1. 从历史记录中搜索
         history_results = self.history.search(searchterm, limit=8)
 
-        # 2. 如果有搜索词，尝试识别新股票
+        # 2. 从证券主数据中搜索（代码、名称、拼音首字母）
+        master_records = []
+        if searchterm and self.securities is not None:
+            master_records = self.securities.search(searchterm, limit=self.master_limit)
+            existing_symbols = {s for _, s in history_results}
+            history_results.extend(
+                (record.display_text, record.symbol)
+                for record in master_records
+                if record.symbol not in existing_symbols
+            )
+
+        # 3. 如果有搜索词，尝试识别新股票
         if searchterm and len(searchterm) >= 1:
             try:
                 market, symbol = self.identifier.identify(searchterm)
+
+                # 名称、拼音等非代码输入已由证券主数据匹配，不再猜测为代码
+                if master_records and not self.identifier.validate_symbol(symbol, market):
+                    return history_results
+
                 # 使用 format_symbol 获得真正标准化的代码（用于去重）
                 standardized_symbol = self.identifier.format_symbol(market, symbol)
 
@@ -75,4 +98,5 @@ class StockSearchService:
             market: 市场类型
             original_input: 用户原始输入
         """
-        self.history.add_record(symbol, market, original_input)
+        record = self.securities.get(symbol, market) if self.securities is not None else None
+        self.history.add_record(symbol, market, original_input, name=record.name if record else None)
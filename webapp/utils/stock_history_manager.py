@@ -1,13 +1,22 @@
 """
 股票代码历史记录管理器
 
-负责保存和检索用户查询过的股票代码
+负责保存和检索用户查询过的股票代码。
+
+历史记录保存在 SQLite 数据库（WAL 模式）中：
+- 每次查询只 upsert 一行，不重写整个文件；多个 Streamlit 会话并发写入由 SQLite 事务保证原子性
+- 代码、原始输入、名称的小写键建有索引，前缀搜索走索引范围查询
+- 按最后查询时间保留最近 max_records 条记录
+
+旧版 `stock_history.json` 在首次打开时自动导入。
 """
 import json
+import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import Iterator, List, Dict, Optional
+from dataclasses import dataclass
 from collections import Counter
 
 
@@ -26,56 +35,123 @@ class StockHistoryItem:
             self.last_query_time = datetime.now().isoformat()
 
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stock_history (
+    symbol          TEXT PRIMARY KEY,
+    market          TEXT NOT NULL,
+    original_input  TEXT NOT NULL,
+    name            TEXT,
+    query_count     INTEGER NOT NULL DEFAULT 0,
+    last_query_time TEXT NOT NULL,
+    symbol_key      TEXT NOT NULL,
+    input_key       TEXT NOT NULL,
+    name_key        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_symbol_key ON stock_history(symbol_key);
+CREATE INDEX IF NOT EXISTS idx_history_input_key ON stock_history(input_key);
+CREATE INDEX IF NOT EXISTS idx_history_name_key ON stock_history(name_key);
+CREATE INDEX IF NOT EXISTS idx_history_rank ON stock_history(query_count DESC, last_query_time);
+CREATE INDEX IF NOT EXISTS idx_history_last_query ON stock_history(last_query_time);
+"""
+
+_COLUMNS = "symbol, market, original_input, name, query_count, last_query_time"
+
+# 排序：查询次数降序，次数相同时按最后查询时间升序
+_ORDER_BY = "ORDER BY query_count DESC, last_query_time ASC"
+
+# 前缀范围查询的上界后缀
+_PREFIX_UPPER = "\U0010ffff"
+
+
+def _escape_like(term: str) -> str:
+    """转义 LIKE 通配符（用户输入中的 % 和 _ 按字面匹配）"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class StockHistoryManager:
     """股票历史记录管理器"""
 
-    def __init__(self, cache_dir: Path = None):
+    def __init__(self, cache_dir: Path = None, max_records: int = 50):
         """
         初始化历史记录管理器
 
         Args:
             cache_dir: 缓存目录路径，默认为 webapp/.cache/
+            max_records: 最多保留的记录数（按最后查询时间淘汰最旧的记录）
         """
         if cache_dir is None:
             cache_dir = Path(__file__).parent.parent / ".cache"
 
         self.cache_dir = Path(cache_dir)
-        self.history_file = self.cache_dir / "stock_history.json"
-        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        self.db_file = self.cache_dir / "stock_history.db"
+        self.legacy_history_file = self.cache_dir / "stock_history.json"
+        self.max_records = max_records
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        self._migrate_legacy_history()
 
-        # 加载历史记录
-        self._history: Dict[str, StockHistoryItem] = self._load_history()
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开数据库连接（每次操作独立连接，可在任意线程中使用）"""
+        conn = sqlite3.connect(self.db_file, timeout=10, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
 
-    def _load_history(self) -> Dict[str, StockHistoryItem]:
-        """从文件加载历史记录"""
-        if not self.history_file.exists():
-            return {}
+    def _migrate_legacy_history(self):
+        """导入旧版 JSON 历史记录（仅在数据库为空时执行一次）"""
+        if not self.legacy_history_file.exists():
+            return
 
         try:
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return {
-                    symbol: StockHistoryItem(**item)
-                    for symbol, item in data.items()
-                }
-        except (json.JSONDecodeError, TypeError):
-            return {}
-
-    def _save_history(self):
-        """保存历史记录到文件"""
-        data = {}
-        for symbol, item in self._history.items():
-            # 转换为字典，并过滤掉None值
-            item_dict = asdict(item)
-            # 移除None值的字段
-            data[symbol] = {k: v for k, v in item_dict.items() if v is not None}
-
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(self.legacy_history_file, 'r', encoding='utf-8') as f:
+                items = [StockHistoryItem(**item) for item in json.load(f).values()]
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            items = []
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                empty = conn.execute("SELECT COUNT(*) FROM stock_history").fetchone()[0] == 0
+                if empty and items:
+                    conn.executemany(
+                        f"INSERT OR IGNORE INTO stock_history ({_COLUMNS}, symbol_key, input_key, name_key) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [self._row(item) for item in items],
+                    )
+                    self._enforce_retention(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        self.legacy_history_file.rename(self.legacy_history_file.with_suffix(".json.migrated"))
+
+    @staticmethod
+    def _row(item: StockHistoryItem) -> tuple:
+        return (
+            item.symbol, item.market, item.original_input, item.name, item.query_count, item.last_query_time,
+            item.symbol.lower(), item.original_input.lower(), item.name.lower() if item.name else None,
+        )
+
+    def _enforce_retention(self, conn: sqlite3.Connection):
+        """只保留最近查询的 max_records 条记录"""
+        if self.max_records is None:
+            return
+        conn.execute(
+            "DELETE FROM stock_history WHERE symbol IN ("
+            " SELECT symbol FROM stock_history ORDER BY last_query_time DESC LIMIT -1 OFFSET ?)",
+            (self.max_records,),
+        )
 
     def add_record(self, symbol: str, market: str, original_input: str, name: str = None):
         """
-        添加或更新历史记录
+        添加或更新历史记录（原子 upsert）
 
         Args:
             symbol: 标准化股票代码
@@ -83,29 +159,40 @@ class StockHistoryManager:
             original_input: 用户原始输入
             name: 股票名称（可选）
         """
-        if symbol in self._history:
-            # 更新现有记录
-            item = self._history[symbol]
-            item.query_count += 1
-            item.last_query_time = datetime.now().isoformat()
-        else:
-            # 创建新记录
-            self._history[symbol] = StockHistoryItem(
-                symbol=symbol,
-                market=market,
-                original_input=original_input,
-                name=name,
-                query_count=1
-            )
+        item = StockHistoryItem(
+            symbol=symbol,
+            market=market,
+            original_input=original_input,
+            name=name,
+            query_count=1
+        )
 
-        self._save_history()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 已有记录：累加查询次数、更新时间；名称缺失时补上
+                conn.execute(
+                    f"INSERT INTO stock_history ({_COLUMNS}, symbol_key, input_key, name_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(symbol) DO UPDATE SET "
+                    " query_count = query_count + 1,"
+                    " last_query_time = excluded.last_query_time,"
+                    " name = COALESCE(stock_history.name, excluded.name),"
+                    " name_key = COALESCE(stock_history.name_key, excluded.name_key)",
+                    self._row(item),
+                )
+                self._enforce_retention(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
 
     def search(self, searchterm: str, limit: int = 10) -> List[tuple]:
         """
         搜索历史记录
 
         Args:
-            searchterm: 搜索词（支持股票代码或名称）
+            searchterm: 搜索词（股票代码、原始输入或名称的前缀；结果不足时再按名称子串匹配）
             limit: 最大返回数量
 
         Returns:
@@ -113,28 +200,34 @@ class StockHistoryManager:
         """
         if not searchterm or len(searchterm) < 1:
             # 返回最常查询的记录
-            sorted_items = sorted(
-                self._history.values(),
-                key=lambda x: (-x.query_count, x.last_query_time)
-            )
-            items = sorted_items[:limit]
+            items = self._query(f"SELECT {_COLUMNS} FROM stock_history {_ORDER_BY} LIMIT ?", (limit,))
         else:
-            # 模糊搜索
-            searchterm = searchterm.lower()
-            matched = []
-
-            for item in self._history.values():
-                # 匹配股票代码或原始输入
-                if (searchterm in item.symbol.lower() or
-                    searchterm in item.original_input.lower() or
-                    (item.name and searchterm in item.name.lower())):
-                    matched.append(item)
-
-            # 按查询频率和时间排序
-            items = sorted(
-                matched,
-                key=lambda x: (-x.query_count, x.last_query_time)
-            )[:limit]
+            prefixes = [searchterm.strip().lower()]
+            if prefixes[0].isdigit() and len(prefixes[0]) < 5:
+                # 港股代码补零（700 → 00700）
+                prefixes.append(prefixes[0].zfill(5))
+
+            conditions = []
+            params: List[str] = []
+            for prefix in prefixes:
+                for key in ("symbol_key", "input_key", "name_key"):
+                    conditions.append(f"({key} >= ? AND {key} < ?)")
+                    params.extend([prefix, prefix + _PREFIX_UPPER])
+
+            items = self._query(
+                f"SELECT {_COLUMNS} FROM stock_history WHERE {' OR '.join(conditions)} {_ORDER_BY} LIMIT ?",
+                (*params, limit),
+            )
+            if len(items) < limit:
+                # 前缀结果不足时按名称子串补充（"茅台" → "贵州茅台"），历史记录最多几十条，全表扫描很便宜
+                found = [item.symbol for item in items]
+                placeholders = ", ".join("?" * len(found))
+                excluded = f" AND symbol NOT IN ({placeholders})" if found else ""
+                items += self._query(
+                    f"SELECT {_COLUMNS} FROM stock_history WHERE name_key LIKE '%' || ? || '%' ESCAPE '\\'"
+                    f"{excluded} {_ORDER_BY} LIMIT ?",
+                    (_escape_like(prefixes[0]), *found, limit - len(items)),
+                )
 
         # 构建显示文本
         results = []
@@ -147,18 +240,28 @@ class StockHistoryManager:
 
         return results
 
+    def _query(self, sql: str, params: tuple = ()) -> List[StockHistoryItem]:
+        with self._connect() as conn:
+            return [StockHistoryItem(*row) for row in conn.execute(sql, params)]
+
+    def get_record(self, symbol: str) -> Optional[StockHistoryItem]:
+        """获取指定股票的历史记录"""
+        items = self._query(f"SELECT {_COLUMNS} FROM stock_history WHERE symbol = ?", (symbol,))
+        return items[0] if items else None
+
     def get_all_symbols(self) -> List[str]:
         """获取所有历史股票代码"""
-        return list(self._history.keys())
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT symbol FROM stock_history ORDER BY last_query_time")]
 
     def clear_history(self):
         """清空历史记录"""
-        self._history.clear()
-        self._save_history()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM stock_history")
 
     def get_statistics(self) -> Dict:
         """获取历史统计信息"""
-        items = list(self._history.values())
+        items = self._query(f"SELECT {_COLUMNS} FROM stock_history")
         return {
             "total_count": len(items),
             "total_queries": sum(item.query_count for item in items),